@@ -0,0 +1,61 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import os
+import tempfile
+
+from test.cli.helpers import CliTest
+
+CONFIG_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "webapi", "res", "config.yml"
+)
+
+
+class TilesSeedCliTest(CliTest):
+    def test_help(self):
+        result = self.invoke_cli(["tiles", "seed", "--help"])
+        self.assertEqual(0, result.exit_code)
+
+    def test_seed_into_output_dir(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            args = [
+                "tiles",
+                "seed",
+                "-c",
+                CONFIG_PATH,
+                "-d",
+                "demo",
+                "--var",
+                "conc_chl",
+                "-z",
+                "4-5",
+                "-p",
+                "cmap='plasma',vmax=20",
+                "-o",
+                output_dir,
+            ]
+            result = self.invoke_cli(args)
+            self.assertEqual(0, result.exit_code)
+            self.assertIn("3 tile(s) processed: 3 computed", result.stdout)
+            self.assertTrue(
+                os.path.isfile(
+                    os.path.join(output_dir, "demo", "conc_chl", "4", "3", "16.png")
+                )
+            )
+
+            result = self.invoke_cli(args)
+            self.assertEqual(0, result.exit_code)
+            self.assertIn("3 tile(s) processed: 3 skipped", result.stdout)
+
+    def test_seed_without_tile_cache_dir(self):
+        result = self.invoke_cli(["tiles", "seed", "-c", CONFIG_PATH, "-d", "demo"])
+        self.assertEqual(1, result.exit_code)
+        self.assertIn("Either OUTPUT must be given", result.stderr)
+
+    def test_invalid_zoom_range(self):
+        result = self.invoke_cli(
+            ["tiles", "seed", "-c", CONFIG_PATH, "-z", "5-3", "-o", "out"]
+        )
+        self.assertEqual(1, result.exit_code)
+        self.assertIn("ZOOM must be a level or a range", result.stderr)
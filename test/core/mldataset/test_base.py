@@ -4,6 +4,9 @@
 
 import unittest
 
+import numpy as np
+import xarray as xr
+
 from xcube.constants import CRS84
 from xcube.core.gridmapping import GridMapping
 from xcube.core.mldataset import BaseMultiLevelDataset
@@ -84,3 +87,105 @@ class BaseMultiLevelDatasetTest(unittest.TestCase):
         self.assertEqual(CRS84, tiling_scheme.crs_name)
         self.assertEqual(0, tiling_scheme.min_level)
         self.assertEqual(2, tiling_scheme.max_level)
+
+
+class CascadedBaseMultiLevelDatasetTest(unittest.TestCase):
+    @staticmethod
+    def new_dataset(chunked: bool) -> xr.Dataset:
+        rng = np.random.default_rng(42)
+        h, w = 37, 53
+
+        def new_var(dtype) -> xr.DataArray:
+            data = rng.random((2, h, w)) * 100
+            data[:, rng.random((h, w)) < 0.2] = np.nan
+            return xr.DataArray(data.astype(dtype), dims=("time", "lat", "lon"))
+
+        dataset = xr.Dataset(
+            dict(
+                v_mean=new_var(np.float32),
+                v_min=new_var(np.float64),
+                v_max=new_var(np.float64),
+                v_median=new_var(np.float64),
+                v_first=new_var(np.float32),
+                v_int=xr.DataArray(
+                    rng.integers(0, 100, (2, h, w)).astype(np.int16),
+                    dims=("time", "lat", "lon"),
+                ),
+            ),
+            coords=dict(
+                lat=np.linspace(50, 40, h),
+                lon=np.linspace(0, 10, w),
+                time=np.array(["2020-01-01", "2020-01-02"], dtype="datetime64[ns]"),
+            ),
+        )
+        return dataset.chunk(dict(lat=8, lon=8)) if chunked else dataset
+
+    def assert_cascaded_equals_direct(self, chunked: bool):
+        dataset = self.new_dataset(chunked)
+        grid_mapping = GridMapping.from_dataset(dataset, tolerance=1e-3).derive(
+            tile_size=8
+        )
+        agg_methods = dict(
+            v_mean="mean",
+            v_min="min",
+            v_max="max",
+            v_median="median",
+            v_first="first",
+            v_int="mean",
+        )
+        direct_ml_ds = BaseMultiLevelDataset(
+            dataset, grid_mapping=grid_mapping, agg_methods=agg_methods
+        )
+        cascaded_ml_ds = BaseMultiLevelDataset(
+            dataset, grid_mapping=grid_mapping, agg_methods=agg_methods, cascaded=True
+        )
+        self.assertFalse(direct_ml_ds.cascaded)
+        self.assertTrue(cascaded_ml_ds.cascaded)
+        self.assertEqual(4, cascaded_ml_ds.num_levels)
+        for level in range(cascaded_ml_ds.num_levels):
+            direct_ds = direct_ml_ds.get_dataset(level)
+            cascaded_ds = cascaded_ml_ds.get_dataset(level)
+            self.assertEqual(direct_ds.sizes, cascaded_ds.sizes)
+            for var_name in dataset.data_vars:
+                direct_var = direct_ds[var_name]
+                cascaded_var = cascaded_ds[var_name]
+                self.assertEqual(direct_var.dims, cascaded_var.dims)
+                self.assertEqual(direct_var.dtype, cascaded_var.dtype)
+                xr.testing.assert_allclose(direct_var, cascaded_var, rtol=1e-6)
+            if chunked:
+                self.assertEqual(
+                    direct_ds.v_mean.chunks, cascaded_ds.v_mean.chunks
+                )
+
+    def test_cascaded_equals_direct(self):
+        self.assert_cascaded_equals_direct(chunked=True)
+
+    def test_cascaded_equals_direct_not_chunked(self):
+        self.assert_cascaded_equals_direct(chunked=False)
+
+    def test_cascaded_mean_is_weighted(self):
+        # Level 1 pixels have different numbers of valid
+        # base pixels, e.g., 1, 3, 2, and 2 (padded) in first row
+        data = np.array(
+            [
+                [1.0, np.nan, 4.0, 0.0, 2.0, 6.0, 8.0],
+                [np.nan, np.nan, 2.0, np.nan, 4.0, np.nan, 8.0],
+                [3.0, 3.0, 3.0, 3.0, np.nan, np.nan, np.nan],
+                [3.0, 3.0, 3.0, 3.0, np.nan, np.nan, np.nan],
+            ]
+        )
+        dataset = xr.Dataset(
+            dict(v=xr.DataArray(data, dims=("lat", "lon"))),
+            coords=dict(lat=np.linspace(50, 47, 4), lon=np.linspace(0, 6, 7)),
+        )
+        ml_ds = BaseMultiLevelDataset(
+            dataset, num_levels=3, agg_methods="mean", cascaded=True
+        )
+        np.testing.assert_equal(
+            np.array([[1.0, 2.0, 4.0, 8.0], [3.0, 3.0, np.nan, np.nan]]),
+            ml_ds.get_dataset(1).v.values,
+        )
+        np.testing.assert_allclose(
+            np.array([[(1 + 4 + 0 + 2 + 3 * 8) / 12, (2 + 6 + 4 + 8 + 8) / 5]]),
+            ml_ds.get_dataset(2).v.values,
+        )
@@ -4,15 +4,21 @@
 
 
 import math
+import time
 import unittest
+import unittest.mock
 from typing import Optional, List
 from collections.abc import Mapping
 
+import dask
 import fsspec
 import fsspec.core
+import numpy as np
 import xarray as xr
 
+from xcube.core.mldataset import BaseMultiLevelDataset
 from xcube.core.mldataset import FsMultiLevelDataset
+from xcube.core.mldataset.fs import FsMultiLevelDatasetError
 from xcube.core.new import new_cube
 from xcube.core.subsampling import AggMethod
 
@@ -122,6 +128,159 @@ class FsMultiLevelDatasetTest(unittest.TestCase):
         for i in range(num_levels):
             self.assertIsInstance(ml_dataset.get_dataset(i), xr.Dataset)
 
+    def assert_levels_equal(self, expected_path: str, actual_path: str):
+        expected = FsMultiLevelDataset(expected_path, fs=self.fs)
+        actual = FsMultiLevelDataset(actual_path, fs=self.fs)
+        self.assertEqual(expected.num_levels, actual.num_levels)
+        for i in range(expected.num_levels):
+            xr.testing.assert_identical(
+                expected.get_dataset(i).compute(), actual.get_dataset(i).compute()
+            )
+
+    def new_time_series_dataset(self) -> xr.Dataset:
+        dataset = new_cube(
+            width=512,
+            height=256,
+            x_res=360 / 512,
+            y_res=180 / 256,
+            time_periods=5,
+            variables=dict(CHL=0.8, qflags=1),
+        )
+        dataset["CHL"] = dataset.CHL + 0.1 * dataset.lon + dataset.time.dt.day
+        return dataset.chunk(dict(time=2))
+
+    def test_write_single_graph(self):
+        FsMultiLevelDataset.write_dataset(self.dataset, "a.levels", fs=self.fs)
+        FsMultiLevelDataset.write_dataset(
+            self.dataset, "b.levels", fs=self.fs, single_graph=True
+        )
+        self.assert_levels_equal("a.levels", "b.levels")
+
+    def test_write_single_graph_with_memory_limit(self):
+        dataset = self.new_time_series_dataset()
+        FsMultiLevelDataset.write_dataset(
+            dataset, "a.levels", fs=self.fs, tile_size=128
+        )
+        written_regions = []
+        to_zarr = xr.Dataset.to_zarr
+
+        def spy_to_zarr(ds, *args, region=None, **kwargs):
+            if region is not None:
+                written_regions.append(region["time"])
+            return to_zarr(ds, *args, region=region, **kwargs)
+
+        with unittest.mock.patch.object(xr.Dataset, "to_zarr", spy_to_zarr):
+            FsMultiLevelDataset.write_dataset(
+                dataset,
+                "b.levels",
+                fs=self.fs,
+                tile_size=128,
+                single_graph=True,
+                # 2 time chunks of level 0 require 8 MiB
+                level_memory_limit="9M",
+            )
+        self.assert_levels_equal("a.levels", "b.levels")
+        # Two levels written in 2 batches of 4 and 1 time steps
+        self.assertEqual(
+            [slice(0, 4), slice(0, 4), slice(4, 5), slice(4, 5)], written_regions
+        )
+
+    def test_write_resume(self):
+        dataset = self.new_time_series_dataset()
+        FsMultiLevelDataset.write_dataset(
+            dataset, "a.levels", fs=self.fs, tile_size=128
+        )
+        for single_graph in (False, True):
+            path = f"b-{single_graph}.levels"
+            FsMultiLevelDataset.write_dataset(
+                dataset, path, fs=self.fs, tile_size=128, single_graph=single_graph
+            )
+            self.assertTrue(self.fs.exists(f"{path}/0.zarr/.zcompleted"))
+            self.assertTrue(self.fs.exists(f"{path}/1.zarr/.zcompleted"))
+
+            # Simulate interrupted write of level 1
+            self.fs.rm(f"{path}/1.zarr/.zcompleted")
+            self.fs.rm(f"{path}/1.zarr/CHL", recursive=True)
+            # Level 0 must not be written again
+            self.fs.rm(f"{path}/0.zarr/.zattrs")
+
+            FsMultiLevelDataset.write_dataset(
+                dataset,
+                path,
+                fs=self.fs,
+                tile_size=128,
+                single_graph=single_graph,
+                resume=True,
+            )
+            self.assertFalse(self.fs.exists(f"{path}/0.zarr/.zattrs"))
+            self.assertTrue(self.fs.exists(f"{path}/1.zarr/.zcompleted"))
+            self.assert_levels_equal("a.levels", path)
+
+    def test_write_single_graph_interrupted(self):
+        dataset = self.new_time_series_dataset().chunk(dict(lon=128, lat=128))
+        FsMultiLevelDataset.write_dataset(dataset, "a.levels", fs=self.fs)
+
+        def fail_after_other_levels(block: np.ndarray, block_info=None):
+            if block_info[0]["chunk-location"] == (2, 0, 0):
+                # Interrupt writing the last time slice of level 0
+                # after the other levels have been written
+                for _ in range(200):
+                    if self.fs.exists("b.levels/1.zarr/.zcompleted"):
+                        break
+                    time.sleep(0.05)
+                raise InterruptedError()
+            return block
+
+        ml_dataset = BaseMultiLevelDataset(dataset)
+        ml_dataset.get_dataset(1)
+        ml_dataset.set_dataset(
+            0,
+            dataset.assign(
+                CHL=dataset.CHL.copy(
+                    data=dataset.CHL.data.map_blocks(
+                        fail_after_other_levels, dtype=dataset.CHL.dtype
+                    )
+                )
+            ),
+        )
+        for level_memory_limit in (None, "9M"):
+            with dask.config.set(scheduler="threads", num_workers=4):
+                with self.assertRaises(InterruptedError):
+                    FsMultiLevelDataset.write_dataset(
+                        ml_dataset,
+                        "b.levels",
+                        fs=self.fs,
+                        single_graph=True,
+                        level_memory_limit=level_memory_limit,
+                        resume=True,
+                    )
+            self.assertFalse(self.fs.exists("b.levels/0.zarr/.zcompleted"))
+            self.assertTrue(self.fs.exists("b.levels/1.zarr/.zcompleted"))
+            self.fs.rm("b.levels/1.zarr/.zcompleted")
+
+        self.fs.touch("b.levels/1.zarr/.zcompleted")
+        # Level 1 must not be written again
+        self.fs.rm("b.levels/1.zarr/.zattrs")
+        FsMultiLevelDataset.write_dataset(
+            dataset, "b.levels", fs=self.fs, single_graph=True, resume=True
+        )
+        self.assertTrue(self.fs.exists("b.levels/0.zarr/.zcompleted"))
+        self.assertFalse(self.fs.exists("b.levels/1.zarr/.zattrs"))
+        xr.testing.assert_equal(
+            FsMultiLevelDataset("a.levels", fs=self.fs).get_dataset(0),
+            FsMultiLevelDataset("b.levels", fs=self.fs).get_dataset(0),
+        )
+
+    def test_write_single_graph_and_use_saved_levels(self):
+        with self.assertRaises(FsMultiLevelDatasetError):
+            FsMultiLevelDataset.write_dataset(
+                self.dataset,
+                "a.levels",
+                fs=self.fs,
+                single_graph=True,
+                use_saved_levels=True,
+            )
+
     def test_compute_size_weights(self):
         size = 2**28
         weighted_sizes = list(
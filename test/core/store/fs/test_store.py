@@ -0,0 +1,291 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import time
+import unittest
+import uuid
+from unittest.mock import patch
+
+from xcube.core.mldataset import MultiLevelDataset
+from xcube.core.new import new_cube
+from xcube.core.store.fs.registry import new_fs_data_store
+from xcube.core.store.fs.store import FsDataStore
+from xcube.core.zarrstore import ChunkCache
+from xcube.core.zarrstore import set_chunk_cache
+from xcube.core.zarrstore import set_decoded_chunk_cache
+
+
+class FsDataStoreIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = f"xcube-index-test-{uuid.uuid4()}"
+        self.store = new_fs_data_store("memory", root=self.root, max_depth=2)
+        fs = self.store.fs
+        for path in (
+            "cube-1.zarr/.zgroup",
+            "cube-2.levels/0.zarr/.zgroup",
+            "places.geojson",
+            "readme.txt",
+            "sub/cube-3.zarr/.zgroup",
+            "sub/sub/cube-4.zarr/.zgroup",
+        ):
+            fs.pipe(f"{self.root}/{path}", b"{}")
+
+    def tearDown(self) -> None:
+        self.store.fs.rm(self.root, recursive=True)
+
+    def new_indexed_store(self, **params) -> FsDataStore:
+        params = dict(dict(max_depth=2, index_ttl=3600), **params)
+        return new_fs_data_store("memory", root=self.root, **params)
+
+    def test_get_data_ids(self):
+        store = self.new_indexed_store()
+        self.assertEqual(3600, store.index_ttl)
+        self.assertEqual(
+            sorted(self.store.get_data_ids()), list(store.get_data_ids())
+        )
+        self.assertEqual(
+            ["cube-1.zarr", "cube-2.levels", "places.geojson", "sub/cube-3.zarr"],
+            list(store.get_data_ids()),
+        )
+        self.assertEqual(
+            [("cube-1.zarr", {}), ("sub/cube-3.zarr", {})],
+            list(store.get_data_ids(data_type="dataset", include_attrs=["title"])),
+        )
+        # Unlike the traversal without index, the index does not
+        # descend into data resources, e.g., into "cube-2.levels"
+        self.assertEqual(
+            ["cube-1.zarr", "cube-2.levels/0.zarr", "sub/cube-3.zarr"],
+            list(self.store.get_data_ids(data_type="dataset")),
+        )
+        self.assertEqual(
+            ["cube-2.levels"], list(store.get_data_ids(data_type="mldataset"))
+        )
+
+    def test_get_data_ids_filtered(self):
+        store = self.new_indexed_store(includes=["*.zarr", "*.geojson"])
+        self.assertEqual(
+            ["cube-1.zarr", "places.geojson", "sub/cube-3.zarr"],
+            list(store.get_data_ids()),
+        )
+        store = self.new_indexed_store(excludes="sub/*")
+        self.assertEqual(
+            ["cube-1.zarr", "cube-2.levels", "places.geojson"],
+            list(store.get_data_ids()),
+        )
+
+    def test_index_is_built_once(self):
+        store = self.new_indexed_store()
+        with patch.object(store, "_list_dir", wraps=store._list_dir) as list_dir:
+            list(store.get_data_ids())
+            # root and "sub"
+            self.assertEqual(2, list_dir.call_count)
+            list(store.get_data_ids())
+            self.assertTrue(store.has_data("sub/cube-3.zarr"))
+            self.assertEqual(2, list_dir.call_count)
+
+    def test_index_expires(self):
+        store = self.new_indexed_store(index_ttl=0.05)
+        self.assertNotIn("cube-5.zarr", set(store.get_data_ids()))
+        store.fs.pipe(f"{self.root}/cube-5.zarr/.zgroup", b"{}")
+        time.sleep(0.1)
+        self.assertIn("cube-5.zarr", set(store.get_data_ids()))
+
+    def test_index_is_updated_by_write_and_delete(self):
+        store = self.new_indexed_store()
+        self.assertEqual(4, len(list(store.get_data_ids())))
+
+        cube = new_cube(width=10, height=5, variables=dict(a=1.0))
+        store.write_data(cube, "cube-6.zarr")
+        store.write_data(cube, "sub/sub/cube-7.zarr")
+        self.assertEqual(
+            [
+                "cube-1.zarr",
+                "cube-2.levels",
+                "cube-6.zarr",
+                "places.geojson",
+                "sub/cube-3.zarr",
+            ],
+            list(store.get_data_ids()),
+        )
+        self.assertTrue(store.has_data("sub/sub/cube-7.zarr"))
+
+        store.delete_data("cube-6.zarr")
+        store.delete_data("cube-1.zarr")
+        self.assertEqual(
+            ["cube-2.levels", "places.geojson", "sub/cube-3.zarr"],
+            list(store.get_data_ids()),
+        )
+        self.assertFalse(store.has_data("cube-1.zarr"))
+
+    def test_no_index(self):
+        self.assertIsNone(self.store.index_ttl)
+        with patch.object(
+            self.store, "_list_dir", wraps=self.store._list_dir
+        ) as list_dir:
+            list(self.store.get_data_ids())
+            list(self.store.get_data_ids())
+            self.assertEqual(4, list_dir.call_count)
+
+    def test_non_existing_root(self):
+        store = new_fs_data_store(
+            "memory", root=f"xcube-index-test-{uuid.uuid4()}", index_ttl=60
+        )
+        self.assertEqual([], list(store.get_data_ids()))
+
+
+class FsDataStoreSearchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = f"xcube-search-test-{uuid.uuid4()}"
+        self.store = new_fs_data_store("memory", root=self.root)
+        cube = new_cube(width=10, height=5, variables=dict(a=1.0))
+        for i in range(3):
+            self.store.write_data(cube, f"cube-{i}.zarr")
+
+    def tearDown(self) -> None:
+        self.store.fs.rm(self.root, recursive=True)
+
+    def test_search_data_concurrently(self):
+        descriptors = list(self.store.search_data(max_workers=2))
+        self.assertEqual(
+            list(self.store.get_data_ids()), [d.data_id for d in descriptors]
+        )
+        self.assertEqual(3, len(descriptors))
+
+    def test_search_data_caches_descriptors(self):
+        store = self.store
+        version = store.get_data_version("cube-0.zarr")
+        self.assertIsNotNone(version)
+        self.assertIsNone(store.get_data_version("cube-9.zarr"))
+        descriptors = list(store.search_data(cache_descriptors=True))
+        with patch.object(
+            store, "describe_data", wraps=store.describe_data
+        ) as describe_data:
+            self.assertEqual(
+                descriptors,
+                list(store.search_data(max_workers=2, cache_descriptors=True)),
+            )
+            self.assertEqual(0, describe_data.call_count)
+
+            time.sleep(0.01)
+            cube = new_cube(width=20, height=10, variables=dict(a=1.0))
+            store.write_data(cube, "cube-1.zarr", replace=True)
+            self.assertNotEqual(version, store.get_data_version("cube-1.zarr"))
+            descriptors = {
+                d.data_id: d for d in store.search_data(cache_descriptors=True)
+            }
+            self.assertEqual(1, describe_data.call_count)
+            self.assertEqual(
+                {"lon": 20, "lat": 10, "time": 5, "bnds": 2},
+                descriptors["cube-1.zarr"].dims,
+            )
+
+    def test_get_data_version_of_zarr_without_consolidated_metadata(self):
+        store = self.store
+        self.assertIsNotNone(store.get_data_version("cube-0.zarr"))
+        store.fs.rm(f"{self.root}/cube-0.zarr/.zmetadata")
+        # Appends to arrays would not be detected
+        self.assertIsNone(store.get_data_version("cube-0.zarr"))
+
+
+class FsDataStoreChunkCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = f"xcube-chunk-cache-test-{uuid.uuid4()}"
+        self.store = new_fs_data_store("memory", root=self.root)
+        cube = new_cube(width=10, height=5, variables=dict(a=1.0))
+        self.store.write_data(cube.chunk(dict(time=1)), "cube.zarr")
+        self.store.write_data(cube, "cube.levels", num_levels=2)
+        self.cache = ChunkCache(1024 * 1024)
+        set_chunk_cache(self.cache)
+
+    def tearDown(self) -> None:
+        set_chunk_cache(None)
+        self.store.fs.rm(self.root, recursive=True)
+
+    def test_open_dataset(self):
+        dataset = self.store.open_data("cube.zarr", chunk_cache=True)
+        dataset.a.values
+        store_name = f"memory://{self.root}/cube.zarr"
+        self.assertEqual([store_name], self.cache.get_store_names())
+        stats = self.cache.get_stats(store_name)
+        self.assertTrue(stats["items"] > 5)
+
+        dataset = self.store.open_data("cube.zarr", chunk_cache=True)
+        dataset.a.values
+        self.assertEqual(stats["misses"], self.cache.get_stats(store_name)["misses"])
+        self.assertTrue(self.cache.get_stats(store_name)["hits"] > stats["hits"] + 5)
+
+    def test_open_dataset_without_chunk_cache(self):
+        dataset = self.store.open_data("cube.zarr")
+        dataset.a.values
+        set_chunk_cache(None)
+        dataset = self.store.open_data("cube.zarr", chunk_cache=True)
+        dataset.a.values
+        self.assertEqual([], self.cache.get_store_names())
+
+    def test_open_ml_dataset(self):
+        ml_dataset = self.store.open_data("cube.levels", chunk_cache=True)
+        self.assertIsInstance(ml_dataset, MultiLevelDataset)
+        self.assertTrue(ml_dataset.chunk_cache)
+        for level in range(ml_dataset.num_levels):
+            ml_dataset.get_dataset(level).a.values
+        self.assertEqual(2, ml_dataset.num_levels)
+        self.assertEqual(
+            [
+                f"memory://{self.root}/cube.levels/0.zarr",
+                f"memory://{self.root}/cube.levels/1.zarr",
+            ],
+            self.cache.get_store_names(),
+        )
+
+
+class FsDataStoreDecodedChunkCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = f"xcube-decoded-chunk-cache-test-{uuid.uuid4()}"
+        self.store = new_fs_data_store("memory", root=self.root)
+        cube = new_cube(width=10, height=5, variables=dict(a=1.0))
+        self.store.write_data(cube.chunk(dict(time=1)), "cube.zarr")
+        self.store.write_data(cube, "cube.levels", num_levels=2)
+        self.cache = ChunkCache(1024 * 1024)
+        set_decoded_chunk_cache(self.cache)
+
+    def tearDown(self) -> None:
+        set_decoded_chunk_cache(None)
+        self.store.fs.rm(self.root, recursive=True)
+
+    def test_open_dataset(self):
+        dataset = self.store.open_data("cube.zarr", decoded_chunk_cache=True)
+        dataset.a.values
+        store_name = f"memory://{self.root}/cube.zarr"
+        self.assertEqual([store_name], self.cache.get_store_names())
+        stats = self.cache.get_stats(store_name)
+        self.assertEqual(5, stats["items"])
+        self.assertEqual(0, stats["hits"])
+
+        dataset = self.store.open_data("cube.zarr", decoded_chunk_cache=True)
+        dataset.a.values
+        stats = self.cache.get_stats(store_name)
+        self.assertEqual(5, stats["misses"])
+        self.assertEqual(5, stats["hits"])
+
+    def test_open_dataset_without_decoded_chunk_cache(self):
+        dataset = self.store.open_data("cube.zarr")
+        dataset.a.values
+        set_decoded_chunk_cache(None)
+        dataset = self.store.open_data("cube.zarr", decoded_chunk_cache=True)
+        dataset.a.values
+        self.assertEqual([], self.cache.get_store_names())
+
+    def test_open_ml_dataset(self):
+        ml_dataset = self.store.open_data("cube.levels", decoded_chunk_cache=True)
+        self.assertIsInstance(ml_dataset, MultiLevelDataset)
+        self.assertTrue(ml_dataset.decoded_chunk_cache)
+        for level in range(ml_dataset.num_levels):
+            ml_dataset.get_dataset(level).a.values
+        self.assertEqual(
+            [
+                f"memory://{self.root}/cube.levels/0.zarr",
+                f"memory://{self.root}/cube.levels/1.zarr",
+            ],
+            self.cache.get_store_names(),
+        )
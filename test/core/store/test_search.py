@@ -0,0 +1,110 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import threading
+import time
+import unittest
+from typing import Optional
+from unittest.mock import patch
+
+from xcube.core.store import DataDescriptor
+from xcube.core.store import DataStoreError
+from xcube.core.store.search import DefaultSearchMixin
+
+
+class SearchableStore(DefaultSearchMixin):
+    def __init__(self, num_data_ids: int = 10, versions: Optional[dict] = None):
+        self.data_ids = [f"ds-{i}" for i in range(num_data_ids)]
+        self.versions = versions
+        self.described = []
+        self.max_concurrency = 0
+        self._concurrency = 0
+        self._lock = threading.Lock()
+
+    # noinspection PyUnusedLocal
+    def get_data_ids(self, data_type=None):
+        return iter(self.data_ids)
+
+    # noinspection PyUnusedLocal
+    def describe_data(self, data_id, data_type=None):
+        with self._lock:
+            self._concurrency += 1
+            self.max_concurrency = max(self.max_concurrency, self._concurrency)
+            self.described.append(data_id)
+        # Later data resources complete first
+        time.sleep(0.01 * (len(self.data_ids) - int(data_id[3:])))
+        with self._lock:
+            self._concurrency -= 1
+        return DataDescriptor(data_id, "dataset")
+
+    def get_data_version(self, data_id: str) -> Optional[str]:
+        return self.versions.get(data_id) if self.versions else None
+
+
+class DefaultSearchMixinTest(unittest.TestCase):
+    def test_search_params_schema(self):
+        schema = SearchableStore().get_search_params_schema()
+        self.assertEqual(
+            {"max_workers", "ordered", "cache_descriptors"},
+            set(schema.to_dict()["properties"]),
+        )
+
+    def test_search_data(self):
+        store = SearchableStore()
+        self.assertEqual(
+            store.data_ids, [d.data_id for d in store.search_data()]
+        )
+        self.assertEqual(1, store.max_concurrency)
+
+    def test_search_data_concurrently(self):
+        store = SearchableStore()
+        self.assertEqual(
+            store.data_ids,
+            [d.data_id for d in store.search_data(max_workers=4)],
+        )
+        self.assertTrue(1 < store.max_concurrency <= 4)
+
+    def test_search_data_concurrently_unordered(self):
+        store = SearchableStore()
+        data_ids = [
+            d.data_id for d in store.search_data(max_workers=4, ordered=False)
+        ]
+        self.assertEqual(set(store.data_ids), set(data_ids))
+        self.assertNotEqual(store.data_ids, data_ids)
+
+    def test_search_data_concurrently_is_lazy(self):
+        store = SearchableStore(num_data_ids=100)
+        descriptors = store.search_data(max_workers=2)
+        self.assertEqual("ds-0", next(descriptors).data_id)
+        descriptors.close()
+        self.assertTrue(len(store.described) <= 5)
+
+    def test_search_data_caches_descriptors(self):
+        store = SearchableStore(versions={"ds-0": "1", "ds-1": "1"})
+        list(store.search_data(cache_descriptors=True))
+        list(store.search_data(max_workers=2, cache_descriptors=True))
+        # ds-0 and ds-1 described once, all others twice
+        self.assertEqual(18, len(store.described))
+
+        store.versions["ds-1"] = "2"
+        list(store.search_data(cache_descriptors=True))
+        self.assertEqual(1, store.described[18:].count("ds-1"))
+        self.assertNotIn("ds-0", store.described[18:])
+
+    def test_search_data_does_not_cache_descriptors_by_default(self):
+        store = SearchableStore(versions={"ds-0": "1", "ds-1": "1"})
+        with patch.object(
+            store, "get_data_version", wraps=store.get_data_version
+        ) as get_data_version:
+            list(store.search_data())
+            list(store.search_data(max_workers=2))
+            self.assertEqual(0, get_data_version.call_count)
+        self.assertEqual(20, len(store.described))
+
+    def test_search_data_invalid_params(self):
+        store = SearchableStore()
+        with self.assertRaises(DataStoreError):
+            list(store.search_data(max_workers=0))
+        with self.assertRaises(DataStoreError):
+            list(store.search_data(query="ds"))
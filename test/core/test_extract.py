@@ -4,10 +4,13 @@
 
 import unittest
 
+import dask
+import dask.array as da
 import numpy as np
 import pandas as pd
 import xarray as xr
 
+from xcube.core.extract import get_array_values_for_indexes
 from xcube.core.extract import get_cube_point_indexes
 from xcube.core.extract import get_cube_values_for_points
 from xcube.core.extract import get_dataset_indexes
@@ -142,6 +145,102 @@ class GetCubeValuesForPointsTest(unittest.TestCase):
         )
 
 
+# noinspection PyMethodMayBeStatic
+class GetArrayValuesForIndexesTest(unittest.TestCase):
+    def setUp(self):
+        values = np.arange(6 * 8 * 10, dtype=np.float64).reshape((6, 8, 10))
+        self.array = xr.DataArray(
+            values,
+            dims=("time", "lat", "lon"),
+            coords=dict(time=np.arange(6)),
+            attrs=dict(units="mg/m^3"),
+        )
+        self.lat_indexes = np.array([0, 7, -1, 3, 4, 3, 0])
+        self.lon_indexes = np.array([0, 9, 5, 2, 6, 2, -1])
+
+    def test_time_series(self):
+        self._assert_time_series_ok(self.array)
+
+    def test_time_series_chunked(self):
+        values = self._assert_time_series_ok(
+            self.array.chunk(dict(time=4, lat=3, lon=4))
+        )
+        self.assertIsInstance(values.data, da.Array)
+        self.assertEqual(((7,), (4, 2)), values.chunks)
+
+    def test_time_series_chunked_is_lazy(self):
+        num_reads = 0
+
+        def read_block(block):
+            nonlocal num_reads
+            num_reads += 1
+            return block
+
+        array = self.array.chunk(dict(time=6, lat=3, lon=4))
+        array = array.copy(
+            data=array.data.map_blocks(read_block, meta=array.data._meta)
+        )
+        values = get_array_values_for_indexes(
+            array, dict(lat=self.lat_indexes, lon=self.lon_indexes)
+        )
+        self.assertEqual(0, num_reads)
+        values.compute()
+        # 4 of 9 chunks contain valid points, each is read once
+        self.assertEqual(4, num_reads)
+
+    def test_time_series_chunked_without_valid_points(self):
+        array = self.array.chunk(dict(time=4, lat=3, lon=4))
+        values = get_array_values_for_indexes(array, dict(lat=[-1, 3], lon=[2, -1]))
+        self.assertIsInstance(values.data, da.Array)
+        self.assertEqual((2, 6), values.shape)
+        np.testing.assert_array_equal(np.full((2, 6), np.nan), values.values)
+
+    def _assert_time_series_ok(self, array: xr.DataArray):
+        values = get_array_values_for_indexes(
+            array, dict(lat=self.lat_indexes, lon=self.lon_indexes)
+        )
+        self.assertIsInstance(values, xr.DataArray)
+        self.assertEqual(("idx", "time"), values.dims)
+        self.assertEqual((7, 6), values.shape)
+        self.assertEqual(dict(units="mg/m^3"), values.attrs)
+        np.testing.assert_array_equal(np.arange(6), values.time.values)
+        expected = self.array.values[:, self.lat_indexes, self.lon_indexes].T
+        expected[2, :] = np.nan
+        expected[6, :] = np.nan
+        np.testing.assert_array_equal(expected, values.values)
+        return values
+
+    def test_points(self):
+        array = self.array.astype(np.int32).chunk(dict(time=4, lat=3, lon=4))
+        time_indexes = np.array([5, 0, 1, 3, 2, 3, 0])
+        values = get_array_values_for_indexes(
+            array,
+            dict(time=time_indexes, lat=self.lat_indexes, lon=self.lon_indexes),
+        )
+        self.assertEqual(("idx",), values.dims)
+        self.assertEqual(np.int32, values.dtype)
+        expected = self.array.values[
+            time_indexes, self.lat_indexes, self.lon_indexes
+        ].astype(np.int32)
+        expected[2] = 0
+        expected[6] = 0
+        np.testing.assert_array_equal(expected, values.values)
+
+    def test_illegal_indexes(self):
+        with self.assertRaises(ValueError) as cm:
+            get_array_values_for_indexes(self.array, dict(x=[0, 1]))
+        self.assertEqual(
+            "indexes must be given for at least one dimension", f"{cm.exception}"
+        )
+        with self.assertRaises(ValueError) as cm:
+            get_array_values_for_indexes(self.array, dict(lat=[0, 1], lon=[1]))
+        self.assertEqual(
+            "index arrays must all have the same size, but found"
+            " 2 for dimension 'lat' and 1 for dimension 'lon'",
+            f"{cm.exception}",
+        )
+
+
 # noinspection PyMethodMayBeStatic
 class GetDatasetIndexesTest(unittest.TestCase):
     def test_get_dataset_indexes_for_single_cell(self):
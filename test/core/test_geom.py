@@ -19,6 +19,7 @@ from xcube.core.geom import is_lon_lat_dataset
 from xcube.core.geom import mask_dataset_by_geometry
 from xcube.core.geom import normalize_geometry
 from xcube.core.geom import rasterize_features
+from xcube.core.geom import rasterize_geometries
 from xcube.core.new import new_cube
 from xcube.util.types import normalize_scalar_or_pair
 
@@ -315,6 +316,14 @@ class DatasetGeometryTest(unittest.TestCase):
         )
         self._assert_saved_geometry_wkt_is_fine(cube, "intersect_geom")
 
+    def test_rasterize_geometries(self):
+        mask = mask_dataset_by_geometry(
+            self.cube, self.triangle, no_clip=True, save_geometry_mask=True
+        ).geometry_mask.values
+        image = rasterize_geometries(self.cube, [self.triangle], [3], fill=1)
+        self.assertEqual(np.int32, image.dtype)
+        np.testing.assert_equal(np.where(mask, 3, 1), image)
+
     def test_mask_dataset_by_geometry_excluded_vars(self):
         cube = mask_dataset_by_geometry(
             self.cube, self.triangle, excluded_vars="precip"
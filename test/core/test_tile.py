@@ -8,6 +8,9 @@ import numpy as np
 import xarray as xr
 
 # noinspection PyProtectedMember
+from xcube.core.tile import TileIndexes
+from xcube.core.tile import TileIndexesCache
+from xcube.core.tile import _is_separable_transform
 from xcube.core.tile import get_var_valid_range
 
 
@@ -31,3 +34,69 @@ class GetVarValidRangeTest(unittest.TestCase):
     def test_from_nothing(self):
         a = xr.DataArray(0)
         self.assertEqual(None, get_var_valid_range(a))
+
+
+def new_tile_indexes(size: int = 4) -> TileIndexes:
+    return TileIndexes(
+        slice(0, size),
+        slice(0, size),
+        np.zeros((1, size), dtype=np.int64),
+        np.zeros((size, 1), dtype=np.int64),
+        np.ones((size, size), dtype=np.bool_),
+    )
+
+
+class TileIndexesTest(unittest.TestCase):
+    def test_nbytes(self):
+        tile_indexes = new_tile_indexes()
+        self.assertEqual(8 * 4 + 8 * 4 + 16, tile_indexes.nbytes)
+
+    def test_arrays_are_read_only(self):
+        tile_indexes = new_tile_indexes()
+        with self.assertRaises(ValueError):
+            tile_indexes.ds_mask[0, 0] = False
+
+
+class TileIndexesCacheTest(unittest.TestCase):
+    def test_get_and_put(self):
+        cache = TileIndexesCache()
+        self.assertIsNone(cache.get("a"))
+        tile_indexes = new_tile_indexes()
+        cache.put("a", tile_indexes)
+        self.assertIs(tile_indexes, cache.get("a"))
+        self.assertEqual(1, len(cache))
+        self.assertEqual(tile_indexes.nbytes, cache.size)
+        cache.clear()
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.size)
+
+    def test_least_recently_used_are_evicted(self):
+        nbytes = new_tile_indexes().nbytes
+        cache = TileIndexesCache(max_size=2 * nbytes)
+        cache.put("a", new_tile_indexes())
+        cache.put("b", new_tile_indexes())
+        cache.get("a")
+        cache.put("c", new_tile_indexes())
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertEqual(2 * nbytes, cache.size)
+
+    def test_too_large_are_not_cached(self):
+        cache = TileIndexesCache(max_size=100)
+        cache.put("a", new_tile_indexes(size=16))
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(0, cache.size)
+
+
+class IsSeparableTransformTest(unittest.TestCase):
+    def test_separable(self):
+        self.assertTrue(_is_separable_transform("EPSG:4326", "EPSG:4326"))
+        self.assertTrue(_is_separable_transform("OGC:CRS84", "EPSG:4326"))
+        self.assertTrue(_is_separable_transform("OGC:CRS84", "EPSG:3857"))
+        self.assertTrue(_is_separable_transform("EPSG:3857", "EPSG:4326"))
+
+    def test_not_separable(self):
+        self.assertFalse(_is_separable_transform("EPSG:4326", "EPSG:32632"))
+        self.assertFalse(_is_separable_transform("EPSG:32632", "EPSG:3857"))
@@ -2,9 +2,11 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
+import io
 import unittest
 from typing import Optional, List
 
+import PIL.Image
 import matplotlib.cm
 import matplotlib.colors
 import numpy as np
@@ -14,6 +16,7 @@ import xarray as xr
 from xcube.core.mldataset import BaseMultiLevelDataset
 from xcube.core.mldataset import MultiLevelDataset
 from xcube.core.tile import compute_rgba_tile
+from xcube.core.tile import compute_rgba_tiles
 from xcube.core.tile import compute_tiles
 from xcube.core.tilingscheme import GEOGRAPHIC_CRS_NAME
 from xcube.core.tilingscheme import WEB_MERCATOR_CRS_NAME
@@ -259,6 +262,77 @@ class ComputeRgbaTileTest(Tile2Test, unittest.TestCase):
         tile = compute_rgba_tile(*args, **kwargs, format="png")
         self.assertIsInstance(tile, bytes)
 
+    def test_compute_rgba_tile_as_png(self):
+        crs_name = WEB_MERCATOR_CRS_NAME
+        ml_ds = self._get_ml_dataset(crs_name)
+        args = [ml_ds, "var_a", 0, 0, 0, CMAP_PROVIDER]
+        kwargs = dict(
+            crs_name=crs_name,
+            tile_size=10,
+            cmap_name="gray",
+            value_ranges=(0, 10),
+            non_spatial_labels={"time": 0},
+            tile_enlargement=0,
+        )
+        expected_tile = compute_rgba_tile(*args, **kwargs, format="numpy")
+
+        for png_kwargs, expected_mode in (
+            (dict(), "P"),
+            (dict(png_palette=False), "RGBA"),
+            (dict(png_compress_level=9, png_compress_strategy="rle"), "P"),
+            (dict(png_compress_level=0, png_palette=False), "RGBA"),
+        ):
+            tile = compute_rgba_tile(*args, **kwargs, **png_kwargs, format="png")
+            self.assertIsInstance(tile, bytes)
+            image = PIL.Image.open(io.BytesIO(tile))
+            self.assertEqual(expected_mode, image.mode)
+            np.testing.assert_equal(np.array(image.convert("RGBA")), expected_tile)
+
+    def test_compute_rgba_tiles(self):
+        crs_name = GEOGRAPHIC_CRS_NAME
+        ml_ds = self._get_ml_dataset(crs_name)
+        kwargs = dict(
+            crs_name=crs_name,
+            tile_size=10,
+            cmap_name="gray",
+            value_ranges=(0, 10),
+            non_spatial_labels={"time": 0},
+            format="numpy",
+        )
+        tiles = compute_rgba_tiles(
+            ml_ds, "var_a", 2, 0, 2, CMAP_PROVIDER, num_tiles=4, **kwargs
+        )
+        # Block is clipped to tile grid of size 8 x 4
+        self.assertEqual(
+            {(x, y) for y in range(4) for x in range(2, 6)}, set(tiles.keys())
+        )
+        for (x, y), tile in tiles.items():
+            self.assertIsInstance(tile, np.ndarray)
+            self.assertEqual((10, 10, 4), tile.shape)
+            expected_tile = compute_rgba_tile(
+                ml_ds, "var_a", x, y, 2, CMAP_PROVIDER, **kwargs
+            )
+            if np.any(expected_tile[..., 3]):
+                # Tile borders may differ, because the block
+                # has access to the pixels of neighbouring tiles
+                np.testing.assert_equal(
+                    tile[2:-2, 2:-2], expected_tile[2:-2, 2:-2]
+                )
+            else:
+                # Single tile covers less than 2x2 dataset pixels,
+                # but the block doesn't
+                self.assertTrue(np.any(tile[..., 3]))
+
+        tiles = compute_rgba_tiles(
+            ml_ds, "var_a", 2, 0, 2, CMAP_PROVIDER, num_tiles=(2, 1), **kwargs
+        )
+        self.assertEqual({(2, 0), (3, 0)}, set(tiles.keys()))
+
+        tiles = compute_rgba_tiles(
+            ml_ds, "var_a", 8, 0, 2, CMAP_PROVIDER, num_tiles=4, **kwargs
+        )
+        self.assertEqual({}, tiles)
+
     def test_compute_rgba_tile_with_components(self):
         crs_name = WEB_MERCATOR_CRS_NAME
         ml_ds = self._get_ml_dataset(crs_name)
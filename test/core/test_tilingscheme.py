@@ -169,6 +169,12 @@ class TilingSchemeTest(unittest.TestCase):
         self.assertEqual((0, -90, 90, 0), tiling_scheme.get_tile_extent(2, 1, 1))
         self.assertEqual((90, -90, 180, 0), tiling_scheme.get_tile_extent(3, 1, 1))
 
+    def test_get_num_tiles(self):
+        self.assertEqual((2, 1), TilingScheme.GEOGRAPHIC.get_num_tiles(0))
+        self.assertEqual((16, 8), TilingScheme.GEOGRAPHIC.get_num_tiles(3))
+        self.assertEqual((1, 1), TilingScheme.WEB_MERCATOR.get_num_tiles(0))
+        self.assertEqual((8, 8), TilingScheme.WEB_MERCATOR.get_num_tiles(3))
+
     def test_get_resolutions_level_web_mercator(self):
         tiling_scheme = TilingScheme.WEB_MERCATOR
 
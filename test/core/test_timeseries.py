@@ -11,7 +11,9 @@ import xarray as xr
 
 from xcube.core.gridmapping import GridMapping
 from xcube.core.new import new_cube
+from xcube.core.timeseries import get_points_time_series
 from xcube.core.timeseries import get_time_series
+from xcube.core.timeseries import get_zonal_time_series
 
 POINT_GEOMETRY = dict(type="Point", coordinates=[20.0, 10.0])
 POLYGON_GEOMETRY = dict(
@@ -195,3 +197,150 @@ class GetTimeSeriesTest(unittest.TestCase):
             np.testing.assert_almost_equal(ts_ds[name].values, expected_values)
         else:
             self.assertNotIn(name, ts_ds)
+
+
+class GetPointsTimeSeriesTest(unittest.TestCase):
+    def setUp(self):
+        shape = 5, 180, 360
+        dims = "time", "lat", "lon"
+        cube = new_cube(
+            time_periods=5,
+            variables=dict(
+                A=xr.DataArray(np.random.default_rng(42).random(shape), dims=dims),
+                B=xr.DataArray(np.random.default_rng(43).random(shape), dims=dims),
+            ),
+        )
+        self.cube = cube.chunk(chunks=dict(time=2, lat=90, lon=90))
+
+    def test_equals_time_series_per_point(self):
+        points = [
+            POINT_GEOMETRY,
+            dict(type="Point", coordinates=[-120.3, 60.7]),
+            # Out of bounds
+            dict(type="Point", coordinates=[200.0, 0.0]),
+            (100.1, -45.4),
+        ]
+
+        ts_datasets = get_points_time_series(self.cube, points, var_names=["B"])
+
+        self.assertEqual(len(points), len(ts_datasets))
+        self.assertIsNone(ts_datasets[2])
+        for point, ts_ds in zip(points, ts_datasets):
+            expected_ts_ds = get_time_series(self.cube, geometry=point, var_names=["B"])
+            if expected_ts_ds is None:
+                self.assertIsNone(ts_ds)
+                continue
+            self.assertIsInstance(ts_ds, xr.Dataset)
+            self.assertEqual({"B"}, set(ts_ds.data_vars))
+            self.assertEqual(("time",), ts_ds.B.dims)
+            self.assertEqual(1, ts_ds.attrs["max_number_of_observations"])
+            np.testing.assert_array_equal(expected_ts_ds.B.values, ts_ds.B.values)
+            np.testing.assert_array_equal(expected_ts_ds.time.values, ts_ds.time.values)
+
+    def test_time_range(self):
+        ts_datasets = get_points_time_series(
+            self.cube,
+            [POINT_GEOMETRY, (100.1, -45.4)],
+            start_date="2010-01-02",
+            end_date="2010-01-04",
+        )
+        self.assertEqual(2, len(ts_datasets))
+        for ts_ds in ts_datasets:
+            self.assertEqual({"A", "B"}, set(ts_ds.data_vars))
+            self.assertEqual(3, ts_ds.time.size)
+
+    def test_illegal_points(self):
+        with self.assertRaises(ValueError) as cm:
+            get_points_time_series(self.cube, [POINT_GEOMETRY, POLYGON_GEOMETRY])
+        self.assertEqual("points must be point geometries", f"{cm.exception}")
+
+
+class GetZonalTimeSeriesTest(unittest.TestCase):
+    def setUp(self):
+        shape = 5, 180, 360
+        dims = "time", "lat", "lon"
+        values = np.random.default_rng(42).uniform(0, 10, shape)
+        values[values < 1] = np.nan
+        cube = new_cube(
+            time_periods=5,
+            variables=dict(A=xr.DataArray(values, dims=dims)),
+        )
+        self.cube = cube.chunk(chunks=dict(time=2, lat=90, lon=90))
+
+    def test_equals_time_series_per_geometry(self):
+        geometries = [
+            POLYGON_GEOMETRY,
+            # Overlaps previous one
+            (15.2, 12.7, 30.3, 25.1),
+            # Does not overlap previous ones
+            dict(
+                type="Polygon",
+                coordinates=[
+                    [[-50.5, 0.2], [-20.0, -30.7], [-10.1, 5.0], [-50.5, 0.2]]
+                ],
+            ),
+            # Smaller than a pixel
+            (-100.6, 40.6, -100.7, 40.7),
+            # Touches the cube's boundaries, is clipped by one
+            # pixel row and column by mask_dataset_by_geometry()
+            (175.2, 80.3, 190.0, 95.0),
+        ]
+        agg_methods = ["mean", "median", "std", "min", "max", "count"]
+
+        ts_datasets = get_zonal_time_series(
+            self.cube, geometries, "A", agg_methods=agg_methods
+        )
+
+        self.assertEqual(len(geometries), len(ts_datasets))
+        for geometry, ts_ds in zip(geometries, ts_datasets):
+            expected_ts_ds = get_time_series(
+                self.cube, geometry=geometry, var_names=["A"], agg_methods=agg_methods
+            )
+            self.assertIsInstance(ts_ds, xr.Dataset)
+            self.assertEqual(
+                expected_ts_ds.attrs["max_number_of_observations"],
+                ts_ds.attrs["max_number_of_observations"],
+            )
+            for agg_method in agg_methods:
+                var_name = f"A_{agg_method}"
+                self.assertEqual(("time",), ts_ds[var_name].dims)
+                np.testing.assert_allclose(
+                    ts_ds[var_name].values, expected_ts_ds[var_name].values
+                )
+
+    def test_time_range(self):
+        ts_datasets = get_zonal_time_series(
+            self.cube,
+            [POLYGON_GEOMETRY, (15.2, 12.7, 30.3, 25.1)],
+            "A",
+            start_date="2010-01-02",
+            end_date="2010-01-04",
+        )
+        self.assertEqual(2, len(ts_datasets))
+        for ts_ds in ts_datasets:
+            self.assertEqual({"A_mean"}, set(ts_ds.data_vars))
+            self.assertEqual(3, ts_ds.time.size)
+
+    def test_infinite_values_are_valid(self):
+        cube = self.cube.copy()
+        values = cube.A.values.copy()
+        values[0, 95:105, 195:205] = np.inf
+        cube["A"] = cube.A.copy(data=values)
+        geometry = (15.2, 4.8, 25.3, 15.1)
+        agg_methods = ["mean", "count"]
+        (ts_ds,) = get_zonal_time_series(cube, [geometry], "A", agg_methods=agg_methods)
+        expected_ts_ds = get_time_series(
+            cube, geometry=geometry, var_names=["A"], agg_methods=agg_methods
+        )
+        self.assertEqual(np.inf, ts_ds.A_mean.values[0])
+        np.testing.assert_allclose(ts_ds.A_mean.values, expected_ts_ds.A_mean.values)
+        np.testing.assert_equal(ts_ds.A_count.values, expected_ts_ds.A_count.values)
+
+    def test_no_overlap(self):
+        ts_datasets = get_zonal_time_series(
+            self.cube, [(200.0, 10.0, 210.0, 20.0), POLYGON_GEOMETRY], "A"
+        )
+        self.assertEqual(2, len(ts_datasets))
+        self.assertIsNone(ts_datasets[0])
+        self.assertIsInstance(ts_datasets[1], xr.Dataset)
+        self.assertEqual(100, ts_datasets[1].attrs["max_number_of_observations"])
@@ -0,0 +1,156 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import threading
+import unittest
+
+import numpy as np
+import pytest
+import xarray as xr
+import zarr.storage
+
+from xcube.core.new import new_cube
+from xcube.core.zarrstore import ChunkCache
+from xcube.core.zarrstore import ChunkCacheStore
+from xcube.core.zarrstore import DiagnosticZarrStore
+from xcube.core.zarrstore import get_chunk_cache
+from xcube.core.zarrstore import set_chunk_cache
+
+
+class ChunkCacheTest(unittest.TestCase):
+    def test_get_and_put(self):
+        cache = ChunkCache(100, num_shards=1)
+        self.assertEqual(100, cache.capacity)
+        self.assertIsNone(cache.get("a", "chl/0.0"))
+        cache.put("a", "chl/0.0", b"0123456789")
+        cache.put("b", "chl/0.0", b"01234")
+        self.assertEqual(b"0123456789", cache.get("a", "chl/0.0"))
+        self.assertEqual(b"01234", cache.get("b", "chl/0.0"))
+        self.assertEqual(15, cache.size)
+        self.assertEqual(
+            dict(hits=2, misses=1, evictions=0, items=2, bytes=15, capacity=100),
+            cache.get_stats(),
+        )
+        self.assertEqual(
+            dict(hits=1, misses=1, evictions=0, items=1, bytes=10),
+            cache.get_stats("a"),
+        )
+        self.assertEqual(["a", "b"], cache.get_store_names())
+
+    def test_least_recently_used_values_are_evicted(self):
+        cache = ChunkCache(100, num_shards=1)
+        for i in range(4):
+            cache.put("a", f"chl/{i}", bytes(30))
+        # Hot store "b" takes memory from store "a"
+        cache.put("b", "chl/0", bytes(30))
+        self.assertIsNone(cache.get("a", "chl/0"))
+        self.assertIsNone(cache.get("a", "chl/1"))
+        self.assertIsNotNone(cache.get("a", "chl/2"))
+        self.assertIsNotNone(cache.get("b", "chl/0"))
+        self.assertEqual(90, cache.size)
+        self.assertEqual(2, cache.get_stats("a")["evictions"])
+        self.assertEqual(60, cache.get_stats("a")["bytes"])
+        self.assertEqual(30, cache.get_stats("b")["bytes"])
+
+        # Values larger than the budget are not cached
+        cache.put("b", "chl/1", bytes(101))
+        self.assertIsNone(cache.get("b", "chl/1"))
+        self.assertEqual(90, cache.size)
+
+    def test_clear(self):
+        cache = ChunkCache(100)
+        cache.put("a", "chl/0", bytes(2))
+        cache.put("b", "chl/0", bytes(3))
+        cache.clear("a")
+        self.assertEqual(3, cache.size)
+        self.assertIsNone(cache.get("a", "chl/0"))
+        cache.clear()
+        self.assertEqual(0, cache.size)
+
+    def test_numpy_values(self):
+        cache = ChunkCache(1000, num_shards=1)
+        cache.put("a", "chl/0", np.zeros(10, dtype=np.float64))
+        self.assertEqual(80, cache.size)
+
+    def test_concurrent_access(self):
+        cache = ChunkCache(1000, num_shards=4)
+
+        def access(store_name: str):
+            for i in range(1000):
+                key = f"chl/{i % 50}"
+                if cache.get(store_name, key) is None:
+                    cache.put(store_name, key, bytes(10))
+
+        threads = [
+            threading.Thread(target=access, args=(f"s{i}",)) for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.get_stats()
+        self.assertEqual(8000, stats["hits"] + stats["misses"])
+        self.assertTrue(cache.size <= 1000)
+        self.assertEqual(cache.size, stats["bytes"])
+        self.assertEqual(cache.size, 10 * stats["items"])
+
+    def test_invalid_args(self):
+        with pytest.raises(ValueError):
+            ChunkCache(-1)
+        with pytest.raises(ValueError):
+            ChunkCache(100, num_shards=0)
+
+
+class ChunkCacheStoreTest(unittest.TestCase):
+    def test_getitem(self):
+        store = DiagnosticZarrStore(
+            {"chl/.zarray": b"{}", "chl/0.0": b"01", "chl/0.1": b"23"}
+        )
+        cache = ChunkCache(100, num_shards=1)
+        cache_store = cache.get_store(store, "memory://cube.zarr")
+        self.assertIsInstance(cache_store, ChunkCacheStore)
+        self.assertIs(cache, cache_store.cache)
+        self.assertEqual("memory://cube.zarr", cache_store.name)
+
+        self.assertEqual(b"01", cache_store["chl/0.0"])
+        self.assertEqual(b"01", cache_store["chl/0.0"])
+        self.assertEqual(["__getitem__('chl/0.0')"], store.records)
+        self.assertEqual(
+            dict(hits=1, misses=1, evictions=0, items=1, bytes=2),
+            cache.get_stats("memory://cube.zarr"),
+        )
+
+        with pytest.raises(KeyError):
+            # noinspection PyStatementEffect
+            cache_store["chl/1.1"]
+        self.assertIn("chl/0.1", cache_store)
+        self.assertEqual(3, len(cache_store))
+        with pytest.raises(NotImplementedError):
+            cache_store["chl/0.0"] = b"45"
+
+    def test_open_dataset(self):
+        cube = new_cube(width=10, height=5, variables=dict(chl=0.5)).chunk(
+            dict(time=1)
+        )
+        store = zarr.storage.MemoryStore()
+        cube.to_zarr(store)
+        cache = ChunkCache(1024 * 1024)
+        dataset = xr.open_zarr(cache.get_store(store, "cube"))
+        xr.testing.assert_equal(cube.chl, dataset.chl)
+        dataset = xr.open_zarr(cache.get_store(store, "cube"))
+        xr.testing.assert_equal(cube.chl, dataset.chl)
+        stats = cache.get_stats("cube")
+        self.assertTrue(stats["hits"] >= 5)
+
+
+class GlobalChunkCacheTest(unittest.TestCase):
+    def test_set_chunk_cache(self):
+        self.assertIsNone(get_chunk_cache())
+        cache = ChunkCache(100)
+        set_chunk_cache(cache)
+        try:
+            self.assertIs(cache, get_chunk_cache())
+        finally:
+            set_chunk_cache(None)
+        self.assertIsNone(get_chunk_cache())
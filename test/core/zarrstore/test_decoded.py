@@ -0,0 +1,172 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import unittest
+
+import dask
+import dask.array as da
+import numpy as np
+import pytest
+import xarray as xr
+import zarr.storage
+
+from xcube.core.mldataset import BaseMultiLevelDataset
+from xcube.core.new import new_cube
+from xcube.core.tile import compute_tiles
+from xcube.core.tilingscheme import GEOGRAPHIC_CRS_NAME
+from xcube.core.zarrstore import ChunkCache
+from xcube.core.zarrstore import DecodedChunkArray
+from xcube.core.zarrstore import cache_decoded_chunks
+from xcube.core.zarrstore import get_decoded_chunk_cache
+from xcube.core.zarrstore import set_decoded_chunk_cache
+
+
+def new_zarr_dataset() -> xr.Dataset:
+    cube = new_cube(
+        width=10,
+        height=6,
+        variables=dict(chl=0.5, tsm=lambda t, y, x: t + y + x),
+    ).chunk(dict(time=1, lat=3, lon=5))
+    store = zarr.storage.MemoryStore()
+    cube.to_zarr(store)
+    return xr.open_zarr(store)
+
+
+class DecodedChunkArrayTest(unittest.TestCase):
+    def test_getitem(self):
+        values = np.arange(60, dtype=np.float64).reshape((6, 10))
+        array = da.from_array(values, chunks=(3, 5))
+        cache = ChunkCache(1024 * 1024, num_shards=1)
+        decoded_array = DecodedChunkArray(array, cache, "cube", "chl")
+        self.assertEqual((6, 10), decoded_array.shape)
+        self.assertEqual(np.float64, decoded_array.dtype)
+        self.assertEqual(2, decoded_array.ndim)
+
+        chunk = decoded_array[3:6, 5:10]
+        np.testing.assert_equal(values[3:6, 5:10], chunk)
+        self.assertFalse(chunk.flags.writeable)
+        with pytest.raises(ValueError):
+            chunk[0, 0] = 1.0
+
+        # Subsets of a cached chunk are views of it
+        subset = decoded_array[4, 6:8]
+        np.testing.assert_equal(values[4, 6:8], subset)
+        self.assertIs(chunk.base, subset.base)
+        self.assertEqual(
+            dict(hits=1, misses=1, evictions=0, items=1, bytes=120),
+            cache.get_stats("cube"),
+        )
+        self.assertIsNotNone(cache.get("cube", "chl/3x5/1.1"))
+
+        # Subsets spanning multiple chunks are not cached
+        np.testing.assert_equal(values[2:4, 4:6], decoded_array[2:4, 4:6])
+        self.assertEqual(1, cache.get_stats("cube")["items"])
+
+
+class CacheDecodedChunksTest(unittest.TestCase):
+    def test_cache_decoded_chunks(self):
+        dataset = new_zarr_dataset()
+        cache = ChunkCache(1024 * 1024)
+        cached_dataset = cache_decoded_chunks(dataset, cache, "memory://cube.zarr")
+        self.assertEqual(dataset.chl.chunks, cached_dataset.chl.chunks)
+        self.assertEqual(dataset.chl.attrs, cached_dataset.chl.attrs)
+        xr.testing.assert_equal(dataset, cached_dataset)
+        stats = cache.get_stats("memory://cube.zarr")
+        self.assertEqual(dict(hits=0, misses=40, items=40), _counts(stats))
+
+        # Tasks yield read-only chunks
+        block = cached_dataset.tsm.data.blocks[2, 0, 1]
+        (key,) = block.__dask_keys__()[0][0]
+        values = dask.get(block.__dask_graph__(), key)
+        self.assertFalse(values.flags.writeable)
+        xr.testing.assert_equal(
+            dataset.tsm, cache_decoded_chunks(dataset, cache, "memory://cube.zarr").tsm
+        )
+        stats = cache.get_stats("memory://cube.zarr")
+        self.assertEqual(dict(hits=21, misses=40, items=40), _counts(stats))
+
+    def test_chunks_are_computed_in_a_single_graph(self):
+        dataset = new_zarr_dataset()
+        cache = ChunkCache(1024 * 1024)
+        cached_dataset = cache_decoded_chunks(dataset, cache, "cube")
+        computations = []
+
+        def get(dsk, keys, **kwargs):
+            computations.append(keys)
+            return dask.get(dsk, keys, **kwargs)
+
+        with dask.config.set(scheduler=get):
+            np.testing.assert_equal(dataset.tsm.values, cached_dataset.tsm.values)
+        # No nested computations
+        self.assertEqual(2, len(computations))
+
+    def test_original_tasks_run_on_cache_misses_only(self):
+        num_calls = [0]
+
+        def load_block(block: np.ndarray) -> np.ndarray:
+            if block.shape == (3, 5):
+                # Not called for inferring meta
+                num_calls[0] += 1
+            return block + 1
+
+        array = da.zeros((6, 10), chunks=(3, 5)).map_blocks(load_block)
+        dataset = xr.Dataset(dict(chl=xr.DataArray(array, dims=("y", "x"))))
+        cache = ChunkCache(1024 * 1024)
+        cached_dataset = cache_decoded_chunks(dataset, cache, "cube")
+        np.testing.assert_equal(np.ones((6, 10)), cached_dataset.chl.values)
+        self.assertEqual(4, num_calls[0])
+        np.testing.assert_equal(np.ones((6, 10)), cached_dataset.chl.values)
+        self.assertEqual(4, num_calls[0])
+
+    def test_chunks_of_different_chunking_are_not_shared(self):
+        dataset = new_zarr_dataset()
+        cache = ChunkCache(1024 * 1024)
+        cached_dataset = cache_decoded_chunks(dataset, cache, "cube")
+        rechunked_dataset = cache_decoded_chunks(
+            dataset.chunk(dict(lon=10)), cache, "cube"
+        )
+        xr.testing.assert_equal(dataset, cached_dataset)
+        xr.testing.assert_equal(dataset, rechunked_dataset)
+
+    def test_compute_tiles(self):
+        dataset = new_zarr_dataset()
+        cache = ChunkCache(1024 * 1024)
+        ml_dataset = BaseMultiLevelDataset(
+            cache_decoded_chunks(dataset, cache, "cube")
+        )
+        tile_bbox = ml_dataset.grid_mapping.xy_bbox
+        tiles = compute_tiles(
+            ml_dataset, "tsm", tile_bbox, GEOGRAPHIC_CRS_NAME, tile_size=10, level=0
+        )
+        expected_tiles = compute_tiles(
+            BaseMultiLevelDataset(dataset),
+            "tsm",
+            tile_bbox,
+            GEOGRAPHIC_CRS_NAME,
+            tile_size=10,
+            level=0,
+        )
+        np.testing.assert_equal(expected_tiles, tiles)
+        self.assertTrue(cache.get_stats("cube")["misses"] > 0)
+
+    def test_unchunked_variables_are_kept(self):
+        dataset = new_zarr_dataset().compute()
+        cache = ChunkCache(1024 * 1024)
+        self.assertIs(dataset, cache_decoded_chunks(dataset, cache, "cube"))
+
+
+class GlobalDecodedChunkCacheTest(unittest.TestCase):
+    def test_set_decoded_chunk_cache(self):
+        self.assertIsNone(get_decoded_chunk_cache())
+        cache = ChunkCache(100)
+        set_decoded_chunk_cache(cache)
+        try:
+            self.assertIs(cache, get_decoded_chunk_cache())
+        finally:
+            set_decoded_chunk_cache(None)
+        self.assertIsNone(get_decoded_chunk_cache())
+
+
+def _counts(stats: dict[str, int]) -> dict[str, int]:
+    return {k: stats[k] for k in ("hits", "misses", "items")}
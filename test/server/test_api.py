@@ -356,6 +356,11 @@ class ApiErrorTest(unittest.TestCase):
         self.assertIsInstance(error, ApiError)
         self.assertEqual(501, error.status_code)
 
+    def test_service_unavailable(self):
+        error = ApiError.ServiceUnavailable()
+        self.assertIsInstance(error, ApiError)
+        self.assertEqual(503, error.status_code)
+
     def test_invalid_server_config(self):
         error = ApiError.InvalidServerConfig()
         self.assertIsInstance(error, ApiError)
@@ -0,0 +1,46 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import threading
+import unittest
+
+from xcube.server.api import ApiError
+from xcube.server.executor import BoundedThreadPoolExecutor
+
+
+class BoundedThreadPoolExecutorTest(unittest.TestCase):
+    def test_props(self):
+        executor = BoundedThreadPoolExecutor(max_workers=3, max_queue_size=5)
+        self.assertEqual(3, executor.max_workers)
+        self.assertEqual(5, executor.max_queue_size)
+        self.assertEqual(0, executor.num_tasks)
+        executor.shutdown()
+
+    def test_rejects_tasks_if_queue_is_full(self):
+        executor = BoundedThreadPoolExecutor(max_workers=2, max_queue_size=1)
+        event = threading.Event()
+        futures = [executor.submit(event.wait) for _ in range(3)]
+        self.assertEqual(3, executor.num_tasks)
+
+        with self.assertRaises(ApiError.ServiceUnavailable) as cm:
+            executor.submit(event.wait)
+        self.assertEqual(503, cm.exception.status_code)
+
+        # Cancelling a waiting task frees its slot
+        self.assertTrue(futures[2].cancel())
+        self.assertEqual(2, executor.num_tasks)
+        futures.append(executor.submit(event.wait))
+
+        event.set()
+        for future in futures[:2] + futures[3:]:
+            self.assertTrue(future.result(timeout=10))
+        executor.shutdown()
+        self.assertEqual(0, executor.num_tasks)
+
+    def test_unlimited_queue(self):
+        executor = BoundedThreadPoolExecutor(max_workers=1)
+        self.assertEqual(None, executor.max_queue_size)
+        futures = [executor.submit(lambda i=i: i) for i in range(10)]
+        self.assertEqual(list(range(10)), [f.result(timeout=10) for f in futures])
+        executor.shutdown()
@@ -2,8 +2,11 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
+import asyncio
 import json
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from tornado import concurrent
@@ -12,6 +15,7 @@ from xcube.server.api import Api
 from xcube.server.api import ApiContext
 from xcube.server.api import Context
 from xcube.server.server import Server
+from xcube.server.executor import BoundedThreadPoolExecutor
 from xcube.server.server import ServerContext
 from xcube.util.frozen import FrozenDict
 from xcube.util.jsonschema import JsonArraySchema
@@ -205,6 +209,37 @@ class ServerTest(unittest.TestCase):
                     "type": "boolean",
                     "title": "Output performance measures",
                 },
+                "executors": {
+                    "type": "object",
+                    "title": "Named executors used to run the requests of APIs",
+                    "description": "APIs not assigned to any executor"
+                    " use the web server's default executor.",
+                    "properties": {},
+                    "additionalProperties": {
+                        "type": "object",
+                        "properties": {
+                            "apis": {
+                                "type": "array",
+                                "title": "Names of the APIs using the executor",
+                                "items": {"type": "string", "minLength": 1},
+                            },
+                            "max_workers": {
+                                "type": "integer",
+                                "title": "Maximum number of worker threads",
+                                "minimum": 1,
+                            },
+                            "max_queue_size": {
+                                "type": "integer",
+                                "title": "Maximum number of requests waiting"
+                                " for a worker thread. Further requests"
+                                " are rejected with HTTP status 503.",
+                                "minimum": 0,
+                            },
+                        },
+                        "additionalProperties": False,
+                        "required": ["apis"],
+                    },
+                },
                 "data_stores": {
                     "type": "array",
                     "items": {
@@ -423,6 +458,123 @@ class ServerContextTest(unittest.TestCase):
         server_ctx.run_in_executor(None, my_func, 40, 2)
         self.assertEqual(1, framework.run_in_executor_count)
 
+    def test_run_in_executor_shared(self):
+        framework = MockFramework()
+        server = mock_server(framework=framework)
+        server_ctx = ServerContext(server, {})
+
+        def my_func(a, b):
+            return a + b
+
+        future1 = server_ctx.run_in_executor_shared("k1", None, my_func, 40, 2)
+        future2 = server_ctx.run_in_executor_shared("k1", None, my_func, 40, 2)
+        self.assertIs(future1, future2)
+        self.assertEqual(1, framework.run_in_executor_count)
+
+        future3 = server_ctx.run_in_executor_shared("k2", None, my_func, 40, 3)
+        self.assertIsNot(future1, future3)
+        self.assertEqual(2, framework.run_in_executor_count)
+
+        # Once done, calls are no longer shared
+        future1.set_result(42)
+        future4 = server_ctx.run_in_executor_shared("k1", None, my_func, 40, 2)
+        self.assertIsNot(future1, future4)
+        self.assertEqual(3, framework.run_in_executor_count)
+
+    def test_run_in_executor_shared_cancelled(self):
+        class AsyncFramework(MockFramework):
+            def run_in_executor(self, executor, function, *args, **kwargs):
+                self.run_in_executor_count += 1
+                loop = asyncio.get_running_loop()
+                return loop.run_in_executor(executor, function, *args)
+
+        framework = AsyncFramework()
+        server = mock_server(framework=framework)
+        server_ctx = ServerContext(server, {})
+        executor = ThreadPoolExecutor(max_workers=1)
+        blocker = threading.Event()
+        calls = []
+
+        async def run():
+            # Keep the only worker busy, so shared calls are queued
+            busy = asyncio.get_running_loop().run_in_executor(
+                executor, blocker.wait, 10
+            )
+            tasks = [
+                asyncio.ensure_future(
+                    server_ctx.run_in_executor_shared(
+                        "k1", executor, calls.append, "k1"
+                    )
+                )
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.01)
+            self.assertEqual(1, framework.run_in_executor_count)
+            tasks[0].cancel()
+            await asyncio.sleep(0.01)
+            # Still awaited by the second caller
+            self.assertIn("k1", server_ctx._shared_calls)
+            tasks[1].cancel()
+            await asyncio.sleep(0.01)
+            self.assertNotIn("k1", server_ctx._shared_calls)
+            blocker.set()
+            await busy
+
+        asyncio.run(run())
+        executor.shutdown(wait=True)
+        # The queued call has been cancelled
+        self.assertEqual([], calls)
+
+    def test_api_executors(self):
+        framework = MockFramework()
+        config = {
+            "executors": {
+                "fast": {"apis": ["tiles"], "max_workers": 4},
+                "slow": {
+                    "apis": ["timeseries"],
+                    "max_workers": 1,
+                    "max_queue_size": 2,
+                },
+            }
+        }
+        server = mock_server(
+            framework=framework,
+            config=config,
+            api_specs=["tiles", "timeseries", "places"],
+        )
+        server_ctx = server.ctx
+        tiles_executor = server_ctx.get_api_executor(server_ctx.get_api_ctx("tiles"))
+        ts_executor = server_ctx.get_api_executor(
+            server_ctx.get_api_ctx("timeseries")
+        )
+        self.assertIsInstance(tiles_executor, BoundedThreadPoolExecutor)
+        self.assertEqual(4, tiles_executor.max_workers)
+        self.assertEqual(None, tiles_executor.max_queue_size)
+        self.assertIsInstance(ts_executor, BoundedThreadPoolExecutor)
+        self.assertEqual(1, ts_executor.max_workers)
+        self.assertEqual(2, ts_executor.max_queue_size)
+        self.assertIsNone(
+            server_ctx.get_api_executor(server_ctx.get_api_ctx("places"))
+        )
+
+        # Unchanged executor config keeps executors
+        server.update(dict(config, port=9090))
+        self.assertIs(
+            tiles_executor,
+            server.ctx.get_api_executor(server.ctx.get_api_ctx("tiles")),
+        )
+
+        # Changed executor config creates new executors
+        server.update({"executors": {"fast": {"apis": ["tiles"]}}})
+        self.assertIsNot(
+            tiles_executor,
+            server.ctx.get_api_executor(server.ctx.get_api_ctx("tiles")),
+        )
+        self.assertIsNone(
+            server.ctx.get_api_executor(server.ctx.get_api_ctx("timeseries"))
+        )
+        server.ctx.on_dispose()
+
     class DatasetsContext(ApiContext):
         def on_update(self, prev_ctx: Optional[Context]):
             pass
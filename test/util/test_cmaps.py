@@ -10,8 +10,10 @@ import numpy as np
 
 from xcube.util.cmaps import Colormap, CUSTOM_CATEGORY
 from xcube.util.cmaps import ColormapCategory
+from xcube.util.cmaps import ColormapLut
 from xcube.util.cmaps import ColormapRegistry
 from xcube.util.cmaps import DEFAULT_CMAP_NAME
+from xcube.util.cmaps import get_continuous_norm
 from xcube.util.cmaps import parse_cm_name
 from xcube.util.cmaps import parse_cm_code
 from xcube.util.cmaps import load_snap_cpd_colormap
@@ -295,6 +297,85 @@ class ColormapRegistryTest(TestCase):
             load_snap_cpd_colormap(cmap_name)
 
 
+class ColormapLutTest(TestCase):
+    def setUp(self) -> None:
+        self.registry = ColormapRegistry()
+        rng = np.random.default_rng(42)
+        self.values = rng.uniform(-10, 110, (64, 64)).astype(np.float32)
+        self.values[0:8, :] = np.nan
+        self.values[8, 0:5] = (0.0, 100.0, 50.0, -10.0, 110.0)
+
+    def assert_lut_maps_like_matplotlib(
+        self, cm_name: str, cmap_norm: str, value_range: tuple[float, float]
+    ):
+        cmap, colormap = self.registry.get_cmap(cm_name)
+        if cmap_norm == "cat" and colormap.bounds:
+            norm = matplotlib.colors.BoundaryNorm(
+                colormap.bounds, ncolors=cmap.N, clip=False
+            )
+        else:
+            norm = get_continuous_norm(value_range, cmap_norm)
+        expected_rgba = (255 * cmap(norm(self.values))).astype(np.uint8)
+        cmap_lut = self.registry.get_cmap_lut(cm_name, cmap_norm, value_range)
+        self.assertIsInstance(cmap_lut, ColormapLut)
+        np.testing.assert_equal(cmap_lut.map(self.values), expected_rgba)
+
+    def test_map_lin(self):
+        self.assert_lut_maps_like_matplotlib("viridis", "lin", (0, 100))
+        self.assert_lut_maps_like_matplotlib("bone_r_alpha", "lin", (100, 0))
+
+    def test_map_log(self):
+        self.assert_lut_maps_like_matplotlib("plasma", "log", (1, 100))
+
+    def test_map_cat(self):
+        self.assert_lut_maps_like_matplotlib(
+            '{"name": "ucb783473",'
+            ' "colors": ['
+            '[1, "#00000000"], '
+            '[2, "#ff0000aa"], '
+            '[50, "#ffffffff"]'
+            '], "type": "key"}',
+            "cat",
+            (0, 1),
+        )
+        self.assert_lut_maps_like_matplotlib(
+            '{"name": "ucb783474",'
+            ' "colors": ['
+            '[0.0, "#00000000"], '
+            '[60.0, "#ff0000aa"], '
+            '[100.0, "#ffffffff"]'
+            '], "type": "bound"}',
+            "cat",
+            (0, 1),
+        )
+
+    def test_luts_are_cached(self):
+        cmap_lut = self.registry.get_cmap_lut("viridis", "lin", (0, 100))
+        self.assertIs(cmap_lut, self.registry.get_cmap_lut("viridis", "lin", (0, 100)))
+        self.assertIsNot(
+            cmap_lut, self.registry.get_cmap_lut("viridis", "lin", (0, 50))
+        )
+
+    def test_palette(self):
+        for cm_name, num_colors in (("tab10", 11), ("viridis", 255)):
+            cmap_lut = self.registry.get_cmap_lut(cm_name, "lin", (0, 100))
+            palette_indexes, palette_colors = cmap_lut.palette
+            self.assertEqual(np.uint8, palette_indexes.dtype)
+            self.assertEqual(cmap_lut.colors.shape[0], palette_indexes.size)
+            self.assertEqual((num_colors, 4), palette_colors.shape)
+            indexes = palette_indexes.take(cmap_lut.get_indexes(self.values))
+            np.testing.assert_equal(
+                palette_colors[indexes], cmap_lut.map(self.values)
+            )
+
+    def test_no_palette_for_too_many_colors(self):
+        colors = np.zeros((300, 4), dtype=np.uint8)
+        colors[:, 0] = np.arange(300) % 256
+        colors[:, 1] = np.arange(300) // 256
+        cmap_lut = ColormapLut(np.arange(298, dtype=np.float64), colors)
+        self.assertIsNone(cmap_lut.palette)
+
+
 class ColormapTest(TestCase):
     def setUp(self) -> None:
         self.colormap = Colormap("coolwarm", cat_name="Diverging")
@@ -3,8 +3,13 @@
 # https://opensource.org/licenses/MIT.
 
 import os.path
+import shutil
+import tempfile
+import threading
+import time
 import unittest
 from typing import Union, Any
+from unittest.mock import patch
 from collections.abc import Mapping
 
 import pytest
@@ -15,9 +20,16 @@ from test.webapi.helpers import get_server
 from xcube.core.mldataset import MultiLevelDataset
 from xcube.server.api import ApiError
 from xcube.server.api import Context
+from xcube.core.zarrstore import get_chunk_cache
+from xcube.core.zarrstore import get_decoded_chunk_cache
 from xcube.webapi.datasets.context import DatasetsContext
 
 
+DEMO_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "examples", "serve", "demo"
+)
+
+
 def get_datasets_ctx(
     server_config: Union[str, Mapping[str, Any]] = "config.yml"
 ) -> DatasetsContext:
@@ -94,6 +106,313 @@ class DatasetsContextTest(unittest.TestCase):
                 conc_chl_z = ctx.get_variable_for_z("demo-aug", var_name, z)
                 self.assertIsInstance(conc_chl_z, xr.DataArray)
 
+    def test_get_time_series_dataset(self):
+        ctx = get_datasets_ctx()
+        self.assertIs(ctx.get_dataset("demo"), ctx.get_time_series_dataset("demo"))
+
+    def test_get_time_series_dataset_from_cache(self):
+        cache_path = tempfile.mkdtemp(prefix="xcube-ts-cache-")
+        try:
+            config = dict(get_server().ctx.config)
+            config["TimeSeriesCache"] = dict(Path=cache_path, TimeChunkSize=5)
+            ctx = get_datasets_ctx(config)
+            dataset = ctx.get_dataset("demo")
+            # Only requested copies are built
+            self.assertIs(dataset, ctx.get_time_series_dataset("demo", "conc_chl"))
+            time.sleep(0.2)
+            self.assertEqual([], os.listdir(cache_path))
+            self.assertIs(
+                dataset,
+                ctx.get_time_series_dataset("demo", "conc_chl", build_copy=True),
+            )
+            for _ in range(200):
+                ts_dataset = ctx.get_time_series_dataset("demo", "conc_chl")
+                if ts_dataset is not dataset:
+                    break
+                time.sleep(0.05)
+            self.assertIsNot(dataset, ts_dataset)
+            self.assertEqual((5,), ts_dataset.conc_chl.chunks[0])
+            xr.testing.assert_equal(dataset.conc_chl, ts_dataset.conc_chl)
+            ctx.on_dispose()
+        finally:
+            shutil.rmtree(cache_path, ignore_errors=True)
+
+    def test_get_dataset_metadata(self):
+        ctx = get_datasets_ctx()
+        computed = []
+
+        def compute_metadata(_ctx: DatasetsContext, ds_id: str):
+            computed.append(ds_id)
+            return dict(id=ds_id)
+
+        metadata = ctx.get_dataset_metadata("demo", compute_metadata)
+        self.assertEqual(dict(id="demo"), metadata)
+        self.assertIs(metadata, ctx.get_dataset_metadata("demo", compute_metadata))
+        self.assertEqual(["demo"], computed)
+
+        # Replacing a dataset invalidates its metadata
+        ctx.add_dataset(ctx.get_dataset("demo"), ds_id="demo")
+        ctx.get_dataset_metadata("demo", compute_metadata)
+        self.assertEqual(["demo", "demo"], computed)
+
+        with pytest.raises(ApiError.NotFound):
+            ctx.get_dataset_metadata("bibo", compute_metadata)
+
+    def test_warm_up_datasets(self):
+        ctx = get_datasets_ctx()
+        computed = []
+
+        def compute_metadata(_ctx: DatasetsContext, ds_id: str):
+            # Warm-up opens datasets concurrently
+            _ctx.get_ml_dataset(ds_id)
+            computed.append(ds_id)
+            return dict(id=ds_id)
+
+        futures = ctx.warm_up_datasets(compute_metadata, max_workers=2)
+        for future in futures:
+            future.result()
+        self.assertEqual(
+            {"demo", "demo-1w"},
+            {ds_id for ds_id in computed if ds_id.startswith("demo")},
+        )
+        self.assertIn("demo", ctx.dataset_cache)
+        self.assertEqual(
+            dict(id="demo"), ctx.get_dataset_metadata("demo", compute_metadata)
+        )
+        self.assertEqual(len(futures), len(computed))
+        ctx.on_dispose()
+
+    def test_warm_up_datasets_and_dispose(self):
+        ctx = get_datasets_ctx()
+        started = threading.Event()
+        proceed = threading.Event()
+        errors = []
+
+        def compute_metadata(_ctx: DatasetsContext, ds_id: str):
+            started.set()
+            proceed.wait(10)
+            try:
+                _ctx.get_ml_dataset(ds_id)
+            except ApiError.ServiceUnavailable as e:
+                errors.append(e)
+                raise
+            return dict(id=ds_id)
+
+        with patch(
+            "xcube.webapi.datasets.context._close_ml_dataset"
+        ) as close_ml_dataset:
+            futures = ctx.warm_up_datasets(compute_metadata, max_workers=1)
+            self.assertTrue(started.wait(10))
+            dispose_thread = threading.Thread(target=ctx.on_dispose)
+            dispose_thread.start()
+            for _ in range(200):
+                if ctx._disposed:
+                    break
+                time.sleep(0.05)
+            # Dispose waits for the running warm-up
+            self.assertTrue(dispose_thread.is_alive())
+            proceed.set()
+            dispose_thread.join(10)
+            self.assertFalse(dispose_thread.is_alive())
+
+        # Dataset opened after dispose has been closed, not cached
+        self.assertEqual(1, len(errors))
+        self.assertEqual(1, close_ml_dataset.call_count)
+        self.assertEqual({}, ctx.dataset_cache)
+        self.assertTrue(all(future.cancelled() for future in futures[1:]))
+        self.assertEqual([], ctx.warm_up_datasets(compute_metadata))
+
+    def test_warm_up_datasets_on_update(self):
+        config = dict(get_server().ctx.config)
+        config["DatasetWarmUp"] = dict(MaxWorkers=2)
+        ctx = get_datasets_ctx(config)
+        self.assertIsNotNone(ctx._warm_up_executor)
+        ctx.on_dispose()
+
+    def test_global_chunk_cache(self):
+        config = dict(get_server().ctx.config)
+        config["GlobalChunkCacheSize"] = "10M"
+        ctx = get_datasets_ctx(config)
+        chunk_cache = ctx.chunk_cache
+        self.assertIsNotNone(chunk_cache)
+        self.assertEqual(10_000_000, chunk_cache.capacity)
+        self.assertIs(chunk_cache, get_chunk_cache())
+        try:
+            ctx.get_dataset("demo").conc_chl.isel(time=0).values
+            (store_name,) = chunk_cache.get_store_names()
+            self.assertTrue(store_name.endswith("cube-1-250-250.zarr"))
+            self.assertTrue(chunk_cache.get_stats()["bytes"] > 0)
+        finally:
+            ctx.on_dispose()
+        self.assertIsNone(get_chunk_cache())
+
+    def test_decoded_chunk_cache(self):
+        config = dict(get_server().ctx.config)
+        config["DecodedChunkCacheSize"] = "10M"
+        ctx = get_datasets_ctx(config)
+        decoded_chunk_cache = ctx.decoded_chunk_cache
+        self.assertIsNotNone(decoded_chunk_cache)
+        self.assertEqual(10_000_000, decoded_chunk_cache.capacity)
+        self.assertIs(decoded_chunk_cache, get_decoded_chunk_cache())
+        try:
+            ctx.get_dataset("demo").conc_chl.isel(time=0).values
+            (store_name,) = decoded_chunk_cache.get_store_names()
+            self.assertTrue(store_name.endswith("cube-1-250-250.zarr"))
+            self.assertTrue(decoded_chunk_cache.get_stats()["bytes"] > 0)
+        finally:
+            ctx.on_dispose()
+        self.assertIsNone(get_decoded_chunk_cache())
+
+    def test_store_open_params_are_not_changed(self):
+        config = dict(get_server("config-datastores.yml").ctx.config)
+        config["GlobalChunkCacheSize"] = "10M"
+        config["DecodedChunkCacheSize"] = "10M"
+        (store_config,) = config["DataStores"]
+        dataset_config = dict(
+            store_config["Datasets"][0], StoreOpenParams=dict(log_access=False)
+        )
+        config["DataStores"] = [dict(store_config, Datasets=[dataset_config])]
+        ctx = get_datasets_ctx(config)
+        try:
+            fingerprint = ctx.get_dataset_fingerprint("Cube-T1.zarr")
+            ctx.get_dataset("Cube-T1.zarr").conc_chl.isel(time=0).values
+            self.assertEqual(
+                dict(log_access=False),
+                ctx.get_dataset_config("Cube-T1.zarr")["StoreOpenParams"],
+            )
+            ctx._dataset_fingerprints.clear()
+            self.assertEqual(fingerprint, ctx.get_dataset_fingerprint("Cube-T1.zarr"))
+        finally:
+            ctx.on_dispose()
+
+    def test_dataset_fingerprint_changes_with_data(self):
+        temp_dir = tempfile.mkdtemp(prefix="xcube-data-version-")
+        try:
+            cube_path = os.path.join(temp_dir, "cube.zarr")
+            shutil.copytree(os.path.join(DEMO_DIR, "cube-1-250-250.zarr"), cube_path)
+            config = dict(get_server().ctx.config)
+            config["GlobalChunkCacheSize"] = "10M"
+            config["Datasets"] = [
+                dict(Identifier="cube", Title="Cube", FileSystem="file", Path=cube_path)
+            ]
+            ctx = get_datasets_ctx(config)
+            removed_ds_ids = []
+            ctx.add_dataset_removed_listener(removed_ds_ids.append)
+            try:
+                with patch(
+                    "xcube.webapi.datasets.context.DATA_VERSION_CHECK_INTERVAL", 0.0
+                ):
+                    fingerprint = ctx.get_dataset_fingerprint("cube")
+                    self.assertIsNotNone(ctx.get_dataset_data_version("cube"))
+                    dataset = ctx.get_dataset("cube")
+                    dataset.conc_chl.isel(time=0).values
+                    self.assertTrue(ctx.chunk_cache.get_stats()["items"] > 0)
+
+                    self.assertEqual(fingerprint, ctx.get_dataset_fingerprint("cube"))
+                    self.assertIs(dataset, ctx.get_dataset("cube"))
+                    self.assertEqual([], removed_ds_ids)
+
+                    # Same as rewriting or appending to the dataset
+                    metadata_path = os.path.join(cube_path, ".zmetadata")
+                    mtime_ns = os.stat(metadata_path).st_mtime_ns
+                    etag = ctx.get_dataset_etag("cube", "conc_chl")
+                    os.utime(metadata_path, ns=(mtime_ns, mtime_ns + 10**9))
+                    self.assertNotEqual(etag, ctx.get_dataset_etag("cube", "conc_chl"))
+                    new_fingerprint = ctx.get_dataset_fingerprint("cube")
+                    self.assertNotEqual(fingerprint, new_fingerprint)
+                    self.assertEqual(["cube"], removed_ds_ids)
+                    self.assertEqual(0, ctx.chunk_cache.get_stats()["items"])
+                    self.assertIsNot(dataset, ctx.get_dataset("cube"))
+            finally:
+                ctx.on_dispose()
+
+            # Fingerprints of unchanged datasets are stable across
+            # server sessions, but no longer equal the outdated ones
+            ctx = get_datasets_ctx(config)
+            try:
+                self.assertEqual(new_fingerprint, ctx.get_dataset_fingerprint("cube"))
+            finally:
+                ctx.on_dispose()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_dataset_data_version_fetched_in_background(self):
+        ctx = get_datasets_ctx()
+        fetching = threading.Event()
+        proceed = threading.Event()
+        data_versions = ["v1"]
+
+        def fetch_data_version(ds_id: str):
+            fetching.set()
+            proceed.wait(10)
+            return data_versions[-1]
+
+        def wait_for_data_version(data_version: str):
+            for _ in range(200):
+                if ctx.get_dataset_data_version("demo") == data_version:
+                    break
+                time.sleep(0.05)
+            self.assertEqual(data_version, ctx.get_dataset_data_version("demo"))
+
+        try:
+            with patch.object(
+                ctx, "_is_remote_dataset", return_value=True
+            ), patch.object(
+                ctx, "_fetch_dataset_data_version", side_effect=fetch_data_version
+            ):
+                # Does not wait for the data store
+                self.assertIsNone(ctx.get_dataset_data_version("demo"))
+                self.assertTrue(fetching.wait(10))
+                pending_fingerprint = ctx.get_dataset_fingerprint("demo")
+                self.assertIsNone(ctx.get_dataset_data_version("demo"))
+                proceed.set()
+                wait_for_data_version("v1")
+                fingerprint = ctx.get_dataset_fingerprint("demo")
+                self.assertNotEqual(pending_fingerprint, fingerprint)
+
+                # The last known version is used until the new one is known
+                proceed.clear()
+                fetching.clear()
+                data_versions.append("v2")
+                # Let the version expire
+                ctx._dataset_data_versions["demo"] = 0.0, "v1"
+                self.assertEqual("v1", ctx.get_dataset_data_version("demo"))
+                self.assertTrue(fetching.wait(10))
+                self.assertEqual("v1", ctx.get_dataset_data_version("demo"))
+                self.assertEqual(fingerprint, ctx.get_dataset_fingerprint("demo"))
+                proceed.set()
+                wait_for_data_version("v2")
+                self.assertNotEqual(fingerprint, ctx.get_dataset_fingerprint("demo"))
+        finally:
+            proceed.set()
+            ctx.on_dispose()
+
+    def test_dataset_fingerprint_changes_with_color_file(self):
+        temp_dir = tempfile.mkdtemp(prefix="xcube-color-file-")
+        try:
+            color_file_path = os.path.join(temp_dir, "cc_tsm.cpd")
+            shutil.copy(os.path.join(DEMO_DIR, "cc_tsm.cpd"), color_file_path)
+            config = dict(get_server().ctx.config)
+            config["Styles"] = [
+                dict(
+                    Identifier="default",
+                    ColorMappings=dict(conc_tsm=dict(ColorFile=color_file_path)),
+                )
+            ]
+            ctx = get_datasets_ctx(config)
+            fingerprint = ctx.get_dataset_fingerprint("demo")
+            colormaps_etag = ctx.colormaps_etag
+            ctx = get_datasets_ctx(config)
+            self.assertEqual(fingerprint, ctx.get_dataset_fingerprint("demo"))
+            self.assertEqual(colormaps_etag, ctx.colormaps_etag)
+            mtime_ns = os.stat(color_file_path).st_mtime_ns
+            os.utime(color_file_path, ns=(mtime_ns, mtime_ns + 10**9))
+            ctx = get_datasets_ctx(config)
+            self.assertNotEqual(fingerprint, ctx.get_dataset_fingerprint("demo"))
+            self.assertNotEqual(colormaps_etag, ctx.colormaps_etag)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
     def test_get_dataset_configs_from_stores(self):
         ctx = get_datasets_ctx("config-datastores.yml")
 
@@ -6,11 +6,13 @@
 import os.path
 import unittest
 from typing import Any, Optional
+from unittest.mock import patch
 
 from test.webapi.helpers import get_api_ctx
 from xcube.core.new import new_cube
 from xcube.server.api import ApiError
 from xcube.webapi.datasets.context import DatasetsContext
+from xcube.webapi.datasets.controllers import compute_dataset_metadata
 from xcube.webapi.datasets.controllers import filter_variable_names
 from xcube.webapi.datasets.controllers import find_dataset_places
 from xcube.webapi.datasets.controllers import get_color_bars
@@ -84,6 +86,33 @@ class DatasetsControllerTest(DatasetsControllerTestBase):
             demo_1w_dataset["attributions"],
         )
 
+    def test_dataset_with_details_from_warmed_up_metadata(self):
+        ctx = get_datasets_ctx()
+        expected = get_datasets(ctx, details=True, base_url="http://test")
+
+        ctx = get_datasets_ctx()
+        for future in ctx.warm_up_datasets(compute_dataset_metadata):
+            future.result()
+        with patch(
+            "xcube.webapi.datasets.controllers.compute_dataset_metadata"
+        ) as compute_metadata:
+            response = get_datasets(ctx, details=True, base_url="http://test2")
+            self.assertEqual(0, compute_metadata.call_count)
+        ctx.on_dispose()
+
+        datasets = self.assertDatasetsOk(response, expected_count=2)
+        for dataset, expected_dataset in zip(datasets, expected["datasets"]):
+            self.assertEqual(
+                {k: v for k, v in expected_dataset.items() if k != "variables"},
+                {k: v for k, v in dataset.items() if k != "variables"},
+            )
+            for variable, expected_variable in zip(
+                dataset["variables"], expected_dataset["variables"]
+            ):
+                self.assertTrue(variable.pop("tileUrl").startswith("http://test2/"))
+                expected_variable.pop("tileUrl")
+                self.assertEqual(expected_variable, variable)
+
     def test_dataset_with_point(self):
         response = get_datasets(
             get_datasets_ctx(), point=(1.7, 51.2), base_url="http://test"
@@ -39,3 +39,13 @@ class DatasetsRoutesTest(RoutesTestCase):
         # Old
         response = self.fetch("/datasets/demo/vars/conc_chl/legend.png")
         self.assertResponseOK(response)
+
+    def test_fetch_legend_not_modified(self):
+        response = self.fetch("/tiles/demo/conc_chl/legend")
+        self.assertResponseOK(response)
+        etag = response.headers.get("Etag")
+        self.assertIsInstance(etag, str)
+        response = self.fetch(
+            "/tiles/demo/conc_chl/legend", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(304, response.status)
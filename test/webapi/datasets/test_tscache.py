@@ -0,0 +1,284 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import xarray as xr
+
+from xcube.core.new import new_cube
+from xcube.webapi.datasets.tscache import TimeSeriesCache
+from xcube.webapi.datasets.tscache import get_time_series_fingerprint
+
+
+def new_source_dataset(time_periods: int = 10) -> xr.Dataset:
+    cube = new_cube(
+        width=36,
+        height=18,
+        x_res=10,
+        time_periods=time_periods,
+        variables=dict(a=0.5, b=4),
+    )
+    return cube.chunk(dict(time=1, lat=9, lon=18))
+
+
+def wait_for_dataset(
+    cache: TimeSeriesCache, ds_id: str, fingerprint: str, dataset: xr.Dataset
+) -> xr.Dataset:
+    for _ in range(200):
+        ts_dataset = cache.get_dataset(ds_id, fingerprint, lambda: dataset)
+        if ts_dataset is not None:
+            return ts_dataset
+        time.sleep(0.05)
+    raise AssertionError("time-optimized copy not built")
+
+
+class TimeSeriesCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache_path = tempfile.mkdtemp(prefix="xcube-ts-cache-")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache_path, ignore_errors=True)
+
+    def test_new_time_optimized_dataset(self):
+        cache = TimeSeriesCache(self.cache_path, chunk_bytes=8 * 10 * 6 * 6)
+        ts_dataset = cache.new_time_optimized_dataset(new_source_dataset())
+        self.assertIsInstance(ts_dataset, xr.Dataset)
+        self.assertEqual({"a", "b"}, set(ts_dataset.data_vars))
+        self.assertEqual(
+            dict(time=(10,), lat=(6, 6, 6), lon=(6, 6, 6, 6, 6, 6)),
+            dict(ts_dataset.chunks),
+        )
+
+        cache = TimeSeriesCache(self.cache_path, time_chunk_size=5)
+        ts_dataset = cache.new_time_optimized_dataset(new_source_dataset())
+        self.assertEqual((5, 5), ts_dataset.chunks["time"])
+        self.assertEqual((18,), ts_dataset.chunks["lat"])
+
+    def test_new_time_optimized_dataset_not_needed(self):
+        cache = TimeSeriesCache(self.cache_path)
+        dataset = new_source_dataset().chunk(dict(time=-1))
+        self.assertIsNone(cache.new_time_optimized_dataset(dataset))
+        dataset = new_source_dataset().isel(time=0, drop=True)
+        self.assertIsNone(cache.new_time_optimized_dataset(dataset))
+
+    def test_get_dataset(self):
+        dataset = new_source_dataset()
+        fingerprint = get_time_series_fingerprint(dataset, "config-1")
+        cache = TimeSeriesCache(self.cache_path, max_workers=2)
+        try:
+            ts_dataset = wait_for_dataset(cache, "demo", fingerprint, dataset)
+            self.assertEqual((10,), ts_dataset.a.chunks[0])
+            xr.testing.assert_equal(dataset.a, ts_dataset.a)
+            xr.testing.assert_equal(dataset.b, ts_dataset.b)
+            self.assertIs(
+                ts_dataset, cache.get_dataset("demo", fingerprint, lambda: dataset)
+            )
+        finally:
+            cache.shutdown()
+
+        # New cache finds copy written before
+        cache = TimeSeriesCache(self.cache_path)
+        try:
+            self.assertIsNotNone(
+                cache.get_dataset("demo", fingerprint, lambda: dataset)
+            )
+        finally:
+            cache.shutdown()
+
+    def test_rebuild_if_fingerprint_changes(self):
+        cache = TimeSeriesCache(self.cache_path)
+        try:
+            dataset = new_source_dataset(time_periods=10)
+            fingerprint_1 = get_time_series_fingerprint(dataset, "config-1")
+            wait_for_dataset(cache, "demo", fingerprint_1, dataset)
+
+            dataset = new_source_dataset(time_periods=12)
+            fingerprint_2 = get_time_series_fingerprint(dataset, "config-1")
+            self.assertNotEqual(fingerprint_1, fingerprint_2)
+            ts_dataset = wait_for_dataset(cache, "demo", fingerprint_2, dataset)
+            self.assertEqual(12, ts_dataset.sizes["time"])
+
+            (ds_dir,) = os.listdir(self.cache_path)
+            self.assertEqual(
+                [f"{fingerprint_2}.zarr"],
+                os.listdir(os.path.join(self.cache_path, ds_dir)),
+            )
+        finally:
+            cache.shutdown()
+
+    def test_keep_copies_of_other_processes(self):
+        cache = TimeSeriesCache(self.cache_path)
+        try:
+            dataset = new_source_dataset(time_periods=10)
+            fingerprint_1 = get_time_series_fingerprint(dataset, "config-1")
+            wait_for_dataset(cache, "demo", fingerprint_1, dataset)
+            (ds_dir,) = os.listdir(self.cache_path)
+            ds_path = os.path.join(self.cache_path, ds_dir)
+            # Simulate another process building a newer copy
+            os.mkdir(os.path.join(ds_path, "other.zarr"))
+
+            cache.remove_dataset("demo")
+            dataset = new_source_dataset(time_periods=12)
+            fingerprint_2 = get_time_series_fingerprint(dataset, "config-1")
+            wait_for_dataset(cache, "demo", fingerprint_2, dataset)
+            self.assertEqual(
+                {"other.zarr", f"{fingerprint_2}.zarr"}, set(os.listdir(ds_path))
+            )
+        finally:
+            cache.shutdown()
+
+    def test_retry_failed_build(self):
+        dataset = new_source_dataset()
+        fingerprint = get_time_series_fingerprint(dataset, "config-1")
+        cache = TimeSeriesCache(self.cache_path, retry_interval=0.5)
+        num_calls = [0]
+
+        def get_source():
+            num_calls[0] += 1
+            if num_calls[0] == 1:
+                raise OSError("Source not available")
+            return dataset
+
+        try:
+            self.assertIsNone(cache.get_dataset("demo", fingerprint, get_source))
+            time.sleep(0.2)
+            # Not retried yet
+            self.assertIsNone(cache.get_dataset("demo", fingerprint, get_source))
+            self.assertEqual(1, num_calls[0])
+            time.sleep(0.4)
+            for _ in range(200):
+                if cache.get_dataset("demo", fingerprint, get_source) is not None:
+                    break
+                time.sleep(0.05)
+            self.assertEqual(2, num_calls[0])
+            self.assertIsNotNone(cache.get_dataset("demo", fingerprint, get_source))
+        finally:
+            cache.shutdown()
+
+    def test_shutdown_stops_build(self):
+        build_started = threading.Event()
+
+        def load_block(block):
+            build_started.set()
+            time.sleep(0.1)
+            return block
+
+        dataset = new_source_dataset()
+        dataset["a"] = dataset.a.copy(data=dataset.a.data.map_blocks(load_block))
+        fingerprint = get_time_series_fingerprint(dataset, "config-1")
+        cache = TimeSeriesCache(self.cache_path)
+        try:
+            self.assertIsNone(cache.get_dataset("demo", fingerprint, lambda: dataset))
+            self.assertTrue(build_started.wait(timeout=10))
+            start_time = time.monotonic()
+            cache.shutdown()
+            # Without stopping, writing all 40 blocks would take 4 seconds
+            self.assertLess(time.monotonic() - start_time, 2.0)
+            for _, _, file_names in os.walk(self.cache_path):
+                self.assertEqual([], file_names)
+        finally:
+            cache.shutdown()
+
+    def test_get_dataset_without_build(self):
+        dataset = new_source_dataset()
+        fingerprint = get_time_series_fingerprint(dataset, "config-1")
+        cache = TimeSeriesCache(self.cache_path)
+        try:
+            self.assertIsNone(
+                cache.get_dataset("demo", fingerprint, lambda: dataset, build=False)
+            )
+            time.sleep(0.2)
+            self.assertEqual([], os.listdir(self.cache_path))
+            wait_for_dataset(cache, "demo", fingerprint, dataset)
+            self.assertIsNotNone(
+                cache.get_dataset("demo", fingerprint, lambda: dataset, build=False)
+            )
+        finally:
+            cache.shutdown()
+
+    def test_get_dataset_exceeding_max_size(self):
+        dataset = new_source_dataset()
+        fingerprint = get_time_series_fingerprint(dataset, "config-1")
+        cache = TimeSeriesCache(self.cache_path, max_size=dataset.nbytes // 2)
+        try:
+            self.assertIsNone(cache.get_dataset("demo", fingerprint, lambda: dataset))
+            time.sleep(0.2)
+            cache.shutdown()
+            self.assertIsNone(cache.get_dataset("demo", fingerprint, lambda: dataset))
+            for _, _, file_names in os.walk(self.cache_path):
+                self.assertEqual([], file_names)
+        finally:
+            cache.shutdown()
+
+        cache = TimeSeriesCache(self.cache_path, max_size=None)
+        try:
+            wait_for_dataset(cache, "demo", fingerprint, dataset)
+        finally:
+            cache.shutdown()
+
+    def test_get_dataset_written_by_other_process(self):
+        dataset = new_source_dataset()
+        fingerprint = get_time_series_fingerprint(dataset, "config-1")
+        cache = TimeSeriesCache(self.cache_path)
+
+        replace = os.replace
+
+        def replace_after_other_process(src: str, dst: str):
+            if not dst.endswith(f"{fingerprint}.zarr"):
+                # Zarr writes its files using os.replace() too
+                return replace(src, dst)
+            # Simulate another process finishing the same copy first
+            shutil.copytree(src, dst)
+            raise OSError(f"Directory not empty: {dst!r}")
+
+        try:
+            with patch(
+                "xcube.webapi.datasets.tscache.os.replace",
+                side_effect=replace_after_other_process,
+            ):
+                ts_dataset = wait_for_dataset(cache, "demo", fingerprint, dataset)
+            xr.testing.assert_equal(dataset.a, ts_dataset.a)
+            (ds_dir,) = os.listdir(self.cache_path)
+            self.assertEqual(
+                [f"{fingerprint}.zarr"],
+                os.listdir(os.path.join(self.cache_path, ds_dir)),
+            )
+        finally:
+            cache.shutdown()
+
+    def test_get_dataset_not_needed(self):
+        dataset = new_source_dataset().chunk(dict(time=-1))
+        cache = TimeSeriesCache(self.cache_path)
+        try:
+            self.assertIsNone(cache.get_dataset("demo", "f", lambda: dataset))
+            cache.shutdown()
+            self.assertIsNone(cache.get_dataset("demo", "f", lambda: dataset))
+        finally:
+            cache.shutdown()
+
+    def test_fingerprint(self):
+        dataset = new_source_dataset()
+        fingerprint = get_time_series_fingerprint(dataset, "config-1")
+        self.assertEqual(
+            fingerprint, get_time_series_fingerprint(new_source_dataset(), "config-1")
+        )
+        self.assertNotEqual(
+            fingerprint, get_time_series_fingerprint(dataset, "config-2")
+        )
+        self.assertNotEqual(
+            fingerprint,
+            get_time_series_fingerprint(
+                dataset.assign_attrs(date_modified="2024-05-01"), "config-1"
+            ),
+        )
+        self.assertNotEqual(
+            fingerprint,
+            get_time_series_fingerprint(dataset.drop_vars("b"), "config-1"),
+        )
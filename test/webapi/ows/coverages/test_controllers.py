@@ -10,21 +10,29 @@ from pathlib import Path
 import numpy as np
 import pyproj
 import xarray as xr
+import rasterio
 import rioxarray
 
 from test.webapi.ows.coverages.test_context import get_coverages_ctx
 from xcube.server.api import ApiError
 from xcube.webapi.ows.coverages.controllers import (
     get_coverage_as_json,
+    get_coverage_blocks,
     get_coverage_data,
     get_crs_from_dataset,
+    iter_dataset_as_image,
+    iter_dataset_as_netcdf,
     dtype_to_opengis_datatype,
     get_dataarray_description,
     get_units,
     is_xy_order,
     transform_bbox,
     get_coverage_rangetype_for_dataset,
+    _get_level_dataset,
+    _get_level_for_scaling,
 )
+from xcube.webapi.ows.coverages.request import CoverageRequest
+from xcube.webapi.ows.coverages.scaling import CoverageScaling
 
 
 class CoveragesControllersTest(unittest.TestCase):
@@ -55,6 +63,125 @@ class CoveragesControllersTest(unittest.TestCase):
             self.assertEqual("Chlorophyll concentration", da.long_name)
             self.assertEqual((1, 400, 400), da.shape)
 
+    def test_get_coverage_data_tiff_tiled_and_compressed(self):
+        query = {
+            "bbox": ["51,1,52,2"],
+            "bbox-crs": ["[EPSG:4326]"],
+            "datetime": ["2017-01-25T00:00:00Z"],
+            "properties": ["conc_chl"],
+            "tiled": ["true"],
+            "compress": ["deflate"],
+        }
+        content, _, _ = get_coverage_data(
+            get_coverages_ctx().datasets_ctx, "demo", query, "image/tiff"
+        )
+        with rasterio.io.MemoryFile(content) as memfile:
+            with memfile.open() as src:
+                self.assertEqual(True, src.profile["tiled"])
+                self.assertEqual((256, 256), src.block_shapes[0])
+                self.assertEqual("deflate", src.profile["compress"])
+                self.assertEqual((400, 400), src.shape)
+
+    def test_get_coverage_blocks(self):
+        query = {
+            "bbox": ["51,1,52,2"],
+            "bbox-crs": ["[EPSG:4326]"],
+            "datetime": ["2017-01-25T00:00:00Z"],
+            "properties": ["conc_chl"],
+        }
+        blocks, content_bbox, content_crs = get_coverage_blocks(
+            get_coverages_ctx().datasets_ctx, "demo", query, "netcdf"
+        )
+        content, _, _ = get_coverage_data(
+            get_coverages_ctx().datasets_ctx, "demo", query, "netcdf"
+        )
+        self.assertEqual(content, b"".join(blocks))
+        self.assertEqual([51, 1, 52, 2], [round(v) for v in content_bbox])
+        self.assertEqual(pyproj.CRS("EPSG:4326"), content_crs)
+
+    def test_iter_dataset_as_image(self):
+        ds = xr.Dataset(
+            dict(a=(("y", "x"), np.arange(64 * 32, dtype=np.float32).reshape(64, 32))),
+            coords=dict(y=np.arange(64.0, 0, -1), x=np.arange(32.0)),
+        )
+        blocks = list(
+            iter_dataset_as_image(
+                ds, "tiff", pyproj.CRS("EPSG:4326"), block_size=1000
+            )
+        )
+        self.assertGreater(len(blocks), 1)
+        self.assertTrue(all(len(block) == 1000 for block in blocks[:-1]))
+        self.assertLessEqual(len(blocks[-1]), 1000)
+        with BytesIO(b"".join(blocks)) as fh:
+            da = rioxarray.open_rasterio(fh)
+            self.assertEqual((1, 64, 32), da.shape)
+            self.assertEqual(pyproj.CRS("EPSG:4326"), da.rio.crs)
+            np.testing.assert_equal(ds.a.values, da.values[0])
+
+    def test_iter_dataset_as_netcdf(self):
+        ds = xr.Dataset(
+            dict(a=(("y", "x"), np.arange(64 * 32, dtype=np.float32).reshape(64, 32))),
+            coords=dict(y=np.arange(64.0), x=np.arange(32.0)),
+        ).chunk(dict(y=16))
+        blocks = list(iter_dataset_as_netcdf(ds, block_size=1000))
+        self.assertGreater(len(blocks), 1)
+        self.assertTrue(all(len(block) == 1000 for block in blocks[:-1]))
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = os.path.join(tempdir, "out.nc")
+            with open(path, "wb") as fh:
+                fh.write(b"".join(blocks))
+            with xr.open_dataset(path) as ds_from_netcdf:
+                xr.testing.assert_equal(ds.compute(), ds_from_netcdf)
+
+    def test_get_coverage_data_from_pyramid_level(self):
+        ml_dataset = get_coverages_ctx().datasets_ctx.get_ml_dataset("demo")
+        query = {
+            "bbox": ["51,1,52,2"],
+            "bbox-crs": ["[EPSG:4326]"],
+            "datetime": ["2017-01-25T00:00:00Z"],
+            "properties": ["conc_chl"],
+        }
+        for scale_factor, expected_level, expected_size in (
+            ("1", 0, 400),
+            ("1.5", 0, 267),
+            ("2", 1, 200),
+            ("3", 1, 133),
+            ("4", 2, 100),
+        ):
+            request = CoverageRequest({**query, "scale-factor": [scale_factor]})
+            ds = ml_dataset.get_dataset(0).sel(lat=slice(52, 51), lon=slice(1, 2))
+            self.assertEqual(
+                expected_level,
+                _get_level_for_scaling(
+                    ml_dataset,
+                    CoverageScaling(request, pyproj.CRS("EPSG:4326"), ds),
+                ),
+            )
+            content, _, _ = get_coverage_data(
+                get_coverages_ctx().datasets_ctx,
+                "demo",
+                {**query, "scale-factor": [scale_factor]},
+                "image/tiff",
+            )
+            with BytesIO(content) as fh:
+                da = rioxarray.open_rasterio(fh)
+                self.assertEqual((1, expected_size, expected_size), da.shape)
+
+    def test_get_level_dataset(self):
+        ml_dataset = get_coverages_ctx().datasets_ctx.get_ml_dataset("demo")
+        ds = _get_level_dataset(ml_dataset, 1)
+        self.assertEqual(500, ds.sizes["lat"])
+        self.assertEqual(1000, ds.sizes["lon"])
+        self.assertEqual(
+            {"lat", "lat_bnds", "lon", "lon_bnds", "time", "time_bnds"},
+            set(ds.coords),
+        )
+        self.assertEqual("lat_bnds", ds.lat.attrs.get("bounds"))
+        np.testing.assert_almost_equal(
+            ds.lat_bnds.values[:, 0] - ds.lat_bnds.values[:, 1],
+            np.full(500, 0.005),
+        )
+
     def test_get_coverage_data_geo_subset(self):
         query = {
             "subset": ["Lat(51:52),Lon(1:2)"],
@@ -127,3 +127,18 @@ class CoveragesRequestTest(unittest.TestCase):
         )
         with self.assertRaises(ValueError):
             CoverageRequest({"crs": ["an invalid CRS specifier"]})
+
+    def test_parse_tiled(self):
+        self.assertFalse(CoverageRequest({}).tiled)
+        self.assertTrue(CoverageRequest({"tiled": ["true"]}).tiled)
+        self.assertTrue(CoverageRequest({"tiled": ["1"]}).tiled)
+        self.assertFalse(CoverageRequest({"tiled": ["False"]}).tiled)
+        with self.assertRaises(ValueError):
+            CoverageRequest({"tiled": ["yes please"]})
+
+    def test_parse_compress(self):
+        self.assertIsNone(CoverageRequest({}).compress)
+        self.assertEqual("deflate", CoverageRequest({"compress": ["DEFLATE"]}).compress)
+        self.assertIsNone(CoverageRequest({"compress": ["none"]}).compress)
+        with self.assertRaises(ValueError):
+            CoverageRequest({"compress": ["jpeg2000"]})
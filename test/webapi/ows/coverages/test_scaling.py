@@ -49,6 +49,27 @@ class ScalingTest(unittest.TestCase):
         self.assertEqual((2, 2), scaling.factor)
         self.assertEqual((180, 90), scaling.size)
 
+    def test_scale_factor_with_level_scale(self):
+        # E.g. the dataset is level 1 of a pyramid whose base is 720 x 360
+        scaling = CoverageScaling(
+            CoverageRequest({"scale-factor": ["4"]}),
+            self.epsg4326,
+            self.ds.isel(lon=slice(0, 180), lat=slice(0, 90)),
+            level_scale=(4, 4),
+        )
+        self.assertEqual((1, 1), scaling.factor)
+        self.assertEqual((180, 90), scaling.size)
+
+    def test_scale_size_with_level_scale(self):
+        scaling = CoverageScaling(
+            CoverageRequest({"scale-size": ["Lat(60),Lon(120)"]}),
+            self.epsg4326,
+            self.ds,
+            level_scale=(2, 2),
+        )
+        self.assertEqual((3, 3), scaling.factor)
+        self.assertEqual((120, 60), scaling.size)
+
     def test_scale_axes(self):
         scaling = CoverageScaling(
             CoverageRequest({"scale-axes": ["Lat(3),Lon(1.2)"]}),
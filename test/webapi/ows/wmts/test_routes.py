@@ -191,3 +191,14 @@ class WmtsRoutesTest(RoutesTestCase):
             "?time=current&cbar=jet&TileMatrixSet=WorldWebMercatorQuad"
         )
         self.assertResponseOK(response)
+
+    def test_fetch_wmts_tile_not_modified(self):
+        response = self.fetch("/wmts/1.0.0/tile/demo/conc_chl/0/0/0.png")
+        self.assertResponseOK(response)
+        etag = response.headers.get("Etag")
+        self.assertIsInstance(etag, str)
+        response = self.fetch(
+            "/wmts/1.0.0/tile/demo/conc_chl/0/0/0.png",
+            headers={"If-None-Match": etag},
+        )
+        self.assertEqual(304, response.status)
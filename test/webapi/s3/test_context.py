@@ -23,6 +23,27 @@ class S3ContextTest(unittest.TestCase):
         self.assertIsInstance(ctx.get_bucket("datasets"), ObjectStorage)
         self.assertIsInstance(ctx.get_bucket("pyramids"), ObjectStorage)
 
+    def test_buckets_forget_removed_datasets(self):
+        ctx = get_s3_ctx()
+        datasets_bucket = ctx.get_bucket("datasets")
+        pyramids_bucket = ctx.get_bucket("pyramids")
+        key_1 = "demo.zarr/conc_chl/0.0.0"
+        key_2 = "demo.levels/0.zarr/conc_chl/0.0.0"
+        value_1, _ = datasets_bucket.get_object(key_1)
+        value_2, _ = pyramids_bucket.get_object(key_2)
+        self.assertTrue(value_1 is datasets_bucket.get_object(key_1)[0])
+        ctx.datasets_ctx.add_dataset(
+            ctx.datasets_ctx.get_dataset("demo"), ds_id="demo"
+        )
+        self.assertFalse(value_1 is datasets_bucket.get_object(key_1)[0])
+        self.assertFalse(value_2 is pyramids_bucket.get_object(key_2)[0])
+
+    def test_get_size_of_compressed_chunk(self):
+        ctx = get_s3_ctx()
+        bucket = ctx.get_bucket("datasets")
+        key = "demo.zarr/conc_chl/0.0.0"
+        self.assertEqual(len(bucket[key]), bucket.get_size(key))
+
     def test_datasets_bucket(self):
         ctx = get_s3_ctx()
         bucket = ctx.get_bucket("datasets")
@@ -82,21 +82,21 @@ class ListS3BucketV12TestsMixin:
                     "ETag": '"16a49349c15b9cd60c5d8a05fc6ad649"',
                     "Key": "bert.zarr/.zattrs",
                     "LastModified": "2019-06-24T20:43:40.862Z",
-                    "Size": -1,
+                    "Size": 376,
                     "StorageClass": "STANDARD",
                 },
                 {
                     "ETag": '"0a44cbe4de5e2936112efc2ed25b6223"',
                     "Key": "bert.zarr/.zgroup",
                     "LastModified": "2019-06-24T20:43:40.862Z",
-                    "Size": -1,
+                    "Size": 22,
                     "StorageClass": "STANDARD",
                 },
                 {
                     "ETag": '"cc1a0115345e38f58a88b83722a9d2d8"',
                     "Key": "bert.zarr/.zmetadata",
                     "LastModified": "2019-06-24T20:43:40.862Z",
-                    "Size": -1,
+                    "Size": 3814,
                     "StorageClass": "STANDARD",
                 },
             ],
@@ -129,6 +129,8 @@ class ListS3BucketV12TestsMixin:
 
 
 class ListBucketV1Test(ListS3BucketTest, ListS3BucketV12TestsMixin):
+    __test__ = True
+
     def list_bucket(self, **kwargs):
         return list_s3_bucket_v1(
             self.object_storage,
@@ -152,35 +154,35 @@ class ListBucketV1Test(ListS3BucketTest, ListS3BucketV12TestsMixin):
                     "ETag": '"16a49349c15b9cd60c5d8a05fc6ad649"',
                     "Key": "bert.zarr/.zattrs",
                     "LastModified": "2019-06-24T20:43:40.862Z",
-                    "Size": -1,
+                    "Size": 376,
                     "StorageClass": "STANDARD",
                 },
                 {
                     "ETag": '"0a44cbe4de5e2936112efc2ed25b6223"',
                     "Key": "bert.zarr/.zgroup",
                     "LastModified": "2019-06-24T20:43:40.862Z",
-                    "Size": -1,
+                    "Size": 22,
                     "StorageClass": "STANDARD",
                 },
                 {
                     "ETag": '"cc1a0115345e38f58a88b83722a9d2d8"',
                     "Key": "bert.zarr/.zmetadata",
                     "LastModified": "2019-06-24T20:43:40.862Z",
-                    "Size": -1,
+                    "Size": 3814,
                     "StorageClass": "STANDARD",
                 },
                 {
                     "ETag": '"b74fb939f20cf7cff02c208e8824faec"',
                     "Key": "bert.zarr/lat/.zarray",
                     "LastModified": "2019-06-24T20:43:40.862Z",
-                    "Size": -1,
+                    "Size": 172,
                     "StorageClass": "STANDARD",
                 },
                 {
                     "ETag": '"05bbb0156ba6af07e613287e17c9385c"',
                     "Key": "bert.zarr/lat/.zattrs",
                     "LastModified": "2019-06-24T20:43:40.862Z",
-                    "Size": -1,
+                    "Size": 152,
                     "StorageClass": "STANDARD",
                 },
             ],
@@ -224,10 +226,15 @@ class ListBucketV1Test(ListS3BucketTest, ListS3BucketV12TestsMixin):
 
 
 class ListS3BucketV2Test(ListS3BucketTest, ListS3BucketV12TestsMixin):
+    __test__ = True
+
     def test_list_bucket_v2_truncated(self):
         list_bucket_result = self.list_bucket(max_keys=5)
         self.assert_list_bucket_result(
-            list_bucket_result, max_keys=5, is_truncated=True, next_continuation_token=6
+            list_bucket_result,
+            max_keys=5,
+            is_truncated=True,
+            next_continuation_token="bert.zarr/lat/0",
         )
         self.assertIsInstance(list_bucket_result.get("Contents"), list)
         self.assertEqual(
@@ -236,35 +243,35 @@ class ListS3BucketV2Test(ListS3BucketTest, ListS3BucketV12TestsMixin):
                     "ETag": '"16a49349c15b9cd60c5d8a05fc6ad649"',
                     "Key": "bert.zarr/.zattrs",
                     "LastModified": "2019-06-24T20:43:40.862Z",
-                    "Size": -1,
+                    "Size": 376,
                     "StorageClass": "STANDARD",
                 },
                 {
                     "ETag": '"0a44cbe4de5e2936112efc2ed25b6223"',
                     "Key": "bert.zarr/.zgroup",
                     "LastModified": "2019-06-24T20:43:40.862Z",
-                    "Size": -1,
+                    "Size": 22,
                     "StorageClass": "STANDARD",
                 },
                 {
                     "ETag": '"cc1a0115345e38f58a88b83722a9d2d8"',
                     "Key": "bert.zarr/.zmetadata",
                     "LastModified": "2019-06-24T20:43:40.862Z",
-                    "Size": -1,
+                    "Size": 3814,
                     "StorageClass": "STANDARD",
                 },
                 {
                     "ETag": '"b74fb939f20cf7cff02c208e8824faec"',
                     "Key": "bert.zarr/lat/.zarray",
                     "LastModified": "2019-06-24T20:43:40.862Z",
-                    "Size": -1,
+                    "Size": 172,
                     "StorageClass": "STANDARD",
                 },
                 {
                     "ETag": '"05bbb0156ba6af07e613287e17c9385c"',
                     "Key": "bert.zarr/lat/.zattrs",
                     "LastModified": "2019-06-24T20:43:40.862Z",
-                    "Size": -1,
+                    "Size": 152,
                     "StorageClass": "STANDARD",
                 },
             ],
@@ -272,6 +279,44 @@ class ListS3BucketV2Test(ListS3BucketTest, ListS3BucketV12TestsMixin):
         )
         self.assertNotIn("CommonPrefixes", list_bucket_result)
 
+    def test_list_bucket_v2_continuation(self):
+        keys = []
+        continuation_token = None
+        while True:
+            list_bucket_result = self.list_bucket(
+                prefix="bibo.zarr/", max_keys=10, continuation_token=continuation_token
+            )
+            keys.extend(item["Key"] for item in list_bucket_result["Contents"])
+            continuation_token = list_bucket_result.get("NextContinuationToken")
+            if continuation_token is None:
+                break
+        self.assertEqual(79, len(keys))
+        self.assertEqual(sorted(keys), keys)
+        self.assertTrue(all(key.startswith("bibo.zarr/") for key in keys))
+
+    def test_list_bucket_v2_start_after(self):
+        list_bucket_result = self.list_bucket(
+            start_after="bibo.zarr/temperature/2.1.2", prefix="bibo.zarr/temperature/"
+        )
+        self.assertEqual(
+            ["bibo.zarr/temperature/2.1.3"],
+            [item["Key"] for item in list_bucket_result["Contents"]],
+        )
+        list_bucket_result = self.list_bucket(
+            start_after="bibo.zarr/temperature/2.1.2",
+            prefix="bibo.zarr/",
+            delimiter="/",
+        )
+        self.assertNotIn("Contents", list_bucket_result)
+        self.assertEqual(
+            [
+                {"Prefix": "bibo.zarr/temperature/"},
+                {"Prefix": "bibo.zarr/time/"},
+                {"Prefix": "bibo.zarr/time_bnds/"},
+            ],
+            list_bucket_result["CommonPrefixes"],
+        )
+
     def test_list_bucket_v2_result_to_xml(self):
         list_bucket_result = self.list_bucket(
             delimiter="/", max_keys=10, prefix="bibo.zarr/"
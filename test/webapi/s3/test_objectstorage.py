@@ -2,13 +2,19 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
+import hashlib
+import itertools
 import unittest
 
+import fsspec
+import xarray as xr
+
 from xcube.core.mldataset import BaseMultiLevelDataset
 from xcube.core.new import new_cube
 
 # noinspection PyUnresolvedReferences
 from xcube.core.zarrstore import ZarrStoreHolder
+from xcube.webapi.s3.objectstorage import KeyIndex
 from xcube.webapi.s3.objectstorage import ObjectStorage
 
 
@@ -51,6 +57,147 @@ class ObjectStorageTest(unittest.TestCase):
     def test_len(self):
         self.assertEqual(len(EXPECTED_KEYS), len(self.object_storage))
 
+    def test_iter_keys(self):
+        self.assertEqual(EXPECTED_KEYS, list(self.object_storage.iter_keys()))
+        self.assertEqual(
+            [k for k in EXPECTED_KEYS if k.startswith("cube_1.levels/1.zarr/B0")],
+            list(self.object_storage.iter_keys(prefix="cube_1.levels/1.zarr/B0")),
+        )
+        self.assertEqual(
+            [k for k in EXPECTED_KEYS if k >= "cube_1.levels/1.zarr/B08/0"],
+            list(self.object_storage.iter_keys(start="cube_1.levels/1.zarr/B08/0")),
+        )
+        self.assertEqual(
+            [],
+            list(self.object_storage.iter_keys(start="cube_3", prefix="cube_2")),
+        )
+
+    def test_get_object(self):
+        key = "cube_2.zarr/CHL/0.1.2"
+        value, e_tag = self.object_storage.get_object(key)
+        self.assertEqual(self.object_storage[key], value)
+        self.assertEqual(hashlib.md5(value).hexdigest(), e_tag)
+        # Cached
+        self.assertTrue(value is self.object_storage.get_object(key)[0])
+
+    def test_get_object_lru(self):
+        key_1 = "cube_2.zarr/CHL/0.0.0"
+        key_2 = "cube_2.zarr/CHL/0.0.1"
+        key_3 = "cube_2.zarr/CHL/0.0.2"
+        chunk_size = self.object_storage.get_size(key_1)
+        object_storage = ObjectStorage(
+            self.object_storage.datasets, cache_size=2 * chunk_size
+        )
+        value_1, _ = object_storage.get_object(key_1)
+        value_2, _ = object_storage.get_object(key_2)
+        self.assertTrue(value_1 is object_storage.get_object(key_1)[0])
+        object_storage.get_object(key_3)
+        # key_2 has been least recently used
+        self.assertTrue(value_1 is object_storage.get_object(key_1)[0])
+        self.assertFalse(value_2 is object_storage.get_object(key_2)[0])
+
+    def test_get_size(self):
+        object_storage = self.object_storage
+        for key in (
+            "cube_2.zarr/.zattrs",
+            "cube_2.zarr/CHL/.zarray",
+            "cube_2.zarr/CHL/0.1.2",
+            "cube_1.levels/1.zarr/B03/0.1.1",
+        ):
+            self.assertEqual(len(object_storage[key]), object_storage.get_size(key))
+        self.assertIsNone(object_storage.get_size("cube_3.zarr/.zattrs"))
+        self.assertIsNone(object_storage.get_size("cube_2.zarr/CHL/"))
+
+    def test_get_size_of_fs_store(self):
+        fs_map = fsspec.get_mapper("memory://test_get_size_of_fs_store.zarr")
+        try:
+            self.object_storage.datasets["cube_2.zarr"].to_zarr(fs_map)
+            dataset = xr.open_zarr(fs_map)
+            dataset.zarr_store.set(fs_map)
+            object_storage = ObjectStorage({"cube_2.zarr": dataset})
+            key = "cube_2.zarr/CHL/0.1.2"
+            self.assertEqual(len(fs_map["CHL/0.1.2"]), object_storage.get_size(key))
+            self.assertIsNone(object_storage.get_size("cube_2.zarr/CHL/9.9.9"))
+        finally:
+            fs_map.fs.rm(fs_map.root, recursive=True)
+
+    def test_remove_dataset(self):
+        cube = self.object_storage.datasets["cube_1.levels"]
+        object_storage = ObjectStorage({"a.levels": cube, "b.levels": cube})
+        key_1 = "a.levels/1.zarr/B03/0.1.1"
+        key_2 = "b.levels/1.zarr/B03/0.1.1"
+        value_1, _ = object_storage.get_object(key_1)
+        value_2, _ = object_storage.get_object(key_2)
+        self.assertTrue(value_1 is object_storage.get_object(key_1)[0])
+        object_storage.remove_dataset("a.levels")
+        self.assertFalse(value_1 is object_storage.get_object(key_1)[0])
+        self.assertTrue(value_2 is object_storage.get_object(key_2)[0])
+
+    def test_remove_dataset_reindexes_keys(self):
+        datasets = {"cube_2.zarr": self.object_storage.datasets["cube_2.zarr"]}
+        object_storage = ObjectStorage(datasets)
+        prefix = "cube_2.zarr/CHL/"
+        keys = list(object_storage.iter_keys(prefix=prefix))
+        datasets["cube_2.zarr"] = datasets["cube_2.zarr"].chunk(dict(lon=1800))
+        # Still indexed
+        self.assertEqual(keys, list(object_storage.iter_keys(prefix=prefix)))
+        object_storage.remove_dataset("cube_2.zarr")
+        self.assertEqual(
+            [k for k in keys if k.endswith((".0", ".1", "/.zarray", "/.zattrs"))],
+            list(object_storage.iter_keys(prefix=prefix)),
+        )
+
+
+class KeyIndexTest(unittest.TestCase):
+    def test_groups_are_loaded_lazily(self):
+        loaded = []
+
+        def load_group(prefix: str) -> list[str]:
+            loaded.append(prefix)
+            return [f"{i}" for i in range(10)]
+
+        key_index = KeyIndex(["b/", "a/", "c/"], load_group)
+        self.assertEqual(
+            ["b/7", "b/8", "b/9"], list(key_index.iter_keys(start="b/7", prefix="b/"))
+        )
+        self.assertEqual(["b/"], loaded)
+        self.assertEqual(
+            ["a/9", "b/0"], list(itertools.islice(key_index.iter_keys(start="a/9"), 2))
+        )
+        self.assertEqual(["b/", "a/"], loaded)
+        self.assertEqual([], list(key_index.iter_keys(prefix="d")))
+        self.assertEqual(["b/", "a/"], loaded)
+
+    def test_remove_group(self):
+        loaded = []
+
+        def load_group(prefix: str) -> list[str]:
+            loaded.append(prefix)
+            return [f"{i}" for i in range(len(loaded))]
+
+        key_index = KeyIndex(["b/", "a/"], load_group)
+        self.assertEqual(["a/0", "b/0", "b/1"], list(key_index.iter_keys()))
+        key_index.remove_group("a/")
+        self.assertEqual(
+            ["a/0", "a/1", "a/2", "b/0", "b/1"], list(key_index.iter_keys())
+        )
+        self.assertEqual(["a/", "b/", "a/"], loaded)
+
+    def test_delimiter_does_not_load_groups(self):
+        loaded = []
+
+        def load_group(prefix: str) -> list[str]:
+            loaded.append(prefix)
+            return ["x/0", "x/1"]
+
+        key_index = KeyIndex(["b/", "a/", "c/"], load_group)
+        self.assertEqual(["a/", "b/", "c/"], list(key_index.iter_keys(delimiter="/")))
+        self.assertEqual([], loaded)
+        self.assertEqual(
+            ["b/x/0", "b/x/1"], list(key_index.iter_keys(prefix="b/", delimiter="/"))
+        )
+        self.assertEqual(["b/"], loaded)
+
 
 EXPECTED_KEYS = [
     "cube_1.levels/0.zarr/.zattrs",
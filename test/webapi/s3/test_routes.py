@@ -39,3 +39,53 @@ class S3RoutesNewTest(RoutesTestCase):
         self.assertResourceNotFoundResponse(response)
         response = self.fetch("/s3/datasets/demo.zarr/conc_chl/3.2.4", method=method)
         self.assertResponseOK(response)
+
+    def test_fetch_get_s3_object_range(self):
+        path = "/s3/datasets/demo.zarr/conc_chl/3.2.4"
+        response = self.fetch(path)
+        self.assertResponseOK(response)
+        data = response.data
+        size = len(data)
+        self.assertEqual("bytes", response.headers.get("Accept-Ranges"))
+
+        response = self.fetch(path, headers={"Range": "bytes=10-19"})
+        self.assertEqual(206, response.status)
+        self.assertEqual(data[10:20], response.data)
+        self.assertEqual(f"bytes 10-19/{size}", response.headers["Content-Range"])
+        self.assertEqual("10", response.headers["Content-Length"])
+
+        response = self.fetch(path, headers={"Range": "bytes=-5"})
+        self.assertEqual(206, response.status)
+        self.assertEqual(data[-5:], response.data)
+
+        response = self.fetch(path, headers={"Range": f"bytes={size - 3}-"})
+        self.assertEqual(206, response.status)
+        self.assertEqual(data[-3:], response.data)
+
+        response = self.fetch(path, headers={"Range": f"bytes={size}-"})
+        self.assertEqual(416, response.status)
+        self.assertEqual(f"bytes */{size}", response.headers["Content-Range"])
+
+        # Invalid and multiple ranges are ignored
+        response = self.fetch(path, headers={"Range": "bytes=10-5"})
+        self.assertEqual(200, response.status)
+        self.assertEqual(data, response.data)
+        response = self.fetch(path, headers={"Range": "bytes=0-1,5-6"})
+        self.assertEqual(200, response.status)
+        self.assertEqual(data, response.data)
+
+    def test_fetch_s3_object_if_none_match(self):
+        path = "/s3/datasets/demo.zarr/conc_chl/3.2.4"
+        for method in ("HEAD", "GET"):
+            response = self.fetch(path, method=method)
+            self.assertResponseOK(response)
+            e_tag = response.headers["ETag"]
+            response = self.fetch(
+                path, method=method, headers={"If-None-Match": e_tag}
+            )
+            self.assertEqual(304, response.status)
+            self.assertEqual(b"", response.data)
+            response = self.fetch(
+                path, method=method, headers={"If-None-Match": '"0123"'}
+            )
+            self.assertEqual(200, response.status)
@@ -4,6 +4,11 @@
 
 import unittest
 
+import numpy as np
+import xarray as xr
+
+from xcube.webapi.statistics.controllers import _compute_histogram
+from xcube.webapi.statistics.controllers import _compute_moments
 from xcube.webapi.statistics.controllers import compute_statistics
 from .test_context import get_statistics_ctx
 
@@ -127,3 +132,62 @@ class StatisticsControllerTest(unittest.TestCase):
         )
         self.assertIsInstance(result, dict)
         self.assertEqual({"count": 0}, result)
+
+
+class FusedStatisticsTest(unittest.TestCase):
+    def setUp(self):
+        data = np.random.default_rng(42).normal(10.0, 2.0, size=(40, 60))
+        data[data < 8.0] = np.nan
+        self.data = data
+
+    def assert_statistics_equal_numpy(self, var: xr.DataArray):
+        data = self.data
+        count, minimum, maximum, mean, deviation = _compute_moments(var)
+        self.assertEqual(int(np.count_nonzero(~np.isnan(data))), count)
+        self.assertEqual(float(np.nanmin(data)), minimum)
+        self.assertEqual(float(np.nanmax(data)), maximum)
+        self.assertAlmostEqual(float(np.nanmean(data)), mean, places=10)
+        self.assertAlmostEqual(float(np.nanstd(data)), deviation, places=10)
+
+        values, edges = _compute_histogram(var, 10, minimum, maximum)
+        expected_values, expected_edges = np.histogram(
+            data, 10, range=(minimum, maximum), density=True
+        )
+        np.testing.assert_allclose(values, expected_values)
+        np.testing.assert_allclose(edges, expected_edges)
+
+    def test_numpy(self):
+        self.assert_statistics_equal_numpy(xr.DataArray(self.data, dims=("y", "x")))
+
+    def test_dask(self):
+        self.assert_statistics_equal_numpy(
+            xr.DataArray(self.data, dims=("y", "x")).chunk(dict(x=25, y=15))
+        )
+
+    def test_large_offset(self):
+        # Regression test: the variance must not be computed as
+        # E[x^2] - E[x]^2, which loses precision for large means
+        data = 1e6 + np.random.default_rng(0).normal(0.0, 0.01, (60, 50))
+        expected_deviation = float(np.std(data))
+        for var in (
+            xr.DataArray(data, dims=("y", "x")),
+            xr.DataArray(data, dims=("y", "x")).chunk(dict(x=25, y=15)),
+        ):
+            count, _, _, mean, deviation = _compute_moments(var)
+            self.assertEqual(3000, count)
+            self.assertAlmostEqual(float(np.mean(data)), mean, places=6)
+            self.assertAlmostEqual(expected_deviation, deviation, places=8)
+
+    def test_all_nan(self):
+        var = xr.DataArray(np.full((4, 5), np.nan), dims=("y", "x")).chunk()
+        self.assertEqual(0, _compute_moments(var)[0])
+
+    def test_constant(self):
+        var = xr.DataArray(np.full((4, 5), 3.0), dims=("y", "x")).chunk()
+        self.assertEqual((20, 3.0, 3.0, 3.0, 0.0), _compute_moments(var))
+        values, edges = _compute_histogram(var, 4, 3.0, 3.0)
+        expected_values, expected_edges = np.histogram(
+            var.values, 4, range=(3.0, 3.0), density=True
+        )
+        np.testing.assert_allclose(values, expected_values)
+        np.testing.assert_allclose(edges, expected_edges)
@@ -0,0 +1,118 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from xcube.webapi.tiles.cache import TileCache
+
+
+class TileCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.disk_path = tempfile.mkdtemp(prefix="xcube-tile-cache-")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.disk_path, ignore_errors=True)
+
+    def test_memory_tier(self):
+        cache = TileCache(memory_size=10)
+        self.assertTrue(cache.is_enabled)
+        self.assertIsNone(cache.get(("ds1", 0, 0, 0)))
+        cache.put(("ds1", 0, 0, 0), b"0123")
+        cache.put(("ds1", 0, 0, 1), b"4567")
+        self.assertEqual(b"0123", cache.get(("ds1", 0, 0, 0)))
+        # Evicts least recently used tile ("ds1", 0, 0, 1)
+        cache.put(("ds2", 0, 0, 0), b"89ab")
+        self.assertIsNone(cache.get(("ds1", 0, 0, 1)))
+        self.assertEqual(b"0123", cache.get(("ds1", 0, 0, 0)))
+        self.assertEqual(b"89ab", cache.get(("ds2", 0, 0, 0)))
+        self.assertEqual(
+            dict(
+                hits=3,
+                misses=2,
+                memory_tiles=2,
+                memory_bytes=8,
+                disk_tiles=0,
+                disk_bytes=0,
+            ),
+            cache.stats,
+        )
+
+    def test_memory_tier_disabled(self):
+        cache = TileCache(memory_size=0)
+        self.assertFalse(cache.is_enabled)
+        cache.put(("ds1", 0, 0, 0), b"0123")
+        self.assertIsNone(cache.get(("ds1", 0, 0, 0)))
+
+    def test_disk_tier(self):
+        cache = TileCache(memory_size=4, disk_path=self.disk_path)
+        cache.put(("ds1", 0, 0, 0), b"0123")
+        cache.put(("ds1", 0, 0, 1), b"4567")
+        self.assertTrue(os.path.isfile(cache.get_tile_path(("ds1", 0, 0, 0))))
+        self.assertTrue(os.path.isfile(cache.get_tile_path(("ds1", 0, 0, 1))))
+        # Promoted from disk tier
+        self.assertEqual(b"0123", cache.get(("ds1", 0, 0, 0)))
+        self.assertEqual(
+            dict(
+                hits=1,
+                misses=0,
+                memory_tiles=1,
+                memory_bytes=4,
+                disk_tiles=2,
+                disk_bytes=8,
+            ),
+            cache.stats,
+        )
+
+        # Disk tier persists
+        cache = TileCache(memory_size=4, disk_path=self.disk_path)
+        self.assertEqual(8, cache.stats["disk_bytes"])
+        self.assertEqual(b"4567", cache.get(("ds1", 0, 0, 1)))
+
+    def test_disk_tier_size(self):
+        cache = TileCache(memory_size=0, disk_path=self.disk_path, disk_size=8)
+        cache.put(("ds1", 0, 0, 0), b"0123")
+        cache.put(("ds1", 0, 0, 1), b"4567")
+        cache.put(("ds1", 0, 0, 2), b"89ab")
+        self.assertIsNone(cache.get(("ds1", 0, 0, 0)))
+        self.assertEqual(b"4567", cache.get(("ds1", 0, 0, 1)))
+        self.assertEqual(b"89ab", cache.get(("ds1", 0, 0, 2)))
+        self.assertFalse(os.path.exists(cache.get_tile_path(("ds1", 0, 0, 0))))
+
+    def test_remove_dataset(self):
+        cache = TileCache(disk_path=self.disk_path)
+        cache.put(("ds1", 0, 0, 0), b"0123")
+        cache.put(("ds1/x", 0, 0, 0), b"4567")
+        cache.put(("ds2", 0, 0, 0), b"89ab")
+        cache.remove_dataset("ds1")
+        self.assertIsNone(cache.get(("ds1", 0, 0, 0)))
+        self.assertFalse(os.path.exists(cache.get_tile_path(("ds1", 0, 0, 0))))
+        self.assertEqual(b"4567", cache.get(("ds1/x", 0, 0, 0)))
+        self.assertEqual(b"89ab", cache.get(("ds2", 0, 0, 0)))
+        self.assertEqual(8, cache.stats["disk_bytes"])
+
+    def test_retain_datasets(self):
+        cache = TileCache(disk_path=self.disk_path)
+        cache.put(("ds1", "fp1", 0, 0, 0), b"0123")
+        cache.put(("ds2", "fp2", 0, 0, 0), b"4567")
+        cache.put(("ds3", "fp3", 0, 0, 0), b"89ab")
+        cache.retain_datasets({"ds1": "fp1", "ds2": "fp2-changed"})
+        self.assertEqual(b"0123", cache.get(("ds1", "fp1", 0, 0, 0)))
+        self.assertIsNone(cache.get(("ds2", "fp2", 0, 0, 0)))
+        self.assertIsNone(cache.get(("ds3", "fp3", 0, 0, 0)))
+        self.assertFalse(
+            os.path.exists(cache.get_tile_path(("ds2", "fp2", 0, 0, 0)))
+        )
+        self.assertEqual(4, cache.stats["disk_bytes"])
+
+    def test_clear(self):
+        cache = TileCache(disk_path=self.disk_path)
+        cache.put(("ds1", 0, 0, 0), b"0123")
+        cache.put(("ds2", 0, 0, 0), b"89ab")
+        cache.clear()
+        self.assertIsNone(cache.get(("ds1", 0, 0, 0)))
+        self.assertIsNone(cache.get(("ds2", 0, 0, 0)))
+        self.assertEqual(0, cache.stats["disk_bytes"])
@@ -2,13 +2,20 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
+import os
+import shutil
+import tempfile
 import unittest
 from typing import Union
 
 from test.webapi.helpers import get_api_ctx
+from test.webapi.helpers import get_res_test_dir
+from test.webapi.helpers import get_server
 from xcube.server.api import Context
 from xcube.server.api import ServerConfig
 from xcube.webapi.datasets.context import DatasetsContext
+from xcube.webapi.tiles.cache import DEFAULT_TILE_CACHE_MEMORY_SIZE
+from xcube.webapi.tiles.cache import TileCache
 from xcube.webapi.tiles.context import TilesContext
 
 
@@ -23,3 +30,96 @@ class TilesContextTest(unittest.TestCase):
         ctx = get_tiles_ctx()
         self.assertIsInstance(ctx.server_ctx, Context)
         self.assertIsInstance(ctx.datasets_ctx, DatasetsContext)
+
+    def test_tile_cache(self):
+        ctx = get_tiles_ctx()
+        self.assertIsInstance(ctx.tile_cache, TileCache)
+        self.assertEqual(DEFAULT_TILE_CACHE_MEMORY_SIZE, ctx.tile_cache.memory_size)
+        self.assertIsNone(ctx.tile_cache.disk_path)
+
+    def test_tile_cache_config(self):
+        config = dict(get_server().ctx.config)
+        config["TileCache"] = dict(MemorySize="1M", Path="tiles", DiskSize="1G")
+        ctx = get_tiles_ctx(config)
+        self.assertEqual(1000**2, ctx.tile_cache.memory_size)
+        self.assertEqual(
+            os.path.join(get_res_test_dir(), "tiles"), ctx.tile_cache.disk_path
+        )
+        self.assertEqual(1000**3, ctx.tile_cache.disk_size)
+
+        config["TileCache"] = dict(MemorySize="OFF")
+        ctx = get_tiles_ctx(config)
+        self.assertFalse(ctx.tile_cache.is_enabled)
+
+    def test_tile_cache_pruned_on_startup(self):
+        disk_path = tempfile.mkdtemp(prefix="xcube-tile-cache-")
+        try:
+            fingerprints = get_tiles_ctx().get_dataset_fingerprints()
+            demo_key = ("demo", fingerprints["demo"], 0, 0, 0)
+            outdated_key = ("demo", "outdated", 0, 0, 0)
+            tile_cache = TileCache(disk_path=disk_path)
+            tile_cache.put(demo_key, b"0123")
+            tile_cache.put(outdated_key, b"4567")
+
+            config = dict(get_server().ctx.config)
+            config["TileCache"] = dict(Path=disk_path)
+            ctx = get_tiles_ctx(config)
+            tile_cache = ctx.tile_cache
+            ctx._tile_cache_pruning.join(10)
+            self.assertEqual(b"0123", tile_cache.get(demo_key))
+            self.assertIsNone(tile_cache.get(outdated_key))
+        finally:
+            shutil.rmtree(disk_path, ignore_errors=True)
+
+    def test_png_options(self):
+        ctx = get_tiles_ctx()
+        self.assertEqual(
+            dict(
+                png_compress_level=6,
+                png_compress_strategy="default",
+                png_palette=True,
+            ),
+            ctx.png_options,
+        )
+
+        config = dict(get_server().ctx.config)
+        config["TileEncoding"] = dict(
+            PngCompressLevel=1, PngCompressStrategy="rle", PngPalette=False
+        )
+        ctx = get_tiles_ctx(config)
+        self.assertEqual(
+            dict(
+                png_compress_level=1,
+                png_compress_strategy="rle",
+                png_palette=False,
+            ),
+            ctx.png_options,
+        )
+
+    def test_tile_cache_kept_on_update(self):
+        server = get_server()
+        ctx = server.ctx.get_api_ctx("tiles", cls=TilesContext)
+        fingerprints = ctx.get_dataset_fingerprints()
+        self.assertEqual({"demo", "demo-1w"}, set(fingerprints.keys()))
+        tile_cache = ctx.tile_cache
+        demo_key = ("demo", fingerprints["demo"], 0, 0, 0)
+        demo_1w_key = ("demo-1w", fingerprints["demo-1w"], 0, 0, 0)
+        tile_cache.put(demo_key, b"0123")
+        tile_cache.put(demo_1w_key, b"4567")
+
+        config = dict(server.ctx.config)
+        config["Datasets"] = [
+            dict(dc, Title="Changed") if dc["Identifier"] == "demo-1w" else dc
+            for dc in config["Datasets"]
+        ]
+        server.update(config)
+        ctx = server.ctx.get_api_ctx("tiles", cls=TilesContext)
+        self.assertIs(tile_cache, ctx.tile_cache)
+        # Outdated tiles are removed in the background
+        ctx._tile_cache_pruning.join(10)
+        self.assertEqual(fingerprints["demo"], ctx.get_dataset_fingerprints()["demo"])
+        self.assertNotEqual(
+            fingerprints["demo-1w"], ctx.get_dataset_fingerprints()["demo-1w"]
+        )
+        self.assertEqual(b"0123", tile_cache.get(demo_key))
+        self.assertIsNone(tile_cache.get(demo_1w_key))
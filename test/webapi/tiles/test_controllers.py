@@ -2,13 +2,18 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
+import concurrent.futures
+import time
 import unittest
 from typing import Union
+from unittest.mock import patch
 
 from test.webapi.helpers import get_api_ctx
+from test.webapi.helpers import get_server
 from xcube.server.api import ApiError
 from xcube.server.api import ServerConfig
 from xcube.webapi.tiles.context import TilesContext
+from xcube.webapi.tiles import controllers
 from xcube.webapi.tiles.controllers import compute_ml_dataset_tile
 from xcube.constants import CRS84
 
@@ -128,3 +133,83 @@ class TilesControllerTest(unittest.TestCase):
             " specified for RGB component R",
             f"{cm.exception}",
         )
+
+    def test_compute_ml_dataset_tile_is_cached(self):
+        ctx = get_tiles_ctx()
+        tile_1 = compute_ml_dataset_tile(
+            ctx, "demo", "conc_tsm", CRS84, "0", "0", "0", dict(time="current")
+        )
+        self.assertEqual(0, ctx.tile_cache.stats["hits"])
+        self.assertEqual(1, ctx.tile_cache.stats["misses"])
+        tile_2 = compute_ml_dataset_tile(
+            ctx, "demo", "conc_tsm", CRS84, "0", "0", "0", dict(time="current")
+        )
+        self.assertIs(tile_1, tile_2)
+        self.assertEqual(1, ctx.tile_cache.stats["hits"])
+
+        # Different style parameters
+        compute_ml_dataset_tile(
+            ctx,
+            "demo",
+            "conc_tsm",
+            CRS84,
+            "0",
+            "0",
+            "0",
+            dict(time="current", vmax="50"),
+        )
+        self.assertEqual(1, ctx.tile_cache.stats["hits"])
+        self.assertEqual(2, ctx.tile_cache.stats["misses"])
+
+        ctx.datasets_ctx.remove_dataset("demo")
+        self.assertEqual(0, ctx.tile_cache.stats["memory_tiles"])
+
+    def test_compute_ml_dataset_tile_with_metatiles(self):
+        config = dict(get_server().ctx.config)
+        config["TileCache"] = dict(MetatileSize=2)
+        ctx = get_tiles_ctx(config)
+        self.assertEqual(2, ctx.metatile_size)
+        tile = compute_ml_dataset_tile(
+            ctx, "demo", "conc_tsm", CRS84, "65", "13", "6", dict(time="current")
+        )
+        self.assertIsInstance(tile, bytes)
+        self.assertEqual(1, ctx.tile_cache.stats["misses"])
+        # All tiles of the metatile are cached
+        self.assertEqual(4, ctx.tile_cache.stats["memory_tiles"])
+        for x, y in (("64", "12"), ("65", "12"), ("64", "13"), ("65", "13")):
+            compute_ml_dataset_tile(
+                ctx, "demo", "conc_tsm", CRS84, x, y, "6", dict(time="current")
+            )
+        self.assertEqual(4, ctx.tile_cache.stats["hits"])
+        self.assertEqual(1, ctx.tile_cache.stats["misses"])
+
+    def test_compute_ml_dataset_tile_with_metatiles_concurrently(self):
+        config = dict(get_server().ctx.config)
+        config["TileCache"] = dict(MetatileSize=2)
+        ctx = get_tiles_ctx(config)
+        compute_rgba_tiles = controllers.compute_rgba_tiles
+        num_calls = []
+
+        def compute_rgba_tiles_slowly(*args, **kwargs):
+            num_calls.append(1)
+            time.sleep(0.2)
+            return compute_rgba_tiles(*args, **kwargs)
+
+        xy_list = [("64", "12"), ("65", "12"), ("64", "13"), ("65", "13")] * 2
+        with patch.object(
+            controllers, "compute_rgba_tiles", wraps=compute_rgba_tiles_slowly
+        ):
+            with concurrent.futures.ThreadPoolExecutor(len(xy_list)) as executor:
+                tiles = list(
+                    executor.map(
+                        lambda xy: compute_ml_dataset_tile(
+                            ctx, "demo", "conc_tsm", CRS84, *xy, "6", {}
+                        ),
+                        xy_list,
+                    )
+                )
+        # The metatile is computed only once
+        self.assertEqual(1, len(num_calls))
+        self.assertEqual(tiles[:4], tiles[4:])
+        self.assertEqual(4, ctx.tile_cache.stats["memory_tiles"])
+        self.assertEqual({}, ctx._metatile_locks)
@@ -21,3 +21,23 @@ class TilesRoutesTest(RoutesTestCase):
             "/tiles/demo/conc_chl/0/0/0?" "time=current&cmap=jet&debug=1"
         )
         self.assertResponseOK(response)
+
+    def test_fetch_dataset_tile_not_modified(self):
+        response = self.fetch("/tiles/demo/conc_chl/0/0/0?cmap=jet")
+        self.assertResponseOK(response)
+        etag = response.headers.get("Etag")
+        self.assertIsInstance(etag, str)
+        self.assertEqual("no-cache", response.headers.get("Cache-Control"))
+
+        response = self.fetch(
+            "/tiles/demo/conc_chl/0/0/0?cmap=jet", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(304, response.status)
+        self.assertEqual(etag, response.headers.get("Etag"))
+
+        response = self.fetch(
+            "/tiles/demo/conc_chl/0/0/0?cmap=viridis",
+            headers={"If-None-Match": etag},
+        )
+        self.assertResponseOK(response)
+        self.assertNotEqual(etag, response.headers.get("Etag"))
@@ -0,0 +1,147 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import os
+import tempfile
+import unittest
+
+from test.webapi.helpers import get_server
+from xcube.core.tilingscheme import TilingScheme
+from xcube.webapi.tiles.controllers import get_ml_dataset_tile_key
+from xcube.webapi.tiles.seed import TILE_SEED_COMPUTED
+from xcube.webapi.tiles.seed import TILE_SEED_FAILED
+from xcube.webapi.tiles.seed import TILE_SEED_SKIPPED
+from xcube.webapi.tiles.seed import get_seed_tiles
+from xcube.webapi.tiles.seed import get_tile_range
+from xcube.webapi.tiles.seed import seed_tiles
+from .test_controllers import get_tiles_ctx
+
+
+class GetTileRangeTest(unittest.TestCase):
+    def test_geographic(self):
+        tiling_scheme = TilingScheme.GEOGRAPHIC
+        self.assertEqual(
+            (0, 0, 1, 0), get_tile_range(tiling_scheme, (-180, -90, 180, 90), 0)
+        )
+        self.assertEqual(
+            (2, 0, 2, 0), get_tile_range(tiling_scheme, (0, 50, 5, 52.5), 1)
+        )
+        self.assertEqual(
+            (64, 13, 65, 14), get_tile_range(tiling_scheme, (0, 50, 5, 52.5), 6)
+        )
+
+    def test_web_mercator(self):
+        tiling_scheme = TilingScheme.WEB_MERCATOR
+        self.assertEqual(
+            (0, 0, 0, 0), get_tile_range(tiling_scheme, (-180, -90, 180, 90), 0)
+        )
+        self.assertEqual(
+            (32, 20, 32, 21), get_tile_range(tiling_scheme, (0, 50, 5, 52.5), 6)
+        )
+        self.assertIsNone(get_tile_range(tiling_scheme, (0, 86, 5, 89), 6))
+
+
+class SeedTilesTest(unittest.TestCase):
+    def test_get_seed_tiles(self):
+        ctx = get_tiles_ctx()
+        tiles = get_seed_tiles(
+            ctx, ds_ids=["demo"], var_names=["conc_chl"], zoom_range=(5, 6)
+        )
+        self.assertEqual(
+            [
+                ("demo", "conc_chl", 32, 6, 5),
+                ("demo", "conc_chl", 32, 7, 5),
+                ("demo", "conc_chl", 64, 13, 6),
+                ("demo", "conc_chl", 65, 13, 6),
+                ("demo", "conc_chl", 64, 14, 6),
+                ("demo", "conc_chl", 65, 14, 6),
+            ],
+            tiles,
+        )
+
+        tiles = get_seed_tiles(ctx, ds_ids=["demo"], zoom_range=(0, 0))
+        self.assertEqual(
+            {"c2rcc_flags", "conc_chl", "conc_tsm", "kd489", "quality_flags"},
+            {var_name for _, var_name, _, _, _ in tiles},
+        )
+
+    def test_seed_tiles_into_output_dir(self):
+        ctx = get_tiles_ctx()
+        tiles = [
+            ("demo", "conc_chl", 32, 6, 5),
+            ("demo", "conc_chl", 32, 7, 5),
+        ]
+        with tempfile.TemporaryDirectory() as output_dir:
+            results = dict(seed_tiles(ctx, tiles, output_dir=output_dir))
+            self.assertEqual(
+                {tile: TILE_SEED_COMPUTED for tile in tiles},
+                results,
+            )
+            self.assertTrue(
+                os.path.isfile(
+                    os.path.join(output_dir, "demo", "conc_chl", "5", "6", "32.png")
+                )
+            )
+            self.assertTrue(
+                os.path.isfile(
+                    os.path.join(output_dir, "demo", "conc_chl", "5", "7", "32.png")
+                )
+            )
+
+            # Resume
+            tiles = tiles + [("demo", "conc_chl", 16, 3, 4)]
+            results = dict(seed_tiles(ctx, tiles, output_dir=output_dir))
+            self.assertEqual(
+                {
+                    tiles[0]: TILE_SEED_SKIPPED,
+                    tiles[1]: TILE_SEED_SKIPPED,
+                    tiles[2]: TILE_SEED_COMPUTED,
+                },
+                results,
+            )
+
+    def test_seed_tiles_into_cache(self):
+        config = dict(get_server().ctx.config)
+        config["TileCache"] = dict(MetatileSize=2)
+        ctx = get_tiles_ctx(config)
+        tiles = get_seed_tiles(
+            ctx, ds_ids=["demo"], var_names=["conc_chl"], zoom_range=(6, 6)
+        )
+        results = dict(seed_tiles(ctx, tiles, num_workers=2))
+        self.assertEqual({tile: TILE_SEED_COMPUTED for tile in tiles}, results)
+        # The 2 x 2 tiles are spread over two metatiles,
+        # which are computed once each
+        self.assertEqual(2, ctx.tile_cache.stats["misses"])
+        self.assertEqual(8, ctx.tile_cache.stats["memory_tiles"])
+
+        # Resume
+        results = dict(seed_tiles(ctx, tiles, num_workers=2))
+        self.assertEqual({tile: TILE_SEED_SKIPPED for tile in tiles}, results)
+        self.assertEqual(2, ctx.tile_cache.stats["misses"])
+
+    def test_seed_tiles_uses_value_range_of_style(self):
+        ctx = get_tiles_ctx()
+        tile = ("demo", "conc_chl", 32, 6, 5)
+        self.assertEqual(
+            [(tile, TILE_SEED_COMPUTED)],
+            list(seed_tiles(ctx, [tile], params=dict(cmap="plasma"))),
+        )
+        _, _, (vmin, vmax) = ctx.datasets_ctx.get_color_mapping("demo", "conc_chl")
+        self.assertNotEqual((0.0, 1.0), (vmin, vmax))
+        tile_key = get_ml_dataset_tile_key(
+            ctx,
+            "demo",
+            "conc_chl",
+            None,
+            "32",
+            "6",
+            "5",
+            dict(cmap="plasma", vmin=str(vmin), vmax=str(vmax)),
+        )
+        self.assertIn(tile_key, ctx.tile_cache)
+
+    def test_seed_tiles_failed(self):
+        ctx = get_tiles_ctx()
+        results = list(seed_tiles(ctx, [("demo", "conc_xyz", 0, 0, 0)]))
+        self.assertEqual([(("demo", "conc_xyz", 0, 0, 0), TILE_SEED_FAILED)], results)
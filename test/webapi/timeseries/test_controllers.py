@@ -14,8 +14,20 @@ import xarray as xr
 from test.mixins import AlmostEqualDeepMixin
 from test.webapi.helpers import get_api_ctx
 from xcube.webapi.timeseries.context import TimeSeriesContext
+from xcube.webapi.timeseries.controllers import collect_timeseries_columns
 from xcube.webapi.timeseries.controllers import collect_timeseries_result
+from xcube.webapi.timeseries.controllers import encode_time_series_columns
 from xcube.webapi.timeseries.controllers import get_time_series
+from xcube.webapi.timeseries.controllers import iter_time_series_arrow
+from xcube.webapi.timeseries.controllers import iter_time_series_csv
+
+try:
+    import pyarrow
+
+    has_pyarrow = True
+except ImportError:
+    pyarrow = None
+    has_pyarrow = False
 
 
 def get_timeseries_ctx(server_config=None) -> TimeSeriesContext:
@@ -318,6 +330,41 @@ class TimeSeriesControllerTest(unittest.TestCase, AlmostEqualDeepMixin):
         ]
         self.assertAlmostEqualDeep(expected_result, actual_result)
 
+    def test_get_time_series_for_multi_point_collection(self):
+        ctx = get_timeseries_ctx()
+        actual_result = get_time_series(
+            ctx,
+            "demo",
+            "conc_tsm",
+            dict(
+                type="GeometryCollection",
+                geometries=[
+                    dict(type="Point", coordinates=[2.1, 51.4]),
+                    dict(type="Point", coordinates=[10.0, 10.0]),
+                    dict(type="Point", coordinates=[1.2, 50.5]),
+                ],
+            ),
+            agg_methods=["mean"],
+            start_date=np.datetime64("2017-01-15"),
+            end_date=np.datetime64("2017-01-29"),
+        )
+        expected_result = [
+            [
+                {"mean": 3.534773588180542, "time": "2017-01-16T10:09:22Z"},
+                {"mean": None, "time": "2017-01-25T09:35:51Z"},
+                {"mean": None, "time": "2017-01-26T10:50:17Z"},
+                {"mean": 20.12085723876953, "time": "2017-01-28T09:58:11Z"},
+            ],
+            [],
+            [
+                {"mean": 90.45850372314453, "time": "2017-01-16T10:09:22Z"},
+                {"mean": None, "time": "2017-01-25T09:35:51Z"},
+                {"mean": None, "time": "2017-01-26T10:50:17Z"},
+                {"mean": 21.609743118286133, "time": "2017-01-28T09:58:11Z"},
+            ],
+        ]
+        self.assertAlmostEqualDeep(expected_result, actual_result)
+
     def test_get_time_series_for_polygon_collection(self):
         ctx = get_timeseries_ctx()
         actual_result = get_time_series(
@@ -380,6 +427,157 @@ class TimeSeriesControllerTest(unittest.TestCase, AlmostEqualDeepMixin):
 
         self.assertAlmostEqualDeep(expected_result, actual_result)
 
+    def test_get_time_series_for_polygon_collection_equals_single(self):
+        ctx = get_timeseries_ctx()
+        polygons = [
+            dict(type="Polygon", coordinates=[[[x1, y1], [x2, y1], [x2, y2], [x1, y1]]])
+            for x1, y1, x2, y2 in [
+                (1.0, 51.0, 2.0, 52.0),
+                (1.5, 51.2, 2.7, 51.9),
+                # Touches the dataset's boundaries
+                (4.2, 52.1, 6.0, 54.0),
+            ]
+        ]
+        agg_methods = ["mean", "std", "count"]
+        actual_result = get_time_series(
+            ctx,
+            "demo",
+            "conc_tsm",
+            dict(type="GeometryCollection", geometries=polygons),
+            agg_methods=agg_methods,
+        )
+        expected_result = [
+            get_time_series(ctx, "demo", "conc_tsm", polygon, agg_methods=agg_methods)
+            for polygon in polygons
+        ]
+        self.assertAlmostEqualDeep(expected_result, actual_result)
+
+    def test_get_time_series_for_feature_collection(self):
+        def get_polygon_feature(x1, y1, x2, y2):
+            return dict(
+                type="Feature",
+                properties={},
+                geometry=dict(
+                    type="Polygon",
+                    coordinates=[
+                        [[x1, y1], [x2, y1], [x2, y2], [x1, y2], [x1, y1]]
+                    ],
+                ),
+            )
+
+        ctx = get_timeseries_ctx()
+        actual_result = get_time_series(
+            ctx,
+            "demo",
+            "conc_tsm",
+            dict(
+                type="FeatureCollection",
+                features=[
+                    get_polygon_feature(1.0, 51.0, 2.0, 52.0),
+                    dict(
+                        type="Feature",
+                        properties={},
+                        geometry=dict(type="Point", coordinates=[1.768, 51.465]),
+                    ),
+                    get_polygon_feature(1.5, 51.5, 2.5, 52.2),
+                ],
+            ),
+            agg_methods=["mean", "count"],
+            max_valids=-1,
+        )
+        expected_result = [
+            [
+                {
+                    "count": 122392,
+                    "count_tot": 159600,
+                    "mean": 56.12519223634024,
+                    "time": "2017-01-16T10:09:22Z",
+                },
+                {
+                    "count": 132066,
+                    "count_tot": 159600,
+                    "mean": 49.70755256053988,
+                    "time": "2017-01-28T09:58:11Z",
+                },
+            ],
+            [
+                {"mean": 44.54958724975586, "time": "2017-01-16T10:09:22Z"},
+                {"mean": 1.8014628887176514, "time": "2017-01-28T09:58:11Z"},
+            ],
+            [
+                {
+                    "count": 58509,
+                    "count_tot": 111600,
+                    "mean": 29.8437058578769,
+                    "time": "2017-01-16T10:09:22Z",
+                },
+                {
+                    "count": 107590,
+                    "count_tot": 111600,
+                    "mean": 41.58826439863202,
+                    "time": "2017-01-28T09:58:11Z",
+                },
+            ],
+        ]
+
+        self.assertAlmostEqualDeep(expected_result, actual_result)
+
+
+    def test_get_time_series_columnar(self):
+        ctx = get_timeseries_ctx()
+        feature_collection = dict(
+            type="FeatureCollection",
+            features=[
+                dict(
+                    type="Feature",
+                    properties={},
+                    geometry=dict(type="Point", coordinates=[2.1, 51.4]),
+                ),
+                dict(
+                    type="Feature",
+                    properties={},
+                    geometry=dict(type="Point", coordinates=[10, 10]),
+                ),
+                dict(
+                    type="Feature",
+                    properties={},
+                    geometry=dict(
+                        type="Polygon",
+                        coordinates=[[[1, 51], [2, 51], [2, 52], [1, 52], [1, 51]]],
+                    ),
+                ),
+            ],
+        )
+        for max_valids in (None, -1, 1):
+            time_series = get_time_series(
+                ctx,
+                "demo",
+                "conc_tsm",
+                feature_collection,
+                agg_methods=["mean", "count"],
+                max_valids=max_valids,
+            )
+            columns = get_time_series(
+                ctx,
+                "demo",
+                "conc_tsm",
+                feature_collection,
+                agg_methods=["mean", "count"],
+                max_valids=max_valids,
+                columnar=True,
+            )
+            self.assertIsInstance(columns, list)
+            self.assertEqual(3, len(columns))
+            self.assertEqual({}, columns[1])
+            json_columns = encode_time_series_columns(columns)
+            self.assertEqual(
+                time_series,
+                [
+                    [dict(zip(c.keys(), v)) for v in zip(*c.values())]
+                    for c in json_columns
+                ],
+            )
+
 
 class CollectTimeSeriesResultTest(unittest.TestCase, AlmostEqualDeepMixin):
     expected_result = [
@@ -479,6 +677,113 @@ class CollectTimeSeriesResultTest(unittest.TestCase, AlmostEqualDeepMixin):
         )
 
 
+class CollectTimeSeriesColumnsTest(unittest.TestCase):
+    @staticmethod
+    def new_time_series_ds(**data_vars) -> xr.Dataset:
+        num_times = len(next(iter(data_vars.values())))
+        return xr.Dataset(
+            data_vars=dict(
+                time=xr.DataArray(
+                    pd.date_range(start="2010-04-05", periods=num_times, freq="1D"),
+                    dims="time",
+                ),
+                **{k: xr.DataArray(v, dims="time") for k, v in data_vars.items()},
+            ),
+            attrs=dict(max_number_of_observations=82),
+        )
+
+    def test_equals_result(self):
+        time_series_ds = self.new_time_series_ds(
+            a=[np.nan, 5, np.nan, 2, 3],
+            b=[np.nan, 33, np.nan, np.nan, 23],
+            count=[0, 12, 0, 8, 0],
+        )
+        key_to_var_names = {"a": "a", "b": "b", "count": "count"}
+        for max_valids in (None, -1, 1, 2, 10):
+            columns = collect_timeseries_columns(
+                time_series_ds, key_to_var_names, max_valids=max_valids
+            )
+            self.assertEqual(
+                ["a", "b", "count", "time", "count_tot"], list(columns.keys())
+            )
+            json_columns = encode_time_series_columns(columns)
+            json_rows = [
+                dict(zip(json_columns.keys(), v)) for v in zip(*json_columns.values())
+            ]
+            self.assertEqual(
+                collect_timeseries_result(
+                    time_series_ds, key_to_var_names, max_valids=max_valids
+                ),
+                json_rows,
+            )
+
+    def test_encode_columns(self):
+        time_series_ds = self.new_time_series_ds(
+            a=[True, False, True], b=[32, 33, 35], c=[0.4, np.nan, 0.7]
+        )
+        columns = collect_timeseries_columns(
+            time_series_ds, {"a": "a", "b": "b", "c": "c"}
+        )
+        self.assertEqual(np.dtype("datetime64[s]"), columns["time"].dtype)
+        self.assertEqual(
+            {
+                "a": [True, False, True],
+                "b": [32, 33, 35],
+                "c": [0.4, None, 0.7],
+                "time": [
+                    "2010-04-05T00:00:00Z",
+                    "2010-04-06T00:00:00Z",
+                    "2010-04-07T00:00:00Z",
+                ],
+            },
+            encode_time_series_columns(columns),
+        )
+
+    def test_csv(self):
+        time_series_ds = self.new_time_series_ds(b=[32, 33, 35], c=[0.4, np.nan, 0.7])
+        columns = collect_timeseries_columns(time_series_ds, {"b": "b", "c": "c"})
+
+        chunks = list(iter_time_series_csv(columns, chunk_size=2))
+        self.assertEqual(2, len(chunks))
+        self.assertEqual(
+            "b,c,time\n"
+            "32,0.4,2010-04-05T00:00:00Z\n"
+            "33,,2010-04-06T00:00:00Z\n"
+            "35,0.7,2010-04-07T00:00:00Z\n",
+            b"".join(chunks).decode("utf-8"),
+        )
+
+        self.assertEqual(
+            "index,b,c,time\n"
+            "0,32,0.4,2010-04-05T00:00:00Z\n"
+            "0,33,,2010-04-06T00:00:00Z\n"
+            "0,35,0.7,2010-04-07T00:00:00Z\n"
+            "2,32,0.4,2010-04-05T00:00:00Z\n"
+            "2,33,,2010-04-06T00:00:00Z\n"
+            "2,35,0.7,2010-04-07T00:00:00Z\n",
+            b"".join(iter_time_series_csv([columns, {}, columns])).decode("utf-8"),
+        )
+
+        self.assertEqual(b"", b"".join(iter_time_series_csv({})))
+        self.assertEqual(b"index\n", b"".join(iter_time_series_csv([])))
+
+    @unittest.skipUnless(has_pyarrow, reason="pyarrow not installed")
+    def test_arrow(self):
+        time_series_ds = self.new_time_series_ds(b=[32, 33, 35], c=[0.4, np.nan, 0.7])
+        columns = collect_timeseries_columns(time_series_ds, {"b": "b", "c": "c"})
+
+        chunks = list(iter_time_series_arrow([columns, {}, columns], chunk_size=2))
+        table = pyarrow.ipc.open_stream(b"".join(chunks)).read_all()
+        self.assertEqual(["index", "b", "c", "time"], table.column_names)
+        self.assertEqual(
+            pyarrow.timestamp("s", tz="UTC"), table.schema.field("time").type
+        )
+        self.assertEqual(6, table.num_rows)
+        self.assertEqual(2, table.column("c").null_count)
+        self.assertEqual([0, 0, 0, 2, 2, 2], table.column("index").to_pylist())
+        self.assertEqual([32, 33, 35, 32, 33, 35], table.column("b").to_pylist())
+
+
 @unittest.skipUnless(
     os.environ.get("XCUBE_TS_PERF_TEST") == "1", "XCUBE_TS_PERF_TEST is not 1"
 )
@@ -117,3 +117,41 @@ class TimeSeriesRoutesTest(RoutesTestCase):
             "Query parameter 'tolerance' must have type 'float'."
             ")",
         )
+
+    def test_fetch_timeseries_format(self):
+        body = (
+            '{"type": "FeatureCollection", "features": ['
+            '  {"type": "Feature", "properties": {}, '
+            '   "geometry": {"type": "Point", "coordinates": [2.1, 51.4]}},'
+            '  {"type": "Feature", "properties": {}, '
+            '   "geometry": {"type": "Point", "coordinates": [1.2, 50.5]}}'
+            "]}"
+        )
+
+        result, status = self.fetch_json(
+            "/timeseries/demo/conc_chl?format=columns", method="POST", body=body
+        )
+        self.assertEqual(200, status)
+        result = result["result"]
+        self.assertEqual(2, len(result))
+        self.assertEqual({"mean", "time"}, set(result[0].keys()))
+
+        response = self.fetch(
+            "/timeseries/demo/conc_chl?format=csv", method="POST", body=body
+        )
+        self.assertResponseOK(response)
+        self.assertEqual("text/csv", response.headers.get("Content-Type"))
+        csv_lines = response.data.decode("utf-8").splitlines()
+        self.assertEqual("index,mean,time", csv_lines[0])
+
+        response = self.fetch(
+            "/timeseries/demo/conc_chl?format=xml", method="POST", body=body
+        )
+        self.assertBadRequestResponse(
+            response,
+            "HTTP 400:"
+            " Bad Request ("
+            "Query parameter 'format' must be one of"
+            " json, columns, csv, arrow, was 'xml'"
+            ")",
+        )
@@ -0,0 +1,102 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import gzip
+import sys
+import unittest
+
+import numpy as np
+import xarray as xr
+
+from xcube.webapi.volumes.controllers import get_volume_nrrd_header
+from xcube.webapi.volumes.controllers import get_volume_scaling
+from xcube.webapi.volumes.controllers import iter_volume_blocks
+
+
+def new_volume_var() -> xr.DataArray:
+    values = np.linspace(0.0, 1.0, 4 * 5 * 6, dtype=np.float64).reshape((4, 5, 6))
+    values[1, 2, 3] = np.nan
+    return xr.DataArray(values, dims=("time", "lat", "lon"))
+
+
+class VolumesControllersTest(unittest.TestCase):
+    def test_nrrd_header_float32(self):
+        header = get_volume_nrrd_header((4, 5, 10), encoding="raw")
+        self.assertEqual(
+            "NRRD0004\n"
+            "# NRRD 4 Format\n"
+            "# see http://teem.sourceforge.net/nrrd/format.html\n"
+            "type: float\n"
+            "dimension: 3\n"
+            "sizes: 10 5 4\n"
+            "encoding: raw\n"
+            f"endian: {sys.byteorder}\n"
+            "space directions: (10.0,0,0) (0,10.0,0) (0,0,25.0)\n"
+            "space origin: (0,0,0)\n"
+            "\n",
+            header,
+        )
+
+    def test_nrrd_header_quantized(self):
+        header = get_volume_nrrd_header(
+            (4, 5, 10), dtype="uint8", value_range=(0.0, 254.0)
+        )
+        self.assertIn("type: uchar\n", header)
+        self.assertIn("encoding: gz\n", header)
+        self.assertNotIn("endian:", header)
+        self.assertTrue(header.endswith("scale:=1.0\noffset:=-1.0\n\n"))
+
+        header = get_volume_nrrd_header(
+            (4, 5, 10), dtype="uint16", value_range=(0.0, 1.0)
+        )
+        self.assertIn("type: ushort\n", header)
+        self.assertIn(f"endian: {sys.byteorder}\n", header)
+
+    def test_get_volume_scaling(self):
+        self.assertEqual((1.0, 9.0), get_volume_scaling("uint8", (10.0, 264.0)))
+        self.assertEqual((1.0, 9.0), get_volume_scaling("uint8", (10.0, 10.0)))
+
+    def test_iter_volume_blocks_float32(self):
+        var = new_volume_var()
+        expected = np.where(np.isnan(var.values), 0.0, var.values).astype(np.float32)
+
+        blocks = list(iter_volume_blocks(var, encoding="raw"))
+        self.assertEqual(4, len(blocks))
+        actual = np.frombuffer(b"".join(blocks), dtype=np.float32)
+        np.testing.assert_equal(expected.ravel(), actual)
+
+        blocks = list(iter_volume_blocks(var.chunk(dict(time=3)), encoding="gz"))
+        actual = np.frombuffer(gzip.decompress(b"".join(blocks)), dtype=np.float32)
+        np.testing.assert_equal(expected.ravel(), actual)
+
+        blocks = list(iter_volume_blocks(var, is_j_axis_up=False, encoding="gz"))
+        actual = np.frombuffer(gzip.decompress(b"".join(blocks)), dtype=np.float32)
+        np.testing.assert_equal(expected[:, ::-1, :].ravel(), actual)
+
+    def test_iter_volume_blocks_quantized(self):
+        var = new_volume_var()
+        for dtype in ("uint8", "uint16"):
+            blocks = iter_volume_blocks(
+                var, encoding="gz", dtype=dtype, value_range=(0.0, 1.0)
+            )
+            raw = np.frombuffer(gzip.decompress(b"".join(blocks)), dtype=dtype)
+            raw = raw.reshape(var.shape)
+            self.assertEqual(0, raw[1, 2, 3])
+            self.assertEqual(1, raw[0, 0, 0])
+            self.assertEqual(np.iinfo(dtype).max, raw[-1, -1, -1])
+            scale, offset = get_volume_scaling(dtype, (0.0, 1.0))
+            decoded = raw * scale + offset
+            valid = ~np.isnan(var.values)
+            self.assertLessEqual(
+                np.max(np.abs(decoded[valid] - var.values[valid])), scale / 2 + 1e-6
+            )
+
+    def test_iter_volume_blocks_quantized_clipped(self):
+        var = new_volume_var()
+        blocks = iter_volume_blocks(
+            var, encoding="raw", dtype="uint8", value_range=(0.25, 0.75)
+        )
+        raw = np.frombuffer(b"".join(blocks), dtype=np.uint8)
+        self.assertEqual(1, raw[0])
+        self.assertEqual(255, raw[-1])
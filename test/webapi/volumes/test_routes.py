@@ -2,6 +2,10 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
+import gzip
+
+import numpy as np
+
 from ..helpers import RoutesTestCase
 
 
@@ -10,6 +14,45 @@ class VolumesRoutesTest(RoutesTestCase):
         response = self.fetch("/volumes/demo/conc_chl?bbox=1.0,51.0,2.0,51.5")
         self.assertResponseOK(response)
 
+    def test_fetch_dataset_volume_content(self):
+        response = self.fetch(
+            "/volumes/demo/conc_chl?bbox=1.0,51.0,2.0,51.5&encoding=raw"
+        )
+        self.assertResponseOK(response)
+        header, data = response.data.split(b"\n\n", 1)
+        self.assertIn(b"type: float\n", header)
+        sizes = header.split(b"sizes: ")[1].split(b"\n")[0]
+        size_x, size_y, size_z = map(int, sizes.split())
+        self.assertEqual(size_x * size_y * size_z * 4, len(data))
+
+    def test_fetch_dataset_volume_quantized(self):
+        response = self.fetch(
+            "/volumes/demo/conc_chl?bbox=1.0,51.0,2.0,51.5"
+            "&dtype=uint8&vmin=0&vmax=20"
+        )
+        self.assertResponseOK(response)
+        header, data = response.data.split(b"\n\n", 1)
+        self.assertIn(b"type: uchar\n", header)
+        self.assertIn(b"scale:=", header)
+        self.assertIn(b"offset:=", header)
+        sizes = header.split(b"sizes: ")[1].split(b"\n")[0]
+        size_x, size_y, size_z = map(int, sizes.split())
+        raw = np.frombuffer(gzip.decompress(data), dtype=np.uint8)
+        self.assertEqual(size_x * size_y * size_z, raw.size)
+
+        # Value range of the variable's color mapping
+        response = self.fetch(
+            "/volumes/demo/conc_chl?bbox=1.0,51.0,2.0,51.5&dtype=uint16"
+        )
+        self.assertResponseOK(response)
+        self.assertIn(b"type: ushort\n", response.data)
+
+    def test_fetch_dataset_volume_invalid_dtype(self):
+        response = self.fetch(
+            "/volumes/demo/conc_chl?bbox=1.0,51.0,2.0,51.5&dtype=int64"
+        )
+        self.assertBadRequestResponse(response)
+
     def test_fetch_dataset_volume_404(self):
         response = self.fetch("/volumes/demo/conc_x?bbox=1.0,51.0,2.0,51.5")
         self.assertResourceNotFoundResponse(response)
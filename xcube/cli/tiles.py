@@ -0,0 +1,240 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from xcube.cli.common import (
+    cli_option_quiet,
+    cli_option_verbosity,
+    configure_cli_output,
+    parse_cli_kwargs,
+)
+
+DEFAULT_ZOOM_RANGE = "0-5"
+
+
+# noinspection PyShadowingBuiltins
+@click.command(name="seed")
+@click.option(
+    "--config",
+    "-c",
+    "config_paths",
+    metavar="CONFIG",
+    required=True,
+    multiple=True,
+    help="Server configuration YAML or JSON file."
+    " If multiple are passed, they will be merged in order.",
+)
+@click.option(
+    "--base-dir",
+    "base_dir",
+    metavar="BASE_DIR",
+    default=None,
+    help="Directory used to resolve relative paths"
+    " in CONFIG files. Defaults to the parent directory"
+    " of (last) CONFIG file.",
+)
+@click.option(
+    "--dataset",
+    "-d",
+    "ds_ids",
+    metavar="DATASET",
+    multiple=True,
+    help="Identifier of a dataset to be seeded."
+    " Can be given multiple times."
+    " Defaults to all configured datasets.",
+)
+@click.option(
+    "--var",
+    "var_names",
+    metavar="VARIABLE",
+    multiple=True,
+    help="Name of a variable to be seeded. Can be given multiple times."
+    ' Use "rgb" for RGB images. Defaults to all spatial variables.',
+)
+@click.option(
+    "--params",
+    "-p",
+    "params",
+    metavar="PARAMS",
+    help="Comma-separated tile request parameters, such as the"
+    " style, e.g., \"cmap='viridis',vmin=0,vmax=10,time='2024-01-01'\"."
+    " If not given, cmap, norm, vmin, and vmax of variables are"
+    " taken from the dataset's style.",
+)
+@click.option(
+    "--zoom",
+    "-z",
+    "zoom_range",
+    metavar="ZOOM",
+    default=DEFAULT_ZOOM_RANGE,
+    help=f"Zoom level or inclusive range of zoom levels"
+    f' "MIN-MAX" to be seeded. Defaults to "{DEFAULT_ZOOM_RANGE}".',
+)
+@click.option(
+    "--bbox",
+    "-b",
+    "bbox",
+    metavar="BBOX",
+    help='Geographic bounding box "LON1,LAT1,LON2,LAT2" of'
+    " the tiles to be seeded. Defaults to the bounding box"
+    " of the respective dataset.",
+)
+@click.option(
+    "--crs",
+    "crs_name",
+    metavar="CRS",
+    default="CRS84",
+    type=click.Choice(["CRS84", "EPSG:3857"]),
+    help='Tiling CRS. Defaults to "CRS84".',
+)
+@click.option(
+    "--output",
+    "-o",
+    "output_dir",
+    metavar="OUTPUT",
+    help="Write tiles into directory OUTPUT using the layout"
+    ' "{dataset}/{variable}/{z}/{y}/{x}.png". If not given,'
+    " tiles are written into the server's tile cache, whose"
+    ' disk directory must be configured by "TileCache: Path".',
+)
+@click.option(
+    "--workers",
+    "-w",
+    "num_workers",
+    metavar="WORKERS",
+    type=int,
+    default=None,
+    help="Number of tiles computed in parallel.",
+)
+@cli_option_quiet
+@cli_option_verbosity
+def seed(
+    config_paths: tuple[str, ...],
+    base_dir: Optional[str],
+    ds_ids: tuple[str, ...],
+    var_names: tuple[str, ...],
+    params: Optional[str],
+    zoom_range: str,
+    bbox: Optional[str],
+    crs_name: str,
+    output_dir: Optional[str],
+    num_workers: Optional[int],
+    quiet: bool,
+    verbosity: int,
+):
+    """Pre-render the image tiles of datasets.
+
+    Tiles are either written into the tile cache of the xcube server
+    configured by CONFIG or into the directory OUTPUT.
+    Tiles already in the tile cache or OUTPUT are not computed again
+    but reported as skipped, so an interrupted run can be resumed by
+    running the same command.
+    """
+    from xcube.server.config import normalize_base_dir
+    from xcube.server.server import Server
+    from xcube.server.webservers.tornado import TornadoFramework
+    from xcube.util.config import load_configs
+    from xcube.webapi.tiles.seed import TILE_SEED_COMPUTED
+    from xcube.webapi.tiles.seed import TILE_SEED_FAILED
+    from xcube.webapi.tiles.seed import get_seed_tiles
+    from xcube.webapi.tiles.seed import seed_tiles
+
+    configure_cli_output(quiet=quiet, verbosity=verbosity)
+
+    zoom_range = _parse_zoom_range(zoom_range)
+    bbox = _parse_bbox(bbox) if bbox else None
+    params = {
+        k: str(v)
+        for k, v in parse_cli_kwargs(params or "", metavar="PARAMS").items()
+    }
+
+    config = load_configs(*config_paths, exception_type=click.ClickException)
+    if base_dir is None:
+        base_dir = config.get("base_dir")
+    if base_dir is None:
+        base_dir = str(Path(config_paths[-1]).parent)
+    config["base_dir"] = normalize_base_dir(base_dir)
+
+    server = Server(TornadoFramework(), config)
+    tiles_ctx = server.ctx.get_api_ctx("tiles")
+    if output_dir is None and tiles_ctx.tile_cache.disk_path is None:
+        raise click.ClickException(
+            "Either OUTPUT must be given or the server's tile cache must"
+            ' be configured to use a disk directory, see "TileCache: Path"'
+        )
+
+    tiles = get_seed_tiles(
+        tiles_ctx,
+        ds_ids=ds_ids,
+        var_names=var_names,
+        crs_name=crs_name,
+        zoom_range=zoom_range,
+        bbox=bbox,
+    )
+
+    results = seed_tiles(
+        tiles_ctx,
+        tiles,
+        crs_name=crs_name,
+        params=params,
+        output_dir=output_dir,
+        num_workers=num_workers,
+    )
+    counts = {}
+    if quiet:
+        for _tile, status in results:
+            counts[status] = counts.get(status, 0) + 1
+    else:
+        with click.progressbar(
+            results, length=len(tiles), label="Seeding tiles"
+        ) as progress_results:
+            for _tile, status in progress_results:
+                counts[status] = counts.get(status, 0) + 1
+
+    if not quiet:
+        click.echo(
+            f"{len(tiles)} tile(s) processed: "
+            + ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+        )
+    num_failed = counts.get(TILE_SEED_FAILED, 0)
+    if num_failed:
+        raise click.ClickException(f"Failed to compute {num_failed} tile(s)")
+    return counts.get(TILE_SEED_COMPUTED, 0)
+
+
+def _parse_zoom_range(zoom_range: str) -> tuple[int, int]:
+    try:
+        if "-" in zoom_range:
+            min_zoom, max_zoom = map(int, zoom_range.split("-", maxsplit=1))
+        else:
+            min_zoom = max_zoom = int(zoom_range)
+    except ValueError:
+        min_zoom = max_zoom = -1
+    if min_zoom < 0 or min_zoom > max_zoom:
+        raise click.ClickException(
+            f'ZOOM must be a level or a range "MIN-MAX", was {zoom_range!r}'
+        )
+    return min_zoom, max_zoom
+
+
+def _parse_bbox(bbox: str) -> tuple[float, float, float, float]:
+    try:
+        x1, y1, x2, y2 = map(float, bbox.split(","))
+    except ValueError:
+        raise click.ClickException(
+            f'BBOX must be given as "LON1,LAT1,LON2,LAT2", was {bbox!r}'
+        )
+    return x1, y1, x2, y2
+
+
+@click.group()
+def tiles():
+    """Manage image tiles of datasets."""
+
+
+tiles.add_command(seed)
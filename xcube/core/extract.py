@@ -2,13 +2,16 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
+import itertools
 from typing import Dict, Union, Tuple, Any, Optional
 from collections.abc import Mapping, Sequence, Hashable
 
+import dask
 import dask.array as da
 import numpy as np
 import pandas as pd
 import xarray as xr
+from dask.highlevelgraph import HighLevelGraph
 
 from xcube.core.verify import assert_cube
 
@@ -220,6 +223,22 @@ def get_cube_values_for_indexes(
         else:
             is_valid_point = np.logical_and(is_valid_point, condition)
 
+    # Data variables are read using the chunk-aware point extraction,
+    # only the coordinates are selected by vectorized indexing
+    idx_dim_name = indexes[index_names[0]].dims[0]
+    data_vars = {
+        var_name: get_array_values_for_indexes(
+            cube[var_name],
+            {
+                dim_names[i]: indexes[index_names[i]].values
+                for i in range(num_dims)
+            },
+        ).rename({INDEX_DIM_NAME: idx_dim_name})
+        for var_name in data_var_names
+    }
+    var_order = list(cube.variables)
+    cube = cube.drop_vars(data_var_names)
+
     num_valid_points = np.count_nonzero(is_valid_point)
     if num_valid_points == num_points:
         # All indexes valid
@@ -255,7 +274,190 @@ def get_cube_values_for_indexes(
     if drop_coords:
         cube_values = cube_values.drop_vars(drop_coords)
 
-    return cube_values
+    # Restore the variable order of the cube
+    variables = {**cube_values.data_vars, **data_vars}
+    return xr.Dataset(
+        {
+            var_name: variables[var_name]
+            for var_name in sorted(
+                variables,
+                key=lambda name: (
+                    var_order.index(name) if name in var_order else len(var_order)
+                ),
+            )
+        },
+        coords=cube_values.coords,
+        attrs=cube_values.attrs,
+    )
+
+
+def get_array_values_for_indexes(
+    array: xr.DataArray,
+    indexes: Mapping[Hashable, SeriesLike],
+) -> xr.DataArray:
+    """Get the values of *array* at the given integer *indexes*.
+
+    *indexes* maps some or all dimensions of *array* to index arrays
+    of same length, one index per point. Dimensions not given in
+    *indexes* are kept entirely, e.g., given indexes for
+    the spatial dimensions, the time series of each point is returned.
+    Points with any negative index are considered invalid, their values
+    are NaN, or 0 for integer arrays.
+
+    If *array* is chunked, the returned values are a lazy dask array.
+    Points are grouped by the chunks that contain them, so that
+    computing the values reads every chunk that contains at least
+    one point exactly once. The graph comprises one task per chunk,
+    independently of the number of points, plus one task per
+    chunk of the non-indexed dimensions that puts the values
+    into point order.
+
+    Args:
+        array: A data array.
+        indexes: A mapping from dimension names of *array* to
+            integer index arrays.
+
+    Returns:
+        A new data array whose first dimension is the point
+        dimension "idx", followed by the dimensions of *array*
+        not given by *indexes*.
+    """
+    index_dims = [dim for dim in array.dims if dim in indexes]
+    other_dims = [dim for dim in array.dims if dim not in indexes]
+    if not index_dims:
+        raise ValueError("indexes must be given for at least one dimension")
+    array = array.transpose(*index_dims, *other_dims)
+    index_arrays = [
+        np.asarray(indexes[dim], dtype=np.int64).reshape((-1,)) for dim in index_dims
+    ]
+    num_points = index_arrays[0].size
+    for dim, index_array in zip(index_dims, index_arrays):
+        if index_array.size != num_points:
+            raise ValueError(
+                f"index arrays must all have the same size, but found"
+                f" {num_points} for dimension {index_dims[0]!r}"
+                f" and {index_array.size} for dimension {dim!r}"
+            )
+
+    fill_value = 0 if np.issubdtype(array.dtype, np.integer) else np.nan
+    shape = (num_points, *(array.sizes[dim] for dim in other_dims))
+
+    valid_points = np.flatnonzero(
+        np.logical_and.reduce([index_array >= 0 for index_array in index_arrays])
+    )
+    valid_indexes = [index_array[valid_points] for index_array in index_arrays]
+    data = array.data
+    if isinstance(data, da.Array):
+        values = _get_chunked_values_for_indexes(
+            data, valid_points, valid_indexes, num_points, fill_value
+        )
+    else:
+        values = np.full(shape, fill_value, dtype=array.dtype)
+        if valid_points.size > 0:
+            values[valid_points] = np.asarray(data)[tuple(valid_indexes)]
+
+    return xr.DataArray(
+        values,
+        dims=(INDEX_DIM_NAME, *other_dims),
+        coords={dim: array.coords[dim] for dim in other_dims if dim in array.coords},
+        attrs=array.attrs,
+    )
+
+
+def _get_chunked_values_for_indexes(
+    data: da.Array,
+    points: np.ndarray,
+    indexes: list[np.ndarray],
+    num_points: int,
+    fill_value: Union[int, float],
+) -> da.Array:
+    num_index_dims = len(indexes)
+    other_chunks = data.chunks[num_index_dims:]
+    chunks = ((num_points,), *other_chunks)
+    if points.size == 0:
+        return da.full(
+            tuple(map(sum, chunks)), fill_value, dtype=data.dtype, chunks=chunks
+        )
+
+    chunk_bounds = [
+        np.cumsum((0, *data.chunks[i]), dtype=np.int64) for i in range(num_index_dims)
+    ]
+    chunk_indexes = np.stack(
+        [
+            np.searchsorted(bounds, index_array, side="right") - 1
+            for bounds, index_array in zip(chunk_bounds, indexes)
+        ],
+        axis=-1,
+    )
+    # Group points by the chunk that contains them
+    chunk_keys, point_groups = np.unique(chunk_indexes, axis=0, return_inverse=True)
+    point_groups = point_groups.reshape((-1,))
+    sort_order = np.argsort(point_groups, kind="stable")
+    group_splits = np.cumsum(np.bincount(point_groups, minlength=len(chunk_keys)))
+    group_members = np.split(sort_order, group_splits[:-1])
+    # Position of the grouped values in the result
+    positions = points[np.concatenate(group_members)]
+
+    # Create a single task per chunk that takes the values of its points.
+    # The tasks refer to the chunks of *data* directly,
+    # so every chunk is read exactly once.
+    token = dask.base.tokenize(data, points, *indexes, num_points)
+    take_name = "take_point_values-" + token
+    name = "point_values-" + token
+    other_chunk_ranges = [range(len(c)) for c in other_chunks]
+    dsk = {}
+    for other_key in itertools.product(*other_chunk_ranges):
+        group_keys = []
+        for group_index, (chunk_key, members) in enumerate(
+            zip(chunk_keys, group_members)
+        ):
+            local_indexes = tuple(
+                index_array[members] - bounds[k]
+                for index_array, bounds, k in zip(indexes, chunk_bounds, chunk_key)
+            )
+            group_key = (take_name, group_index, *other_key)
+            dsk[group_key] = (
+                _take_block_values,
+                (data.name, *map(int, chunk_key), *other_key),
+                local_indexes,
+            )
+            group_keys.append(group_key)
+        # Put the values of all groups into point order
+        block_shape = (num_points, *(c[k] for c, k in zip(other_chunks, other_key)))
+        dsk[(name, 0, *other_key)] = (
+            _put_point_values,
+            group_keys,
+            positions,
+            block_shape,
+            fill_value,
+            data.dtype,
+        )
+    graph = HighLevelGraph.from_collections(name, dsk, dependencies=[data])
+    return da.Array(
+        graph,
+        name,
+        chunks=chunks,
+        dtype=data.dtype,
+        meta=np.array((), dtype=data.dtype),
+    )
+
+
+def _take_block_values(
+    block: np.ndarray, local_indexes: tuple[np.ndarray, ...]
+) -> np.ndarray:
+    return block[local_indexes]
+
+
+def _put_point_values(
+    group_values: list[np.ndarray],
+    positions: np.ndarray,
+    shape: tuple[int, ...],
+    fill_value: Union[int, float],
+    dtype: np.dtype,
+) -> np.ndarray:
+    values = np.full(shape, fill_value, dtype=dtype)
+    values[positions] = np.concatenate(group_values)
+    return values
 
 
 def get_cube_point_indexes(
@@ -280,6 +280,61 @@ def _rasterize_features_into_block(
     return block
 
 
+def rasterize_geometries(
+    dataset: xr.Dataset,
+    geometries: Sequence[shapely.geometry.base.BaseGeometry],
+    values: Sequence[int],
+    fill: int = 0,
+    all_touched: bool = False,
+) -> np.ndarray:
+    """Rasterize *geometries* into an integer image of the
+    spatial grid of *dataset*. Pixels covered by a geometry are
+    set to the geometry's value in *values*, other pixels
+    are set to *fill*. Where geometries overlap, the value of
+    the last one is used.
+
+    Pixels are selected by the same rule as in
+    :func:`mask_dataset_by_geometry`, so the image of a single
+    geometry equals its mask.
+
+    Args:
+        dataset: The xarray dataset.
+        geometries: The geometries, in the CRS of *dataset*.
+        values: The values of the geometries.
+        fill: The value of pixels not covered by any geometry.
+        all_touched: If True, all pixels intersected by a
+            geometry's outlines will be included.
+            If False, only pixels whose center is
+            within the geometry will be included.
+    Returns:
+        A numpy array of shape (height, width) and type ``np.int32``.
+    """
+    xy_var_names = get_dataset_xy_var_names(dataset, must_exist=True)
+    x_min, y_min, x_max, y_max = get_dataset_bounds(dataset, xy_var_names=xy_var_names)
+
+    x_var_name, y_var_name = xy_var_names
+    x_var, y_var = dataset[x_var_name], dataset[y_var_name]
+
+    width = x_var.size
+    height = y_var.size
+    x_res = (x_max - x_min) / width
+    y_res = (y_max - y_min) / height
+
+    image = rasterio.features.rasterize(
+        zip(geometries, values),
+        out_shape=(height, width),
+        transform=affine.Affine(x_res, 0.0, x_min, 0.0, -y_res, y_max),
+        fill=fill,
+        all_touched=all_touched,
+        dtype=np.int32,
+    )
+
+    if y_var[0] < y_var[-1]:
+        image = image[::-1, ::]
+
+    return image
+
+
 def mask_dataset_by_geometry(
     dataset: xr.Dataset,
     geometry: GeometryLike,
@@ -488,6 +543,42 @@ def _clip_dataset_by_geometry(
     update_attrs: bool = False,
     save_geometry_wkt: bool = False,
 ) -> Optional[xr.Dataset]:
+    x_slice, y_slice = get_dataset_clip_slices(
+        dataset, intersection_geometry, xy_var_names
+    )
+
+    x_var_name, y_var_name = xy_var_names
+    dataset_subset = dataset.isel(**{x_var_name: x_slice, y_var_name: y_slice})
+
+    if update_attrs:
+        update_dataset_spatial_attrs(
+            dataset_subset, update_existing=True, in_place=True
+        )
+
+    _save_geometry_wkt(dataset_subset, intersection_geometry, save_geometry_wkt)
+
+    return dataset_subset
+
+
+def get_dataset_clip_slices(
+    dataset: xr.Dataset,
+    intersection_geometry: shapely.geometry.base.BaseGeometry,
+    xy_var_names: tuple[str, str],
+) -> tuple[slice, slice]:
+    """Get the index slices in x- and y-direction used to clip
+    *dataset* by the bounding box of the given geometry,
+    as done by :func:`clip_dataset_by_geometry` and
+    :func:`mask_dataset_by_geometry`.
+
+    Args:
+        dataset: The dataset
+        intersection_geometry: The intersection of the geometry
+            with the bounds of *dataset*.
+        xy_var_names: The names of the x- and y-coordinate variables.
+
+    Returns:
+        The pair of x- and y-index slices.
+    """
     # TODO (forman): the following code is wrong,
     #   if the dataset bounds cross the anti-meridian!
 
@@ -514,18 +605,7 @@ def _clip_dataset_by_geometry(
         y1 = height - _y2 - 1
         y2 = height - _y1 - 1
 
-    dataset_subset = dataset.isel(
-        **{x_var_name: slice(x1, x2), y_var_name: slice(y1, y2)}
-    )
-
-    if update_attrs:
-        update_dataset_spatial_attrs(
-            dataset_subset, update_existing=True, in_place=True
-        )
-
-    _save_geometry_wkt(dataset_subset, intersection_geometry, save_geometry_wkt)
-
-    return dataset_subset
+    return slice(x1, x2), slice(y1, y2)
 
 
 def _save_geometry_mask(dataset, mask, save_mask):
@@ -2,8 +2,10 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
 
+import dask.array as da
+import numpy as np
 import xarray as xr
 
 from xcube.core.gridmapping import GridMapping
@@ -16,6 +18,9 @@ from xcube.util.assertions import assert_instance
 from xcube.util.assertions import assert_true
 from .lazy import LazyMultiLevelDataset
 
+# Sum and count of valid base pixels stacked along a new first axis
+_MeanState = Union[np.ndarray, da.Array]
+
 
 class BaseMultiLevelDataset(LazyMultiLevelDataset):
     """A multi-level dataset whose level datasets are
@@ -32,6 +37,16 @@ class BaseMultiLevelDataset(LazyMultiLevelDataset):
             "first", "min", "max", "mean", "median". If None, the
             default, "first" is used for integer variables and "mean"
             for floating point variables.
+        cascaded: If True, the dataset at level *i* is derived from
+            the dataset at level *i-1* by down-sampling with factor two,
+            so that computing all levels requires about 1.33 times
+            the work of the base level only. Otherwise, the default,
+            each level is down-sampled from the base dataset.
+            Aggregation methods keep their meaning: "mean" is
+            computed from the sums and counts of valid base pixels.
+            Variables aggregated by "median" are still down-sampled
+            from the base dataset, because a median of medians is
+            not a median.
     """
 
     def __init__(
@@ -41,6 +56,7 @@ class BaseMultiLevelDataset(LazyMultiLevelDataset):
         num_levels: Optional[int] = None,
         agg_methods: Optional[AggMethods] = "first",
         ds_id: Optional[str] = None,
+        cascaded: bool = False,
     ):
         assert_instance(base_dataset, xr.Dataset, name="base_dataset")
         if grid_mapping is not None:
@@ -57,12 +73,21 @@ class BaseMultiLevelDataset(LazyMultiLevelDataset):
         )
 
         self._base_dataset = base_dataset
+        self._cascaded = cascaded
+        # Sums and counts of valid base pixels of "mean" variables
+        # per level, used in cascaded mode
+        self._mean_states: dict[int, dict[str, _MeanState]] = {}
         super().__init__(grid_mapping=grid_mapping, num_levels=num_levels, ds_id=ds_id)
 
     @property
     def agg_methods(self):
         return self._agg_methods
 
+    @property
+    def cascaded(self) -> bool:
+        """Whether levels are derived from their preceding level."""
+        return self._cascaded
+
     def _get_num_levels_lazily(self) -> int:
         gm = self.grid_mapping
         return get_num_levels(gm.size, gm.tile_size)
@@ -86,6 +111,8 @@ class BaseMultiLevelDataset(LazyMultiLevelDataset):
 
         if index == 0:
             level_dataset = self._base_dataset
+        elif self._cascaded:
+            level_dataset = self._get_cascaded_dataset(index)
         else:
             level_dataset = subsample_dataset(
                 self._base_dataset,
@@ -101,3 +128,180 @@ class BaseMultiLevelDataset(LazyMultiLevelDataset):
                 level_dataset, self.grid_mapping, tile_size=tile_size
             )
         return level_dataset
+
+    def _get_cascaded_dataset(self, index: int) -> xr.Dataset:
+        """Down-sample the dataset at level *index* - 1 by factor two."""
+        xy_dim_names = self.grid_mapping.xy_dim_names
+        # Variables aggregated by "mean" and "median" are
+        # replaced below, so use cheap "first" here.
+        level_dataset = subsample_dataset(
+            self.get_dataset(index - 1),
+            2,
+            xy_dim_names=xy_dim_names,
+            agg_methods={
+                var_name: agg_method if agg_method in ("min", "max") else "first"
+                for var_name, agg_method in self._agg_methods.items()
+            },
+        )
+
+        median_var_names = [
+            var_name
+            for var_name, agg_method in self._agg_methods.items()
+            if agg_method == "median"
+        ]
+        if median_var_names:
+            median_dataset = subsample_dataset(
+                self._base_dataset[median_var_names],
+                2**index,
+                xy_dim_names=xy_dim_names,
+                agg_methods=self._agg_methods,
+            )
+            level_dataset = level_dataset.assign(
+                {
+                    var_name: median_dataset[var_name].assign_coords(
+                        level_dataset[var_name].coords
+                    )
+                    for var_name in median_var_names
+                }
+            )
+
+        for var_name, mean_state in self._get_mean_states(index).items():
+            var = self._base_dataset[var_name]
+            coords_var = level_dataset[var_name]
+            if isinstance(mean_state, da.Array):
+                data = da.map_blocks(
+                    _get_mean_from_state,
+                    mean_state,
+                    var.dtype,
+                    drop_axis=0,
+                    dtype=var.dtype,
+                )
+            else:
+                data = _get_mean_from_state(mean_state, var.dtype)
+            new_var = xr.DataArray(
+                data, dims=coords_var.dims, coords=coords_var.coords, attrs=var.attrs
+            )
+            new_var.encoding.update(var.encoding)
+            level_dataset[var_name] = new_var
+
+        return level_dataset
+
+    def _get_mean_states(self, index: int) -> dict[str, _MeanState]:
+        """Get the states of the variables aggregated by "mean"
+        at level *index*. A state is an array that stacks the sum
+        and the count of valid base pixels along a new first axis.
+        """
+        mean_states = self._mean_states.get(index)
+        if mean_states is not None:
+            return mean_states
+
+        x_name, y_name = self.grid_mapping.xy_dim_names
+        mean_states = dict()
+        if index == 0:
+            for var_name, agg_method in self._agg_methods.items():
+                if agg_method == "mean":
+                    data = self._base_dataset[var_name].data
+                    if isinstance(data, da.Array):
+                        mean_states[var_name] = da.map_blocks(
+                            _new_mean_state,
+                            data,
+                            new_axis=0,
+                            chunks=((2,), *data.chunks),
+                            dtype=np.float64,
+                        )
+                    else:
+                        mean_states[var_name] = _new_mean_state(np.asarray(data))
+        else:
+            tile_size = self.grid_mapping.tile_size
+            for var_name, mean_state in self._get_mean_states(index - 1).items():
+                var = self._base_dataset[var_name]
+                # Axes of the state are shifted by one
+                axis_tile_sizes = {
+                    var.dims.index(dim) + 1: (
+                        tile_size[i] if tile_size is not None else None
+                    )
+                    for i, dim in enumerate((x_name, y_name))
+                    if dim in var.dims
+                }
+                axes = tuple(sorted(axis_tile_sizes.keys()))
+                if isinstance(mean_state, da.Array):
+                    mean_state = _downsample_mean_state_chunked(
+                        mean_state, axes, axis_tile_sizes
+                    )
+                else:
+                    mean_state = _downsample_mean_state(mean_state, axes)
+                mean_states[var_name] = mean_state
+        self._mean_states[index] = mean_states
+        return mean_states
+
+
+def _new_mean_state(data: np.ndarray) -> np.ndarray:
+    valid = np.isfinite(data) if np.issubdtype(data.dtype, np.floating) else None
+    if valid is None:
+        return np.stack([data.astype(np.float64), np.ones(data.shape)])
+    return np.stack([np.where(valid, data, 0.0), valid.astype(np.float64)])
+
+
+def _get_mean_from_state(mean_state: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    var_sum, var_count = mean_state[0], mean_state[1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Same as subsample_dataset(), we don't want "mean"
+        # to turn data from, e.g., dtype uint16 into float64
+        return np.where(var_count > 0, var_sum / var_count, np.nan).astype(dtype)
+
+
+def _downsample_mean_state(mean_state: np.ndarray, axes: tuple[int, ...]):
+    """Sum up windows of 2 x 2 pixels. Windows at ragged edges
+    are padded by zeros, i.e., contain no valid pixels.
+    """
+    for axis in axes:
+        if mean_state.shape[axis] % 2 == 1:
+            pad_width = [(0, 0)] * mean_state.ndim
+            pad_width[axis] = (0, 1)
+            mean_state = np.pad(mean_state, pad_width)
+        even = [slice(None)] * mean_state.ndim
+        odd = [slice(None)] * mean_state.ndim
+        even[axis] = slice(0, None, 2)
+        odd[axis] = slice(1, None, 2)
+        mean_state = mean_state[tuple(even)] + mean_state[tuple(odd)]
+    return mean_state
+
+
+def _downsample_mean_state_chunked(
+    mean_state: da.Array,
+    axes: tuple[int, ...],
+    axis_tile_sizes: dict[int, Optional[int]],
+) -> da.Array:
+    # All chunks, except the last, must have even sizes,
+    # so that no window crosses chunk boundaries.
+    even_chunks = {
+        axis: _get_even_chunks(mean_state.chunks[axis])
+        for axis in axes
+        if any(c % 2 == 1 for c in mean_state.chunks[axis][:-1])
+    }
+    if even_chunks:
+        mean_state = mean_state.rechunk(even_chunks)
+    chunks = tuple(
+        tuple((c + 1) // 2 for c in dim_chunks) if axis in axes else dim_chunks
+        for axis, dim_chunks in enumerate(mean_state.chunks)
+    )
+    mean_state = da.map_blocks(
+        _downsample_mean_state,
+        mean_state,
+        axes,
+        chunks=chunks,
+        dtype=mean_state.dtype,
+    )
+    axis_tile_sizes = {a: s for a, s in axis_tile_sizes.items() if s is not None}
+    if axis_tile_sizes:
+        # Keep number of chunks small, like rechunk_cube()
+        mean_state = mean_state.rechunk(axis_tile_sizes)
+    return mean_state
+
+
+def _get_even_chunks(chunks: tuple[int, ...]) -> tuple[int, ...]:
+    size = sum(chunks)
+    chunk_size = max(2, chunks[0] + chunks[0] % 2)
+    return (chunk_size,) * (size // chunk_size) + (
+        (size % chunk_size,) if size % chunk_size else ()
+    )
@@ -9,8 +9,9 @@ import pathlib
 import warnings
 from functools import cached_property
 from typing import Any, Optional, List, Union, Dict
-from collections.abc import Mapping, Sequence
+from collections.abc import Mapping, MutableMapping, Sequence
 
+import dask
 import fsspec
 import fsspec.core
 import numpy as np
@@ -21,9 +22,15 @@ import zarr
 import xcube.core.zarrstore
 from xcube.core.gridmapping import GridMapping
 from xcube.core.subsampling import AggMethods, AggMethod
+from xcube.core.zarrstore import cache_decoded_chunks
+from xcube.core.zarrstore import get_chunk_cache
+from xcube.core.zarrstore import get_decoded_chunk_cache
 from xcube.util.assertions import assert_instance
+from xcube.util.cache import parse_mem_size
 from xcube.util.fspath import get_fs_path_class
 from xcube.util.fspath import resolve_path
+from xcube.util.progress import observe_dask_progress
+from xcube.util.progress import observe_progress
 from xcube.util.types import ScalarOrPair
 from xcube.util.types import normalize_scalar_or_pair
 from .abc import MultiLevelDataset
@@ -32,6 +39,10 @@ from .lazy import LazyMultiLevelDataset
 
 LEVELS_FORMAT_VERSION = "1.0"
 
+# Written into a level's Zarr once the level is completely written.
+# Used to skip completed levels when resuming interrupted writes.
+_LEVEL_COMPLETED_KEY = ".zcompleted"
+
 
 class FsMultiLevelDataset(LazyMultiLevelDataset):
     _MIN_CACHE_SIZE = 1024 * 1024  # 1 MiB
@@ -43,6 +54,8 @@ class FsMultiLevelDataset(LazyMultiLevelDataset):
         fs_root: Optional[str] = None,
         fs_kwargs: Optional[Mapping[str, Any]] = None,
         cache_size: Optional[int] = None,
+        chunk_cache: bool = False,
+        decoded_chunk_cache: bool = False,
         consolidate: Optional[bool] = None,
         **zarr_kwargs,
     ):
@@ -61,6 +74,8 @@ class FsMultiLevelDataset(LazyMultiLevelDataset):
         self._fs = fs
         self._fs_root = fs_root
         self._cache_size = cache_size
+        self._chunk_cache = chunk_cache
+        self._decoded_chunk_cache = decoded_chunk_cache
         self._consolidate = consolidate
         self._zarr_kwargs = zarr_kwargs
         self._path_class = get_fs_path_class(fs)
@@ -77,6 +92,20 @@ class FsMultiLevelDataset(LazyMultiLevelDataset):
     def cache_size(self) -> Optional[int]:
         return self._cache_size
 
+    @property
+    def chunk_cache(self) -> bool:
+        """Whether the levels are read through the process-wide
+        chunk cache, if any. If so, *cache_size* is ignored.
+        """
+        return self._chunk_cache
+
+    @property
+    def decoded_chunk_cache(self) -> bool:
+        """Whether the levels read their decoded chunks through the
+        process-wide cache for decoded chunks, if any.
+        """
+        return self._decoded_chunk_cache
+
     @cached_property
     def size_weights(self) -> np.ndarray:
         """Size weights are used to distribute the cache size
@@ -144,7 +173,13 @@ class FsMultiLevelDataset(LazyMultiLevelDataset):
             else (".zmetadata" in level_zarr_store)
         )
 
-        if isinstance(cache_size, int) and cache_size >= self._MIN_CACHE_SIZE:
+        chunk_cache = get_chunk_cache() if self._chunk_cache else None
+        if chunk_cache is not None:
+            # All levels share the budget of the process-wide cache
+            level_zarr_store = chunk_cache.get_store(
+                level_zarr_store, fs.unstrip_protocol(str(level_path))
+            )
+        elif isinstance(cache_size, int) and cache_size >= self._MIN_CACHE_SIZE:
             # compute cache size for level weighted by
             # size in pixels for each level
             cache_size = math.ceil(self.size_weights[index] * cache_size)
@@ -162,6 +197,16 @@ class FsMultiLevelDataset(LazyMultiLevelDataset):
                 f"Failed to open" f" dataset {level_path!r}:" f" {e}"
             ) from e
 
+        decoded_chunk_cache = (
+            get_decoded_chunk_cache() if self._decoded_chunk_cache else None
+        )
+        if decoded_chunk_cache is not None:
+            level_dataset = cache_decoded_chunks(
+                level_dataset,
+                decoded_chunk_cache,
+                fs.unstrip_protocol(str(level_path)),
+            )
+
         level_dataset.zarr_store.set(level_zarr_store)
         return level_dataset
 
@@ -237,6 +282,9 @@ class FsMultiLevelDataset(LazyMultiLevelDataset):
         use_saved_levels: bool = False,
         base_dataset_path: Optional[str] = None,
         agg_methods: Optional[AggMethods] = None,
+        single_graph: bool = False,
+        level_memory_limit: Optional[Union[int, str]] = None,
+        resume: bool = False,
         **zarr_kwargs,
     ) -> str:
         assert_instance(dataset, (xr.Dataset, MultiLevelDataset), name="dataset")
@@ -247,10 +295,17 @@ class FsMultiLevelDataset(LazyMultiLevelDataset):
             tile_size = normalize_scalar_or_pair(
                 tile_size, item_type=int, name="tile_size"
             )
+        if isinstance(level_memory_limit, str):
+            level_memory_limit = parse_mem_size(level_memory_limit)
 
         assert_instance(path, str, name="path")
         assert_instance(fs, fsspec.AbstractFileSystem, name="fs")
 
+        if single_graph and use_saved_levels:
+            raise FsMultiLevelDatasetError(
+                "use_saved_levels cannot be combined with single_graph"
+            )
+
         if isinstance(dataset, MultiLevelDataset):
             ml_dataset = dataset
             if tile_size:
@@ -285,7 +340,7 @@ class FsMultiLevelDataset(LazyMultiLevelDataset):
 
         path_class = get_fs_path_class(fs)
         data_path = path_class(path)
-        fs.mkdirs(str(data_path), exist_ok=replace)
+        fs.mkdirs(str(data_path), exist_ok=replace or resume)
 
         if num_levels is None or num_levels <= 0:
             num_levels_max = ml_dataset.num_levels
@@ -306,8 +361,14 @@ class FsMultiLevelDataset(LazyMultiLevelDataset):
                 levels_data.update(agg_methods=dict(ml_dataset.agg_methods))
             json.dump(levels_data, fp, indent=2)
 
+        # Levels that are not yet completely written may be overwritten
+        mode = "w" if replace or resume else None
+
+        # Maps level index to level dataset and its Zarr store,
+        # if levels are written in a single graph
+        pending_levels: dict[int, tuple[xr.Dataset, MutableMapping]] = {}
+
         for index in range(num_levels_max):
-            level_dataset = ml_dataset.get_dataset(index)
             if base_dataset_path and index == 0:
                 assert_instance(fs_root, str, name="fs_root")
 
@@ -329,14 +390,24 @@ class FsMultiLevelDataset(LazyMultiLevelDataset):
                 link_path = data_path / f"{index}.link"
                 with fs.open(str(link_path), mode="w") as fp:
                     fp.write(base_dataset_path.as_posix())
+                continue
+
+            # Write level "{index}.zarr"
+            level_path = data_path / f"{index}.zarr"
+            level_zarr_store = fs.get_mapper(str(level_path), create=True)
+            if resume and _LEVEL_COMPLETED_KEY in level_zarr_store:
+                # Level has been completely written before
+                pass
+            elif single_graph:
+                level_dataset = ml_dataset.get_dataset(index)
+                pending_levels[index] = level_dataset, level_zarr_store
+                continue
             else:
-                # Write level "{index}.zarr"
-                level_path = data_path / f"{index}.zarr"
-                level_zarr_store = fs.get_mapper(str(level_path), create=True)
+                level_dataset = ml_dataset.get_dataset(index)
                 try:
                     level_dataset.to_zarr(
                         level_zarr_store,
-                        mode="w" if replace else None,
+                        mode=mode,
                         consolidated=consolidated,
                         **zarr_kwargs,
                     )
@@ -345,16 +416,203 @@ class FsMultiLevelDataset(LazyMultiLevelDataset):
                     raise FsMultiLevelDatasetError(
                         f"Failed to write dataset {path}: {e}"
                     ) from e
-                if use_saved_levels:
-                    level_dataset = xr.open_zarr(
-                        level_zarr_store, consolidated=consolidated
-                    )
-                    level_dataset.zarr_store.set(level_zarr_store)
-                    ml_dataset.set_dataset(index, level_dataset)
+                level_zarr_store[_LEVEL_COMPLETED_KEY] = b"{}"
+            if use_saved_levels:
+                level_dataset = xr.open_zarr(
+                    level_zarr_store, consolidated=consolidated
+                )
+                level_dataset.zarr_store.set(level_zarr_store)
+                ml_dataset.set_dataset(index, level_dataset)
+
+        if pending_levels:
+            try:
+                _write_levels(
+                    pending_levels,
+                    ml_dataset.grid_mapping.xy_dim_names,
+                    mode=mode,
+                    consolidated=consolidated,
+                    level_memory_limit=level_memory_limit,
+                    zarr_kwargs=zarr_kwargs,
+                )
+            except ValueError as e:
+                raise FsMultiLevelDatasetError(
+                    f"Failed to write dataset {path}: {e}"
+                ) from e
 
         return path
 
 
+def _write_levels(
+    levels: Mapping[int, tuple[xr.Dataset, MutableMapping]],
+    xy_dim_names: tuple[str, str],
+    mode: Optional[str],
+    consolidated: bool,
+    level_memory_limit: Optional[int],
+    zarr_kwargs: Mapping[str, Any],
+):
+    """Write the data of the given *levels* by a single Dask
+    computation, so that tasks shared by the levels, such as reading
+    the chunks of the base level, are computed only once.
+
+    If *level_memory_limit* is given, levels are written in batches
+    of slices along their first non-spatial dimension, e.g., "time",
+    so that the data of a batch of any level does not exceed
+    *level_memory_limit* bytes.
+
+    Each level is marked as completed as soon as its data has been
+    written, so that an interrupted write can be resumed.
+    """
+    batch_dim, batch_size = _get_write_batch_size(
+        [level_dataset for level_dataset, _ in levels.values()],
+        xy_dim_names,
+        level_memory_limit,
+    )
+    if batch_dim is not None:
+        # Coordinates and variables not sliced in batches
+        # are written upfront
+        levels = {
+            index: (_load_unbatched_vars(level_dataset, batch_dim), level_zarr_store)
+            for index, (level_dataset, level_zarr_store) in levels.items()
+        }
+
+    # Write metadata and non-Dask variables of all levels
+    delayed_writes = [
+        level_dataset.to_zarr(
+            level_zarr_store,
+            mode=mode,
+            consolidated=consolidated,
+            compute=False,
+            **zarr_kwargs,
+        )
+        for level_dataset, level_zarr_store in levels.values()
+    ]
+
+    if batch_dim is None:
+        with observe_progress("Writing multi-level dataset", 1) as progress:
+            progress.will_work(1)
+            with observe_dask_progress("Writing levels", 100):
+                dask.compute(
+                    *[
+                        _mark_level_completed(level_zarr_store, delayed_write)
+                        for (_, level_zarr_store), delayed_write in zip(
+                            levels.values(), delayed_writes
+                        )
+                    ]
+                )
+        return
+
+    # Encodings have already been written with metadata
+    region_kwargs = {k: v for k, v in zarr_kwargs.items() if k != "encoding"}
+    dim_size = next(iter(levels.values()))[0].sizes[batch_dim]
+    batch_starts = range(0, dim_size, batch_size)
+    with observe_progress("Writing multi-level dataset", len(batch_starts)) as progress:
+        for batch_start in batch_starts:
+            batch_stop = min(batch_start + batch_size, dim_size)
+            region = {batch_dim: slice(batch_start, batch_stop)}
+            batch_writes = []
+            for level_dataset, level_zarr_store in levels.values():
+                batch_dataset = level_dataset[
+                    [
+                        var_name
+                        for var_name, var in level_dataset.data_vars.items()
+                        if batch_dim in var.dims
+                    ]
+                ]
+                batch_dataset = batch_dataset.drop_vars(
+                    list(batch_dataset.coords)
+                ).isel(region)
+                batch_write = batch_dataset.to_zarr(
+                    level_zarr_store,
+                    region=region,
+                    compute=False,
+                    **region_kwargs,
+                )
+                if batch_stop == dim_size:
+                    batch_write = _mark_level_completed(level_zarr_store, batch_write)
+                batch_writes.append(batch_write)
+            progress.will_work(1)
+            with observe_dask_progress(
+                f"Writing {batch_dim} slice {batch_start}", 100
+            ):
+                dask.compute(*batch_writes)
+
+
+@dask.delayed
+def _mark_level_completed(level_zarr_store: MutableMapping, _write: Any):
+    """Mark a level as completely written.
+    Called by Dask once the given *_write* has been computed.
+    """
+    level_zarr_store[_LEVEL_COMPLETED_KEY] = b"{}"
+
+
+def _get_write_batch_size(
+    level_datasets: Sequence[xr.Dataset],
+    xy_dim_names: tuple[str, str],
+    level_memory_limit: Optional[int],
+) -> tuple[Optional[str], int]:
+    """Get the dimension and the size of batches, so that a batch
+    of any level dataset requires at most *level_memory_limit* bytes.
+    Batches are aligned with the chunks of the batch dimension.
+    Returns ``(None, 0)``, if levels cannot or need not be batched.
+    """
+    if not level_memory_limit:
+        return None, 0
+    # The first level is the largest one
+    base_level_dataset = level_datasets[0]
+    batch_dim = next(
+        (dim for dim in base_level_dataset.dims if dim not in xy_dim_names), None
+    )
+    if batch_dim is None:
+        warnings.warn(
+            "level_memory_limit is ignored for datasets"
+            " without non-spatial dimensions"
+        )
+        return None, 0
+
+    dim_size = base_level_dataset.sizes[batch_dim]
+    chunk_sizes = set()
+    for level_dataset in level_datasets:
+        for var in level_dataset.data_vars.values():
+            if batch_dim in var.dims:
+                chunks = (
+                    var.chunks[var.dims.index(batch_dim)]
+                    if var.chunks is not None
+                    else (dim_size,)
+                )
+                chunk_sizes.add(chunks[0])
+                if any(c != chunks[0] for c in chunks[:-1]):
+                    chunk_sizes.add(-1)
+    if len(chunk_sizes) != 1:
+        warnings.warn(
+            f"level_memory_limit is ignored for datasets"
+            f" with irregular chunks along dimension {batch_dim!r}"
+        )
+        return None, 0
+
+    chunk_size = chunk_sizes.pop()
+    slice_bytes = sum(
+        var.nbytes // dim_size
+        for var in base_level_dataset.data_vars.values()
+        if batch_dim in var.dims
+    )
+    num_chunks = max(1, level_memory_limit // max(1, slice_bytes * chunk_size))
+    batch_size = num_chunks * chunk_size
+    if batch_size >= dim_size:
+        # Levels fit into memory limit
+        return None, 0
+    return batch_dim, batch_size
+
+
+def _load_unbatched_vars(dataset: xr.Dataset, batch_dim: str) -> xr.Dataset:
+    dataset = dataset.copy()
+    for var_name, var in list(dataset.variables.items()):
+        if var.chunks is not None and (
+            var_name in dataset.coords or batch_dim not in var.dims
+        ):
+            dataset[var_name] = var.compute()
+    return dataset
+
+
 class FsMultiLevelDatasetError(ValueError):
     def __init__(self, message: str):
         super().__init__(message)
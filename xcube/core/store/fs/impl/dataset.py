@@ -14,6 +14,9 @@ import zarr
 from rasterio.session import AWSSession
 
 from xcube.core.zarrstore import LoggingZarrStore
+from xcube.core.zarrstore import cache_decoded_chunks
+from xcube.core.zarrstore import get_chunk_cache
+from xcube.core.zarrstore import get_decoded_chunk_cache
 
 # Note, we need the following reference to register the
 # xarray property accessor
@@ -41,6 +44,17 @@ ZARR_OPEN_DATA_PARAMS_SCHEMA = JsonObjectSchema(
         cache_size=JsonIntegerSchema(
             minimum=0,
         ),
+        chunk_cache=JsonBooleanSchema(
+            description="Whether to read chunks through the process-wide"
+            " chunk cache, if any. Takes precedence over cache_size.",
+            default=False,
+        ),
+        decoded_chunk_cache=JsonBooleanSchema(
+            description="Whether to read decoded chunks through the"
+            " process-wide cache for decoded chunks, if any."
+            " Computed chunks are then read-only.",
+            default=False,
+        ),
         group=JsonStringSchema(
             description="Group path." " (a.k.a. path in zarr terminology.).",
             min_length=1,
@@ -148,8 +162,15 @@ class DatasetZarrFsDataAccessor(DatasetFsDataAccessor):
         fs, root, open_params = self.load_fs(open_params)
         zarr_store = fs.get_mapper(data_id)
         cache_size = open_params.pop("cache_size", None)
-        if isinstance(cache_size, int) and cache_size > 0:
+        use_chunk_cache = open_params.pop("chunk_cache", False)
+        chunk_cache = get_chunk_cache() if use_chunk_cache else None
+        if chunk_cache is not None:
+            zarr_store = chunk_cache.get_store(
+                zarr_store, fs.unstrip_protocol(data_id)
+            )
+        elif isinstance(cache_size, int) and cache_size > 0:
             zarr_store = zarr.LRUStoreCache(zarr_store, max_size=cache_size)
+        use_decoded_chunk_cache = open_params.pop("decoded_chunk_cache", False)
         log_access = open_params.pop("log_access", None)
         if log_access:
             zarr_store = LoggingZarrStore(zarr_store, name=f"zarr_store({data_id!r})")
@@ -161,6 +182,14 @@ class DatasetZarrFsDataAccessor(DatasetFsDataAccessor):
         except ValueError as e:
             raise DataStoreError(f"Failed to open" f" dataset {data_id!r}: {e}") from e
 
+        decoded_chunk_cache = (
+            get_decoded_chunk_cache() if use_decoded_chunk_cache else None
+        )
+        if decoded_chunk_cache is not None:
+            dataset = cache_decoded_chunks(
+                dataset, decoded_chunk_cache, fs.unstrip_protocol(data_id)
+            )
+
         dataset.zarr_store.set(zarr_store)
         return dataset
 
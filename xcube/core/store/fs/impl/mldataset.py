@@ -97,6 +97,28 @@ class MultiLevelDatasetLevelsFsDataAccessor(DatasetZarrFsDataAccessor):
             " name pattern to aggregation method. The pattern"
             " may include wildcard characters * and ?.",
         )
+        schema.properties["single_graph"] = JsonBooleanSchema(
+            description="Whether to write the data of all levels"
+            " by a single Dask computation, so that tasks shared"
+            " by the levels are computed only once.",
+            default=False,
+        )
+        schema.properties["level_memory_limit"] = JsonComplexSchema(
+            one_of=[
+                JsonIntegerSchema(minimum=1),
+                JsonStringSchema(),
+                JsonNullSchema(),
+            ],
+            description="Memory limit in bytes, or as size string"
+            ' such as "512M", for a batch of any level written with'
+            " single_graph. Levels are then written in slices along"
+            " their first non-spatial dimension.",
+        )
+        schema.properties["resume"] = JsonBooleanSchema(
+            description="Whether to skip levels that have been"
+            " completely written before.",
+            default=False,
+        )
         return schema
 
     def write_data(
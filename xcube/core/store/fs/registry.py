@@ -189,6 +189,7 @@ def new_fs_data_store(
     includes: Optional[Sequence[str]] = None,
     excludes: Optional[Sequence[str]] = None,
     storage_options: dict[str, Any] = None,
+    index_ttl: Optional[float] = None,
 ) -> FsDataStore:
     """Create a new instance of a filesystem-based data store.
 
@@ -220,6 +221,9 @@ def new_fs_data_store(
         storage_options: Options specific to the underlying filesystem
             identified by *protocol*. Used to instantiate the
             filesystem.
+        index_ttl: Optional time in seconds for which an index of
+            the data identifiers in the filesystem is kept.
+            By default, no index is used.
 
     Returns:
         A new data store instance of type :class:`FsDataStore`.
@@ -235,6 +239,7 @@ def new_fs_data_store(
             includes=includes,
             excludes=excludes,
             storage_options=storage_options,
+            index_ttl=index_ttl,
         ).items()
         if v is not None
     }
@@ -2,9 +2,12 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
+import concurrent.futures
 import fnmatch
 import os.path
 import pathlib
+import re
+import time
 import uuid
 import warnings
 from threading import RLock
@@ -35,6 +38,7 @@ from xcube.util.jsonschema import JsonBooleanSchema
 from xcube.util.jsonschema import JsonComplexSchema
 from xcube.util.jsonschema import JsonIntegerSchema
 from xcube.util.jsonschema import JsonNullSchema
+from xcube.util.jsonschema import JsonNumberSchema
 from xcube.util.jsonschema import JsonObjectSchema
 from xcube.util.jsonschema import JsonStringSchema
 from .accessor import FsAccessor
@@ -94,6 +98,10 @@ _DataIdIter = Iterator[_DataId]
 _DataIdTupleIter = Iterator[_DataIdTuple]
 _DataIds = Union[_DataIdIter, _DataIdTupleIter]
 
+# Maximum number of directories listed concurrently
+# when building the index of data identifiers
+_INDEX_MAX_WORKERS = 16
+
 
 class BaseFsDataStore(DefaultSearchMixin, MutableDataStore):
     """
@@ -125,6 +133,14 @@ class BaseFsDataStore(DefaultSearchMixin, MutableDataStore):
         excludes: Optional sequence of wildcards that identify excluded
             filesystem paths. Affects the data identifiers (paths)
             returned by `get_data_ids()`. By default, no paths are excluded.
+        index_ttl: Optional time in seconds for which an index of
+            the data identifiers in the filesystem is kept.
+            If given, `get_data_ids()` lists the index, which is built
+            by listing the directories of each level concurrently,
+            and rebuilt once it has expired. Data written or deleted
+            by this store is immediately reflected by the index.
+            By default, no index is used and the filesystem
+            is traversed on every call.
     """
 
     def __init__(
@@ -135,6 +151,7 @@ class BaseFsDataStore(DefaultSearchMixin, MutableDataStore):
         read_only: bool = False,
         includes: Optional[Union[str, Sequence[str]]] = None,
         excludes: Optional[Union[str, Sequence[str]]] = None,
+        index_ttl: Optional[float] = None,
     ):
         if fs is not None:
             assert_instance(fs, fsspec.AbstractFileSystem, name="fs")
@@ -145,6 +162,12 @@ class BaseFsDataStore(DefaultSearchMixin, MutableDataStore):
         self._read_only = read_only
         self._includes = self._normalize_wc(includes)
         self._excludes = self._normalize_wc(excludes)
+        self._includes_re = self._compile_wc(self._includes)
+        self._excludes_re = self._compile_wc(self._excludes)
+        self._index_ttl = index_ttl
+        # Maps data identifiers to their data types
+        self._index: Optional[dict[str, DataType]] = None
+        self._index_expiry = 0.0
         self._lock = RLock()
 
     @property
@@ -210,6 +233,13 @@ class BaseFsDataStore(DefaultSearchMixin, MutableDataStore):
         """Wildcard patterns that exclude paths."""
         return self._excludes
 
+    @property
+    def index_ttl(self) -> Optional[float]:
+        """Time in seconds for which the index of data identifiers
+        is kept. None means, no index is used.
+        """
+        return self._index_ttl
+
     #########################################################################
     # MutableDataStore impl.
 
@@ -229,6 +259,7 @@ class BaseFsDataStore(DefaultSearchMixin, MutableDataStore):
                 read_only=JsonBooleanSchema(default=False),
                 includes=wc_schema,
                 excludes=wc_schema,
+                index_ttl=JsonNumberSchema(nullable=True, minimum=0),
             ),
             additional_properties=False,
         )
@@ -261,7 +292,10 @@ class BaseFsDataStore(DefaultSearchMixin, MutableDataStore):
         data_type = DataType.normalize(data_type)
         # TODO: do not ignore names in include_attrs
         return_tuples = include_attrs is not None
-        data_ids = self._generate_data_ids("", data_type, return_tuples, 1)
+        if self._index_ttl is not None:
+            data_ids = self._generate_indexed_data_ids(data_type, return_tuples)
+        else:
+            data_ids = self._generate_data_ids("", data_type, return_tuples, 1)
         if self._includes or self._excludes:
             yield from self._filter_data_ids(data_ids, return_tuples)
         yield from data_ids
@@ -269,6 +303,11 @@ class BaseFsDataStore(DefaultSearchMixin, MutableDataStore):
     def has_data(self, data_id: str, data_type: DataTypeLike = None) -> bool:
         assert_given(data_id, "data_id")
         if self._is_data_specified(data_id, data_type):
+            with self._lock:
+                # Use the index only if it is valid, but do not build it
+                if self._index is not None and time.monotonic() < self._index_expiry:
+                    if data_id in self._index:
+                        return True
             fs_path = self._convert_data_id_into_fs_path(data_id)
             return self.fs.exists(fs_path)
         return False
@@ -286,6 +325,29 @@ class BaseFsDataStore(DefaultSearchMixin, MutableDataStore):
         data = self.open_data(data_id)
         return new_data_descriptor(data_id, data, require=True)
 
+    def get_data_version(self, data_id: str) -> Optional[str]:
+        """Get the ETag or modification time of the data resource
+        given by *data_id*. For Zarr datasets, the version of their
+        consolidated metadata is used, which changes if the dataset
+        is rewritten or appended to. Other directories,
+        e.g., Zarr datasets without consolidated metadata,
+        have no version.
+        """
+        fs_path = self._convert_data_id_into_fs_path(data_id)
+        if fs_path.endswith(".zarr"):
+            fs_path = f"{fs_path}/.zmetadata"
+        try:
+            info = self.fs.info(fs_path)
+        except (FileNotFoundError, OSError):
+            return None
+        if info.get("type") == "directory":
+            return None
+        for key in ("ETag", "mtime", "LastModified", "created"):
+            version = info.get(key)
+            if version is not None:
+                return f"{info.get('size')}:{version}"
+        return None
+
     def get_data_opener_ids(
         self, data_id: str = None, data_type: DataTypeLike = None
     ) -> tuple[str, ...]:
@@ -367,6 +429,9 @@ class BaseFsDataStore(DefaultSearchMixin, MutableDataStore):
             message="FsDataAccessor implementations must "
             "return the data_id passed in.",
         )
+        self._update_index(
+            data_id, self._guess_data_type_for_data_id(data_id, require=False)
+        )
         # Return original data_id (which is a relative path).
         # Note: it would be cleaner to return written_fs_path
         # here, but it is an absolute path.
@@ -390,6 +455,7 @@ class BaseFsDataStore(DefaultSearchMixin, MutableDataStore):
         )
         fs_path = self._convert_data_id_into_fs_path(data_id)
         writer.delete_data(fs_path, fs=self.fs, root=self.root, **delete_params)
+        self._update_index(data_id, None)
 
     def register_data(self, data_id: str, data: Any):
         # We don't need this as we use the filesystem
@@ -635,45 +701,114 @@ class BaseFsDataStore(DefaultSearchMixin, MutableDataStore):
         root = self.root + ("/" + dir_path if dir_path else "")
         if not self.fs.exists(root):
             return
-        # noinspection PyArgumentEqualDefault
-        for file_info in self.fs.ls(root, detail=True):
-            file_path: str = file_info["name"]
-            if file_path.startswith(self.root):
-                file_path = file_path[len(self.root) + 1 :]
-            elif file_path.startswith("/" + self.root):
-                file_path = file_path[len(self.root) + 2 :]
-            if not file_path:
-                continue
+        for file_path, file_type in self._list_dir(dir_path):
             if self._is_data_specified(file_path, data_type):
                 yield (file_path, {}) if return_tuples else file_path
-            elif file_info.get("type") == "directory" and (
+            elif file_type == "directory" and (
                 self._max_depth is None or current_depth < self._max_depth
             ):
                 yield from self._generate_data_ids(
                     file_path, data_type, return_tuples, current_depth + 1
                 )
 
+    def _list_dir(self, dir_path: str) -> list[tuple[str, Optional[str]]]:
+        """List the directory given by *dir_path* relative to root.
+
+        Returns:
+            A list of tuples (file_path, file_type) with file paths
+            relative to root.
+        """
+        root = self.root + ("/" + dir_path if dir_path else "")
+        file_entries = []
+        # noinspection PyArgumentEqualDefault
+        for file_info in self.fs.ls(root, detail=True):
+            file_path: str = file_info["name"]
+            if file_path.startswith(self.root):
+                file_path = file_path[len(self.root) + 1 :]
+            elif file_path.startswith("/" + self.root):
+                file_path = file_path[len(self.root) + 2 :]
+            if file_path:
+                file_entries.append((file_path, file_info.get("type")))
+        return file_entries
+
+    def _generate_indexed_data_ids(
+        self, data_type: DataType, return_tuples: bool
+    ) -> _DataIds:
+        with self._lock:
+            if self._index is None or time.monotonic() >= self._index_expiry:
+                self._index = self._build_index()
+                self._index_expiry = time.monotonic() + self._index_ttl
+            index_items = sorted(self._index.items())
+        for data_id, actual_data_type in index_items:
+            if data_type.is_super_type_of(actual_data_type):
+                yield (data_id, {}) if return_tuples else data_id
+
+    def _build_index(self) -> dict[str, DataType]:
+        """Traverse the filesystem and collect the data identifiers
+        and their data types. The directories of each level are
+        listed concurrently.
+        """
+        index = {}
+        if not self.fs.exists(self.root):
+            return index
+        dir_paths = [""]
+        current_depth = 1
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=_INDEX_MAX_WORKERS, thread_name_prefix="xcube-fs-index"
+        ) as executor:
+            while dir_paths:
+                sub_dir_paths = []
+                for file_entries in executor.map(self._list_dir, dir_paths):
+                    for file_path, file_type in file_entries:
+                        data_type = self._guess_data_type_for_data_id(
+                            file_path, require=False
+                        )
+                        if data_type is not None:
+                            index[file_path] = data_type
+                        elif file_type == "directory" and (
+                            self._max_depth is None or current_depth < self._max_depth
+                        ):
+                            sub_dir_paths.append(file_path)
+                dir_paths = sub_dir_paths
+                current_depth += 1
+        return index
+
+    def _update_index(self, data_id: str, data_type: Optional[DataType]):
+        """Add *data_id* to the index, if any, or remove it,
+        if *data_type* is None.
+        """
+        with self._lock:
+            if self._index is None:
+                return
+            if data_type is None:
+                self._index.pop(data_id, None)
+            elif self._max_depth is None or data_id.count("/") < self._max_depth:
+                self._index[data_id] = data_type
+
     def _filter_data_ids(self, data_ids: _DataIds, return_tuples: bool) -> _DataIds:
+        includes_re, excludes_re = self._includes_re, self._excludes_re
         for data_id in data_ids:
-            path = data_id[0] if return_tuples else data_id
-            excluded = False
-            for pattern in self._excludes:
-                excluded = fnmatch.fnmatch(path, pattern)
-                if excluded:
-                    break
-            if not excluded:
-                included = True
-                for pattern in self._includes:
-                    included = fnmatch.fnmatch(path, pattern)
-                    if included:
-                        break
-                if included:
-                    yield data_id
+            path = os.path.normcase(data_id[0] if return_tuples else data_id)
+            if excludes_re is not None and excludes_re.match(path):
+                continue
+            if includes_re is None or includes_re.match(path):
+                yield data_id
 
     @staticmethod
     def _normalize_wc(wc: Optional[Union[str, Sequence[str]]]) -> tuple[str]:
         return tuple() if not wc else (wc,) if isinstance(wc, str) else tuple(wc)
 
+    @staticmethod
+    def _compile_wc(patterns: tuple[str]) -> Optional[re.Pattern]:
+        # Same as fnmatch.fnmatch() for any of the patterns
+        if not patterns:
+            return None
+        return re.compile(
+            "|".join(
+                fnmatch.translate(os.path.normcase(pattern)) for pattern in patterns
+            )
+        )
+
 
 class FsDataStore(BaseFsDataStore, FsAccessor):
     """Specialization of a :class:`BaseFsDataStore` that
@@ -705,6 +840,9 @@ class FsDataStore(BaseFsDataStore, FsAccessor):
             excluded.
         storage_options: Parameters specific to the underlying
             filesystem. Used to instantiate the filesystem.
+        index_ttl: Optional time in seconds for which an index of
+            the data identifiers in the filesystem is kept.
+            By default, no index is used.
     """
 
     def __init__(
@@ -715,6 +853,7 @@ class FsDataStore(BaseFsDataStore, FsAccessor):
         includes: Optional[Sequence[str]] = None,
         excludes: Optional[Sequence[str]] = None,
         storage_options: dict[str, Any] = None,
+        index_ttl: Optional[float] = None,
     ):
         self._storage_options = storage_options or {}
         super().__init__(
@@ -723,6 +862,7 @@ class FsDataStore(BaseFsDataStore, FsAccessor):
             read_only=read_only,
             includes=includes,
             excludes=excludes,
+            index_ttl=index_ttl,
         )
 
     @property
@@ -2,11 +2,18 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
+import collections
+import concurrent.futures
+import threading
 from abc import abstractmethod, ABC
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
+from typing import Callable, Optional
 
+from xcube.util.jsonschema import JsonBooleanSchema
+from xcube.util.jsonschema import JsonIntegerSchema
 from xcube.util.jsonschema import JsonObjectSchema
 from .assertions import assert_valid_params
+from .datatype import DataType
 from .datatype import DataTypeLike
 from .descriptor import DataDescriptor
 
@@ -69,7 +76,12 @@ class DefaultSearchMixin(DataSearcher):
     search behaviour.
 
     It is expected that such data stores have no dedicated search
-    parameters.
+    parameters other than the ones that control the concurrency
+    of the search, see :meth:`search_data`.
+
+    If requested by the search parameter *cache_descriptors*,
+    descriptors are cached, provided that the data store provides
+    a version of its data resources, see :meth:`get_data_version`.
     """
 
     # noinspection PyUnusedLocal
@@ -79,8 +91,9 @@ class DefaultSearchMixin(DataSearcher):
     ) -> JsonObjectSchema:
         """Get search parameters JSON object schema.
 
-        The default implementation returns a schema that does
-        not allow for any search parameters.
+        The default implementation returns a schema that only
+        allows for the parameters "max_workers", "ordered", and
+        "cache_descriptors".
 
         Args:
             data_type
@@ -88,7 +101,28 @@ class DefaultSearchMixin(DataSearcher):
         Returns:
             a JSON object schema for the search parameters
         """
-        return JsonObjectSchema(additional_properties=False)
+        return JsonObjectSchema(
+            properties=dict(
+                max_workers=JsonIntegerSchema(
+                    minimum=1,
+                    default=1,
+                    title="Maximum number of data resources"
+                    " described concurrently",
+                ),
+                ordered=JsonBooleanSchema(
+                    default=True,
+                    title="Whether to return the descriptors in the"
+                    " order of the data identifiers rather than"
+                    " as they are completed",
+                ),
+                cache_descriptors=JsonBooleanSchema(
+                    default=False,
+                    title="Whether to cache the descriptors of data"
+                    " resources for their version",
+                ),
+            ),
+            additional_properties=False,
+        )
 
     def search_data(
         self, data_type: DataTypeLike = None, **search_params
@@ -98,9 +132,24 @@ class DefaultSearchMixin(DataSearcher):
         The default implementation returns all data resources that
         may be filtered using the optional *data_type*.
 
+        If the search parameter *max_workers* is greater than one,
+        up to *max_workers* data resources are described concurrently
+        by a pool of threads. The descriptors are then returned in the
+        order of the data identifiers, unless the search parameter
+        *ordered* is false, in which case they are returned as soon
+        as they are completed.
+
+        If the search parameter *cache_descriptors* is true,
+        descriptors are cached by this data store and reused
+        by subsequent searches as long as the version of the data
+        resource, see :meth:`get_data_version`, does not change.
+        Getting the version may cost additional requests per
+        data resource, therefore caching is disabled by default.
+
         Args:
             data_type: Type specifier to filter returned data resources.
-            **search_params: Not supported (yet)
+            **search_params: The search parameters "max_workers",
+                "ordered", and "cache_descriptors".
 
         Returns:
             an iterator of :class:`DataDescriptor` instances
@@ -109,6 +158,99 @@ class DefaultSearchMixin(DataSearcher):
         assert_valid_params(
             search_params, name="search_params", schema=search_params_schema
         )
-        for data_id in self.get_data_ids(data_type=data_type):
-            data_descriptor = self.describe_data(data_id, data_type=data_type)
-            yield data_descriptor
+        max_workers = search_params.get("max_workers", 1)
+        ordered = search_params.get("ordered", True)
+        cache_descriptors = search_params.get("cache_descriptors", False)
+        describe_data = (
+            self._describe_data_cached
+            if cache_descriptors
+            else self._describe_data_uncached
+        )
+        data_ids = self.get_data_ids(data_type=data_type)
+        if max_workers == 1:
+            for data_id in data_ids:
+                yield describe_data(data_id, data_type)
+        else:
+            yield from self._describe_data_concurrently(
+                data_ids, data_type, describe_data, max_workers, ordered
+            )
+
+    def get_data_version(self, data_id: str) -> Optional[str]:
+        """Get a version of the data resource given by *data_id*,
+        e.g., an ETag or a modification time.
+
+        If a version is returned and the search parameter
+        *cache_descriptors* is true, :meth:`search_data` caches
+        the descriptor of the data resource for that version.
+        The default implementation returns None, so descriptors
+        are never cached.
+
+        Args:
+            data_id: The data identifier.
+
+        Returns:
+            A version that changes if the data resource changes,
+            or None, if it is not known.
+        """
+        return None
+
+    def _describe_data_uncached(
+        self, data_id: str, data_type: DataTypeLike
+    ) -> DataDescriptor:
+        return self.describe_data(data_id, data_type=data_type)
+
+    def _describe_data_cached(
+        self, data_id: str, data_type: DataTypeLike
+    ) -> DataDescriptor:
+        version = self.get_data_version(data_id)
+        if version is None:
+            return self.describe_data(data_id, data_type=data_type)
+        # Instance attributes are created lazily, because mixins
+        # have no constructor
+        lock = self.__dict__.setdefault("_search_cache_lock", threading.Lock())
+        cache = self.__dict__.setdefault("_search_cache", {})
+        key = data_id, str(DataType.normalize(data_type))
+        with lock:
+            entry = cache.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        data_descriptor = self.describe_data(data_id, data_type=data_type)
+        with lock:
+            cache[key] = version, data_descriptor
+        return data_descriptor
+
+    def _describe_data_concurrently(
+        self,
+        data_ids: Iterable[str],
+        data_type: DataTypeLike,
+        describe_data: Callable[[str, DataTypeLike], DataDescriptor],
+        max_workers: int,
+        ordered: bool,
+    ) -> Iterator[DataDescriptor]:
+        data_ids = iter(data_ids)
+        # Number of pending data resources is bounded,
+        # so that data identifiers are consumed lazily
+        max_pending = 2 * max_workers
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="xcube-search"
+        ) as executor:
+            pending = collections.deque()
+            try:
+                while True:
+                    for data_id in data_ids:
+                        pending.append(
+                            executor.submit(describe_data, data_id, data_type)
+                        )
+                        if len(pending) >= max_pending:
+                            break
+                    if not pending:
+                        break
+                    if ordered:
+                        future = pending.popleft()
+                    else:
+                        future = next(concurrent.futures.as_completed(pending))
+                        pending.remove(future)
+                    yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
@@ -3,6 +3,7 @@
 # https://opensource.org/licenses/MIT.
 
 import os.path
+import threading
 from typing import Any, Dict, Optional, List, Union
 from collections.abc import Mapping
 
@@ -175,6 +176,7 @@ class DataStoreInstance:
         assert_instance(store_config, DataStoreConfig, name="store_config")
         self._store_config = store_config
         self._store: Optional[DataStore] = None
+        self._lock = threading.Lock()
 
     @property
     def store_config(self) -> DataStoreConfig:
@@ -183,9 +185,14 @@ class DataStoreInstance:
     @property
     def store(self) -> DataStore:
         if self._store is None:
-            self._store = new_data_store(
-                self._store_config.store_id, **(self._store_config.store_params or {})
-            )
+            # Stores may be requested concurrently,
+            # e.g., when datasets are warmed up
+            with self._lock:
+                if self._store is None:
+                    self._store = new_data_store(
+                        self._store_config.store_id,
+                        **(self._store_config.store_params or {}),
+                    )
         return self._store
 
     def close(self):
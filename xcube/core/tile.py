@@ -2,15 +2,16 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
+import collections
 import io
 import logging
-import math
+import threading
 from typing import Optional, Tuple, Dict, Any, Union, List
 from collections.abc import Hashable, Sequence
 
-import PIL
-import matplotlib.colors
+import PIL.Image
 import numpy as np
+import pandas as pd
 import pyproj
 import xarray as xr
 
@@ -20,6 +21,7 @@ from xcube.util.assertions import assert_instance
 from xcube.util.assertions import assert_true
 from xcube.util.cmaps import ColormapProvider
 from xcube.util.cmaps import DEFAULT_CMAP_NAME
+from xcube.util.cmaps import get_continuous_norm
 from xcube.util.perf import measure_time_cm
 from xcube.util.projcache import ProjCache
 from xcube.util.timeindex import ensure_time_label_compatible
@@ -35,6 +37,18 @@ DEFAULT_VALUE_RANGE = (0.0, 1.0)
 DEFAULT_CMAP_NORM = "lin"
 DEFAULT_FORMAT = "png"
 DEFAULT_TILE_ENLARGEMENT = 1
+DEFAULT_METATILE_SIZE = 4
+DEFAULT_PNG_COMPRESS_LEVEL = 6
+DEFAULT_PNG_COMPRESS_STRATEGY = "default"
+
+# Maps names to ZLIB compression strategies
+PNG_COMPRESS_STRATEGIES = {
+    "default": 0,
+    "filtered": 1,
+    "huffman": 2,
+    "rle": 3,
+    "fixed": 4,
+}
 
 ValueRange = tuple[float, float]
 
@@ -49,6 +63,7 @@ def compute_tiles(
     non_spatial_labels: Optional[dict[str, Any]] = None,
     as_dataset: bool = False,
     tile_enlargement: int = DEFAULT_TILE_ENLARGEMENT,
+    num_tiles: ScalarOrPair[int] = 1,
     trace_perf: bool = False,
 ) -> Optional[Union[list[np.ndarray], xr.Dataset]]:
     """Compute tiles for given *variable_names* in
@@ -73,6 +88,11 @@ def compute_tiles(
     10. turn that array into an RGBA image.
     11. encode RGBA image into PNG bytes.
 
+    The indexes computed in steps 3 to 8 are kept in a bounded
+    cache, see :class:`TileIndexesCache`. If the tile CRS and the
+    dataset CRS are geographic or axis-aligned, such as web mercator,
+    steps 3 and 4 are performed on the tile's 1D coordinates only.
+
     Args:
         ml_dataset: Multi-level dataset
         variable_names: Single variable name
@@ -94,12 +114,20 @@ def compute_tiles(
             the computed source tile read from the data.
             Can be used to increase the accuracy of the borders of target
             tiles at high zoom levels. Defaults to 1.
+        num_tiles: Number of tiles in x- and y-direction
+            that subdivide *tile_bbox*.
+            Can be a scalar or an integer pair. Defaults to 1.
+            If given, the result is a block of tiles, a so-called
+            metatile, whose pixels are the same as the pixels of
+            the individually computed tiles, except at tile borders,
+            where the block may use source pixels of neighbouring tiles.
         trace_perf: If set, detailed performance
             metrics are logged using the level of the "xcube" logger.
     Returns:
         A list of numpy.ndarray instances according to variables
-        given by *variable_names*. Returns None, if the resulting
-        spatial subset would be too small.
+        given by *variable_names*. The arrays' shape is
+        the tile size multiplied by *num_tiles*.
+        Returns None, if the resulting spatial subset would be too small.
     Raises: TileNotFoundException
     """
     if isinstance(variable_names, str):
@@ -126,85 +154,52 @@ def compute_tiles(
 
     variable_0 = variables[0]
 
-    with measure_time("Transforming tile map to dataset coordinates"):
-        ds_x_name, ds_y_name = ml_dataset.grid_mapping.xy_dim_names
-
-        ds_y_coords = variable_0[ds_y_name]
-        ds_y_points_up = bool(ds_y_coords[0] < ds_y_coords[-1])
-
-        tile_res_x = (tile_x_max - tile_x_min) / (tile_width - 1)
-        tile_res_y = (tile_y_max - tile_y_min) / (tile_height - 1)
-
-        tile_x_1d = np.linspace(
-            tile_x_min + 0.5 * tile_res_x, tile_x_max - 0.5 * tile_res_x, tile_width
-        )
-        tile_y_1d = np.linspace(
-            tile_y_min + 0.5 * tile_res_y, tile_y_max - 0.5 * tile_res_y, tile_height
-        )
-
-        tile_x_2d = np.tile(tile_x_1d, (tile_height, 1))
-        tile_y_2d = np.tile(tile_y_1d, (tile_width, 1)).transpose()
-
-        assert tile_x_2d.shape == (tile_height, tile_width)
-        assert tile_y_2d.shape == tile_x_2d.shape
-
-        t_map_to_ds = ProjCache.INSTANCE.get_transformer(
-            tile_crs, ml_dataset.grid_mapping.crs
-        )
-
-        tile_ds_x_2d, tile_ds_y_2d = t_map_to_ds.transform(tile_x_2d, tile_y_2d)
-
-    with measure_time("Getting spatial subset"):
-        # Get min/max of the 1D arrays surrounding the 2D array
-        # North
-        ds_x_n = tile_ds_x_2d[0, :]
-        ds_y_n = tile_ds_y_2d[0, :]
-        # South
-        ds_x_s = tile_ds_x_2d[tile_height - 1, :]
-        ds_y_s = tile_ds_y_2d[tile_height - 1, :]
-        # West
-        ds_x_w = tile_ds_x_2d[:, 0]
-        ds_y_w = tile_ds_y_2d[:, 0]
-        # East
-        ds_x_e = tile_ds_x_2d[:, tile_width - 1]
-        ds_y_e = tile_ds_y_2d[:, tile_width - 1]
-        # Min
-        ds_x_min = np.nanmin(
-            [np.nanmin(ds_x_n), np.nanmin(ds_x_s), np.nanmin(ds_x_w), np.nanmin(ds_x_e)]
-        )
-        ds_y_min = np.nanmin(
-            [np.nanmin(ds_y_n), np.nanmin(ds_y_s), np.nanmin(ds_y_w), np.nanmin(ds_y_e)]
-        )
-        # Max
-        ds_x_max = np.nanmax(
-            [np.nanmax(ds_x_n), np.nanmax(ds_x_s), np.nanmax(ds_x_w), np.nanmax(ds_x_e)]
-        )
-        ds_y_max = np.nanmax(
-            [np.nanmax(ds_y_n), np.nanmax(ds_y_s), np.nanmax(ds_y_w), np.nanmax(ds_y_e)]
+    ds_x_name, ds_y_name = ml_dataset.grid_mapping.xy_dim_names
+
+    num_tiles = normalize_scalar_or_pair(num_tiles)
+    num_tiles_x, num_tiles_y = num_tiles
+
+    tile_x_1d = _get_tile_coords_1d(tile_x_min, tile_x_max, tile_width, num_tiles_x)
+    tile_y_1d = _get_tile_coords_1d(tile_y_min, tile_y_max, tile_height, num_tiles_y)
+
+    with measure_time("Getting tile indexes"):
+        ds_x_index = variable_0.indexes[ds_x_name]
+        ds_y_index = variable_0.indexes[ds_y_name]
+        ds_crs = ml_dataset.grid_mapping.crs
+        tile_indexes_key = (
+            ProjCache.get_crs_srs(tile_crs),
+            ProjCache.get_crs_srs(ds_crs),
+            tuple(float(c) for c in tile_bbox),
+            tile_size,
+            num_tiles,
+            tile_enlargement,
+            _get_index_key(ds_x_index),
+            _get_index_key(ds_y_index),
         )
-        if (
-            np.isnan(ds_x_min)
-            or np.isnan(ds_y_min)
-            or np.isnan(ds_y_max)
-            or np.isnan(ds_y_max)
-        ):
-            raise TileNotFoundException(
-                "Tile bounds NaN after map projection", logger=logger
+        tile_indexes = TileIndexesCache.INSTANCE.get(tile_indexes_key)
+        if tile_indexes is None:
+            tile_indexes = _compute_tile_indexes(
+                tile_x_1d,
+                tile_y_1d,
+                tile_crs,
+                ds_crs,
+                ds_x_index,
+                ds_y_index,
+                tile_enlargement,
+                logger,
             )
+            if tile_indexes is None:
+                return None
+            TileIndexesCache.INSTANCE.put(tile_indexes_key, tile_indexes)
 
-        num_extra_pixels = tile_enlargement
-        res_x = (ds_x_max - ds_x_min) / tile_width
-        res_y = (ds_y_max - ds_y_min) / tile_height
-        extra_dx = num_extra_pixels * res_x
-        extra_dy = num_extra_pixels * res_y
-        ds_x_slice = slice(ds_x_min - extra_dx, ds_x_max + extra_dx)
-        if ds_y_points_up:
-            ds_y_slice = slice(ds_y_min - extra_dy, ds_y_max + extra_dy)
-        else:
-            ds_y_slice = slice(ds_y_max + extra_dy, ds_y_min - extra_dy)
-
+    with measure_time("Getting spatial subset"):
         var_subsets = [
-            variable.sel({ds_x_name: ds_x_slice, ds_y_name: ds_y_slice})
+            variable.isel(
+                {
+                    ds_x_name: tile_indexes.ds_x_slice,
+                    ds_y_name: tile_indexes.ds_y_slice,
+                }
+            )
             for variable in variables
         ]
         for var_subset in var_subsets:
@@ -214,38 +209,9 @@ def compute_tiles(
             if 0 in var_subset.shape or 1 in var_subset.shape:
                 return None
 
-    with measure_time("Transforming dataset coordinates into indices"):
-        var_subset_0 = var_subsets[0]
-        ds_x_coords = var_subset_0[ds_x_name]
-        ds_y_coords = var_subset_0[ds_y_name]
-
-        ds_x1 = float(ds_x_coords[0])
-        ds_x2 = float(ds_x_coords[-1])
-        ds_y1 = float(ds_y_coords[0])
-        ds_y2 = float(ds_y_coords[-1])
-
-        ds_size_x = ds_x_coords.size
-        ds_size_y = ds_y_coords.size
-
-        ds_dx = (ds_x2 - ds_x1) / (ds_size_x - 1)
-        ds_dy = (ds_y2 - ds_y1) / (ds_size_y - 1)
-
-        ds_x_indices = (tile_ds_x_2d - ds_x1) / ds_dx
-        ds_y_indices = (tile_ds_y_2d - ds_y1) / ds_dy
-
-        ds_x_indices = ds_x_indices.astype(dtype=np.int64)
-        ds_y_indices = ds_y_indices.astype(dtype=np.int64)
-
-    with measure_time("Masking dataset indices"):
-        ds_mask = (
-            (ds_x_indices >= 0)
-            & (ds_x_indices < ds_size_x)
-            & (ds_y_indices >= 0)
-            & (ds_y_indices < ds_size_y)
-        )
-
-        ds_x_indices = np.where(ds_mask, ds_x_indices, 0)
-        ds_y_indices = np.where(ds_mask, ds_y_indices, 0)
+    ds_x_indices = tile_indexes.ds_x_indices
+    ds_y_indices = tile_indexes.ds_y_indices
+    ds_mask = tile_indexes.ds_mask
 
     var_tiles = []
     for var_subset in var_subsets:
@@ -279,6 +245,276 @@ def compute_tiles(
     return var_tiles
 
 
+class TileIndexes:
+    """Indexes that map the pixels of a tile to the pixels of
+    a dataset's spatial subset.
+
+    The index arrays *ds_x_indices* and *ds_y_indices* are
+    broadcastable to the tile's 2D shape given by *ds_mask*.
+
+    Args:
+        ds_x_slice: Integer slice of the spatial subset in x-direction.
+        ds_y_slice: Integer slice of the spatial subset in y-direction.
+        ds_x_indices: Indexes into the spatial subset in x-direction.
+        ds_y_indices: Indexes into the spatial subset in y-direction.
+        ds_mask: Mask that is true for tile pixels
+            that are within the spatial subset.
+    """
+
+    def __init__(
+        self,
+        ds_x_slice: slice,
+        ds_y_slice: slice,
+        ds_x_indices: np.ndarray,
+        ds_y_indices: np.ndarray,
+        ds_mask: np.ndarray,
+    ):
+        for array in (ds_x_indices, ds_y_indices, ds_mask):
+            # Instances are shared between tile computations
+            array.setflags(write=False)
+        self.ds_x_slice = ds_x_slice
+        self.ds_y_slice = ds_y_slice
+        self.ds_x_indices = ds_x_indices
+        self.ds_y_indices = ds_y_indices
+        self.ds_mask = ds_mask
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes consumed by the arrays."""
+        return self.ds_x_indices.nbytes + self.ds_y_indices.nbytes + self.ds_mask.nbytes
+
+
+DEFAULT_TILE_INDEXES_CACHE_SIZE = 64 * 1000**2
+"""Default byte budget of the cache for tile indexes."""
+
+
+class TileIndexesCache:
+    """A byte-budgeted, least-recently-used cache
+    for instances of :class:`TileIndexes`.
+
+    Tile indexes depend only on the tile's CRS, bounding box, and size,
+    and on the CRS and spatial coordinates of the dataset level.
+    Hence, they can be reused across variables, time steps,
+    and color mappings.
+
+    Instances of this class are thread-safe.
+
+    Args:
+        max_size: Byte budget of the cache.
+    """
+
+    INSTANCE: "TileIndexesCache"
+
+    def __init__(self, max_size: int = DEFAULT_TILE_INDEXES_CACHE_SIZE):
+        self._max_size = max_size
+        self._entries: collections.OrderedDict[Hashable, TileIndexes] = (
+            collections.OrderedDict()
+        )
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        """Byte budget of the cache."""
+        return self._max_size
+
+    @property
+    def size(self) -> int:
+        """Number of bytes currently consumed by the cache."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[TileIndexes]:
+        with self._lock:
+            tile_indexes = self._entries.get(key)
+            if tile_indexes is not None:
+                self._entries.move_to_end(key)
+            return tile_indexes
+
+    def put(self, key: Hashable, tile_indexes: TileIndexes):
+        nbytes = tile_indexes.nbytes
+        if nbytes > self._max_size:
+            return
+        with self._lock:
+            prev_tile_indexes = self._entries.pop(key, None)
+            if prev_tile_indexes is not None:
+                self._size -= prev_tile_indexes.nbytes
+            self._entries[key] = tile_indexes
+            self._size += nbytes
+            while self._size > self._max_size:
+                _, evicted_tile_indexes = self._entries.popitem(last=False)
+                self._size -= evicted_tile_indexes.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+TileIndexesCache.INSTANCE = TileIndexesCache()
+
+
+def _get_tile_coords_1d(
+    coord_min: float, coord_max: float, tile_size: int, num_tiles: int
+) -> np.ndarray:
+    # Computes the coordinates of each tile separately,
+    # so a block of tiles has the same pixels as its tiles.
+    tile_extent = (coord_max - coord_min) / num_tiles
+    coords_1d = []
+    for i in range(num_tiles):
+        tile_min = coord_min + i * tile_extent
+        tile_max = coord_max if i == num_tiles - 1 else tile_min + tile_extent
+        tile_res = (tile_max - tile_min) / (tile_size - 1)
+        coords_1d.append(
+            np.linspace(
+                tile_min + 0.5 * tile_res, tile_max - 0.5 * tile_res, tile_size
+            )
+        )
+    return coords_1d[0] if num_tiles == 1 else np.concatenate(coords_1d)
+
+
+def _get_index_key(index: pd.Index) -> tuple[float, float, int]:
+    return float(index[0]), float(index[-1]), len(index)
+
+
+def _compute_tile_indexes(
+    tile_x_1d: np.ndarray,
+    tile_y_1d: np.ndarray,
+    tile_crs: Union[str, pyproj.CRS],
+    ds_crs: Union[str, pyproj.CRS],
+    ds_x_index: pd.Index,
+    ds_y_index: pd.Index,
+    tile_enlargement: int,
+    logger: Optional[logging.Logger],
+) -> Optional[TileIndexes]:
+    tile_width = tile_x_1d.size
+    tile_height = tile_y_1d.size
+
+    t_map_to_ds = ProjCache.INSTANCE.get_transformer(tile_crs, ds_crs)
+
+    if _is_separable_transform(tile_crs, ds_crs):
+        # Dataset x only depends on tile x, dataset y only on tile y,
+        # so we can transform the tile's 1D coordinates and get
+        # arrays that are broadcastable to the tile's 2D shape.
+        tile_ds_x, _ = t_map_to_ds.transform(
+            tile_x_1d, np.full_like(tile_x_1d, tile_y_1d[tile_height // 2])
+        )
+        _, tile_ds_y = t_map_to_ds.transform(
+            np.full_like(tile_y_1d, tile_x_1d[tile_width // 2]), tile_y_1d
+        )
+        tile_ds_x = tile_ds_x[np.newaxis, :]
+        tile_ds_y = tile_ds_y[:, np.newaxis]
+        tile_ds_x_outline = tile_ds_x
+        tile_ds_y_outline = tile_ds_y
+    else:
+        tile_x_2d = np.tile(tile_x_1d, (tile_height, 1))
+        tile_y_2d = np.tile(tile_y_1d, (tile_width, 1)).transpose()
+
+        assert tile_x_2d.shape == (tile_height, tile_width)
+        assert tile_y_2d.shape == tile_x_2d.shape
+
+        tile_ds_x, tile_ds_y = t_map_to_ds.transform(tile_x_2d, tile_y_2d)
+
+        # The 1D arrays surrounding the 2D array (N, S, W, E)
+        tile_ds_x_outline = np.concatenate(
+            [tile_ds_x[0, :], tile_ds_x[-1, :], tile_ds_x[:, 0], tile_ds_x[:, -1]]
+        )
+        tile_ds_y_outline = np.concatenate(
+            [tile_ds_y[0, :], tile_ds_y[-1, :], tile_ds_y[:, 0], tile_ds_y[:, -1]]
+        )
+
+    ds_x_min = np.nanmin(tile_ds_x_outline)
+    ds_y_min = np.nanmin(tile_ds_y_outline)
+    ds_x_max = np.nanmax(tile_ds_x_outline)
+    ds_y_max = np.nanmax(tile_ds_y_outline)
+    if (
+        np.isnan(ds_x_min)
+        or np.isnan(ds_y_min)
+        or np.isnan(ds_x_max)
+        or np.isnan(ds_y_max)
+    ):
+        raise TileNotFoundException(
+            "Tile bounds NaN after map projection", logger=logger
+        )
+
+    num_extra_pixels = tile_enlargement
+    res_x = (ds_x_max - ds_x_min) / tile_width
+    res_y = (ds_y_max - ds_y_min) / tile_height
+    extra_dx = num_extra_pixels * res_x
+    extra_dy = num_extra_pixels * res_y
+    ds_x_slice = ds_x_index.slice_indexer(ds_x_min - extra_dx, ds_x_max + extra_dx)
+    ds_y_points_up = bool(ds_y_index[0] < ds_y_index[-1])
+    if ds_y_points_up:
+        ds_y_slice = ds_y_index.slice_indexer(ds_y_min - extra_dy, ds_y_max + extra_dy)
+    else:
+        ds_y_slice = ds_y_index.slice_indexer(ds_y_max + extra_dy, ds_y_min - extra_dy)
+
+    ds_x_coords = ds_x_index[ds_x_slice]
+    ds_y_coords = ds_y_index[ds_y_slice]
+
+    ds_size_x = ds_x_coords.size
+    ds_size_y = ds_y_coords.size
+    if ds_size_x < 2 or ds_size_y < 2:
+        return None
+
+    ds_x1 = float(ds_x_coords[0])
+    ds_x2 = float(ds_x_coords[-1])
+    ds_y1 = float(ds_y_coords[0])
+    ds_y2 = float(ds_y_coords[-1])
+
+    ds_dx = (ds_x2 - ds_x1) / (ds_size_x - 1)
+    ds_dy = (ds_y2 - ds_y1) / (ds_size_y - 1)
+
+    ds_x_indices = ((tile_ds_x - ds_x1) / ds_dx).astype(dtype=np.int64)
+    ds_y_indices = ((tile_ds_y - ds_y1) / ds_dy).astype(dtype=np.int64)
+
+    ds_x_mask = (ds_x_indices >= 0) & (ds_x_indices < ds_size_x)
+    ds_y_mask = (ds_y_indices >= 0) & (ds_y_indices < ds_size_y)
+    ds_mask = np.broadcast_to(ds_x_mask & ds_y_mask, (tile_height, tile_width))
+
+    return TileIndexes(
+        ds_x_slice,
+        ds_y_slice,
+        np.where(ds_x_mask, ds_x_indices, 0),
+        np.where(ds_y_mask, ds_y_indices, 0),
+        np.ascontiguousarray(ds_mask),
+    )
+
+
+def _is_separable_transform(
+    crs1: Union[str, pyproj.CRS], crs2: Union[str, pyproj.CRS]
+) -> bool:
+    crs1 = ProjCache.INSTANCE.get_crs(crs1)
+    crs2 = ProjCache.INSTANCE.get_crs(crs2)
+    if crs1 == crs2:
+        return True
+    if crs1.datum != crs2.datum:
+        return False
+    return _is_axis_aligned_crs(crs1) and _is_axis_aligned_crs(crs2)
+
+
+# Projection methods whose x only depends on longitude
+# and whose y only depends on latitude.
+_AXIS_ALIGNED_METHOD_NAMES = {
+    "Popular Visualisation Pseudo Mercator",
+    "Mercator (variant A)",
+    "Mercator (variant B)",
+    "Equidistant Cylindrical",
+}
+
+
+def _is_axis_aligned_crs(crs: pyproj.CRS) -> bool:
+    if crs.is_geographic:
+        return True
+    coordinate_operation = crs.coordinate_operation
+    return (
+        coordinate_operation is not None
+        and coordinate_operation.method_name in _AXIS_ALIGNED_METHOD_NAMES
+    )
+
+
 def _new_tile_dataset(
     original_vars: list[tuple[xr.DataArray, tuple[Hashable, ...]]],
     tiles: list[np.ndarray],
@@ -348,6 +584,9 @@ def compute_rgba_tile(
     non_spatial_labels: Optional[dict[str, Any]] = None,
     format: str = DEFAULT_FORMAT,
     tile_enlargement: int = DEFAULT_TILE_ENLARGEMENT,
+    png_compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+    png_compress_strategy: str = DEFAULT_PNG_COMPRESS_STRATEGY,
+    png_palette: bool = True,
     trace_perf: bool = False,
 ) -> Union[bytes, np.ndarray]:
     """Compute an RGBA image tile from *variable_names* in
@@ -411,12 +650,115 @@ def compute_rgba_tile(
             accuracy of the borders of target tiles at high zoom levels.
             Defaults to 1.
         format: Either 'png', 'image/png' or 'numpy'.
+        png_compress_level: ZLIB compression level of PNG images,
+            from 0 (no compression) to 9 (best compression).
+            Defaults to 6.
+        png_compress_strategy: ZLIB compression strategy of PNG images.
+            One of "default", "filtered", "huffman", "rle", "fixed".
+            Defaults to "default".
+        png_palette: If set, single-variable tiles are encoded as
+            palette PNG images, if the colormap has at most 256
+            distinct colors. Defaults to True.
         trace_perf: If set, detailed performance metrics are logged
             using the level of the "xcube" logger.
 
     Returns:
         PNG bytes or unit8 numpy array, depending on *format*
 
+    Raises:
+        TileNotFoundException
+        TileRequestException
+    """
+    tile_size = normalize_scalar_or_pair(tile_size)
+    format = _normalize_format(format)
+    tiles = compute_rgba_tiles(
+        ml_dataset,
+        variable_names,
+        tile_x,
+        tile_y,
+        tile_z,
+        cmap_provider,
+        num_tiles=1,
+        crs_name=crs_name,
+        tile_size=tile_size,
+        cmap_name=cmap_name,
+        cmap_norm=cmap_norm,
+        value_ranges=value_ranges,
+        non_spatial_labels=non_spatial_labels,
+        format=format,
+        tile_enlargement=tile_enlargement,
+        png_compress_level=png_compress_level,
+        png_compress_strategy=png_compress_strategy,
+        png_palette=png_palette,
+        trace_perf=trace_perf,
+    )
+    tile = tiles.get((tile_x, tile_y))
+    if tile is None:
+        # Whether to raise or not
+        # could be made a configuration option.
+        #
+        # raise TileRequestException.new(
+        #     'Tile indices out of tile grid bounds',
+        #     logger=logger
+        # )
+        return TransparentRgbaTilePool.INSTANCE.get(tile_size, format)
+    return tile
+
+
+def compute_rgba_tiles(
+    ml_dataset: MultiLevelDataset,
+    variable_names: Union[str, Sequence[str]],
+    tile_x: int,
+    tile_y: int,
+    tile_z: int,
+    cmap_provider: ColormapProvider,
+    num_tiles: ScalarOrPair[int] = DEFAULT_METATILE_SIZE,
+    crs_name: str = DEFAULT_CRS_NAME,
+    tile_size: ScalarOrPair[int] = DEFAULT_TILE_SIZE,
+    cmap_name: Optional[str] = DEFAULT_CMAP_NAME,
+    cmap_norm: Optional[str] = DEFAULT_CMAP_NORM,
+    value_ranges: Optional[Union[ValueRange, Sequence[ValueRange]]] = None,
+    non_spatial_labels: Optional[dict[str, Any]] = None,
+    format: str = DEFAULT_FORMAT,
+    tile_enlargement: int = DEFAULT_TILE_ENLARGEMENT,
+    png_compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+    png_compress_strategy: str = DEFAULT_PNG_COMPRESS_STRATEGY,
+    png_palette: bool = True,
+    trace_perf: bool = False,
+) -> dict[tuple[int, int], Union[bytes, np.ndarray]]:
+    """Compute a block of neighbouring RGBA image tiles,
+    a so-called metatile, from *variable_names* in
+    given multi-resolution dataset *mr_dataset*.
+
+    The tiles are computed in a single pass as one large image
+    that is then sliced into the individual tiles.
+    This is considerably faster than computing the tiles
+    separately using :func:`compute_rgba_tile`, because the
+    data is subset, read, reprojected, and color mapped only once.
+
+    Args:
+        ml_dataset: Multi-level dataset
+        variable_names: Single variable name or a sequence of three
+            names.
+        tile_x: X coordinate of the upper left tile of the block
+        tile_y: Y coordinate of the upper left tile of the block
+        tile_z: Tile Z coordinate
+        cmap_provider: Provider for colormaps.
+        num_tiles: Number of tiles of the block in x- and y-direction.
+            Can be a scalar or an integer pair. Defaults to 4.
+            The block is clipped to the bounds of the tile grid.
+        crs_name: Spatial tile coordinate reference system.
+        tile_size: The tile size in pixels. Can be a scalar or an
+            integer width/height pair. Defaults to 256.
+
+    For the remaining arguments, refer to :func:`compute_rgba_tile`.
+
+    Returns:
+        A dictionary that maps the (x, y) coordinates of the tiles
+        to PNG bytes or uint8 numpy arrays, depending on *format*.
+        It contains only tiles within the bounds of the tile grid,
+        hence it is empty, if the block is outside the tile grid.
+
     Raises:
         TileNotFoundException
         TileRequestException
@@ -442,21 +784,38 @@ def compute_rgba_tile(
     )
     format = _normalize_format(format)
     assert_in(format, ("png", "numpy"), name="format")
+    assert_in(
+        png_compress_strategy, PNG_COMPRESS_STRATEGIES, name="png_compress_strategy"
+    )
 
     measure_time = measure_time_cm(disabled=not trace_perf, logger=LOG)
 
     tiling_scheme = TilingScheme.for_crs(crs_name).derive(tile_size=tile_size)
 
-    tile_bbox = tiling_scheme.get_tile_extent(tile_x, tile_y, tile_z)
-    if tile_bbox is None:
-        # Whether to raise or not
-        # could be made a configuration option.
-        #
-        # raise TileRequestException.new(
-        #     'Tile indices out of tile grid bounds',
-        #     logger=logger
-        # )
-        return TransparentRgbaTilePool.INSTANCE.get(tile_size, format)
+    num_tiles_x, num_tiles_y = normalize_scalar_or_pair(num_tiles)
+    if tile_z >= 0:
+        grid_num_tiles_x, grid_num_tiles_y = tiling_scheme.get_num_tiles(tile_z)
+        num_tiles_x = min(num_tiles_x, grid_num_tiles_x - tile_x)
+        num_tiles_y = min(num_tiles_y, grid_num_tiles_y - tile_y)
+    first_tile_bbox = tiling_scheme.get_tile_extent(tile_x, tile_y, tile_z)
+    if first_tile_bbox is None or num_tiles_x < 1 or num_tiles_y < 1:
+        return {}
+
+    tile_coords = [
+        (tile_x + i, tile_y + j)
+        for j in range(num_tiles_y)
+        for i in range(num_tiles_x)
+    ]
+
+    last_tile_bbox = tiling_scheme.get_tile_extent(
+        tile_x + num_tiles_x - 1, tile_y + num_tiles_y - 1, tile_z
+    )
+    tile_bbox = (
+        first_tile_bbox[0],
+        last_tile_bbox[1],
+        last_tile_bbox[2],
+        first_tile_bbox[3],
+    )
 
     ds_level = tiling_scheme.get_resolutions_level(
         tile_z, ml_dataset.avg_resolutions, ml_dataset.grid_mapping.spatial_unit_name
@@ -471,11 +830,20 @@ def compute_rgba_tile(
         level=ds_level,
         non_spatial_labels=non_spatial_labels,
         tile_enlargement=tile_enlargement,
+        num_tiles=(num_tiles_x, num_tiles_y),
         trace_perf=trace_perf,
     )
 
     if var_tiles is None:
-        return TransparentRgbaTilePool.INSTANCE.get(tile_size, format)
+        transparent_tile = TransparentRgbaTilePool.INSTANCE.get(tile_size, format)
+        return {xy: transparent_tile for xy in tile_coords}
+
+    def get_tile_slice(xy: tuple[int, int]) -> tuple[slice, slice]:
+        i, j = xy[0] - tile_x, xy[1] - tile_y
+        return (
+            slice(j * tile_height, (j + 1) * tile_height),
+            slice(i * tile_width, (i + 1) * tile_width),
+        )
 
     cmap_norm = cmap_norm or DEFAULT_CMAP_NORM
 
@@ -483,19 +851,26 @@ def compute_rgba_tile(
         with measure_time("Decoding color mapping"):
             # Note, we measure here because cmap_name may be an
             # JSON-encoded user-defined color map.
-            cmap, colormap = cmap_provider.get_cmap(cmap_name or DEFAULT_CMAP_NAME)
+            cmap_lut = cmap_provider.get_cmap_lut(
+                cmap_name or DEFAULT_CMAP_NAME, cmap_norm, value_ranges[0]
+            )
 
         with measure_time("Encoding tile as RGBA image"):
-            var_tile, value_range = var_tiles[0], value_ranges[0]
-            if cmap_norm == "cat" and colormap.bounds:
-                norm = matplotlib.colors.BoundaryNorm(
-                    colormap.bounds, ncolors=cmap.N, clip=False
-                )
-            else:
-                norm = get_continuous_norm(value_range, cmap_norm)
-            norm_var_tile = norm(var_tile[::-1, :])
-            var_tile_rgba = cmap(norm_var_tile)
-            var_tile_rgba = (255 * var_tile_rgba).astype(np.uint8)
+            var_tile_indexes = cmap_lut.get_indexes(var_tiles[0][::-1, :])
+            if format == "png" and png_palette and cmap_lut.palette is not None:
+                palette_indexes, palette_colors = cmap_lut.palette
+                var_tile_indexes = palette_indexes.take(var_tile_indexes)
+                with measure_time("Encoding palette images as PNG bytes"):
+                    return {
+                        xy: _encode_palette_as_png(
+                            var_tile_indexes[get_tile_slice(xy)],
+                            palette_colors,
+                            compress_level=png_compress_level,
+                            compress_strategy=png_compress_strategy,
+                        )
+                        for xy in tile_coords
+                    }
+            var_tile_rgba = cmap_lut.colors.take(var_tile_indexes, axis=0)
     else:
         with measure_time("Encoding 3 tiles as RGBA image"):
             norm_var_tiles = []
@@ -504,31 +879,27 @@ def compute_rgba_tile(
                 norm_var_tiles.append(norm(var_tile[::-1, :]))
 
             r, g, b = norm_var_tiles
-            var_tile_rgba = np.zeros((tile_height, tile_width, 4), dtype=np.uint8)
+            var_tile_rgba = np.zeros((*r.shape, 4), dtype=np.uint8)
             var_tile_rgba[:, :, 0] = (255 * r).astype(np.uint8)
             var_tile_rgba[:, :, 1] = (255 * g).astype(np.uint8)
             var_tile_rgba[:, :, 2] = (255 * b).astype(np.uint8)
             var_tile_rgba[:, :, 3] = np.where(np.isfinite(r + g + b), 255, 0)
 
     if format == "png":
-        with measure_time("Encoding RGBA image as PNG bytes"):
-            return _encode_rgba_as_png(var_tile_rgba)
+        with measure_time("Encoding RGBA images as PNG bytes"):
+            return {
+                xy: _encode_rgba_as_png(
+                    var_tile_rgba[get_tile_slice(xy)],
+                    compress_level=png_compress_level,
+                    compress_strategy=png_compress_strategy,
+                )
+                for xy in tile_coords
+            }
     else:  # format == 'numpy'
-        return var_tile_rgba
-
-
-def get_continuous_norm(
-    value_range: tuple[float, float], cmap_norm: Optional[str]
-) -> matplotlib.colors.Normalize:
-    value_min, value_max = value_range
-    if value_max < value_min:
-        value_min, value_max = value_max, value_min
-    if math.isclose(value_min, value_max):
-        value_max = value_min + 1
-    if cmap_norm == "log":
-        return matplotlib.colors.LogNorm(value_min, value_max, clip=True)
-    else:
-        return matplotlib.colors.Normalize(value_min, value_max, clip=True)
+        return {
+            xy: np.ascontiguousarray(var_tile_rgba[get_tile_slice(xy)])
+            for xy in tile_coords
+        }
 
 
 def get_var_cmap_params(
@@ -707,9 +1078,38 @@ def _normalize_format(format: str) -> str:
     return format
 
 
-def _encode_rgba_as_png(rgba_array: np.ndarray) -> bytes:
+def _encode_rgba_as_png(
+    rgba_array: np.ndarray,
+    compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+    compress_strategy: str = DEFAULT_PNG_COMPRESS_STRATEGY,
+) -> bytes:
     # noinspection PyUnresolvedReferences
     image = PIL.Image.fromarray(rgba_array)
+    return _encode_image_as_png(image, compress_level, compress_strategy)
+
+
+def _encode_palette_as_png(
+    index_array: np.ndarray,
+    palette_colors: np.ndarray,
+    compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+    compress_strategy: str = DEFAULT_PNG_COMPRESS_STRATEGY,
+) -> bytes:
+    # noinspection PyUnresolvedReferences
+    image = PIL.Image.fromarray(index_array.astype(np.uint8))
+    # Turns the grayscale image into a palette image.
+    # The alpha values of the palette are written as PNG "tRNS" chunk.
+    image.putpalette(palette_colors.tobytes(), rawmode="RGBA")
+    return _encode_image_as_png(image, compress_level, compress_strategy)
+
+
+def _encode_image_as_png(
+    image: PIL.Image.Image, compress_level: int, compress_strategy: str
+) -> bytes:
     stream = io.BytesIO()
-    image.save(stream, format="PNG")
+    image.save(
+        stream,
+        format="PNG",
+        compress_level=compress_level,
+        compress_type=PNG_COMPRESS_STRATEGIES[compress_strategy],
+    )
     return bytes(stream.getvalue())
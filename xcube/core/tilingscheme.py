@@ -333,6 +333,20 @@ class TilingScheme:
 
         raise RuntimeError("should not come here")
 
+    def get_num_tiles(self, tile_z: int) -> Pair[int]:
+        """Get the number of tiles in x- and y-direction
+        at the given level.
+
+        Args:
+            tile_z: The tile's level index
+
+        Returns:
+            The number of tiles in x- and y-direction
+        """
+        zoom_factor = 1 << tile_z
+        num_tiles_x0, num_tiles_y0 = self.num_level_zero_tiles
+        return num_tiles_x0 * zoom_factor, num_tiles_y0 * zoom_factor
+
     def get_tile_extent(
         self, tile_x: int, tile_y: int, tile_z: int
     ) -> Optional[tuple[float, float, float, float]]:
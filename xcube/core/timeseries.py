@@ -6,6 +6,7 @@ import warnings
 from typing import Union, Optional, AbstractSet, Set
 from collections.abc import Sequence
 
+import dask
 import numpy as np
 import pyproj
 import shapely.geometry
@@ -13,11 +14,18 @@ import shapely.ops
 import shapely.wkt
 import xarray as xr
 
+from xcube.core.extract import get_array_values_for_indexes
+from xcube.core.extract import get_dataset_indexes
 from xcube.core.geom import GeometryLike
-from xcube.core.geom import normalize_geometry
+from xcube.core.geom import get_dataset_bounds
+from xcube.core.geom import get_dataset_clip_slices
 from xcube.core.geom import get_dataset_geometry
+from xcube.core.geom import intersect_geometries
 from xcube.core.geom import mask_dataset_by_geometry
+from xcube.core.geom import normalize_geometry
+from xcube.core.geom import rasterize_geometries
 from xcube.core.gridmapping import GridMapping
+from xcube.core.schema import get_dataset_xy_var_names
 from xcube.core.select import select_variables_subset
 from xcube.util.timeindex import ensure_time_index_compatible
 from xcube.util.assertions import assert_instance
@@ -44,6 +52,10 @@ AGG_METHODS = {
     AGG_COUNT: CAN_COMPUTE,
 }
 
+# Maximum number of values of a variable loaded at once
+# while computing zonal time series
+_ZONAL_MAX_BATCH_SIZE = 2**24
+
 
 def get_time_series(
     cube: xr.Dataset,
@@ -190,6 +202,409 @@ def get_time_series(
     return ts_dataset
 
 
+def get_points_time_series(
+    cube: xr.Dataset,
+    points: Sequence[GeometryLike],
+    var_names: Optional[Sequence[str]] = None,
+    grid_mapping: Optional[GridMapping] = None,
+    start_date: Optional[Date] = None,
+    end_date: Optional[Date] = None,
+) -> list[Optional[xr.Dataset]]:
+    """Get the time series datasets for multiple *points*
+    from a data *cube*.
+
+    The result for each point corresponds to the one of
+    :func:`get_time_series` for the same point, but the values
+    of all points are extracted together: every chunk of
+    the *cube* that contains any of the points is read only once,
+    see :func:`xcube.core.extract.get_array_values_for_indexes`.
+
+    Args:
+        cube: The xcube dataset
+        points: Sequence of point geometries.
+        var_names: Optional sequence of names of variables to be
+            included.
+        grid_mapping: Grid mapping of *cube*.
+        start_date: Optional start date.
+        end_date: Optional end date.
+
+    Returns:
+        A list of time series datasets for the given *points*
+        at same indices. An item is ``None``, if the respective
+        point is not within the cube's boundaries.
+    """
+    assert_instance(cube, xr.Dataset)
+    if grid_mapping is not None:
+        assert_instance(grid_mapping, GridMapping)
+    else:
+        grid_mapping = GridMapping.from_dataset(cube)
+
+    points = [normalize_geometry(point) for point in points]
+    for point in points:
+        if not isinstance(point, shapely.geometry.Point):
+            raise ValueError("points must be point geometries")
+    if not points:
+        return []
+
+    xs = np.array([point.x for point in points], dtype=np.float64)
+    ys = np.array([point.y for point in points], dtype=np.float64)
+    if not grid_mapping.crs.is_geographic:
+        xs, ys = pyproj.Transformer.from_crs(
+            CRS_CRS84, grid_mapping.crs, always_xy=True
+        ).transform(xs, ys)
+
+    dataset = select_variables_subset(cube, var_names)
+    if len(dataset.data_vars) == 0:
+        return [None] * len(points)
+
+    if start_date is not None or end_date is not None:
+        date_slice = slice(start_date, end_date)
+        safe_slice = ensure_time_index_compatible(dataset, date_slice)
+        dataset = dataset.sel(time=safe_slice)
+
+    x_name, y_name = grid_mapping.xy_dim_names
+    is_valid = np.logical_and(
+        get_dataset_indexes(dataset, x_name, xs, index_dtype=np.int64) >= 0,
+        get_dataset_indexes(dataset, y_name, ys, index_dtype=np.int64) >= 0,
+    )
+    # Same pixels as selected by dataset.sel(..., method="nearest")
+    indexes = {
+        x_name: dataset.indexes[x_name].get_indexer(xs, method="nearest"),
+        y_name: dataset.indexes[y_name].get_indexer(ys, method="nearest"),
+    }
+    indexes = {dim: np.where(is_valid, index, -1) for dim, index in indexes.items()}
+
+    # Compute the values of all variables in a single computation
+    var_names = list(dataset.data_vars)
+    point_values = dict(
+        zip(
+            var_names,
+            dask.compute(
+                *(
+                    get_array_values_for_indexes(dataset[var_name], indexes)
+                    for var_name in var_names
+                )
+            ),
+        )
+    )
+
+    return [
+        (
+            xr.Dataset(
+                {
+                    var_name: values[point_index]
+                    for var_name, values in point_values.items()
+                },
+                attrs=dict(dataset.attrs, max_number_of_observations=1),
+            )
+            if is_valid[point_index]
+            else None
+        )
+        for point_index in range(len(points))
+    ]
+
+
+def get_zonal_time_series(
+    cube: xr.Dataset,
+    geometries: Sequence[GeometryLike],
+    var_name: str,
+    grid_mapping: Optional[GridMapping] = None,
+    start_date: Optional[Date] = None,
+    end_date: Optional[Date] = None,
+    agg_methods: Union[str, Sequence[str], AbstractSet[str]] = AGG_MEAN,
+) -> list[Optional[xr.Dataset]]:
+    """Get the time series datasets for multiple area *geometries*
+    (zones) from a data *cube*.
+
+    The result for each geometry corresponds to the one of
+    :func:`get_time_series` for the same geometry, but all zones
+    are computed together: the geometries are rasterized into
+    a label image and all aggregation methods of all zones are computed
+    by a single grouped reduction per time step.
+    Overlapping geometries are rasterized into separate label images.
+    This is much faster than calling :func:`get_time_series`
+    for each geometry if there are many geometries.
+
+    Args:
+        cube: The xcube dataset
+        geometries: Sequence of geometries that cover an area.
+        var_name: Name of the variable to be aggregated.
+        grid_mapping: Grid mapping of *cube*.
+        start_date: Optional start date.
+        end_date: Optional end date.
+        agg_methods: Aggregation methods. May be single string or
+            sequence of strings. Possible values are 'mean', 'median',
+            'min', 'max', 'std', 'count'. Defaults to 'mean'.
+
+    Returns:
+        A list of time series datasets for the given *geometries*
+        at same indices. An item is ``None``, if the respective
+        geometry does not overlap the cube's boundaries.
+    """
+    assert_instance(cube, xr.Dataset)
+    if grid_mapping is not None:
+        assert_instance(grid_mapping, GridMapping)
+    else:
+        grid_mapping = GridMapping.from_dataset(cube)
+
+    agg_methods = normalize_agg_methods(agg_methods)
+
+    geometries = [normalize_geometry(geometry) for geometry in geometries]
+    if not grid_mapping.crs.is_geographic:
+        project = pyproj.Transformer.from_crs(
+            CRS_CRS84, grid_mapping.crs, always_xy=True
+        ).transform
+        geometries = [
+            shapely.ops.transform(project, geometry) if geometry is not None else None
+            for geometry in geometries
+        ]
+
+    dataset = select_variables_subset(cube, [var_name])
+    if start_date is not None or end_date is not None:
+        date_slice = slice(start_date, end_date)
+        safe_slice = ensure_time_index_compatible(dataset, date_slice)
+        dataset = dataset.sel(time=safe_slice)
+
+    xy_var_names = get_dataset_xy_var_names(dataset, must_exist=True)
+    dataset_bounds = get_dataset_bounds(dataset, xy_var_names=xy_var_names)
+    geometries = [
+        intersect_geometries(dataset_bounds, geometry) if geometry is not None else None
+        for geometry in geometries
+    ]
+    zone_indexes = [i for i, geometry in enumerate(geometries) if geometry is not None]
+    if not zone_indexes:
+        return [None] * len(geometries)
+
+    # Clip every zone exactly like mask_dataset_by_geometry() does,
+    # so that results are the same as the ones of get_time_series().
+    # Each zone window is given as (x_start, x_stop, y_start, y_stop).
+    zone_windows = np.array(
+        [
+            (x_slice.start, x_slice.stop, y_slice.start, y_slice.stop)
+            for x_slice, y_slice in (
+                get_dataset_clip_slices(dataset, geometries[i], xy_var_names)
+                for i in zone_indexes
+            )
+        ],
+        dtype=np.intp,
+    )
+    x_name, y_name = grid_mapping.xy_dim_names
+    x_start, y_start = zone_windows[:, 0].min(), zone_windows[:, 2].min()
+    x_stop, y_stop = zone_windows[:, 1].max(), zone_windows[:, 3].max()
+    dataset = dataset.isel(
+        {
+            x_name: slice(x_start, max(x_start, x_stop)),
+            y_name: slice(y_start, max(y_start, y_stop)),
+        }
+    )
+    zone_windows -= np.array([x_start, x_start, y_start, y_start], dtype=np.intp)
+
+    var = dataset[var_name].transpose("time", y_name, x_name)
+
+    # Rasterize zones into label images, label 0 is the background.
+    # Zone labels are one-based indexes into zone_indexes.
+    label_images = (
+        [
+            _rasterize_zones(
+                dataset,
+                [geometries[zone_indexes[zone_index]] for zone_index in layer],
+                [zone_index + 1 for zone_index in layer],
+                zone_windows,
+            )
+            for layer in _get_non_overlapping_layers(
+                [geometries[i] for i in zone_indexes]
+            )
+        ]
+        if var.shape[1] > 0 and var.shape[2] > 0
+        else []
+    )
+
+    num_labels = len(zone_indexes) + 1
+    max_numbers_of_observations = sum(
+        (
+            np.bincount(label_image, minlength=num_labels)
+            for label_image in label_images
+        ),
+        np.zeros(num_labels, dtype=np.int64),
+    )
+
+    num_times = var.shape[0]
+    agg_values = {
+        agg_method: np.full(
+            (num_labels, num_times),
+            0 if agg_method == AGG_COUNT else np.nan,
+            dtype=np.int64 if agg_method == AGG_COUNT else np.float64,
+        )
+        for agg_method in agg_methods
+    }
+    for time_slice in _get_time_slices(var, _ZONAL_MAX_BATCH_SIZE):
+        values = var[time_slice].values
+        values = values.reshape((values.shape[0], -1))
+        for label_image in label_images:
+            pixel_indexes = np.flatnonzero(label_image)
+            pixel_labels = label_image[pixel_indexes]
+            for time_index, time_values in enumerate(values, start=time_slice.start):
+                _aggregate_zones(
+                    time_values[pixel_indexes],
+                    pixel_labels,
+                    num_labels,
+                    agg_values,
+                    time_index,
+                )
+
+    time_series_datasets: list[Optional[xr.Dataset]] = [None] * len(geometries)
+    for label, zone_index in enumerate(zone_indexes, start=1):
+        time_series_datasets[zone_index] = xr.Dataset(
+            {
+                f"{var_name}_{agg_method}": xr.DataArray(
+                    agg_values[agg_method][label], dims="time"
+                )
+                for agg_method in agg_methods
+            },
+            coords=dict(time=var.time),
+            attrs=dict(
+                max_number_of_observations=int(max_numbers_of_observations[label])
+            ),
+        )
+    return time_series_datasets
+
+
+def _get_non_overlapping_layers(
+    geometries: Sequence[shapely.geometry.base.BaseGeometry],
+) -> list[list[int]]:
+    """Distribute the indexes of the given *geometries* into
+    as few layers as possible such that the geometries
+    of a layer do not intersect each other.
+    """
+    bounds = np.array([geometry.bounds for geometry in geometries])
+    layers: list[list[int]] = []
+    geometry_layers: list[int] = []
+    for index, geometry in enumerate(geometries):
+        x_min, y_min, x_max, y_max = bounds[index]
+        candidates = np.flatnonzero(
+            (bounds[:index, 0] <= x_max)
+            & (bounds[:index, 2] >= x_min)
+            & (bounds[:index, 1] <= y_max)
+            & (bounds[:index, 3] >= y_min)
+        )
+        used_layers = {
+            geometry_layers[i]
+            for i in candidates
+            if geometries[i].intersects(geometry)
+        }
+        layer = next(i for i in range(len(layers) + 1) if i not in used_layers)
+        if layer == len(layers):
+            layers.append([])
+        layers[layer].append(index)
+        geometry_layers.append(layer)
+    return layers
+
+
+def _rasterize_zones(
+    dataset: xr.Dataset,
+    geometries: Sequence[shapely.geometry.base.BaseGeometry],
+    labels: Sequence[int],
+    zone_windows: np.ndarray,
+) -> np.ndarray:
+    """Rasterize non-overlapping *geometries* into a flattened
+    label image of the spatial grid of *dataset*, see
+    :func:`rasterize_geometries`. Pixels not covered by any
+    geometry are labelled 0.
+    Pixels with label ``i`` outside the window
+    ``zone_windows[i - 1]`` are labelled 0 too.
+    """
+    label_image = rasterize_geometries(dataset, geometries, labels)
+    width = label_image.shape[1]
+    label_image = label_image.astype(np.intp).ravel()
+    pixel_indexes = np.flatnonzero(label_image)
+    rows, cols = np.divmod(pixel_indexes, width)
+    windows = zone_windows[label_image[pixel_indexes] - 1]
+    outside = (
+        (cols < windows[:, 0])
+        | (cols >= windows[:, 1])
+        | (rows < windows[:, 2])
+        | (rows >= windows[:, 3])
+    )
+    label_image[pixel_indexes[outside]] = 0
+    return label_image
+
+
+def _get_time_slices(var: xr.DataArray, max_batch_size: int) -> list[slice]:
+    """Split the time dimension of *var* into slices
+    comprising at most *max_batch_size* values. If possible,
+    slices are aligned with the time chunks of *var*.
+    """
+    num_times = var.shape[0]
+    max_num_steps = max(1, max_batch_size // max(1, var[0].size))
+    time_chunks = var.chunks[0] if var.chunks else (num_times,)
+    time_slices = []
+    start = end = 0
+    for chunk_size in time_chunks:
+        if end + chunk_size - start > max_num_steps:
+            if end > start:
+                time_slices.append(slice(start, end))
+                start = end
+            while end + chunk_size - start > max_num_steps:
+                time_slices.append(slice(start, start + max_num_steps))
+                start += max_num_steps
+        end += chunk_size
+    if end > start:
+        time_slices.append(slice(start, end))
+    return time_slices
+
+
+def _aggregate_zones(
+    values: np.ndarray,
+    labels: np.ndarray,
+    num_labels: int,
+    agg_values: dict[str, np.ndarray],
+    time_index: int,
+):
+    """Aggregate the *values* of one time step for all zones
+    given by *labels* and store the results at *time_index*
+    in *agg_values*.
+    """
+    valid = ~np.isnan(values)
+    values = values[valid].astype(np.float64)
+    labels = labels[valid]
+    counts = np.bincount(labels, minlength=num_labels)
+    has_values = counts > 0
+    if AGG_COUNT in agg_values:
+        agg_values[AGG_COUNT][:, time_index] += counts
+    if not np.any(has_values):
+        return
+    if AGG_MEAN in agg_values or AGG_STD in agg_values:
+        sums = np.bincount(labels, weights=values, minlength=num_labels)
+        means = np.divide(sums, counts, where=has_values, out=np.zeros(num_labels))
+        if AGG_MEAN in agg_values:
+            agg_values[AGG_MEAN][has_values, time_index] = means[has_values]
+        if AGG_STD in agg_values:
+            deviations = values - means[labels]
+            sq_sums = np.bincount(
+                labels, weights=deviations * deviations, minlength=num_labels
+            )
+            agg_values[AGG_STD][has_values, time_index] = np.sqrt(
+                sq_sums[has_values] / counts[has_values]
+            )
+    if AGG_MIN in agg_values or AGG_MAX in agg_values or AGG_MEDIAN in agg_values:
+        # Sort by label, then by value, so the values of each
+        # zone are contiguous and in ascending order
+        sorted_values = values[np.lexsort((values, labels))]
+        starts = (np.cumsum(counts) - counts)[has_values]
+        counts = counts[has_values]
+        if AGG_MIN in agg_values:
+            agg_values[AGG_MIN][has_values, time_index] = sorted_values[starts]
+        if AGG_MAX in agg_values:
+            agg_values[AGG_MAX][has_values, time_index] = sorted_values[
+                starts + counts - 1
+            ]
+        if AGG_MEDIAN in agg_values:
+            agg_values[AGG_MEDIAN][has_values, time_index] = 0.5 * (
+                sorted_values[starts + (counts - 1) // 2]
+                + sorted_values[starts + counts // 2]
+            )
+
+
 def normalize_agg_methods(
     agg_methods: Union[str, Sequence[str]], exception_type=ValueError
 ) -> set[str]:
@@ -3,6 +3,14 @@
 # https://opensource.org/licenses/MIT.
 
 from .cached import CachedZarrStore
+from .chunkcache import ChunkCache
+from .chunkcache import ChunkCacheStore
+from .chunkcache import get_chunk_cache
+from .chunkcache import set_chunk_cache
+from .decoded import DecodedChunkArray
+from .decoded import cache_decoded_chunks
+from .decoded import get_decoded_chunk_cache
+from .decoded import set_decoded_chunk_cache
 from .diagnostic import DiagnosticZarrStore
 from .generic import GenericArray
 from .generic import GenericArrayLike
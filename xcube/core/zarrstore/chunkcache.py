@@ -0,0 +1,322 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import collections
+import collections.abc
+import threading
+from typing import Any, Optional
+from collections.abc import Iterator
+
+import zarr.storage
+
+from xcube.util.assertions import assert_instance, assert_true
+
+DEFAULT_CHUNK_CACHE_NUM_SHARDS = 16
+"""Default number of independently locked shards of a chunk cache."""
+
+_CacheKey = tuple[str, str]
+
+
+class ChunkCache:
+    """A thread-safe cache for the values of Zarr stores, such as
+    chunks, with a single byte budget *capacity* shared by all stores.
+
+    Stores use the cache by being wrapped into a
+    :class:`ChunkCacheStore`, see :meth:`get_store`. Stores are
+    identified by a name, hence stores with equal names share
+    their cached values.
+
+    The least recently used values are evicted first, regardless of
+    the store they belong to. Hence, memory is used by the values of
+    datasets and levels that are frequently accessed rather than
+    being statically partitioned among them.
+
+    To avoid a global lock, values are distributed over *num_shards*
+    shards by the hash of their keys. Each shard has its own lock
+    and a budget of ``capacity / num_shards`` bytes. Values larger
+    than a shard's budget are not cached.
+
+    Args:
+        capacity: The cache's budget in bytes.
+        num_shards: Number of shards.
+    """
+
+    def __init__(
+        self, capacity: int, num_shards: int = DEFAULT_CHUNK_CACHE_NUM_SHARDS
+    ):
+        assert_instance(capacity, int, name="capacity")
+        assert_true(capacity >= 0, message="capacity must not be negative")
+        assert_true(num_shards >= 1, message="num_shards must be positive")
+        self._capacity = capacity
+        shard_capacity = capacity // num_shards
+        self._shards = tuple(
+            _ChunkCacheShard(shard_capacity) for _ in range(num_shards)
+        )
+
+    @property
+    def capacity(self) -> int:
+        """The cache's budget in bytes."""
+        return self._capacity
+
+    @property
+    def size(self) -> int:
+        """The number of bytes currently cached."""
+        return sum(shard.size for shard in self._shards)
+
+    def get_store(
+        self, store: collections.abc.MutableMapping, name: str
+    ) -> "ChunkCacheStore":
+        """Wrap the given *store* so that its values are read
+        through this cache.
+
+        Args:
+            store: The Zarr store to be wrapped.
+            name: A name that uniquely identifies *store*,
+                e.g., its URL.
+
+        Returns:
+            A read-only Zarr store.
+        """
+        return ChunkCacheStore(store, self, name)
+
+    def get(self, store_name: str, key: str) -> Optional[Any]:
+        """Get the value for *key* of the store named *store_name*,
+        or None, if it is not cached.
+        """
+        cache_key = store_name, key
+        return self._get_shard(cache_key).get(cache_key)
+
+    def put(self, store_name: str, key: str, value: Any):
+        """Put the *value* for *key* of the store named *store_name*
+        into this cache.
+        """
+        cache_key = store_name, key
+        self._get_shard(cache_key).put(cache_key, value)
+
+    def clear(self, store_name: Optional[str] = None):
+        """Remove all values, or, if *store_name* is given,
+        all values of the store named *store_name*.
+        Statistics are kept.
+        """
+        for shard in self._shards:
+            shard.clear(store_name)
+
+    def get_stats(self, store_name: Optional[str] = None) -> dict[str, int]:
+        """Get the statistics of this cache, or, if *store_name* is given,
+        of the store named *store_name*.
+
+        Returns:
+            A dictionary with the numbers of cache "hits", cache "misses",
+            "evictions", cached "items", and the cached "bytes".
+            The statistics of the whole cache additionally comprise
+            its "capacity".
+        """
+        stats = collections.Counter(hits=0, misses=0, evictions=0, items=0, bytes=0)
+        for shard in self._shards:
+            with shard.lock:
+                shard_stats = (
+                    shard.stats
+                    if store_name is None
+                    else shard.store_stats.get(store_name, {})
+                )
+                stats.update(shard_stats)
+        stats = dict(stats)
+        if store_name is None:
+            stats["capacity"] = self._capacity
+        return stats
+
+    def get_store_names(self) -> list[str]:
+        """Get the names of all stores that used this cache."""
+        store_names = set()
+        for shard in self._shards:
+            with shard.lock:
+                store_names.update(shard.store_stats.keys())
+        return sorted(store_names)
+
+    def _get_shard(self, cache_key: _CacheKey) -> "_ChunkCacheShard":
+        return self._shards[hash(cache_key) % len(self._shards)]
+
+
+class _ChunkCacheShard:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.entries: collections.OrderedDict[_CacheKey, tuple[Any, int]] = (
+            collections.OrderedDict()
+        )
+        self.size = 0
+        self.stats = collections.Counter()
+        self.store_stats: dict[str, collections.Counter] = dict()
+
+    def get(self, cache_key: _CacheKey) -> Optional[Any]:
+        with self.lock:
+            entry = self.entries.get(cache_key)
+            outcome = "misses" if entry is None else "hits"
+            self.stats[outcome] += 1
+            self._get_store_stats(cache_key)[outcome] += 1
+            if entry is None:
+                return None
+            self.entries.move_to_end(cache_key)
+            return entry[0]
+
+    def put(self, cache_key: _CacheKey, value: Any):
+        value_size = _get_size(value)
+        if value_size > self.capacity:
+            return
+        with self.lock:
+            if cache_key in self.entries:
+                self._remove(cache_key)
+            while self.entries and self.size + value_size > self.capacity:
+                evicted_key = next(iter(self.entries))
+                self._remove(evicted_key)
+                self.stats["evictions"] += 1
+                self._get_store_stats(evicted_key)["evictions"] += 1
+            self.entries[cache_key] = value, value_size
+            self._update_size(cache_key, 1, value_size)
+
+    def clear(self, store_name: Optional[str]):
+        with self.lock:
+            for cache_key in list(self.entries.keys()):
+                if store_name is None or cache_key[0] == store_name:
+                    self._remove(cache_key)
+
+    def _remove(self, cache_key: _CacheKey):
+        _, value_size = self.entries.pop(cache_key)
+        self._update_size(cache_key, -1, -value_size)
+
+    def _update_size(self, cache_key: _CacheKey, items: int, size: int):
+        self.size += size
+        self.stats["items"] += items
+        self.stats["bytes"] += size
+        store_stats = self._get_store_stats(cache_key)
+        store_stats["items"] += items
+        store_stats["bytes"] += size
+
+    def _get_store_stats(self, cache_key: _CacheKey) -> collections.Counter:
+        store_name = cache_key[0]
+        store_stats = self.store_stats.get(store_name)
+        if store_stats is None:
+            store_stats = collections.Counter()
+            self.store_stats[store_name] = store_stats
+        return store_stats
+
+
+class ChunkCacheStore(zarr.storage.Store):
+    """A read-only Zarr store that reads the values of *store*
+    through the given chunk *cache*.
+
+    Note that iterating keys and containment checks are performed
+    on *store* only.
+
+    Args:
+        store: The Zarr store to be wrapped.
+        cache: The chunk cache.
+        name: A name that uniquely identifies *store* in *cache*.
+    """
+
+    _readable = True  # Because the base class is readable
+    _listable = True  # Because the base class is listable
+    _writeable = False  # Because this is not yet supported
+    _erasable = False  # Because this is not yet supported
+
+    def __init__(
+        self,
+        store: collections.abc.MutableMapping,
+        cache: ChunkCache,
+        name: str,
+    ):
+        assert_instance(store, collections.abc.MutableMapping, name="store")
+        assert_instance(cache, ChunkCache, name="cache")
+        assert_instance(name, str, name="name")
+        if not isinstance(store, zarr.storage.BaseStore):
+            store = zarr.storage.KVStore(store)
+        self._store = store
+        self._cache = cache
+        self._name = name
+        self._implement_op("listdir")
+        self._implement_op("getsize")
+
+    @property
+    def store(self) -> zarr.storage.BaseStore:
+        return self._store
+
+    @property
+    def cache(self) -> ChunkCache:
+        return self._cache
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def _implement_op(self, op: str):
+        if hasattr(self._store, op):
+            assert hasattr(self, "_" + op)
+            setattr(self, op, getattr(self, "_" + op))
+
+    def _listdir(self, path: str = "") -> list[str]:
+        # noinspection PyUnresolvedReferences
+        return self._store.listdir(path=path)
+
+    def _getsize(self, path: str) -> int:
+        # noinspection PyUnresolvedReferences
+        return self._store.getsize(path)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store)
+
+    def __contains__(self, key: str):
+        return key in self._store
+
+    def __getitem__(self, key: str) -> bytes:
+        value = self._cache.get(self._name, key)
+        if value is None:
+            value = self._store[key]
+            self._cache.put(self._name, key, value)
+        return value
+
+    def __setitem__(self, key: str, value: bytes) -> None:
+        raise NotImplementedError()
+
+    def __delitem__(self, key: str) -> None:
+        raise NotImplementedError()
+
+
+_chunk_cache: Optional[ChunkCache] = None
+
+
+def get_chunk_cache() -> Optional[ChunkCache]:
+    """Get the process-wide chunk cache, if any.
+
+    Returns:
+        The chunk cache set by :func:`set_chunk_cache` or None.
+    """
+    return _chunk_cache
+
+
+def set_chunk_cache(chunk_cache: Optional[ChunkCache]):
+    """Set the process-wide chunk cache.
+
+    The process-wide chunk cache is used by data stores
+    when opening Zarr datasets with parameter ``chunk_cache=True``.
+
+    Args:
+        chunk_cache: The chunk cache or None to disable it.
+    """
+    global _chunk_cache
+    if chunk_cache is not None:
+        assert_instance(chunk_cache, ChunkCache, name="chunk_cache")
+    _chunk_cache = chunk_cache
+
+
+def _get_size(value: Any) -> int:
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    try:
+        return len(value)
+    except TypeError:
+        return 0
@@ -0,0 +1,301 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import bisect
+import itertools
+from typing import Any, Callable, Optional, Union
+
+import dask.array as da
+import dask.core
+import numpy as np
+import xarray as xr
+from dask.base import tokenize
+from dask.core import flatten
+from dask.core import get_dependencies
+from dask.highlevelgraph import HighLevelGraph
+
+from xcube.util.assertions import assert_instance
+from .chunkcache import ChunkCache
+
+_Key = Union[int, slice, tuple[Union[int, slice], ...]]
+
+
+class DecodedChunkArray:
+    """A read-only array-like that reads the chunks of the
+    chunked array *array* through the given chunk *cache*.
+
+    In contrast to :class:`ChunkCacheStore`, which caches the
+    encoded, usually compressed values of a Zarr store, the cache
+    holds decoded chunks as NumPy arrays, so cache hits require
+    neither decompression nor decoding.
+
+    Cached chunks are keyed by *store_name* and
+    ``"{array_name}/{chunk_shape}/{chunk_index}"``, e.g.,
+    ``"chl/1x180x360/0.1.0"``. They are made read-only, so that
+    they, and the views of them returned by this array, can be
+    shared without being copied.
+
+    Chunks that are not cached are computed using the scheduler
+    configured by the caller, e.g., by ``dask.config.set()``.
+
+    Args:
+        array: A chunked array, usually the Dask array
+            of a dataset variable.
+        cache: The chunk cache.
+        store_name: A name that uniquely identifies the
+            store or dataset *array* belongs to, e.g., its URL.
+        array_name: A name that uniquely identifies *array*
+            within the store, e.g., the variable name.
+    """
+
+    def __init__(
+        self,
+        array: da.Array,
+        cache: ChunkCache,
+        store_name: str,
+        array_name: str,
+    ):
+        assert_instance(array, da.Array, name="array")
+        assert_instance(cache, ChunkCache, name="cache")
+        assert_instance(store_name, str, name="store_name")
+        assert_instance(array_name, str, name="array_name")
+        self._array = array
+        self._cache = cache
+        self._store_name = store_name
+        chunk_shape = "x".join(str(c[0]) if c else "0" for c in array.chunks)
+        self._key_prefix = f"{array_name}/{chunk_shape}/"
+        self._chunk_offsets = tuple(
+            (0,) + tuple(itertools.accumulate(c)) for c in array.chunks
+        )
+
+    @property
+    def array(self) -> da.Array:
+        return self._array
+
+    @property
+    def cache(self) -> ChunkCache:
+        return self._cache
+
+    @property
+    def store_name(self) -> str:
+        return self._store_name
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self._array.shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._array.dtype
+
+    @property
+    def ndim(self) -> int:
+        return self._array.ndim
+
+    @property
+    def chunks(self) -> tuple[tuple[int, ...], ...]:
+        return self._array.chunks
+
+    def get_chunk(self, chunk_index: tuple[int, ...]) -> np.ndarray:
+        """Get the read-only, decoded chunk at *chunk_index*."""
+        return self._get_chunk(
+            chunk_index, lambda: self._array.blocks[chunk_index].compute()
+        )
+
+    def _get_chunk(
+        self, chunk_index: tuple[int, ...], load_chunk: Callable[[], Any]
+    ) -> np.ndarray:
+        key = self._key_prefix + ".".join(map(str, chunk_index))
+        chunk = self._cache.get(self._store_name, key)
+        if chunk is None:
+            chunk = np.asarray(load_chunk())
+            chunk.flags.writeable = False
+            self._cache.put(self._store_name, key, chunk)
+        return chunk
+
+    def __getitem__(self, key: _Key) -> np.ndarray:
+        chunk_key = self._get_chunk_key(key)
+        if chunk_key is None:
+            # Not contained in a single chunk
+            return np.asarray(self._array[key].compute())
+        chunk_index, chunk_slices = chunk_key
+        return self.get_chunk(chunk_index)[chunk_slices]
+
+    def __array__(self, dtype: Any = None, copy: Optional[bool] = None):
+        array = self[tuple(slice(None) for _ in range(self.ndim))]
+        if dtype is not None:
+            return array.astype(dtype)
+        return array.copy() if copy else array
+
+    def _get_chunk_key(
+        self, key: _Key
+    ) -> Optional[tuple[tuple[int, ...], tuple[Union[int, slice], ...]]]:
+        key = key if isinstance(key, tuple) else (key,)
+        if len(key) > self.ndim or any(
+            not isinstance(k, (int, np.integer, slice)) for k in key
+        ):
+            return None
+        key = key + (slice(None),) * (self.ndim - len(key))
+        chunk_index = []
+        chunk_slices = []
+        for k, size, offsets in zip(key, self.shape, self._chunk_offsets):
+            if isinstance(k, slice):
+                start, stop, step = k.indices(size)
+                if step != 1 or stop <= start:
+                    return None
+            else:
+                start = int(k) + size if k < 0 else int(k)
+                stop = start + 1
+            i = bisect.bisect_right(offsets, start) - 1
+            if stop > offsets[i + 1]:
+                return None
+            offset = offsets[i]
+            chunk_index.append(i)
+            chunk_slices.append(
+                slice(start - offset, stop - offset)
+                if isinstance(k, slice)
+                else start - offset
+            )
+        return tuple(chunk_index), tuple(chunk_slices)
+
+
+def cache_decoded_chunks(
+    dataset: xr.Dataset, cache: ChunkCache, store_name: str
+) -> xr.Dataset:
+    """Let the chunked data variables of *dataset* read their
+    decoded chunks through the given chunk *cache*.
+
+    Each Dask-backed data variable is replaced by a Dask array
+    with the same chunks whose tasks look up the decoded chunks
+    in *cache*. Only on a cache miss, a task runs the task of the
+    original chunk. The dependencies of the original chunk tasks,
+    e.g., the opened Zarr arrays, are dependencies of the new tasks,
+    so no computation is nested in another one.
+
+    The tasks of the new Dask arrays yield read-only views of
+    the cached chunks rather than copies. Hence, functions applied
+    to the blocks of these arrays must not modify them in place.
+
+    Args:
+        dataset: The dataset, e.g., opened from Zarr.
+        cache: The chunk cache.
+        store_name: A name that uniquely identifies *dataset*,
+            e.g., its URL.
+
+    Returns:
+        A new dataset whose chunked data variables read through *cache*.
+    """
+    assert_instance(dataset, xr.Dataset, name="dataset")
+    assert_instance(cache, ChunkCache, name="cache")
+    cached_vars = {}
+    for var_name, var in dataset.data_vars.items():
+        if not isinstance(var.data, da.Array):
+            continue
+        cached_vars[var_name] = var.copy(
+            data=_cache_decoded_chunks(var.data, cache, store_name, str(var_name))
+        )
+    if not cached_vars:
+        return dataset
+    return dataset.assign(cached_vars)
+
+
+def _cache_decoded_chunks(
+    array: da.Array, cache: ChunkCache, store_name: str, array_name: str
+) -> da.Array:
+    decoded_array = DecodedChunkArray(array, cache, store_name, array_name)
+    name = "decoded-chunks-" + tokenize(store_name, array_name, array.name)
+    graph = array.__dask_graph__()
+    layer = {}
+    dep_layer_names = set()
+    for key in flatten(array.__dask_keys__()):
+        dep_keys = list(get_dependencies(graph, key))
+        chunk_task = _DecodedChunkTask(
+            decoded_array, key[1:], key, graph[key], dep_keys
+        )
+        layer[(name, *key[1:])] = (chunk_task, *dep_keys)
+        dep_layer_names.update(_get_layer_name(graph, k) for k in dep_keys)
+    # The new layer depends on the dependencies of the original
+    # chunks rather than on the original chunks, so these are
+    # neither computed nor fused with their dependencies.
+    graph = HighLevelGraph(
+        {**graph.layers, name: layer},
+        {**graph.dependencies, name: dep_layer_names},
+    )
+    return da.Array(
+        graph,
+        name,
+        chunks=array.chunks,
+        meta=np.empty((0,) * array.ndim, dtype=array.dtype),
+    )
+
+
+def _get_layer_name(graph: HighLevelGraph, key: Any) -> str:
+    name = key[0] if isinstance(key, tuple) else key
+    if name in graph.layers and key in graph.layers[name]:
+        return name
+    return next(n for n, layer in graph.layers.items() if key in layer)
+
+
+class _DecodedChunkTask:
+    """Gets a decoded chunk from the cache of *decoded_array*.
+    On a cache miss, runs *task*, the task of the original chunk,
+    given the values of its dependencies.
+    """
+
+    def __init__(
+        self,
+        decoded_array: DecodedChunkArray,
+        chunk_index: tuple[int, ...],
+        key: Any,
+        task: Any,
+        dep_keys: list[Any],
+    ):
+        self._decoded_array = decoded_array
+        self._chunk_index = chunk_index
+        self._key = key
+        self._task = task
+        self._dep_keys = dep_keys
+
+    def __call__(self, *dep_values: Any) -> np.ndarray:
+        # dask.core.get() evaluates the single task in this thread,
+        # it is not a scheduler
+        return self._decoded_array._get_chunk(
+            self._chunk_index,
+            lambda: dask.core.get(
+                {self._key: self._task},
+                [self._key],
+                cache=dict(zip(self._dep_keys, dep_values)),
+            )[0],
+        )
+
+
+_decoded_chunk_cache: Optional[ChunkCache] = None
+
+
+def get_decoded_chunk_cache() -> Optional[ChunkCache]:
+    """Get the process-wide cache for decoded chunks, if any.
+
+    Returns:
+        The chunk cache set by :func:`set_decoded_chunk_cache` or None.
+    """
+    return _decoded_chunk_cache
+
+
+def set_decoded_chunk_cache(decoded_chunk_cache: Optional[ChunkCache]):
+    """Set the process-wide cache for decoded chunks.
+
+    The process-wide cache for decoded chunks is used by data stores
+    when opening Zarr datasets with parameter
+    ``decoded_chunk_cache=True``. It should be a different
+    instance than the one set by :func:`set_chunk_cache`.
+
+    Args:
+        decoded_chunk_cache: The chunk cache or None to disable it.
+    """
+    global _decoded_chunk_cache
+    if decoded_chunk_cache is not None:
+        assert_instance(
+            decoded_chunk_cache, ChunkCache, name="decoded_chunk_cache"
+        )
+    _decoded_chunk_cache = decoded_chunk_cache
@@ -184,6 +184,7 @@ def _register_cli_commands(ext_registry: extension.ExtensionRegistry):
         "rectify",
         "resample",
         "serve",
+        "tiles",
         "vars2dim",
         "verify",
         "versions",
@@ -18,7 +18,7 @@ from typing import (
     Union,
     Callable,
 )
-from collections.abc import Sequence, Awaitable, Mapping
+from collections.abc import Sequence, Awaitable, Mapping, Hashable, Iterable
 
 from .asyncexec import AsyncExecution
 from ..util.assertions import assert_instance
@@ -28,6 +28,7 @@ from ..util.jsonschema import JsonObjectSchema
 
 _SERVER_CONTEXT_ATTR_NAME = "__xcube_server_context"
 _HTTP_METHODS = {"head", "get", "post", "put", "delete", "options"}
+_END_OF_STREAM = object()
 
 ArgT = TypeVar("ArgT")
 ReturnT = TypeVar("ReturnT")
@@ -416,6 +417,54 @@ class Context(AsyncExecution, ABC):
             exists.
         """
 
+    def get_api_executor(
+        self, api_ctx: "Context"
+    ) -> Optional[concurrent.futures.Executor]:
+        """Get the executor configured for the API
+        whose context is *api_ctx*.
+        The default implementation returns ``None``.
+
+        Args:
+            api_ctx: The context of an API.
+
+        Returns:
+            The API's executor or ``None``, if the API
+            shall use the framework's default executor.
+        """
+        return None
+
+    def run_in_executor_shared(
+        self,
+        key: Hashable,
+        executor: Optional[concurrent.futures.Executor],
+        function: Callable[..., ReturnT],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Awaitable[ReturnT]:
+        """Like ``run_in_executor()``, but concurrent calls using an
+        equal *key* share a single, pending invocation of *function*,
+        hence all of them await the same result.
+
+        The *key* should identify the request that is being processed,
+        e.g., by the operation and its normalized parameters.
+        Cancelling a caller does not affect the others. Once all
+        callers have been cancelled, the invocation is cancelled,
+        unless it is already running.
+        The default implementation does not share invocations
+        and just calls ``run_in_executor()``.
+
+        Args:
+            key: A hashable key that identifies the invocation.
+            executor: An optional executor.
+            function: The function to be run concurrently.
+            *args: Positional arguments passed to *function*.
+            **kwargs: Keyword arguments passed to *function*.
+
+        Returns:
+            The awaitable return value of *function*.
+        """
+        return self.run_in_executor(executor, function, *args, **kwargs)
+
     @abstractmethod
     def on_update(self, prev_context: Optional["Context"]):
         """Called when the server configuration changed.
@@ -505,9 +554,32 @@ class ApiContext(Context):
         *args: Any,
         **kwargs: Any,
     ) -> Awaitable[ReturnT]:
-        """Calls the server context's ``run_in_executor()`` method."""
+        """Calls the server context's ``run_in_executor()`` method.
+        If *executor* is ``None``, the executor configured for
+        this context's API is used, if any.
+        """
+        if executor is None:
+            executor = self.server_ctx.get_api_executor(self)
         return self.server_ctx.run_in_executor(executor, function, *args, **kwargs)
 
+    def run_in_executor_shared(
+        self,
+        key: Hashable,
+        executor: Optional[concurrent.futures.Executor],
+        function: Callable[..., ReturnT],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Awaitable[ReturnT]:
+        """Calls the server context's ``run_in_executor_shared()`` method.
+        If *executor* is ``None``, the executor configured for
+        this context's API is used, if any.
+        """
+        if executor is None:
+            executor = self.server_ctx.get_api_executor(self)
+        return self.server_ctx.run_in_executor_shared(
+            key, executor, function, *args, **kwargs
+        )
+
     def on_update(self, prev_context: Optional["Context"]):
         """Does nothing."""
 
@@ -635,6 +707,12 @@ class ApiResponse(ABC):
     def write(self, data: Union[str, bytes, JSON], content_type: Optional[str] = None):
         """Write data."""
 
+    async def flush(self):
+        """Send the data written so far to the client.
+        Used to stream large responses in chunks.
+        The default implementation does nothing.
+        """
+
     @abstractmethod
     def finish(
         self, data: Union[str, bytes, JSON] = None, content_type: Optional[str] = None
@@ -697,6 +775,70 @@ class ApiHandler(Generic[ServerContextT], ABC):
             if hasattr(getattr(cls, name), "__openapi__")
         ]
 
+    def get_etag(self, *args, **kwargs) -> Optional[str]:
+        """Get an entity tag (ETag) for the response of the
+        GET method of this handler.
+
+        The method is called with the same arguments as ``get()``
+        but before ``get()`` is invoked.
+        It should return a cheap fingerprint of the response's
+        content, e.g., a hash computed from the request parameters,
+        the relevant configuration, and the version of the data,
+        without computing the response itself. The ETag must change
+        whenever the response would change. As the method is called
+        on the server's IO loop, it must neither block on network
+        access nor wait for locks held by other requests.
+
+        If an ETag is returned, it is set as response header
+        together with the ``Cache-Control`` header given by
+        :attr:`cache_control`. If the ETag matches the request's
+        ``If-None-Match`` header, the server responds
+        with status 304 (Not Modified) without invoking ``get()``.
+
+        The default implementation returns ``None``.
+
+        Returns:
+            The entity tag or ``None``.
+        """
+        return None
+
+    async def stream_response(
+        self, chunks: Iterable[bytes], content_type: Optional[str] = None
+    ):
+        """Write the given *chunks* to the response and finish it.
+
+        The chunks are produced by iterating *chunks* in the
+        context's executor, so that other requests are served
+        meanwhile. Every chunk is sent to the client before the
+        next one is produced. Empty chunks are skipped.
+
+        Args:
+            chunks: An iterable of the response's chunks,
+                e.g., a generator that encodes them lazily.
+            content_type: Optional value of the
+                ``Content-Type`` response header.
+        """
+        if content_type is not None:
+            self.response.set_header("Content-Type", content_type)
+        iterator = iter(chunks)
+        while True:
+            chunk = await self.ctx.run_in_executor(
+                None, next, iterator, _END_OF_STREAM
+            )
+            if chunk is _END_OF_STREAM:
+                break
+            if chunk:
+                self.response.write(chunk)
+                await self.response.flush()
+        await self.response.finish()
+
+    cache_control: str = "no-cache"
+    """The value of the ``Cache-Control`` response header
+    that is set, if :meth:`get_etag` returns an entity tag.
+    The default ``"no-cache"`` lets clients cache responses
+    but forces them to revalidate them.
+    """
+
     # HTTP methods
 
     def head(self, *args, **kwargs):
@@ -866,6 +1008,7 @@ class ApiError(Exception):
     ContentTooLarge: type["_DerivedApiError"]
     InternalServerError: type["_DerivedApiError"]
     NotImplemented: type["_DerivedApiError"]
+    ServiceUnavailable: type["_DerivedApiError"]
     InvalidServerConfig: type["_DerivedApiError"]
     UnsupportedMediaType: type["_DerivedApiError"]
 
@@ -944,6 +1087,11 @@ class _NotImplemented(ApiError):
         super().__init__(501, message=message)
 
 
+class _ServiceUnavailable(ApiError):
+    def __init__(self, message: Optional[str] = None):
+        super().__init__(503, message=message)
+
+
 class _InvalidServerConfig(ApiError):
     def __init__(self, message: Optional[str] = None):
         super().__init__(580, message=message)
@@ -959,5 +1107,6 @@ ApiError.Conflict = _Conflict
 ApiError.Gone = _Gone
 ApiError.InternalServerError = _InternalServerError
 ApiError.NotImplemented = _NotImplemented
+ApiError.ServiceUnavailable = _ServiceUnavailable
 ApiError.InvalidServerConfig = _InvalidServerConfig
 ApiError.ContentTooLarge = _ContentTooLarge
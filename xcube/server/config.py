@@ -59,6 +59,30 @@ BASE_SERVER_CONFIG_SCHEMA = JsonObjectSchema(
                 additional_properties=False,
             ),
         ),
+        executors=JsonObjectSchema(
+            title="Named executors used to run the requests of APIs",
+            description="APIs not assigned to any executor"
+            " use the web server's default executor.",
+            additional_properties=JsonObjectSchema(
+                properties=dict(
+                    apis=JsonArraySchema(
+                        JsonStringSchema(min_length=1),
+                        title="Names of the APIs using the executor",
+                    ),
+                    max_workers=JsonIntegerSchema(
+                        title="Maximum number of worker threads", minimum=1
+                    ),
+                    max_queue_size=JsonIntegerSchema(
+                        title="Maximum number of requests waiting for"
+                        " a worker thread. Further requests"
+                        " are rejected with HTTP status 503.",
+                        minimum=0,
+                    ),
+                ),
+                required=["apis"],
+                additional_properties=False,
+            ),
+        ),
         api_spec=JsonObjectSchema(
             title="API specification",
             description="selected = (includes | ALL) - (excludes | NONE)",
@@ -0,0 +1,79 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import concurrent.futures
+import threading
+from typing import Any, Callable, Optional
+
+from .api import ApiError
+
+
+class BoundedThreadPoolExecutor(concurrent.futures.ThreadPoolExecutor):
+    """A thread pool executor that limits the number of tasks
+    waiting for a free worker thread.
+
+    If *max_queue_size* tasks are already waiting, ``submit()``
+    raises ``ApiError.ServiceUnavailable``, so the current request
+    is rejected with HTTP status 503.
+
+    Args:
+        max_workers: Maximum number of worker threads.
+        max_queue_size: Maximum number of waiting tasks.
+            If not given, the number is not limited.
+        thread_name_prefix: Optional prefix for the names
+            of the worker threads.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+        thread_name_prefix: str = "",
+    ):
+        super().__init__(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self._max_queue_size = max_queue_size
+        self._num_tasks = 0
+        self._num_tasks_lock = threading.Lock()
+
+    @property
+    def max_workers(self) -> int:
+        """Maximum number of worker threads."""
+        return self._max_workers
+
+    @property
+    def max_queue_size(self) -> Optional[int]:
+        """Maximum number of waiting tasks, or None if unlimited."""
+        return self._max_queue_size
+
+    @property
+    def num_tasks(self) -> int:
+        """Number of tasks that are either running or waiting."""
+        return self._num_tasks
+
+    def submit(
+        self, fn: Callable, /, *args: Any, **kwargs: Any
+    ) -> concurrent.futures.Future:
+        with self._num_tasks_lock:
+            if (
+                self._max_queue_size is not None
+                and self._num_tasks >= self._max_workers + self._max_queue_size
+            ):
+                raise ApiError.ServiceUnavailable(
+                    f"too many pending requests,"
+                    f" limit of {self._max_queue_size} exceeded"
+                )
+            self._num_tasks += 1
+        try:
+            future = super().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._on_task_done(None)
+            raise
+        future.add_done_callback(self._on_task_done)
+        return future
+
+    def _on_task_done(self, _future: Optional[concurrent.futures.Future]):
+        with self._num_tasks_lock:
+            self._num_tasks -= 1
@@ -2,9 +2,11 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
+import asyncio
 import collections.abc
 import concurrent.futures
 import copy
+import threading
 from typing import (
     Optional,
     Dict,
@@ -15,7 +17,7 @@ from typing import (
     Type,
     List,
 )
-from collections.abc import Sequence, Awaitable, Mapping
+from collections.abc import Sequence, Awaitable, Mapping, Hashable
 
 import jsonschema.exceptions
 
@@ -39,6 +41,7 @@ from .asyncexec import AsyncExecution
 from .config import BASE_SERVER_CONFIG_SCHEMA
 from .config import get_url_prefix
 from .config import resolve_config_path
+from .executor import BoundedThreadPoolExecutor
 from .framework import Framework
 from ..util.frozen import FrozenDict
 
@@ -447,6 +450,12 @@ class ServerContext(Context):
         self._server = server
         self._config = FrozenDict.freeze(config)
         self._api_contexts: dict[str, Context] = dict()
+        # Maps keys of shared calls to pairs [future, number of waiters]
+        self._shared_calls: dict[Hashable, list] = dict()
+        self._shared_calls_lock = threading.RLock()
+        self._executors: Optional[dict[str, concurrent.futures.Executor]] = None
+        # Maps API names to executors
+        self._api_executors: dict[str, concurrent.futures.Executor] = dict()
 
     @property
     def server(self) -> Server:
@@ -478,6 +487,42 @@ class ServerContext(Context):
         )
         self._api_contexts[api_name] = api_ctx
         setattr(self, api_name, api_ctx)
+        executor = self._get_executor_for_api(api_name)
+        if executor is not None:
+            self._api_executors[api_name] = executor
+
+    def get_api_executor(
+        self, api_ctx: Context
+    ) -> Optional[concurrent.futures.Executor]:
+        for api_name, executor in self._api_executors.items():
+            if self._api_contexts.get(api_name) is api_ctx:
+                return executor
+        return None
+
+    def _get_executor_for_api(
+        self, api_name: str
+    ) -> Optional[concurrent.futures.Executor]:
+        executors = self._get_executors()
+        for executor_name, executor_config in self._config.get(
+            "executors", {}
+        ).items():
+            if api_name in executor_config["apis"]:
+                return executors[executor_name]
+        return None
+
+    def _get_executors(self) -> dict[str, concurrent.futures.Executor]:
+        if self._executors is None:
+            self._executors = {
+                executor_name: BoundedThreadPoolExecutor(
+                    max_workers=executor_config.get("max_workers"),
+                    max_queue_size=executor_config.get("max_queue_size"),
+                    thread_name_prefix=f"xcube-{executor_name}",
+                )
+                for executor_name, executor_config in self._config.get(
+                    "executors", {}
+                ).items()
+            }
+        return self._executors
 
     def call_later(
         self, delay: Union[int, float], callback: Callable, *args, **kwargs
@@ -493,11 +538,65 @@ class ServerContext(Context):
     ) -> Awaitable[ReturnT]:
         return self._server.run_in_executor(executor, function, *args, **kwargs)
 
+    def run_in_executor_shared(
+        self,
+        key: Hashable,
+        executor: Optional[concurrent.futures.Executor],
+        function: Callable[..., ReturnT],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Awaitable[ReturnT]:
+        with self._shared_calls_lock:
+            shared_call = self._shared_calls.get(key)
+            if shared_call is None:
+                future = self.run_in_executor(executor, function, *args, **kwargs)
+                shared_call = [future, 0]
+                self._shared_calls[key] = shared_call
+
+                def remove_shared_call(_):
+                    with self._shared_calls_lock:
+                        if self._shared_calls.get(key) is shared_call:
+                            del self._shared_calls[key]
+
+                future.add_done_callback(remove_shared_call)
+            future = shared_call[0]
+            if not isinstance(future, asyncio.Future):
+                return future
+            shared_call[1] += 1
+        return self._await_shared_call(key, shared_call)
+
+    async def _await_shared_call(self, key: Hashable, shared_call: list):
+        future = shared_call[0]
+        cancelled = False
+        try:
+            # Cancelling one of the callers, e.g., because its client
+            # disconnected, must not cancel the call for the others
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            with self._shared_calls_lock:
+                shared_call[1] -= 1
+                if cancelled and shared_call[1] == 0 and not future.done():
+                    # The last caller has been cancelled, so cancel
+                    # the call, unless it is already running.
+                    # New callers must not share it anymore.
+                    if self._shared_calls.get(key) is shared_call:
+                        del self._shared_calls[key]
+                    future.cancel()
+
     def on_update(self, prev_ctx: Optional["ServerContext"]):
         if prev_ctx is None:
             LOG.info(f"Applying initial configuration...")
         else:
             LOG.info(f"Applying configuration changes...")
+            if prev_ctx._executors is not None:
+                if prev_ctx.config.get("executors") == self.config.get("executors"):
+                    # Keep executors, so pending requests remain in their queues
+                    self._executors = prev_ctx._executors
+                else:
+                    prev_ctx._shutdown_executors()
         for api in self.apis:
             prev_api_ctx: Optional[ApiContext] = None
             if prev_ctx is not None:
@@ -517,3 +616,11 @@ class ServerContext(Context):
             api_ctx = self.get_api_ctx(api_name)
             if api_ctx is not None:
                 api_ctx.on_dispose()
+        self._shutdown_executors()
+
+    def _shutdown_executors(self):
+        if self._executors is not None:
+            for executor in self._executors.values():
+                # Running and pending tasks will still be completed
+                executor.shutdown(wait=False)
+            self._executors = None
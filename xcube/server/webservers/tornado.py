@@ -300,6 +300,8 @@ class TornadoRequestHandler(tornado.web.RequestHandler):
             TornadoApiResponse(self),
             **api_route.handler_kwargs,
         )
+        self._task: Optional[asyncio.Task] = None
+        self._connection_closed = False
 
     def set_default_headers(self):
         self.set_header("Server", f"xcube-server/{version}")
@@ -346,15 +348,43 @@ class TornadoRequestHandler(tornado.web.RequestHandler):
     async def options(self, *args, **kwargs):
         await self._call_method("options", *args, **kwargs)
 
+    def on_connection_close(self):
+        # The client went away, so cancel the current request.
+        # This also cancels any work that is still waiting for
+        # an executor's worker thread.
+        self._connection_closed = True
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
     async def _call_method(self, method_name: str, *args, **kwargs):
         method = getattr(self._api_handler, method_name)
+        self._task = asyncio.current_task()
         try:
+            if method_name == "get" and self._is_not_modified(*args, **kwargs):
+                self.set_status(304)
+                await self.finish()
+                return
             if asyncio.iscoroutinefunction(method):
                 await method(*args, **kwargs)
             else:
                 method(*args, **kwargs)
         except ApiError as e:
             raise tornado.web.HTTPError(e.status_code, log_message=e.message) from e
+        except asyncio.CancelledError:
+            if self._connection_closed:
+                LOG.debug(f"Request cancelled: {self.request.uri}")
+                return
+            raise
+        finally:
+            self._task = None
+
+    def _is_not_modified(self, *args, **kwargs) -> bool:
+        etag = self._api_handler.get_etag(*args, **kwargs)
+        if etag is None:
+            return False
+        self.set_header("Etag", f'"{etag}"')
+        self.set_header("Cache-Control", self._api_handler.cache_control)
+        return self.check_etag_header()
 
 
 class TornadoApiRequest(ApiRequest):
@@ -469,6 +499,9 @@ class TornadoApiResponse(ApiResponse):
         if content_type is not None:
             self._handler.set_header("Content-Type", content_type)
 
+    async def flush(self):
+        await self._handler.flush()
+
     def finish(
         self, data: Union[str, bytes, JSON] = None, content_type: Optional[str] = None
     ):
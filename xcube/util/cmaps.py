@@ -3,9 +3,12 @@
 # https://opensource.org/licenses/MIT.
 
 import base64
+import collections
 import io
 import json
+import math
 import os
+import threading
 from abc import ABC, abstractmethod
 from functools import cached_property
 from typing import Dict, Tuple, List, Optional, Any, Union
@@ -31,6 +34,11 @@ REVERSED_SUFFIX = "_r"  # Used by ocm / Ocean
 
 DEFAULT_CMAP_NAME = "viridis"
 
+MAX_NUM_CMAP_LUTS = 1024
+"""Maximum number of color lookup tables cached
+by a :class:`ColormapRegistry`.
+"""
+
 
 # Have colormaps separated into categories taken from
 # https://matplotlib.org/stable/gallery/color/colormap_reference.html
@@ -281,6 +289,119 @@ class Colormap:
         return self._bounds
 
 
+class ColormapLut:
+    """A lookup table that maps data values to RGBA colors.
+
+    Data values are mapped to indexes into the table of *colors*
+    by the bins given by the sorted *edges*. A value *v* falls into
+    bin *i*, if ``edges[i - 1] <= v < edges[i]``. The last entry of
+    *colors* is used for NaN values.
+
+    Use :meth:`new` to create a lookup table that reproduces the
+    colors of a matplotlib colormap applied to normalized values.
+
+    Args:
+        edges: 1D array of sorted bin edges.
+        colors: Array of uint8 RGBA colors of shape
+            ``(len(edges) + 2, 4)``.
+    """
+
+    def __init__(self, edges: np.ndarray, colors: np.ndarray):
+        assert edges.ndim == 1
+        assert colors.shape == (edges.size + 2, 4)
+        assert colors.dtype == np.uint8
+        self._edges = edges
+        self._colors = colors
+
+    @classmethod
+    def new(
+        cls,
+        cmap: matplotlib.colors.Colormap,
+        colormap: Optional["Colormap"],
+        cmap_norm: Optional[str],
+        value_range: tuple[float, float],
+    ) -> "ColormapLut":
+        """Create a new lookup table for the given
+        matplotlib colormap *cmap*, normalisation *cmap_norm*,
+        and *value_range*.
+
+        If *cmap_norm* is ``"cat"`` and the *colormap* has bounds,
+        the bounds are used as bin edges. Otherwise, the bins are
+        given by the colors of *cmap* over the value range,
+        using a linear or logarithmic normalisation.
+
+        Args:
+            cmap: Matplotlib colormap.
+            colormap: Colormap object, may provide bounds.
+            cmap_norm: Color map normalisation. One of "lin" (linear),
+                "log" (logarithmic), "cat" (categorical).
+            value_range: Value range of the continuous normalisation.
+
+        Returns:
+            A new lookup table.
+        """
+        if cmap_norm == "cat" and colormap is not None and colormap.bounds:
+            norm = matplotlib.colors.BoundaryNorm(
+                colormap.bounds, ncolors=cmap.N, clip=False
+            )
+            edges = np.array(colormap.bounds, dtype=np.float64)
+            # Use a value of each bin to let matplotlib
+            # determine its color, including under and over colors.
+            bin_values = np.concatenate(
+                [[np.nextafter(edges[0], -np.inf)], edges, [np.nan]]
+            )
+            rgba = cmap(norm(bin_values))
+        else:
+            norm = get_continuous_norm(value_range, cmap_norm)
+            edges = np.asarray(
+                norm.inverse(np.arange(1, cmap.N) / cmap.N), dtype=np.float64
+            )
+            rgba = np.concatenate(
+                [cmap(np.arange(cmap.N)), cmap(norm(np.array([np.nan])))]
+            )
+        # Same conversion as applied to matplotlib's float colors
+        colors = (255 * rgba).astype(np.uint8)
+        return ColormapLut(edges, colors)
+
+    @property
+    def edges(self) -> np.ndarray:
+        """The sorted bin edges."""
+        return self._edges
+
+    @property
+    def colors(self) -> np.ndarray:
+        """The uint8 RGBA colors, one per bin plus one for NaN values."""
+        return self._colors
+
+    def get_indexes(self, values: np.ndarray) -> np.ndarray:
+        """Get the indexes into :attr:`colors` for given *values*."""
+        indexes = np.searchsorted(self._edges, values, side="right")
+        indexes[np.isnan(values)] = self._colors.shape[0] - 1
+        return indexes
+
+    def map(self, values: np.ndarray) -> np.ndarray:
+        """Map the given *values* to uint8 RGBA colors.
+        The returned array has the shape of *values*
+        plus a trailing dimension of size 4.
+        """
+        return self._colors.take(self.get_indexes(values), axis=0)
+
+    @cached_property
+    def palette(self) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        """A palette for the :attr:`colors`, if there are at most
+        256 distinct ones, otherwise ``None``.
+        The palette is a pair comprising a uint8 array that maps
+        indexes into :attr:`colors` to indexes into the palette,
+        and the uint8 RGBA colors of the palette.
+        """
+        palette_colors, palette_indexes = np.unique(
+            self._colors, axis=0, return_inverse=True
+        )
+        if palette_colors.shape[0] > 256:
+            return None
+        return palette_indexes.reshape(-1).astype(np.uint8), palette_colors
+
+
 class ColormapProvider(ABC):
     @abstractmethod
     def get_cmap(
@@ -309,11 +430,39 @@ class ColormapProvider(ABC):
             the given *cm_name* suffix(es), and the base colormap object.
         """
 
+    def get_cmap_lut(
+        self,
+        cm_name: str,
+        cmap_norm: Optional[str],
+        value_range: tuple[float, float],
+    ) -> ColormapLut:
+        """Get a color lookup table for the given *cm_name*,
+        colormap normalisation *cmap_norm*, and *value_range*.
+
+        The default implementation creates a new lookup table
+        from the colormap returned by :meth:`get_cmap`.
+
+        Args:
+            cm_name: Colormap name.
+            cmap_norm: Color map normalisation. One of "lin" (linear),
+                "log" (logarithmic), "cat" (categorical).
+            value_range: Value range of the continuous normalisation.
+
+        Returns:
+            The color lookup table.
+        """
+        cmap, colormap = self.get_cmap(cm_name)
+        return ColormapLut.new(cmap, colormap, cmap_norm, value_range)
+
 
 class ColormapRegistry(ColormapProvider):
     def __init__(self, *colormaps: Colormap):
         self._categories: dict[str, ColormapCategory] = {}
         self._colormaps: dict[str, Colormap] = {}
+        self._cmap_luts: collections.OrderedDict[tuple, ColormapLut] = (
+            collections.OrderedDict()
+        )
+        self._cmap_luts_lock = threading.Lock()
         # Add standard Matplotlib colormaps
         self._register_mpl_cmaps()
         # Add Ocean colormaps, if any
@@ -376,6 +525,31 @@ class ColormapRegistry(ColormapProvider):
             cmap = cmap.resampled(num_colors)
         return cmap, colormap
 
+    def get_cmap_lut(
+        self,
+        cm_name: str,
+        cmap_norm: Optional[str],
+        value_range: tuple[float, float],
+    ) -> ColormapLut:
+        """Get a color lookup table for the given *cm_name*,
+        colormap normalisation *cmap_norm*, and *value_range*.
+
+        Lookup tables are cached. The cache keeps up to
+        ``MAX_NUM_CMAP_LUTS`` most recently used tables.
+        """
+        key = cm_name, cmap_norm, tuple(map(float, value_range))
+        with self._cmap_luts_lock:
+            cmap_lut = self._cmap_luts.get(key)
+            if cmap_lut is not None:
+                self._cmap_luts.move_to_end(key)
+                return cmap_lut
+        cmap_lut = super().get_cmap_lut(cm_name, cmap_norm, value_range)
+        with self._cmap_luts_lock:
+            self._cmap_luts[key] = cmap_lut
+            while len(self._cmap_luts) > MAX_NUM_CMAP_LUTS:
+                self._cmap_luts.popitem(last=False)
+        return cmap_lut
+
     def to_json(self) -> list:
         result = []
         # Loop through TEMPLATE_CATEGORIES to preserve category order
@@ -558,6 +732,20 @@ def get_alpha_cmap(
     return cm_name, cmap
 
 
+def get_continuous_norm(
+    value_range: tuple[float, float], cmap_norm: Optional[str]
+) -> matplotlib.colors.Normalize:
+    value_min, value_max = value_range
+    if value_max < value_min:
+        value_min, value_max = value_max, value_min
+    if math.isclose(value_min, value_max):
+        value_max = value_min + 1
+    if cmap_norm == "log":
+        return matplotlib.colors.LogNorm(value_min, value_max, clip=True)
+    else:
+        return matplotlib.colors.Normalize(value_min, value_max, clip=True)
+
+
 def get_cmap_png_base64(cmap: matplotlib.colors.Colormap) -> str:
     gradient = np.linspace(0, 1, 256)
     gradient = np.vstack((gradient,))
@@ -4,6 +4,7 @@
 
 from xcube.util.jsonschema import JsonArraySchema
 from xcube.util.jsonschema import JsonComplexSchema
+from xcube.util.jsonschema import JsonIntegerSchema
 from xcube.util.jsonschema import JsonNumberSchema
 from xcube.util.jsonschema import JsonObjectSchema
 from xcube.webapi.common.schemas import BOOLEAN_SCHEMA
@@ -177,6 +178,25 @@ STYLE_SCHEMA = JsonObjectSchema(
     additional_properties=False,
 )
 
+TIME_SERIES_CACHE_SCHEMA = JsonObjectSchema(
+    properties=dict(
+        Path=PATH_SCHEMA,
+        MaxWorkers=JsonIntegerSchema(minimum=1),
+        TimeChunkSize=JsonIntegerSchema(minimum=1),
+        ChunkSize=CHUNK_SIZE_SCHEMA,
+        MaxSize=CHUNK_SIZE_SCHEMA,
+    ),
+    required=["Path"],
+    additional_properties=False,
+)
+
+DATASET_WARM_UP_SCHEMA = JsonObjectSchema(
+    properties=dict(
+        MaxWorkers=JsonIntegerSchema(minimum=1),
+    ),
+    additional_properties=False,
+)
+
 SERVICE_PROVIDER_SCHEMA = JsonObjectSchema(
     additional_properties=True,
 )
@@ -186,6 +206,10 @@ CONFIG_SCHEMA = JsonObjectSchema(
         DatasetAttribution=ATTRIBUTION_SCHEMA,
         AccessControl=ACCESS_CONTROL_SCHEMA,
         DatasetChunkCacheSize=CHUNK_SIZE_SCHEMA,
+        GlobalChunkCacheSize=CHUNK_SIZE_SCHEMA,
+        DecodedChunkCacheSize=CHUNK_SIZE_SCHEMA,
+        TimeSeriesCache=TIME_SERIES_CACHE_SCHEMA,
+        DatasetWarmUp=DATASET_WARM_UP_SCHEMA,
         Datasets=JsonArraySchema(items=DATASET_CONFIG_SCHEMA),
         DataStores=JsonArraySchema(items=DATA_STORE_SCHEMA),
         Styles=JsonArraySchema(items=STYLE_SCHEMA),
@@ -3,10 +3,16 @@
 # https://opensource.org/licenses/MIT.
 
 
+import concurrent.futures
 import fnmatch
+import hashlib
 import itertools
+import json
 import os
 import os.path
+import threading
+import time
+import uuid
 import warnings
 from functools import cached_property
 from typing import (
@@ -36,18 +42,31 @@ from xcube.core.store import DataStoreConfig
 from xcube.core.store import DataStorePool
 from xcube.core.store import DatasetDescriptor
 from xcube.core.store import MULTI_LEVEL_DATASET_TYPE
+from xcube.core.store.fs.store import BaseFsDataStore
 from xcube.core.tile import get_var_cmap_params
 from xcube.core.tile import get_var_valid_range
+from xcube.core.zarrstore import ChunkCache
+from xcube.core.zarrstore import get_chunk_cache
+from xcube.core.zarrstore import get_decoded_chunk_cache
+from xcube.core.zarrstore import set_chunk_cache
+from xcube.core.zarrstore import set_decoded_chunk_cache
 from xcube.server.api import Context, ApiError
 from xcube.server.api import ServerConfig
 from xcube.server.config import is_absolute_path
+from xcube.server.config import resolve_config_path
 from xcube.util.assertions import assert_given
 from xcube.util.assertions import assert_instance
 from xcube.util.cache import parse_mem_size
 from xcube.util.cmaps import ColormapRegistry
 from xcube.util.cmaps import load_custom_colormap
+from xcube.version import version
 from xcube.webapi.common.context import ResourcesContext
 from xcube.webapi.places import PlacesContext
+from .tscache import DEFAULT_TIME_SERIES_CACHE_MAX_SIZE
+from .tscache import DEFAULT_TIME_SERIES_CACHE_MAX_WORKERS
+from .tscache import DEFAULT_TIME_SERIES_CHUNK_BYTES
+from .tscache import TimeSeriesCache
+from .tscache import get_time_series_fingerprint
 
 COMPUTE_DATASET = "compute_dataset"
 COMPUTE_VARIABLES = "compute_variables"
@@ -65,8 +84,31 @@ NON_MEMORY_FILE_SYSTEMS = ["local", "obs", "file", "s3"]
 
 ALL_PLACES = "all"
 
+DEFAULT_DATASET_WARM_UP_MAX_WORKERS = 4
+"""Default number of datasets warmed up concurrently."""
+
+DATA_VERSION_CHECK_INTERVAL = 10.0
+"""Minimum time in seconds between two checks whether
+the data of a dataset has changed.
+"""
+
+DATA_VERSION_MAX_WORKERS = 4
+"""Number of threads that fetch the data versions of
+datasets from remote data stores in the background.
+"""
+
+# Used in fingerprints computed before the data version of a dataset
+# is known. Unique per process, so that resources cached by other
+# processes or sessions never match such fingerprints.
+_PENDING_DATA_VERSION = f"pending-{uuid.uuid4().hex}"
+
+# File systems whose data versions are fetched by the requesting thread
+_LOCAL_FS_PROTOCOLS = ("file", "local", "memory")
+
 MultiLevelDatasetOpener = Callable[["DatasetsContext", ServerConfig], MultiLevelDataset]
 
+DatasetMetadataFunction = Callable[["DatasetsContext", str], dict[str, Any]]
+
 DatasetConfig = Mapping[str, Any]
 
 
@@ -80,26 +122,117 @@ class DatasetsContext(ResourcesContext):
         # cache for all dataset configs
         # contains tuples of form (MultiLevelDataset, dataset_config)
         self._dataset_cache = dict()
+        # Locks that serialize the opening of individual datasets
+        self._dataset_locks: dict[str, threading.RLock] = dict()
+        # Maps dataset identifiers to tuples (fingerprint, metadata)
+        self._dataset_metadata: dict[str, tuple[str, dict[str, Any]]] = dict()
+        self._warm_up_executor: Optional[concurrent.futures.Executor] = None
+        # Set once disposed, so that datasets opened afterwards,
+        # e.g., by warm-up threads, are closed rather than cached
+        self._disposed = False
+        self._chunk_cache: Optional[ChunkCache] = None
+        self._decoded_chunk_cache: Optional[ChunkCache] = None
         self._data_store_pool, self._dataset_configs = self._process_dataset_configs(
             self.config, self.base_dir
         )
         self._cm_styles, self._colormap_registry = self._get_cm_styles()
+        # Maps dataset identifiers to tuples (data version, fingerprint)
+        self._dataset_fingerprints: dict[str, tuple[Optional[str], str]] = dict()
+        self._dataset_revisions: dict[str, int] = dict()
+        # Maps dataset identifiers to tuples (expiry time, data version)
+        self._dataset_data_versions: dict[str, tuple[float, Optional[str]]] = dict()
+        # Fetches data versions from remote data stores
+        self._data_version_executor: Optional[concurrent.futures.Executor] = None
+        # Identifiers of datasets whose data version is being fetched
+        self._data_version_refreshes: set[str] = set()
+        self._dataset_removed_listeners: list[Callable[[str], Any]] = []
+        self._time_series_cache = self._new_time_series_cache()
+        self._time_series_fingerprints: dict[str, str] = dict()
+        if self._time_series_cache is not None:
+            self.add_dataset_removed_listener(self._time_series_cache.remove_dataset)
+
+    def _new_time_series_cache(self) -> Optional[TimeSeriesCache]:
+        ts_cache_config = self.config.get("TimeSeriesCache")
+        if not ts_cache_config:
+            return None
+        chunk_bytes = self.get_chunk_cache_capacity(ts_cache_config, "ChunkSize")
+        return TimeSeriesCache(
+            resolve_config_path(self.config, ts_cache_config["Path"]),
+            max_workers=ts_cache_config.get(
+                "MaxWorkers", DEFAULT_TIME_SERIES_CACHE_MAX_WORKERS
+            ),
+            time_chunk_size=ts_cache_config.get("TimeChunkSize"),
+            chunk_bytes=chunk_bytes or DEFAULT_TIME_SERIES_CHUNK_BYTES,
+            max_size=(
+                self.get_chunk_cache_capacity(ts_cache_config, "MaxSize")
+                if "MaxSize" in ts_cache_config
+                else DEFAULT_TIME_SERIES_CACHE_MAX_SIZE
+            ),
+        )
+
+    def on_update(self, prev_context: Optional[Context]):
+        chunk_cache_size = self.get_chunk_cache_capacity(
+            self.config, "GlobalChunkCacheSize"
+        )
+        if chunk_cache_size:
+            self._chunk_cache = ChunkCache(chunk_cache_size)
+            # Replaces the cache of the previous context, if any
+            set_chunk_cache(self._chunk_cache)
+        decoded_chunk_cache_size = self.get_chunk_cache_capacity(
+            self.config, "DecodedChunkCacheSize"
+        )
+        if decoded_chunk_cache_size:
+            self._decoded_chunk_cache = ChunkCache(decoded_chunk_cache_size)
+            # Replaces the cache of the previous context, if any
+            set_decoded_chunk_cache(self._decoded_chunk_cache)
+        warm_up_config = self.config.get("DatasetWarmUp")
+        if warm_up_config:
+            # Imported here, because the controllers depend on this module
+            from .controllers import compute_dataset_metadata
+
+            self.warm_up_datasets(
+                compute_dataset_metadata,
+                max_workers=warm_up_config.get(
+                    "MaxWorkers", DEFAULT_DATASET_WARM_UP_MAX_WORKERS
+                ),
+            )
 
     def on_dispose(self):
         with self.rlock:
+            self._disposed = True
+            warm_up_executor = self._warm_up_executor
+            self._warm_up_executor = None
+            if self._data_version_executor is not None:
+                # Do not wait for slow or unreachable data stores
+                self._data_version_executor.shutdown(wait=False, cancel_futures=True)
+                self._data_version_executor = None
+        if warm_up_executor is not None:
+            # Running warm-ups require the lock, so wait outside of it
+            warm_up_executor.shutdown(wait=True, cancel_futures=True)
+        if self._time_series_cache is not None:
+            # Running builds may require the lock too
+            self._time_series_cache.shutdown()
+        with self.rlock:
+            if self._chunk_cache is not None:
+                if get_chunk_cache() is self._chunk_cache:
+                    set_chunk_cache(None)
+                self._chunk_cache = None
+            if self._decoded_chunk_cache is not None:
+                if get_decoded_chunk_cache() is self._decoded_chunk_cache:
+                    set_decoded_chunk_cache(None)
+                self._decoded_chunk_cache = None
             # Close all datasets
             for ml_dataset, _ in self._dataset_cache.values():
-                # noinspection PyBroadException
-                try:
-                    ml_dataset.close()
-                except Exception:
-                    pass
+                _close_ml_dataset(ml_dataset)
             # Clear all caches
-            if self._dataset_cache:
-                self._dataset_cache.clear()
+            self._dataset_cache.clear()
             if self._data_store_pool:
                 self._data_store_pool.remove_all_store_configs()
             self._dataset_configs = None
+            self._dataset_metadata.clear()
+            self._dataset_fingerprints.clear()
+            self._dataset_data_versions.clear()
+            self._dataset_removed_listeners.clear()
 
     @property
     def places_ctx(self):
@@ -109,6 +242,20 @@ class DatasetsContext(ResourcesContext):
     def dataset_cache(self) -> dict[str, tuple[MultiLevelDataset, DatasetConfig]]:
         return self._dataset_cache
 
+    @property
+    def chunk_cache(self) -> Optional[ChunkCache]:
+        """The process-wide chunk cache shared by all datasets,
+        if configured by "GlobalChunkCacheSize".
+        """
+        return self._chunk_cache
+
+    @property
+    def decoded_chunk_cache(self) -> Optional[ChunkCache]:
+        """The process-wide cache for decoded chunks shared by
+        all datasets, if configured by "DecodedChunkCacheSize".
+        """
+        return self._decoded_chunk_cache
+
     @cached_property
     def access_control(self) -> dict[str, Any]:
         return self.config.get("AccessControl", {})
@@ -169,6 +316,28 @@ class DatasetsContext(ResourcesContext):
             (ml_dataset, dict(Identifier=ml_dataset.ds_id, Hidden=True))
         )
 
+    def add_dataset_removed_listener(self, listener: Callable[[str], Any]):
+        """Add a *listener* that is called with the identifier of
+        a dataset whenever that dataset is removed or replaced.
+        Listeners are used to invalidate resources derived
+        from a dataset, such as cached tiles.
+
+        Args:
+            listener: A callable that receives a dataset identifier.
+        """
+        self._dataset_removed_listeners.append(listener)
+
+    def _notify_dataset_removed(self, ds_id: str, increment_revision: bool = True):
+        self._dataset_metadata.pop(ds_id, None)
+        self._dataset_fingerprints.pop(ds_id, None)
+        self._time_series_fingerprints.pop(ds_id, None)
+        if increment_revision:
+            # Datasets replaced in memory may keep their configuration,
+            # hence we must distinguish them by a revision number.
+            self._dataset_revisions[ds_id] = self._dataset_revisions.get(ds_id, 0) + 1
+        for listener in self._dataset_removed_listeners:
+            listener(ds_id)
+
     def add_dataset(
         self,
         dataset: Union[xr.Dataset, MultiLevelDataset],
@@ -198,6 +367,7 @@ class DatasetsContext(ResourcesContext):
         for index, dataset_config in enumerate(dataset_configs):
             if dataset_config["Identifier"] == ds_id:
                 del dataset_configs[index]
+                self._notify_dataset_removed(ds_id)
                 break
         dataset_config = dict(
             Identifier=ds_id, Title=title or dataset.attrs.get("title", ds_id)
@@ -208,18 +378,21 @@ class DatasetsContext(ResourcesContext):
             style = style or ds_id
             dataset_config.update(dict(Style=style))
             self._cm_styles[style] = color_mappings
-        self._dataset_cache[ds_id] = ml_dataset, dataset_config
+            # Style may be shared by other datasets
+            self._dataset_fingerprints.clear()
+        self._set_dataset_entry((ml_dataset, dataset_config))
         self._dataset_configs.append(dataset_config)
         return ds_id
 
     def remove_dataset(self, ds_id: str):
         assert_instance(ds_id, str, "ds_id")
         assert_given(ds_id, "ds_id")
-        if ds_id in self._dataset_cache:
-            del self._dataset_cache[ds_id]
+        with self.rlock:
+            self._dataset_cache.pop(ds_id, None)
         self._dataset_configs = [
             dc for dc in self._dataset_configs if dc["Identifier"] != ds_id
         ]
+        self._notify_dataset_removed(ds_id)
 
     def add_ml_dataset(
         self,
@@ -231,6 +404,8 @@ class DatasetsContext(ResourcesContext):
             ml_dataset.ds_id = ds_id
         else:
             ds_id = ml_dataset.ds_id
+        if ds_id in self._dataset_cache:
+            self._notify_dataset_removed(ds_id)
         self._set_dataset_entry((ml_dataset, dict(Identifier=ds_id, Title=title)))
 
     def get_dataset(
@@ -246,8 +421,21 @@ class DatasetsContext(ResourcesContext):
                     )
         return dataset
 
-    def get_time_series_dataset(self, ds_id: str, var_name: str = None) -> xr.Dataset:
+    def get_time_series_dataset(
+        self, ds_id: str, var_name: str = None, build_copy: bool = False
+    ) -> xr.Dataset:
+        """Get the dataset used to extract time series from
+        the dataset given by *ds_id*.
+
+        If the time-series cache is enabled and *build_copy* is true,
+        building the time-optimized copy of the dataset is scheduled,
+        if it does not exist yet.
+        """
         dataset_config = self.get_dataset_config(ds_id)
+        if "TimeSeriesDataset" not in dataset_config:
+            ts_dataset = self._get_time_series_cache_dataset(ds_id, build_copy)
+            if ts_dataset is not None and (var_name is None or var_name in ts_dataset):
+                return ts_dataset
         ts_ds_name = dataset_config.get("TimeSeriesDataset", ds_id)
         try:
             # Try to get more efficient, time-chunked dataset
@@ -261,6 +449,29 @@ class DatasetsContext(ResourcesContext):
                 ds_id, expected_var_names=[var_name] if var_name else None
             )
 
+    def _get_time_series_cache_dataset(
+        self, ds_id: str, build_copy: bool
+    ) -> Optional[xr.Dataset]:
+        """Get the time-optimized copy of the dataset given by *ds_id*
+        from the time-series cache, if enabled and if the copy
+        is available. Otherwise, if *build_copy* is true,
+        schedule building the copy.
+        """
+        if self._time_series_cache is None:
+            return None
+        if self._get_dataset_data_version_entry(ds_id) is None:
+            # Copies must not be identified by preliminary fingerprints
+            return None
+        fingerprint = self._time_series_fingerprints.get(ds_id)
+        if fingerprint is None:
+            fingerprint = get_time_series_fingerprint(
+                self.get_dataset(ds_id), self.get_dataset_fingerprint(ds_id)
+            )
+            self._time_series_fingerprints[ds_id] = fingerprint
+        return self._time_series_cache.get_dataset(
+            ds_id, fingerprint, lambda: self.get_dataset(ds_id), build=build_copy
+        )
+
     def get_variable_for_z(
         self, ds_id: str, var_name: str, z_index: int
     ) -> xr.DataArray:
@@ -448,6 +659,327 @@ class DatasetsContext(ResourcesContext):
             raise ApiError.NotFound(f'Dataset "{ds_id}" not found')
         return dataset_config
 
+    def get_dataset_fingerprint(self, ds_id: str) -> str:
+        """Get a fingerprint of the configuration and the data of
+        the dataset given by *ds_id*, including its color mappings
+        and the color files they refer to.
+        The fingerprint changes whenever the dataset's configuration
+        or data changes, so it can be used to derive keys for
+        cached resources.
+
+        Changes of the data are detected only if the dataset's data
+        store provides a version of the data, e.g., the modification
+        time of a Zarr's consolidated metadata,
+        see :meth:`get_dataset_data_version`. As long as the data
+        version is being fetched, the fingerprint is unique
+        to this server process.
+
+        Args:
+            ds_id: The dataset identifier.
+
+        Returns:
+            A hexadecimal digest string.
+        """
+        data_version_entry = self._get_dataset_data_version_entry(ds_id)
+        data_version = (
+            data_version_entry[1]
+            if data_version_entry is not None
+            else _PENDING_DATA_VERSION
+        )
+        fingerprint_entry = self._dataset_fingerprints.get(ds_id)
+        if fingerprint_entry is not None and fingerprint_entry[0] == data_version:
+            fingerprint = fingerprint_entry[1]
+        else:
+            dataset_config = self.get_dataset_config(ds_id)
+            color_mappings = self.get_color_mappings(ds_id)
+            color_file_versions = self.get_color_file_versions(
+                dataset_config.get("Style", "default")
+            )
+            revision = self._dataset_revisions.get(ds_id, 0)
+            fingerprint_json = json.dumps(
+                [
+                    dataset_config,
+                    color_mappings,
+                    color_file_versions,
+                    data_version,
+                    revision,
+                ],
+                sort_keys=True,
+                default=str,
+            )
+            fingerprint = hashlib.sha1(fingerprint_json.encode("utf-8")).hexdigest()
+            if data_version_entry is not None:
+                self._dataset_fingerprints[ds_id] = data_version, fingerprint
+        return fingerprint
+
+    def get_dataset_data_version(self, ds_id: str) -> Optional[str]:
+        """Get the version of the data of the dataset given by *ds_id*
+        as provided by its data store, see
+        :meth:`xcube.core.store.search.DefaultSearchMixin.get_data_version`.
+
+        The version is checked at most every
+        :data:`DATA_VERSION_CHECK_INTERVAL` seconds. If it has changed,
+        the dataset is closed and reopened on next access, and all
+        resources derived from it, such as cached tiles or chunks,
+        are invalidated.
+
+        This method does not block on remote data stores. Their
+        versions are fetched in the background, while the last known
+        version is returned, see :meth:`refresh_dataset_data_version`.
+
+        Args:
+            ds_id: The dataset identifier.
+
+        Returns:
+            The data version or None, if it is not known (yet).
+        """
+        entry = self._get_dataset_data_version_entry(ds_id)
+        return entry[1] if entry is not None else None
+
+    def refresh_dataset_data_version(self, ds_id: str) -> Optional[str]:
+        """Fetch the version of the data of the dataset given by *ds_id*
+        from its data store, and, if it has changed, invalidate
+        the dataset and all resources derived from it.
+
+        In contrast to :meth:`get_dataset_data_version`, this method
+        blocks until the version has been fetched. Hence, it must not
+        be called by request handlers running on the server's IO loop.
+
+        Args:
+            ds_id: The dataset identifier.
+
+        Returns:
+            The data version or None, if it is not known.
+        """
+        data_version = self._fetch_dataset_data_version(ds_id)
+        with self.rlock:
+            entry = self._dataset_data_versions.get(ds_id)
+            self._dataset_data_versions[ds_id] = (
+                time.monotonic() + DATA_VERSION_CHECK_INTERVAL,
+                data_version,
+            )
+        if entry is not None and entry[1] != data_version:
+            LOG.info(f"Data of dataset {ds_id!r} has changed")
+            self._reset_dataset(ds_id)
+        return data_version
+
+    def _get_dataset_data_version_entry(
+        self, ds_id: str
+    ) -> Optional[tuple[float, Optional[str]]]:
+        """Get the tuple (expiry time, data version) for the dataset
+        given by *ds_id* or None, if its version is being fetched.
+        """
+        entry = self._dataset_data_versions.get(ds_id)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry
+        dataset_entry = self._dataset_cache.get(ds_id)
+        dataset_config = (
+            dataset_entry[1]
+            if dataset_entry is not None
+            else self.get_dataset_config(ds_id)
+        )
+        if self._is_remote_dataset(dataset_config):
+            self._schedule_data_version_refresh(ds_id)
+            return entry
+        self.refresh_dataset_data_version(ds_id)
+        return self._dataset_data_versions.get(ds_id)
+
+    def _schedule_data_version_refresh(self, ds_id: str):
+        with self.rlock:
+            if self._disposed or ds_id in self._data_version_refreshes:
+                return
+            if self._data_version_executor is None:
+                self._data_version_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=DATA_VERSION_MAX_WORKERS,
+                    thread_name_prefix="xcube-data-version",
+                )
+            self._data_version_refreshes.add(ds_id)
+            self._data_version_executor.submit(
+                self._refresh_dataset_data_version_in_background, ds_id
+            )
+
+    def _refresh_dataset_data_version_in_background(self, ds_id: str):
+        try:
+            self.refresh_dataset_data_version(ds_id)
+        except Exception as e:
+            LOG.warning(f"Failed to refresh data version of dataset {ds_id!r}: {e}")
+        finally:
+            with self.rlock:
+                self._data_version_refreshes.discard(ds_id)
+
+    def _is_remote_dataset(self, dataset_config: DatasetConfig) -> bool:
+        """Test whether fetching the data version of the dataset
+        given by *dataset_config* may require network access.
+        """
+        store_instance_id = dataset_config.get("StoreInstanceId")
+        if not store_instance_id:
+            return False
+        data_store = self.get_data_store_pool().get_store(store_instance_id)
+        if not hasattr(data_store, "get_data_version"):
+            return False
+        if isinstance(data_store, BaseFsDataStore):
+            protocols = data_store.fs.protocol
+            protocols = (protocols,) if isinstance(protocols, str) else protocols
+            return not any(p in _LOCAL_FS_PROTOCOLS for p in protocols)
+        return True
+
+    def _fetch_dataset_data_version(self, ds_id: str) -> Optional[str]:
+        dataset_entry = self._dataset_cache.get(ds_id)
+        dataset_config = (
+            dataset_entry[1]
+            if dataset_entry is not None
+            else self.get_dataset_config(ds_id)
+        )
+        store_instance_id = dataset_config.get("StoreInstanceId")
+        if not store_instance_id:
+            return None
+        data_store = self.get_data_store_pool().get_store(store_instance_id)
+        get_data_version = getattr(data_store, "get_data_version", None)
+        if get_data_version is None:
+            return None
+        # noinspection PyBroadException
+        try:
+            return get_data_version(dataset_config["Path"])
+        except Exception as e:
+            LOG.warning(f"Failed to get data version of dataset {ds_id!r}: {e}")
+            return None
+
+    def _reset_dataset(self, ds_id: str):
+        """Forget the opened dataset given by *ds_id* and
+        all resources derived from it.
+        """
+        with self.rlock:
+            dataset_entry = self._dataset_cache.pop(ds_id, None)
+        if dataset_entry is not None:
+            self._clear_chunk_caches(dataset_entry[1])
+        # No new revision, the data version distinguishes the datasets
+        self._notify_dataset_removed(ds_id, increment_revision=False)
+
+    def _clear_chunk_caches(self, dataset_config: DatasetConfig):
+        store_instance_id = dataset_config.get("StoreInstanceId")
+        if not store_instance_id:
+            return
+        data_store = self.get_data_store_pool().get_store(store_instance_id)
+        if not isinstance(data_store, BaseFsDataStore):
+            return
+        data_id = dataset_config["Path"]
+        root = data_store.root
+        # Same store names as used by the dataset openers
+        url = data_store.fs.unstrip_protocol(f"{root}/{data_id}" if root else data_id)
+        for chunk_cache in (self._chunk_cache, self._decoded_chunk_cache):
+            if chunk_cache is not None:
+                for store_name in chunk_cache.get_store_names():
+                    if store_name == url or store_name.startswith(url + "/"):
+                        chunk_cache.clear(store_name)
+
+    def get_dataset_metadata(
+        self, ds_id: str, compute_metadata: DatasetMetadataFunction
+    ) -> dict[str, Any]:
+        """Get the metadata of the dataset given by *ds_id*, such as
+        its bounding box, time coordinates, and variables.
+
+        The metadata is computed by *compute_metadata* once per
+        dataset fingerprint, see :meth:`get_dataset_fingerprint`, and
+        cached by this context. Hence, it is discarded once the
+        server configuration changes. The returned dictionary must
+        not be modified.
+
+        Args:
+            ds_id: The dataset identifier.
+            compute_metadata: Function that computes the metadata
+                from this context and a dataset identifier.
+
+        Returns:
+            The dataset's metadata.
+        """
+        fingerprint = self.get_dataset_fingerprint(ds_id)
+        entry = self._dataset_metadata.get(ds_id)
+        if entry is None or entry[0] != fingerprint:
+            with self._get_dataset_lock(ds_id):
+                # Metadata may have been computed meanwhile,
+                # e.g., by warm_up_datasets()
+                entry = self._dataset_metadata.get(ds_id)
+                if entry is None or entry[0] != fingerprint:
+                    entry = fingerprint, compute_metadata(self, ds_id)
+                    with self.rlock:
+                        self._dataset_metadata[ds_id] = entry
+        return entry[1]
+
+    def warm_up_datasets(
+        self,
+        compute_metadata: DatasetMetadataFunction,
+        max_workers: int = DEFAULT_DATASET_WARM_UP_MAX_WORKERS,
+    ) -> list[concurrent.futures.Future]:
+        """Open all datasets that are not hidden and compute their
+        metadata in the background, so that the first requests
+        need not wait for it. Datasets are warmed up concurrently
+        by a thread pool of *max_workers* workers.
+
+        Args:
+            compute_metadata: Function that computes the metadata
+                from this context and a dataset identifier,
+                see :meth:`get_dataset_metadata`.
+            max_workers: Maximum number of datasets warmed up
+                concurrently.
+
+        Returns:
+            The futures of the warm-up of each dataset.
+        """
+        with self.rlock:
+            if self._disposed:
+                return []
+            if self._warm_up_executor is None:
+                self._warm_up_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="xcube-warm-up"
+                )
+            return [
+                self._warm_up_executor.submit(
+                    self._warm_up_dataset,
+                    dataset_config["Identifier"],
+                    compute_metadata,
+                )
+                for dataset_config in self.get_dataset_configs()
+                if not dataset_config.get("Hidden")
+            ]
+
+    def _warm_up_dataset(self, ds_id: str, compute_metadata: DatasetMetadataFunction):
+        if self._disposed:
+            return
+        try:
+            with self.measure_time(tag=f"Warmed up dataset {ds_id!r}"):
+                # Avoid computing the metadata for a preliminary fingerprint
+                self.refresh_dataset_data_version(ds_id)
+                self.get_dataset_metadata(ds_id, compute_metadata)
+        except Exception as e:
+            LOG.warning(f"Failed to warm up dataset {ds_id!r}: {e}")
+
+    def get_dataset_etag(self, ds_id: str, *args: Any) -> str:
+        """Get an entity tag (ETag) for a resource derived from the
+        dataset given by *ds_id*. The ETag is computed from
+        the dataset's fingerprint, the xcube version, and
+        the given request-specific *args*, such as variable name,
+        tile coordinates, or query parameters.
+        Like the fingerprint, see :meth:`get_dataset_fingerprint`,
+        the ETag changes if the dataset's data changes.
+
+        Args:
+            ds_id: The dataset identifier.
+            *args: Request-specific values that identify the resource.
+
+        Returns:
+            A hexadecimal digest string.
+        """
+        return _compute_etag(version, self.get_dataset_fingerprint(ds_id), *args)
+
+    @cached_property
+    def colormaps_etag(self) -> str:
+        """An entity tag (ETag) for the available colormaps."""
+        styles = self.config.get("Styles") or []
+        color_file_versions = [
+            self.get_color_file_versions(style["Identifier"]) for style in styles
+        ]
+        return _compute_etag(version, styles, color_file_versions)
+
     def get_dataset_configs(self) -> list[DatasetConfig]:
         assert self._dataset_configs is not None
         return self._dataset_configs
@@ -559,22 +1091,71 @@ class DatasetsContext(ResourcesContext):
 
         return cm_styles, ColormapRegistry(*custom_colormaps.values())
 
+    def get_color_file_versions(self, style_id: str) -> list[str]:
+        """Get the versions of the color files used by the color
+        mappings of the style given by *style_id*.
+        A version comprises the path, size, and modification time
+        of a color file.
+        """
+        color_file_versions = []
+        for style in self.config.get("Styles", []):
+            if style["Identifier"] != style_id:
+                continue
+            for color_mapping in style["ColorMappings"].values():
+                if "ColorFile" not in color_mapping:
+                    continue
+                color_file_path = self.get_config_path(
+                    color_mapping, "ColorMappings", path_entry_name="ColorFile"
+                )
+                try:
+                    stat = os.stat(color_file_path)
+                    color_file_versions.append(
+                        f"{color_file_path}:{stat.st_size}:{stat.st_mtime_ns}"
+                    )
+                except OSError:
+                    color_file_versions.append(color_file_path)
+        return color_file_versions
+
     def get_color_mappings(self, ds_id: str) -> Optional[dict[str, dict[str, Any]]]:
         dataset_config = self.get_dataset_config(ds_id)
         style_id = dataset_config.get("Style", "default")
         return self._cm_styles.get(style_id, {})
 
     def _get_dataset_entry(self, ds_id: str) -> tuple[MultiLevelDataset, ServerConfig]:
+        # Forgets the dataset, if its data has changed
+        self.get_dataset_data_version(ds_id)
         if ds_id not in self._dataset_cache:
-            with self.rlock:
-                self._set_dataset_entry(self._create_dataset_entry(ds_id))
+            # Raise early for unknown datasets, so they get no lock
+            self.get_dataset_config(ds_id)
+            # Different datasets may be opened concurrently
+            with self._get_dataset_lock(ds_id):
+                dataset_entry = self._dataset_cache.get(ds_id)
+                if dataset_entry is None:
+                    dataset_entry = self._create_dataset_entry(ds_id)
+                    self._set_dataset_entry(dataset_entry)
+                return dataset_entry
         return self._dataset_cache[ds_id]
 
+    def _get_dataset_lock(self, ds_id: str) -> threading.RLock:
+        with self.rlock:
+            dataset_lock = self._dataset_locks.get(ds_id)
+            if dataset_lock is None:
+                dataset_lock = threading.RLock()
+                self._dataset_locks[ds_id] = dataset_lock
+            return dataset_lock
+
     def _set_dataset_entry(
         self, dataset_entry: tuple[MultiLevelDataset, DatasetConfig]
     ):
         ml_dataset, dataset_config = dataset_entry
-        self._dataset_cache[ml_dataset.ds_id] = ml_dataset, dataset_config
+        with self.rlock:
+            if self._disposed:
+                # Opened while or after this context has been disposed
+                _close_ml_dataset(ml_dataset)
+                raise ApiError.ServiceUnavailable(
+                    f"Dataset {ml_dataset.ds_id!r} is not available anymore"
+                )
+            self._dataset_cache[ml_dataset.ds_id] = ml_dataset, dataset_config
 
     def _create_dataset_entry(
         self, ds_id: str
@@ -590,13 +1171,28 @@ class DatasetsContext(ResourcesContext):
             data_store_pool = self.get_data_store_pool()
             data_store = data_store_pool.get_store(store_instance_id)
             data_id = dataset_config.get("Path")
-            open_params = dataset_config.get("StoreOpenParams") or {}
+            # Copy, because the dataset configuration must not change
+            open_params = dict(dataset_config.get("StoreOpenParams") or {})
+            is_zarr = data_id.endswith(".zarr") or data_id.endswith(".levels")
+            if (
+                is_zarr
+                and self._chunk_cache is not None
+                and "ChunkCacheSize" not in dataset_config
+                and "cache_size" not in open_params
+            ):
+                # Use the global chunk cache rather than
+                # the default chunk cache of a dataset
+                open_params.setdefault("chunk_cache", True)
+            if is_zarr and self._decoded_chunk_cache is not None:
+                # Keep decoded chunks of frequently accessed datasets
+                open_params.setdefault("decoded_chunk_cache", True)
             # Inject chunk_cache_capacity into open parameters
             chunk_cache_capacity = self.get_dataset_chunk_cache_capacity(dataset_config)
             if (
                 chunk_cache_capacity
-                and (data_id.endswith(".zarr") or data_id.endswith(".levels"))
+                and is_zarr
                 and "cache_size" not in open_params
+                and not open_params.get("chunk_cache")
             ):
                 open_params["cache_size"] = chunk_cache_capacity
             with self.measure_time(
@@ -782,6 +1378,14 @@ class DatasetsContext(ResourcesContext):
         return cache_size
 
 
+def _close_ml_dataset(ml_dataset: MultiLevelDataset):
+    # noinspection PyBroadException
+    try:
+        ml_dataset.close()
+    except Exception:
+        pass
+
+
 def _open_ml_dataset_from_python_code(
     ctx: DatasetsContext, dataset_config: DatasetConfig
 ) -> MultiLevelDataset:
@@ -863,6 +1467,11 @@ def _get_common_prefixes(p):
         )
 
 
+def _compute_etag(*args: Any) -> str:
+    etag_json = json.dumps(args, sort_keys=True, default=str)
+    return hashlib.sha1(etag_json.encode("utf-8")).hexdigest()
+
+
 def _lastindex(prefix, symbol):
     try:
         return prefix.rindex(symbol)
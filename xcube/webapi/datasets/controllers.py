@@ -158,6 +158,109 @@ def get_dataset(
     if can_authenticate and not can_read_all_datasets:
         _allow_dataset(ctx, dataset_config, granted_scopes, assert_scopes)
 
+    metadata = ctx.get_dataset_metadata(ds_id, compute_dataset_metadata)
+
+    try:
+        ts_ds = ctx.get_time_series_dataset(ds_id)
+    except (ValueError, DataStoreError):
+        ts_ds = None
+
+    dataset_dict = dict(
+        id=ds_id,
+        title=metadata["title"],
+        bbox=list(metadata["bbox"]),
+        geometry=metadata["geometry"],
+        spatialRef=metadata["spatialRef"],
+    )
+
+    variable_dicts = []
+    dim_names = []
+    for var_metadata in metadata["variables"]:
+        var_name = var_metadata["name"]
+
+        if (
+            can_authenticate
+            and not can_read_all_variables
+            and not _allow_variable(ctx, dataset_config, var_name, granted_scopes)
+        ):
+            continue
+
+        variable_dict = dict(var_metadata)
+        variable_dict["timeChunkSize"] = get_time_chunk_size(ts_ds, var_name, ds_id)
+
+        tile_url = _get_dataset_tile_url2(ctx, ds_id, var_name, base_url)
+        # Note that tileUrl is no longer used since xcube viewer v0.13
+        variable_dict["tileUrl"] = tile_url
+        LOG.debug("Tile URL for variable %s: %s", var_name, tile_url)
+
+        variable_dicts.append(variable_dict)
+        for dim_name in var_metadata["dims"]:
+            if dim_name not in dim_names:
+                dim_names.append(dim_name)
+
+    dataset_dict["variables"] = variable_dicts
+
+    if not variable_dicts:
+        if not metadata["hasDataVars"]:
+            message = f"Dataset {ds_id!r} has no variables"
+        else:
+            message = f"Dataset {ds_id!r} has no published variables"
+        raise DatasetIsNotACubeError(message)
+
+    rgb_var_names = metadata["rgbVarNames"]
+    if any(rgb_var_names):
+        rgb_tile_url = _get_dataset_tile_url2(ctx, ds_id, "rgb", base_url)
+        rgb_schema = {
+            "varNames": rgb_var_names,
+            "normRanges": metadata["rgbNormRanges"],
+            # Note that tileUrl is no longer used since xcube viewer v0.13
+            "tileUrl": rgb_tile_url,
+            "tileLevelMin": metadata["tileLevelMin"],
+            "tileLevelMax": metadata["tileLevelMax"],
+        }
+
+        dataset_dict["rgbSchema"] = rgb_schema
+
+    dataset_dict["dimensions"] = [
+        metadata["dimensions"][dim_name] for dim_name in dim_names
+    ]
+
+    dataset_dict["attrs"] = metadata["attrs"]
+
+    dataset_attributions = dataset_config.get(
+        "Attribution", ctx.config.get("DatasetAttribution")
+    )
+    if dataset_attributions is not None:
+        if isinstance(dataset_attributions, str):
+            dataset_attributions = [dataset_attributions]
+        dataset_dict["attributions"] = dataset_attributions
+
+    place_groups = ctx.get_dataset_place_groups(ds_id, base_url)
+    if place_groups:
+        dataset_dict["placeGroups"] = _filter_place_groups(
+            place_groups, del_features=True
+        )
+
+    return dataset_dict
+
+
+def compute_dataset_metadata(ctx: DatasetsContext, ds_id: str) -> dict:
+    """Compute the metadata of the dataset given by *ds_id*
+    that is independent of the request, i.e., of the base URL
+    and the granted scopes. Opens the dataset, if not yet done.
+
+    The result is cached by the context,
+    see :meth:`DatasetsContext.get_dataset_metadata`.
+
+    Args:
+        ctx: The datasets context.
+        ds_id: The dataset identifier.
+
+    Returns:
+        The dataset's metadata.
+    """
+    dataset_config = ctx.get_dataset_config(ds_id)
+
     try:
         ml_ds = ctx.get_ml_dataset(ds_id)
     except (ValueError, DataStoreError) as e:
@@ -165,17 +268,11 @@ def get_dataset(
 
     ds = ml_ds.get_dataset(0)
 
-    try:
-        ts_ds = ctx.get_time_series_dataset(ds_id)
-    except (ValueError, DataStoreError):
-        ts_ds = None
-
     x_name, y_name = ml_ds.grid_mapping.xy_dim_names
 
     ds_title = dataset_config.get(
         "Title", ds.attrs.get("title", ds.attrs.get("name", ds_id))
     )
-    dataset_dict = dict(id=ds_id, title=ds_title)
 
     crs = ml_ds.grid_mapping.crs
     transformer = pyproj.Transformer.from_crs(crs, CRS_CRS84, always_xy=True)
@@ -192,13 +289,6 @@ def get_dataset(
             (x1, x2), (y1, y2) = transformer.transform((x1, x2), (y1, y2))
         ds_bbox = [x1, y1, x2, y2]
 
-    dataset_dict["bbox"] = list(ds_bbox)
-    dataset_dict["geometry"] = get_bbox_geometry(dataset_bounds, transformer)
-    dataset_dict["spatialRef"] = crs.to_string()
-
-    variable_dicts = []
-    dim_names = set()
-
     tiling_scheme = ml_ds.derive_tiling_scheme(TilingScheme.GEOGRAPHIC)
     LOG.debug(
         "Tile level range for dataset %s: %d to %d",
@@ -223,16 +313,11 @@ def get_dataset(
                 f' You may specify a wildcard "*" as last item.'
             )
 
+    variable_dicts = []
+    dim_names = set()
     for var_name in spatial_var_names:
         var = ds.data_vars[var_name]
 
-        if (
-            can_authenticate
-            and not can_read_all_variables
-            and not _allow_variable(ctx, dataset_config, var_name, granted_scopes)
-        ):
-            continue
-
         variable_dict = dict(
             id=f"{ds_id}.{var_name}",
             name=var_name,
@@ -241,14 +326,8 @@ def get_dataset(
             dtype=str(var.dtype),
             units=var.attrs.get("units", ""),
             title=var.attrs.get("title", var.attrs.get("long_name", var_name)),
-            timeChunkSize=get_time_chunk_size(ts_ds, var_name, ds_id),
         )
 
-        tile_url = _get_dataset_tile_url2(ctx, ds_id, var_name, base_url)
-        # Note that tileUrl is no longer used since xcube viewer v0.13
-        variable_dict["tileUrl"] = tile_url
-        LOG.debug("Tile URL for variable %s: %s", var_name, tile_url)
-
         variable_dict["tileLevelMin"] = tiling_scheme.min_level
         variable_dict["tileLevelMax"] = tiling_scheme.max_level
 
@@ -271,54 +350,27 @@ def get_dataset(
 
         variable_dicts.append(variable_dict)
         for dim_name in var.dims:
-            dim_names.add(dim_name)
-
-    dataset_dict["variables"] = variable_dicts
-
-    if not variable_dicts:
-        if not ds.data_vars:
-            message = f"Dataset {ds_id!r} has no variables"
-        else:
-            message = f"Dataset {ds_id!r} has no published variables"
-        raise DatasetIsNotACubeError(message)
+            dim_names.add(str(dim_name))
 
     rgb_var_names, rgb_norm_ranges = ctx.get_rgb_color_mapping(ds_id)
-    if any(rgb_var_names):
-        rgb_tile_url = _get_dataset_tile_url2(ctx, ds_id, "rgb", base_url)
-        rgb_schema = {
-            "varNames": rgb_var_names,
-            "normRanges": rgb_norm_ranges,
-            # Note that tileUrl is no longer used since xcube viewer v0.13
-            "tileUrl": rgb_tile_url,
-            "tileLevelMin": tiling_scheme.min_level,
-            "tileLevelMax": tiling_scheme.max_level,
-        }
-
-        dataset_dict["rgbSchema"] = rgb_schema
-
-    dataset_dict["dimensions"] = [
-        get_dataset_coordinates(ctx, ds_id, str(dim_name)) for dim_name in dim_names
-    ]
 
-    dataset_dict["attrs"] = {
-        key: ds.attrs[key] for key in sorted(list(map(str, ds.attrs.keys())))
-    }
-
-    dataset_attributions = dataset_config.get(
-        "Attribution", ctx.config.get("DatasetAttribution")
+    return dict(
+        title=ds_title,
+        bbox=ds_bbox,
+        geometry=get_bbox_geometry(dataset_bounds, transformer),
+        spatialRef=crs.to_string(),
+        tileLevelMin=tiling_scheme.min_level,
+        tileLevelMax=tiling_scheme.max_level,
+        variables=variable_dicts,
+        hasDataVars=bool(ds.data_vars),
+        rgbVarNames=rgb_var_names,
+        rgbNormRanges=rgb_norm_ranges,
+        dimensions={
+            dim_name: get_dataset_coordinates(ctx, ds_id, dim_name)
+            for dim_name in dim_names
+        },
+        attrs={key: ds.attrs[key] for key in sorted(list(map(str, ds.attrs.keys())))},
     )
-    if dataset_attributions is not None:
-        if isinstance(dataset_attributions, str):
-            dataset_attributions = [dataset_attributions]
-        dataset_dict["attributions"] = dataset_attributions
-
-    place_groups = ctx.get_dataset_place_groups(ds_id, base_url)
-    if place_groups:
-        dataset_dict["placeGroups"] = _filter_place_groups(
-            place_groups, del_features=True
-        )
-
-    return dataset_dict
 
 
 def filter_variable_names(
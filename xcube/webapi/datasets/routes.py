@@ -192,6 +192,13 @@ class PlacesForDatasetHandler(ApiHandler[DatasetsContext]):
 
 # noinspection PyPep8Naming
 class LegendHandler(ApiHandler[DatasetsContext]):
+    def get_etag(self, datasetId: str, varName: str):
+        return self.ctx.get_dataset_etag(
+            datasetId,
+            varName,
+            {k: v[0] for k, v in self.request.query.items()},
+        )
+
     async def get(self, datasetId: str, varName: str):
         legend = await self.ctx.run_in_executor(
             None,
@@ -259,6 +266,9 @@ class NewLegendHandler(LegendHandler):
 class StylesColorBarsHandler(ApiHandler):
     """Get available color bars."""
 
+    def get_etag(self):
+        return self.ctx.colormaps_etag
+
     @api.operation(
         operation_id="getColorBars",
         summary="Get available color bars.",
@@ -273,6 +283,9 @@ class StylesColorBarsHandler(ApiHandler):
 class StylesColorBarsHtmlHandler(ApiHandler):
     """Show available color bars."""
 
+    def get_etag(self):
+        return self.ctx.colormaps_etag
+
     @api.operation(
         operation_id="showColorBars",
         summary="Show available color bars.",
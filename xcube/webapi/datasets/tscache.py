@@ -0,0 +1,438 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import concurrent.futures
+import hashlib
+import json
+import math
+import os
+import os.path
+import shutil
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import numpy as np
+import xarray as xr
+from dask.callbacks import Callback
+
+from xcube.constants import LOG
+
+DEFAULT_TIME_SERIES_CACHE_MAX_WORKERS = 1
+"""Default number of time-optimized copies built concurrently."""
+
+DEFAULT_TIME_SERIES_CHUNK_BYTES = 16 * 1000**2
+"""Default target size of the chunks of time-optimized copies."""
+
+DEFAULT_TIME_SERIES_CACHE_MAX_SIZE = 10 * 1000**3
+"""Default byte budget of the time-optimized copies on disk."""
+
+DEFAULT_TIME_SERIES_CACHE_RETRY_INTERVAL = 600.0
+"""Default time in seconds after which a failed build is retried."""
+
+_ZARR_EXT = ".zarr"
+_TEMP_EXT = ".tmp"
+
+_BUILD_PENDING = "pending"
+_BUILD_NOT_NEEDED = "not-needed"
+
+
+class TimeSeriesCache:
+    """A cache for time-optimized copies of datasets.
+
+    Datasets whose variables are chunked with small chunk sizes
+    along the time dimension, e.g., time=1, are expensive to read
+    when extracting time-series, because one chunk must be read per
+    time step. This cache builds copies of such datasets whose chunks
+    comprise *time_chunk_size* time steps (by default the whole
+    time dimension) and correspondingly smaller spatial extents.
+
+    Copies are written as Zarr datasets into directory *cache_path*
+    by a thread pool of *max_workers* workers in the background.
+    A copy is used only after it has been completely written.
+    A copy that has already been written by another process
+    sharing *cache_path* is used as well.
+    Copies are identified by a fingerprint of their source dataset,
+    see :func:`get_time_series_fingerprint`. If the fingerprint
+    changes, a new copy is built and outdated copies are removed.
+
+    Copies on disk are removed once a copy with a new fingerprint
+    of the same dataset has been built, but only those whose
+    fingerprints this instance has seen being replaced.
+
+    No copy is built, if the copies on disk would then exceed
+    *max_size* bytes. Since the size of a copy is estimated from
+    its uncompressed size, the budget is a conservative limit.
+    A failed build is retried after *retry_interval* seconds.
+
+    Instances of this class are thread-safe.
+
+    Args:
+        cache_path: Directory of the copies.
+        max_workers: Maximum number of copies built concurrently.
+        time_chunk_size: Chunk size of the time dimension of copies.
+            If not given, the whole time dimension is used.
+        chunk_bytes: Target size of the chunks of copies in bytes.
+        max_size: Byte budget of the copies on disk.
+            If ``None``, the budget is unbounded.
+        retry_interval: Time in seconds after which
+            a failed build is retried.
+    """
+
+    def __init__(
+        self,
+        cache_path: str,
+        max_workers: int = DEFAULT_TIME_SERIES_CACHE_MAX_WORKERS,
+        time_chunk_size: Optional[int] = None,
+        chunk_bytes: int = DEFAULT_TIME_SERIES_CHUNK_BYTES,
+        max_size: Optional[int] = DEFAULT_TIME_SERIES_CACHE_MAX_SIZE,
+        retry_interval: float = DEFAULT_TIME_SERIES_CACHE_RETRY_INTERVAL,
+    ):
+        self._cache_path = os.path.normpath(cache_path)
+        self._time_chunk_size = time_chunk_size
+        self._chunk_bytes = chunk_bytes
+        self._max_size = max_size or None
+        self._retry_interval = retry_interval
+        # Estimated sizes of the copies being built
+        self._reserved_bytes = 0
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="xcube-ts-cache"
+        )
+        # Maps (ds_id, fingerprint) to an opened copy, a build status,
+        # or the monotonic time of a failed build
+        self._entries: dict[tuple[str, str], Any] = dict()
+        # Maps ds_id to fingerprints whose copies have been replaced
+        self._outdated_fingerprints: dict[str, set[str]] = dict()
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    @property
+    def cache_path(self) -> str:
+        """Directory of the time-optimized copies."""
+        return self._cache_path
+
+    def get_dataset(
+        self,
+        ds_id: str,
+        fingerprint: str,
+        get_source_dataset: Callable[[], xr.Dataset],
+        build: bool = True,
+    ) -> Optional[xr.Dataset]:
+        """Get the time-optimized copy of the dataset given by *ds_id*.
+
+        If the copy for the given *fingerprint* does not exist yet,
+        ``None`` is returned and, if *build* is true,
+        its build is scheduled.
+
+        Args:
+            ds_id: The dataset identifier.
+            fingerprint: Fingerprint of the source dataset.
+            get_source_dataset: Function that returns the
+                source dataset. Called by the building worker.
+            build: Whether to schedule building the copy,
+                if it does not exist yet.
+
+        Returns:
+            The time-optimized copy, or ``None``, if it is not available.
+        """
+        key = ds_id, fingerprint
+        with self._lock:
+            entry = self._entries.get(key)
+            if isinstance(entry, xr.Dataset):
+                return entry
+            if isinstance(entry, float):
+                if time.monotonic() - entry < self._retry_interval:
+                    # Failed recently
+                    return None
+            elif entry is not None:
+                # Pending or not needed
+                return None
+            copy_path = self._get_copy_path(ds_id, fingerprint)
+            # Written by a previous server session or another process
+            dataset = self._open_copy(ds_id, copy_path)
+            if dataset is not None:
+                self._entries[key] = dataset
+                return dataset
+            if not build:
+                return None
+            self._entries[key] = _BUILD_PENDING
+            try:
+                self._executor.submit(
+                    self._build_copy, ds_id, fingerprint, get_source_dataset
+                )
+            except RuntimeError:
+                # Executor has been shut down
+                self._entries.pop(key, None)
+        return None
+
+    def remove_dataset(self, ds_id: str):
+        """Forget all copies of the dataset given by *ds_id*.
+        Copies on disk are removed once a new copy has been built.
+
+        Args:
+            ds_id: The dataset identifier.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == ds_id]:
+                self._outdated_fingerprints.setdefault(ds_id, set()).add(key[1])
+                entry = self._entries[key]
+                if entry is not _BUILD_PENDING:
+                    del self._entries[key]
+
+    def shutdown(self):
+        """Cancel all pending builds and stop the builds in progress.
+        Returns after the builds in progress have stopped.
+        """
+        self._stopped = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _build_copy(
+        self,
+        ds_id: str,
+        fingerprint: str,
+        get_source_dataset: Callable[[], xr.Dataset],
+    ):
+        key = ds_id, fingerprint
+        copy_path = self._get_copy_path(ds_id, fingerprint)
+        temp_path = f"{copy_path}.{os.getpid()}{_TEMP_EXT}"
+        reserved_bytes = 0
+        dataset = self._open_copy(ds_id, copy_path)
+        if dataset is not None:
+            # Written by another process meanwhile
+            with self._lock:
+                self._entries[key] = dataset
+            return
+        try:
+            LOG.info(f"Building time-optimized copy of dataset {ds_id!r}")
+            dataset = self.new_time_optimized_dataset(get_source_dataset())
+            if dataset is None:
+                LOG.info(f"Dataset {ds_id!r} requires no time-optimized copy")
+                with self._lock:
+                    self._entries[key] = _BUILD_NOT_NEEDED
+                return
+            reserved_bytes = dataset.nbytes
+            if not self._reserve_bytes(reserved_bytes):
+                LOG.warning(
+                    f"Time-optimized copy of dataset {ds_id!r} not built,"
+                    f" because it would exceed the cache's size"
+                )
+                reserved_bytes = 0
+                with self._lock:
+                    # Retry with the next request, maybe space is freed
+                    self._entries.pop(key, None)
+                return
+            os.makedirs(os.path.dirname(copy_path), exist_ok=True)
+            shutil.rmtree(temp_path, ignore_errors=True)
+            with _StopCallback(lambda: self._stopped):
+                dataset.to_zarr(temp_path)
+            try:
+                os.replace(temp_path, copy_path)
+            except OSError:
+                if not os.path.isdir(copy_path):
+                    raise
+                # Copies are moved into place only once complete,
+                # so this one, written by another process, is complete
+                shutil.rmtree(temp_path, ignore_errors=True)
+            dataset = xr.open_zarr(copy_path)
+        except _BuildStopped:
+            LOG.info(f"Stopped building time-optimized copy of dataset {ds_id!r}")
+            shutil.rmtree(temp_path, ignore_errors=True)
+            with self._lock:
+                self._entries.pop(key, None)
+            return
+        except Exception as e:
+            LOG.error(f"Failed to build time-optimized copy of dataset {ds_id!r}: {e}")
+            shutil.rmtree(temp_path, ignore_errors=True)
+            with self._lock:
+                self._entries[key] = time.monotonic()
+            return
+        finally:
+            with self._lock:
+                self._reserved_bytes -= reserved_bytes
+        with self._lock:
+            self._entries[key] = dataset
+        self._remove_outdated_copies(ds_id, fingerprint)
+        LOG.info(f"Built time-optimized copy of dataset {ds_id!r}")
+
+    def _open_copy(self, ds_id: str, copy_path: str) -> Optional[xr.Dataset]:
+        if not os.path.isdir(copy_path):
+            return None
+        try:
+            return xr.open_zarr(copy_path)
+        except Exception as e:
+            LOG.warning(
+                f"Failed to open time-optimized copy of dataset {ds_id!r}: {e}"
+            )
+            shutil.rmtree(copy_path, ignore_errors=True)
+            return None
+
+    def _reserve_bytes(self, num_bytes: int) -> bool:
+        """Reserve *num_bytes* of the cache's budget for a new copy.
+        Returns false, if the budget would be exceeded.
+        """
+        if self._max_size is None:
+            return True
+        used_bytes = _get_disk_usage(self._cache_path)
+        with self._lock:
+            if used_bytes + self._reserved_bytes + num_bytes > self._max_size:
+                return False
+            self._reserved_bytes += num_bytes
+            return True
+
+    def _remove_outdated_copies(self, ds_id: str, fingerprint: str):
+        # Copies of other fingerprints may be used
+        # or being built by other processes
+        with self._lock:
+            outdated_fingerprints = self._outdated_fingerprints.pop(ds_id, set())
+            # Copies used before by this instance are replaced too
+            outdated_fingerprints.update(
+                key[1] for key in self._entries if key[0] == ds_id
+            )
+            outdated_fingerprints.discard(fingerprint)
+            for outdated_fingerprint in list(outdated_fingerprints):
+                key = ds_id, outdated_fingerprint
+                if self._entries.get(key) is _BUILD_PENDING:
+                    # Still being built, must be removed later
+                    outdated_fingerprints.discard(outdated_fingerprint)
+                    self._outdated_fingerprints.setdefault(ds_id, set()).add(
+                        outdated_fingerprint
+                    )
+                else:
+                    self._entries.pop(key, None)
+        for outdated_fingerprint in outdated_fingerprints:
+            shutil.rmtree(
+                self._get_copy_path(ds_id, outdated_fingerprint), ignore_errors=True
+            )
+
+    def new_time_optimized_dataset(
+        self, dataset: xr.Dataset
+    ) -> Optional[xr.Dataset]:
+        """Create a lazy, time-optimized version of *dataset*.
+
+        Only variables that have a time dimension and at least one
+        further dimension are included.
+
+        Args:
+            dataset: The source dataset.
+
+        Returns:
+            The rechunked dataset, or ``None``, if *dataset* has no
+            time dimension or is already chunked appropriately.
+        """
+        if "time" not in dataset.dims:
+            return None
+        num_times = dataset.sizes["time"]
+        time_chunk_size = min(self._time_chunk_size or num_times, num_times)
+        var_names = [
+            var_name
+            for var_name, var in dataset.data_vars.items()
+            if var.ndim >= 2 and "time" in var.dims
+        ]
+        if not var_names or all(
+            _get_time_chunk_size(dataset[var_name]) >= time_chunk_size
+            for var_name in var_names
+        ):
+            return None
+
+        dataset = dataset[var_names]
+        chunks = {"time": time_chunk_size}
+        for var_name in var_names:
+            var = dataset[var_name]
+            other_dims = [dim for dim in var.dims if dim != "time"]
+            # Spatial chunk sizes so that chunks have about chunk_bytes
+            num_pixels = self._chunk_bytes / (time_chunk_size * var.dtype.itemsize)
+            size = max(1, int(math.pow(num_pixels, 1.0 / len(other_dims))))
+            for dim in other_dims:
+                chunks[dim] = min(chunks.get(dim, size), size, dataset.sizes[dim])
+        dataset = dataset.chunk(chunks)
+        for var in dataset.variables.values():
+            # Encoded chunks of the source would conflict
+            var.encoding = {
+                k: v
+                for k, v in var.encoding.items()
+                if k in ("dtype", "_FillValue", "scale_factor", "add_offset")
+            }
+        return dataset
+
+    def _get_copy_path(self, ds_id: str, fingerprint: str) -> str:
+        return os.path.join(self._get_ds_path(ds_id), fingerprint + _ZARR_EXT)
+
+    def _get_ds_path(self, ds_id: str) -> str:
+        # Dataset identifiers may contain characters
+        # not allowed in file names
+        ds_hash = hashlib.sha1(ds_id.encode("utf-8")).hexdigest()
+        return os.path.join(self._cache_path, ds_hash)
+
+
+def get_time_series_fingerprint(dataset: xr.Dataset, config_fingerprint: str) -> str:
+    """Compute a fingerprint for the time-optimized copy of *dataset*.
+
+    The fingerprint changes, if *config_fingerprint* changes,
+    if its variables change, if time steps are added or
+    removed, or if its modification date, given by the attributes
+    "date_modified" or "history", changes.
+
+    Args:
+        dataset: The source dataset.
+        config_fingerprint: Fingerprint of the dataset's configuration
+            and, if known, of the version of its data.
+
+    Returns:
+        A hexadecimal digest string.
+    """
+    fingerprint_data = [
+        config_fingerprint,
+        {
+            str(var_name): [var.dims, str(var.dtype), var.shape]
+            for var_name, var in dataset.data_vars.items()
+        },
+        dataset.attrs.get("date_modified"),
+        dataset.attrs.get("history"),
+    ]
+    sha1 = hashlib.sha1(
+        json.dumps(fingerprint_data, sort_keys=True, default=str).encode("utf-8")
+    )
+    if "time" in dataset.coords:
+        sha1.update(np.ascontiguousarray(dataset.coords["time"].values).tobytes())
+    return sha1.hexdigest()
+
+
+class _BuildStopped(Exception):
+    pass
+
+
+class _StopCallback(Callback):
+    """Stops a Dask computation by raising :class:`_BuildStopped`
+    before the next task is started, once *is_stopped* returns true.
+    """
+
+    def __init__(self, is_stopped: Callable[[], bool]):
+        super().__init__()
+        self._is_stopped = is_stopped
+
+    def _pretask(self, key, dsk, state):
+        if self._is_stopped():
+            raise _BuildStopped()
+
+
+def _get_disk_usage(path: str) -> int:
+    num_bytes = 0
+    for dir_path, _, file_names in os.walk(path):
+        for file_name in file_names:
+            try:
+                num_bytes += os.path.getsize(os.path.join(dir_path, file_name))
+            except OSError:
+                # Removed meanwhile
+                pass
+    return num_bytes
+
+
+def _get_time_chunk_size(var: xr.DataArray) -> int:
+    if var.chunks is None:
+        chunk_size = var.encoding.get("chunks")
+        if chunk_size is None:
+            # Not chunked at all
+            return var.sizes["time"]
+        return chunk_size[var.dims.index("time")]
+    return max(var.chunks[var.dims.index("time")])
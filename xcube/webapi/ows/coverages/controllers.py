@@ -1,18 +1,17 @@
 # Copyright (c) 2018-2024 by xcube team and contributors
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
-import os
 import re
-import tempfile
 from typing import Optional, Any, Literal, NamedTuple, Union
-from collections.abc import Mapping, Sequence
+from collections.abc import Iterator, Mapping, Sequence
 
 import numpy as np
 import pyproj
-import rasterio
 import xarray as xr
+from rasterio.io import MemoryFile
 
 from xcube.core.gridmapping import GridMapping
+from xcube.core.mldataset import MultiLevelDataset
 from xcube.core.resampling import resample_in_space
 from xcube.server.api import ApiError
 from xcube.util.timeindex import ensure_time_index_compatible
@@ -21,6 +20,14 @@ from xcube.webapi.ows.coverages.request import CoverageRequest
 from xcube.webapi.ows.coverages.scaling import CoverageScaling
 from xcube.webapi.ows.coverages.util import get_h_dim, get_v_dim
 
+COVERAGE_BLOCK_SIZE = 1024 * 1024
+"""Size of the blocks in which encoded coverages are streamed."""
+
+GEOTIFF_TILE_SIZE = 256
+"""Tile size of tiled GeoTIFF coverages."""
+
+_GDAL_DRIVERS = dict(png="PNG", tiff="GTiff")
+
 
 def get_coverage_as_json(ctx: DatasetsContext, collection_id: str):
     """Return a JSON representation of the specified coverage
@@ -59,10 +66,40 @@ def get_coverage_data(
 ) -> tuple[Optional[bytes], list[float], pyproj.CRS]:
     """Return coverage data from a dataset
 
+    Same as :func:`get_coverage_blocks`, but returns the coverage
+    as a single bytes object.
+
+    Args:
+        ctx: a datasets context
+        collection_id: the dataset from which to return the coverage
+        query: the HTTP query parameters
+        content_type: the MIME type of the desired output format
+
+    Returns:
+        A tuple consisting of: (1) the coverage as bytes in the
+        requested output format; (2) the bounding box of the returned
+        data; (3) the CRS of the returned dataset and bounding box
+    """
+    blocks, bbox, crs = get_coverage_blocks(ctx, collection_id, query, content_type)
+    return b"".join(blocks), bbox, crs
+
+
+def get_coverage_blocks(
+    ctx: DatasetsContext,
+    collection_id: str,
+    query: Mapping[str, Sequence[str]],
+    content_type: str,
+) -> tuple[Iterator[bytes], list[float], pyproj.CRS]:
+    """Return coverage data from a dataset as a stream of blocks
+
     This method currently returns coverage data from a dataset as either
     TIFF or NetCDF. The bbox, datetime, and properties parameters are
     currently handled.
 
+    The coverage is encoded in memory when the first block is
+    requested, so the returned iterator should be consumed in a
+    worker thread.
+
     Args:
         ctx: a datasets context
         collection_id: the dataset from which to return the coverage
@@ -70,14 +107,15 @@ def get_coverage_data(
         content_type: the MIME type of the desired output format
 
     Returns:
-        A tuple consisting of: (1) the coverage as bytes in the
-        requested output format, or None if the requested output format
-        is not supported; (2) the bounding box of the returned data,
-        respecting the axis ordering of the CRS (e.g. latitude first for
-        EPSG:4326); (3) the CRS of the returned dataset and bounding box
+        A tuple consisting of: (1) an iterator of the blocks of the
+        coverage encoded in the requested output format; (2) the
+        bounding box of the returned data, respecting the axis ordering
+        of the CRS (e.g. latitude first for EPSG:4326); (3) the CRS of
+        the returned dataset and bounding box
     """
 
-    ds = get_dataset(ctx, collection_id)
+    ml_dataset = ctx.get_ml_dataset(collection_id)
+    ds = ml_dataset.get_dataset(0)
 
     try:
         request = CoverageRequest(query)
@@ -90,35 +128,34 @@ def get_coverage_data(
     bbox_crs = request.bbox_crs
     subset_crs = request.subset_crs
 
-    if request.properties is not None:
-        ds = _apply_properties(collection_id, ds, request.properties)
-
-    # https://docs.ogc.org/DRAFTS/19-087.html#datetime-parameter-subset-requirements
-    # requirement 7D: "If a datetime parameter is specified requesting a
-    # coverage without any temporal dimension, the parameter SHALL either be
-    # ignored, or a 4xx client error generated." We choose to ignore it.
-    if request.datetime is not None and "time" in ds.variables:
-        if isinstance(request.datetime, tuple):
-            time_slice = slice(*request.datetime)
-            time_slice = ensure_time_index_compatible(ds, time_slice)
-            ds = ds.sel(time=time_slice)
-        else:
-            timespec = ensure_time_index_compatible(ds, request.datetime)
-            ds = ds.sel(time=timespec, method="nearest").squeeze()
-
-    if request.subset is not None:
-        subset_bbox, ds = _apply_subsetting(ds, request.subset, subset_crs)
-    else:
-        subset_bbox = None
-
-    if request.bbox is not None:
-        ds = _apply_bbox(ds, request.bbox, bbox_crs, always_xy=False)
+    subset_bbox, ds = _apply_request_subsetting(collection_id, ds, request)
 
     # Do a provisional size check with an approximate scaling before attempting
     # to determine a grid mapping, so the client gets a comprehensible error
     # if the coverage is empty or too large.
     _assert_coverage_size_ok(CoverageScaling(request, final_crs, ds))
 
+    # If the coverage is downscaled, read it from the coarsest level
+    # of the dataset's pyramid that still provides the requested
+    # resolution rather than from full resolution.
+    level_scale = (1, 1)
+    level = _get_level_for_scaling(
+        ml_dataset, CoverageScaling(request, native_crs, ds)
+    )
+    if level > 0:
+        base_ds = ds
+        _, ds = _apply_request_subsetting(
+            collection_id, _get_level_dataset(ml_dataset, level), request
+        )
+        x_dim, y_dim = get_h_dim(ds), get_v_dim(ds)
+        if ds.sizes[x_dim] > 0 and ds.sizes[y_dim] > 0:
+            level_scale = (
+                base_ds.sizes[x_dim] / ds.sizes[x_dim],
+                base_ds.sizes[y_dim] / ds.sizes[y_dim],
+            )
+        else:
+            ds = base_ds
+
     transformed_gm = source_gm = GridMapping.from_dataset(ds, crs=native_crs)
     if native_crs != final_crs:
         transformed_gm = transformed_gm.transform(final_crs).to_regular()
@@ -138,7 +175,7 @@ def get_coverage_data(
 
     # Apply final size check and scaling operation after bbox, subsetting,
     # and CRS transformation, to make sure that the final size is correct.
-    scaling = CoverageScaling(request, final_crs, ds)
+    scaling = CoverageScaling(request, final_crs, ds, level_scale=level_scale)
     _assert_coverage_size_ok(scaling)
     if scaling.factor != (1, 1):
         cropped_gm = GridMapping.from_dataset(ds, crs=final_crs)
@@ -157,11 +194,17 @@ def get_coverage_data(
         netcdf={"netcdf", "application/netcdf", "application/x-netcdf"},
     )
     if content_type in media_types["tiff"]:
-        content = dataset_to_image(ds, "tiff", final_crs)
+        content = iter_dataset_as_image(
+            ds,
+            "tiff",
+            final_crs,
+            tiled=request.tiled,
+            compress=request.compress,
+        )
     elif content_type in media_types["png"]:
-        content = dataset_to_image(ds, "png", final_crs)
+        content = iter_dataset_as_image(ds, "png", final_crs)
     elif content_type in media_types["netcdf"]:
-        content = dataset_to_netcdf(ds)
+        content = iter_dataset_as_netcdf(ds)
     else:
         # It's expected that the caller (server API handler) will catch
         # unhandled types, but we may as well do the right thing if any
@@ -177,6 +220,83 @@ def get_coverage_data(
     return content, final_bbox, final_crs
 
 
+def _apply_request_subsetting(
+    collection_id: str, ds: xr.Dataset, request: CoverageRequest
+) -> tuple[Optional[list[float]], xr.Dataset]:
+    if request.properties is not None:
+        ds = _apply_properties(collection_id, ds, request.properties)
+
+    # https://docs.ogc.org/DRAFTS/19-087.html#datetime-parameter-subset-requirements
+    # requirement 7D: "If a datetime parameter is specified requesting a
+    # coverage without any temporal dimension, the parameter SHALL either be
+    # ignored, or a 4xx client error generated." We choose to ignore it.
+    if request.datetime is not None and "time" in ds.variables:
+        if isinstance(request.datetime, tuple):
+            time_slice = slice(*request.datetime)
+            time_slice = ensure_time_index_compatible(ds, time_slice)
+            ds = ds.sel(time=time_slice)
+        else:
+            timespec = ensure_time_index_compatible(ds, request.datetime)
+            ds = ds.sel(time=timespec, method="nearest").squeeze()
+
+    if request.subset is not None:
+        subset_bbox, ds = _apply_subsetting(ds, request.subset, request.subset_crs)
+    else:
+        subset_bbox = None
+
+    if request.bbox is not None:
+        ds = _apply_bbox(ds, request.bbox, request.bbox_crs, always_xy=False)
+
+    return subset_bbox, ds
+
+
+def _get_level_for_scaling(
+    ml_dataset: MultiLevelDataset, scaling: CoverageScaling
+) -> int:
+    """Get the index of the coarsest pyramid level of *ml_dataset*
+    whose resolution is still at least the one requested by *scaling*.
+    """
+    x_factor, y_factor = scaling.factor
+    if x_factor <= 1 or y_factor <= 1 or ml_dataset.num_levels == 1:
+        return 0
+    x_res, y_res = ml_dataset.resolutions[0]
+    return ml_dataset.get_level_for_resolution((x_res * x_factor, y_res * y_factor))
+
+
+def _get_level_dataset(ml_dataset: MultiLevelDataset, level: int) -> xr.Dataset:
+    base_ds = ml_dataset.get_dataset(0)
+    level_ds = ml_dataset.get_dataset(level)
+    # Pyramid levels may lack the coordinate attributes and the
+    # non-spatial coordinates, e.g., time bounds, of the base level.
+    xy_dims = {get_h_dim(base_ds), get_v_dim(base_ds)}
+    level_ds = level_ds.assign_coords(
+        {
+            name: coord
+            for name, coord in base_ds.coords.items()
+            if name not in level_ds.variables and not xy_dims.intersection(coord.dims)
+        }
+    )
+    for name, coord in level_ds.coords.items():
+        if name in base_ds.coords:
+            coord.attrs = {**base_ds.coords[name].attrs, **coord.attrs}
+    # Cell boundaries are added if the base level provides them.
+    xy_var_names = ml_dataset.grid_mapping.xy_var_names
+    bounds_names = {level_ds[name].attrs.get("bounds") for name in xy_var_names}
+    if any(name in base_ds.variables for name in bounds_names if name):
+        level_gm = GridMapping.from_dataset(level_ds)
+        level_coords = level_gm.to_coords(
+            xy_var_names=level_gm.xy_var_names, xy_dim_names=level_gm.xy_dim_names
+        )
+        level_ds = level_ds.assign_coords(
+            {
+                name: coord
+                for name, coord in level_coords.items()
+                if name not in level_ds.variables
+            }
+        )
+    return level_ds
+
+
 def _apply_properties(collection_id, ds, properties):
     requested_vars = set(properties)
     data_vars = set(
@@ -405,6 +525,8 @@ def dataset_to_image(
     ds: xr.Dataset,
     image_format: Literal["png", "tiff"] = "png",
     crs: pyproj.CRS = None,
+    tiled: bool = False,
+    compress: Optional[str] = None,
 ) -> bytes:
     """Return an in-memory bitmap (TIFF or PNG) representing a dataset
 
@@ -412,10 +534,44 @@ def dataset_to_image(
         ds: a dataset
         image_format: image format to generate ("png" or "tiff")
         crs: CRS of the dataset
+        tiled: whether to write a tiled GeoTIFF
+        compress: GeoTIFF compression method, e.g. "deflate"
 
     Returns:
         TIFF-formatted bytes representing the dataset
     """
+    return b"".join(
+        iter_dataset_as_image(
+            ds, image_format, crs, tiled=tiled, compress=compress
+        )
+    )
+
+
+def iter_dataset_as_image(
+    ds: xr.Dataset,
+    image_format: Literal["png", "tiff"] = "png",
+    crs: pyproj.CRS = None,
+    tiled: bool = False,
+    compress: Optional[str] = None,
+    block_size: int = COVERAGE_BLOCK_SIZE,
+) -> Iterator[bytes]:
+    """Encode a dataset as bitmap (TIFF or PNG) and return an
+    iterator of the encoded bytes in blocks of *block_size*.
+
+    The image is encoded in memory when the first block is
+    requested, so no temporary files are written.
+
+    Args:
+        ds: a dataset
+        image_format: image format to generate ("png" or "tiff")
+        crs: CRS of the dataset
+        tiled: whether to write a tiled GeoTIFF
+        compress: GeoTIFF compression method, e.g. "deflate"
+        block_size: maximum size of the blocks in bytes
+
+    Returns:
+        An iterator of the blocks of the encoded image
+    """
 
     if image_format == "png":
         for var in ds.data_vars:
@@ -423,23 +579,33 @@ def dataset_to_image(
             if ds[var].dtype not in {np.uint8, np.uint16}:
                 ds[var] = ds[var].astype(np.uint16, casting="unsafe")
 
+    # Make dataset representable in an image format by discarding
+    # additional variables and dimensions.
     ds = ds.squeeze()
+    ds = ds.drop_vars(names=["crs", "spatial_ref"], errors="ignore").squeeze()
+    if crs is not None:
+        ds = ds.rio.write_crs(crs)
+
+    options = {}
+    if image_format == "tiff":
+        if tiled:
+            options.update(
+                tiled=True,
+                blockxsize=GEOTIFF_TILE_SIZE,
+                blockysize=GEOTIFF_TILE_SIZE,
+            )
+        if compress is not None:
+            options.update(compress=compress)
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        path = os.path.join(tempdir, "out." + image_format)
-        # Make dataset representable in an image format by discarding
-        # additional variables and dimensions.
-        ds = ds.drop_vars(names=["crs", "spatial_ref"], errors="ignore").squeeze()
+    with MemoryFile(ext="." + image_format) as memfile:
+        driver = _GDAL_DRIVERS[image_format]
         if len(ds.data_vars) == 1:
-            ds[list(ds.data_vars)[0]].rio.to_raster(path)
+            ds[list(ds.data_vars)[0]].rio.to_raster(
+                memfile.name, driver=driver, **options
+            )
         else:
-            ds.rio.to_raster(path)
-        if crs is not None:
-            with rasterio.open(path, mode="r+") as src:
-                src.crs = crs
-        with open(path, "rb") as fh:
-            data = fh.read()
-    return data
+            ds.rio.to_raster(memfile.name, driver=driver, **options)
+        yield from _iter_blocks(memoryview(memfile.getbuffer()), block_size)
 
 
 def dataset_to_netcdf(ds: xr.Dataset) -> bytes:
@@ -451,12 +617,32 @@ def dataset_to_netcdf(ds: xr.Dataset) -> bytes:
     Returns:
         NetCDF-formatted bytes representing the dataset
     """
-    with tempfile.TemporaryDirectory() as tempdir:
-        path = os.path.join(tempdir, "out.nc")
-        ds.to_netcdf(path)
-        with open(path, "rb") as fh:
-            data = fh.read()
-    return data
+    return b"".join(iter_dataset_as_netcdf(ds))
+
+
+def iter_dataset_as_netcdf(
+    ds: xr.Dataset, block_size: int = COVERAGE_BLOCK_SIZE
+) -> Iterator[bytes]:
+    """Encode a dataset as NetCDF and return an iterator of the
+    encoded bytes in blocks of *block_size*.
+
+    The whole dataset is encoded in memory by :meth:`xarray.Dataset.to_netcdf`
+    when the first block is requested, so no temporary files are written.
+
+    Args:
+        ds: a dataset
+        block_size: maximum size of the blocks in bytes
+
+    Returns:
+        An iterator of the blocks of the encoded dataset
+    """
+    yield from _iter_blocks(memoryview(ds.to_netcdf()), block_size)
+
+
+def _iter_blocks(buffer: memoryview, block_size: int) -> Iterator[bytes]:
+    with buffer:
+        for offset in range(0, len(buffer), block_size):
+            yield bytes(buffer[offset : offset + block_size])
 
 
 def get_coverage_domainset(ctx: DatasetsContext, collection_id: str):
@@ -7,6 +7,9 @@ from collections.abc import Mapping, Sequence
 import pyproj
 import rfc3339_validator
 
+GEOTIFF_COMPRESSION_METHODS = ("deflate", "lzw", "zstd", "packbits")
+"""Compression methods supported for GeoTIFF coverages."""
+
 
 class CoverageRequest:
     """A representation of a parsed OGC API - Coverages request
@@ -25,6 +28,8 @@ class CoverageRequest:
     scale_axes: Optional[dict[str, float]]
     scale_size: Optional[dict[str, float]]
     crs: Optional[pyproj.CRS]
+    tiled: bool
+    compress: Optional[str]
 
     def __init__(self, query: Mapping[str, Sequence[str]]):
         self.query = query
@@ -38,6 +43,8 @@ class CoverageRequest:
         self._parse_scale_axes()
         self._parse_scale_size()
         self.crs = self._parse_crs("crs")
+        self._parse_tiled()
+        self._parse_compress()
 
     def _parse_bbox(self):
         self.bbox = None
@@ -133,6 +140,26 @@ class CoverageRequest:
                 result[m.group(1)] = float(m.group(2))
         return result
 
+    def _parse_tiled(self):
+        # Vendor-specific parameter for GeoTIFF output
+        tiled_spec = self.query["tiled"][0] if "tiled" in self.query else "false"
+        if tiled_spec.lower() not in ("true", "false", "1", "0"):
+            raise ValueError(f"Invalid tiled {tiled_spec}")
+        self.tiled = tiled_spec.lower() in ("true", "1")
+
+    def _parse_compress(self):
+        # Vendor-specific parameter for GeoTIFF output
+        self.compress = None
+        if "compress" in self.query:
+            compress_spec = self.query["compress"][0].lower()
+            if compress_spec not in GEOTIFF_COMPRESSION_METHODS + ("none",):
+                raise ValueError(
+                    f"Invalid compress {compress_spec}, must be one of"
+                    f" {', '.join(GEOTIFF_COMPRESSION_METHODS)}, none"
+                )
+            if compress_spec != "none":
+                self.compress = compress_spec
+
     def _parse_crs(self, param, default=None):
         specifier = self.query[param][0] if param in self.query else default
         if specifier is None:
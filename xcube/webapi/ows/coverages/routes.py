@@ -14,7 +14,7 @@ from .controllers import (
     get_coverage_domainset,
     get_coverage_rangetype,
     get_collection_metadata,
-    get_coverage_data,
+    get_coverage_blocks,
 )
 
 
@@ -58,7 +58,6 @@ class CoveragesCoverageHandler(ApiHandler[CoveragesContext]):
             # TODO: support covjson
         ]
         content_type = negotiate_content_type(self.request, available_types)
-        content_bbox = content_crs = None
         if content_type is None:
             raise ApiError.UnsupportedMediaType(
                 f'Available media types: {", ".join(available_types)}\n'
@@ -72,14 +71,13 @@ class CoveragesCoverageHandler(ApiHandler[CoveragesContext]):
         elif content_type in {"application/json", "json"}:
             result = get_coverage_as_json(ds_ctx, collectionId)
         else:
-            result, content_bbox, content_crs = get_coverage_data(
+            blocks, content_bbox, content_crs = get_coverage_blocks(
                 ds_ctx, collectionId, self.request.query, content_type
             )
-
-        if content_bbox is not None:
             self.response.set_header("Content-Bbox", ",".join(map(str, content_bbox)))
-        if content_crs is not None:
             self.response.set_header("Content-Crs", f"[{content_crs.to_string()}]")
+            return await self.stream_response(blocks, content_type)
+
         return await self.response.finish(result, content_type=content_type)
 
 
@@ -27,7 +27,13 @@ class CoverageScaling:
     _x_name: str
     _y_name: str
 
-    def __init__(self, request: CoverageRequest, crs: pyproj.CRS, ds: xr.Dataset):
+    def __init__(
+        self,
+        request: CoverageRequest,
+        crs: pyproj.CRS,
+        ds: xr.Dataset,
+        level_scale: tuple[float, float] = (1, 1),
+    ):
         """Create a new scaling from a coverages request object
 
         Args:
@@ -38,6 +44,12 @@ class CoverageScaling:
                 (currently 1:1)
             crs: the CRS of the dataset to be scaled
             ds: the dataset to be scaled
+            level_scale: the x and y downscaling factors of the dataset
+                to be scaled relative to the dataset that the scaling
+                parameters refer to, e.g. if the dataset is a level of
+                a multi-resolution pyramid. Scale factors are divided
+                by these factors, so that the final size of the
+                coverage is independent of the level being scaled.
         """
         h_dim = get_h_dim(ds)
         v_dim = get_v_dim(ds)
@@ -64,9 +76,13 @@ class CoverageScaling:
         # parameters are given. We choose to handle one and ignore the
         # others in such cases.
         if request.scale_factor is not None:
-            self._scale = request.scale_factor, request.scale_factor
+            self._scale = self._get_level_scale(
+                (request.scale_factor, request.scale_factor), level_scale
+            )
         elif request.scale_axes is not None:
-            self._scale = self._get_xy_values(request.scale_axes)
+            self._scale = self._get_level_scale(
+                self._get_xy_values(request.scale_axes), level_scale
+            )
         elif request.scale_size is not None:
             # The standard allows floats for "scale-size" but mandates:
             # "The returned coverage SHALL contain exactly the specified number
@@ -119,6 +135,14 @@ class CoverageScaling:
             x_scale, y_scale = self._scale
             return x_initial / x_scale, y_initial / y_scale
 
+    @staticmethod
+    def _get_level_scale(
+        scale: tuple[float, float], level_scale: tuple[float, float]
+    ) -> tuple[float, float]:
+        if level_scale == (1, 1):
+            return scale
+        return scale[0] / level_scale[0], scale[1] / level_scale[1]
+
     def _get_xy_values(self, axis_to_value: dict[str, float]) -> tuple[float, float]:
         x, y = None, None
         for axis in axis_to_value:
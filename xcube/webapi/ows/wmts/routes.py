@@ -2,6 +2,8 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
+from typing import Union
+
 from xcube.server.api import ApiError
 from xcube.server.api import ApiHandler
 from .api import api
@@ -113,6 +115,12 @@ class WmtsCapabilitiesXmlForTmsHandler(ApiHandler[WmtsContext]):
 @api.route("/wmts/1.0.0/tile/{datasetId}/{varName}/{z}/{y}/{x}.png")
 class WmtsImageTileHandler(ApiHandler[WmtsContext]):
     # noinspection PyPep8Naming
+    def get_etag(self, datasetId: str, varName: str, z: str, y: str, x: str):
+        self.request.make_query_lower_case()
+        return self.ctx.datasets_ctx.get_dataset_etag(
+            datasetId, varName, z, y, x, _query_to_dict(self.request)
+        )
+
     @api.operation(
         operationId="getWmtsImageTile",
         summary="Gets a WMTS image tile in PNG format.",
@@ -123,7 +131,9 @@ class WmtsImageTileHandler(ApiHandler[WmtsContext]):
         tms_id = self.request.get_query_arg("tilematrixset", default=WMTS_CRS84_TMS_ID)
         _assert_valid_tms_id(tms_id)
         crs_name = get_crs_name_from_tms_id(tms_id)
-        tile = await self.ctx.run_in_executor(
+        params = _query_to_dict(self.request)
+        tile = await self.ctx.run_in_executor_shared(
+            _get_tile_call_key(datasetId, varName, crs_name, x, y, z, params),
             None,
             compute_ml_dataset_tile,
             self.ctx.tiles_ctx,
@@ -133,7 +143,7 @@ class WmtsImageTileHandler(ApiHandler[WmtsContext]):
             x,
             y,
             z,
-            _query_to_dict(self.request),
+            params,
         )
         self.response.set_header("Content-Type", "image/png")
         await self.response.finish(tile)
@@ -142,6 +152,14 @@ class WmtsImageTileHandler(ApiHandler[WmtsContext]):
 @api.route("/wmts/1.0.0/tile/{datasetId}/{varName}/{tmsId}/{z}/{y}/{x}.png")
 class WmtsImageTileForTmsHandler(ApiHandler[WmtsContext]):
     # noinspection PyPep8Naming
+    def get_etag(
+        self, datasetId: str, varName: str, tmsId: str, z: str, y: str, x: str
+    ):
+        self.request.make_query_lower_case()
+        return self.ctx.datasets_ctx.get_dataset_etag(
+            datasetId, varName, tmsId, z, y, x, _query_to_dict(self.request)
+        )
+
     @api.operation(
         operationId="getWmtsTmsImageTile",
         summary="Gets a WMTS image tile" " for given tile matrix set in PNG format",
@@ -153,7 +171,9 @@ class WmtsImageTileForTmsHandler(ApiHandler[WmtsContext]):
         self.request.make_query_lower_case()
         _assert_valid_tms_id(tmsId)
         crs_name = get_crs_name_from_tms_id(tmsId)
-        tile = await self.ctx.run_in_executor(
+        params = _query_to_dict(self.request)
+        tile = await self.ctx.run_in_executor_shared(
+            _get_tile_call_key(datasetId, varName, crs_name, x, y, z, params),
             None,
             compute_ml_dataset_tile,
             self.ctx.tiles_ctx,
@@ -163,7 +183,7 @@ class WmtsImageTileForTmsHandler(ApiHandler[WmtsContext]):
             x,
             y,
             z,
-            _query_to_dict(self.request),
+            params,
         )
         self.response.set_header("Content-Type", "image/png")
         await self.response.finish(tile)
@@ -171,6 +191,18 @@ class WmtsImageTileForTmsHandler(ApiHandler[WmtsContext]):
 
 @api.route("/wmts/kvp")
 class WmtsKvpHandler(ApiHandler[WmtsContext]):
+    def get_etag(self):
+        self.request.make_query_lower_case()
+        if self.request.get_query_arg("request") != "GetTile":
+            return None
+        layer = self.request.get_query_arg("layer", default="")
+        ds_id, _, var_name = layer.partition(".")
+        if not ds_id or not var_name:
+            return None
+        return self.ctx.datasets_ctx.get_dataset_etag(
+            ds_id, _query_to_dict(self.request)
+        )
+
     @api.operation(
         operationId="invokeWmtsMethodFromKvp",
         summary="Invokes the WMTS by key-value pairs",
@@ -232,7 +264,9 @@ class WmtsKvpHandler(ApiHandler[WmtsContext]):
             x = self.request.get_query_arg("tilecol", type=int)
             y = self.request.get_query_arg("tilerow", type=int)
             z = self.request.get_query_arg("tilematrix", type=int)
-            tile = await self.ctx.run_in_executor(
+            params = _query_to_dict(self.request)
+            tile = await self.ctx.run_in_executor_shared(
+                _get_tile_call_key(ds_id, var_name, crs_name, x, y, z, params),
                 None,
                 compute_ml_dataset_tile,
                 self.ctx.tiles_ctx,
@@ -242,7 +276,7 @@ class WmtsKvpHandler(ApiHandler[WmtsContext]):
                 x,
                 y,
                 z,
-                _query_to_dict(self.request),
+                params,
             )
             self.response.set_header("Content-Type", "image/png")
             await self.response.finish(tile)
@@ -264,3 +298,24 @@ def _assert_valid_tms_id(tms_id: str):
 
 def _query_to_dict(request):
     return {k: v[0] for k, v in request.query.items()}
+
+
+def _get_tile_call_key(
+    ds_id: str,
+    var_name: str,
+    crs_name: str,
+    x: Union[str, int],
+    y: Union[str, int],
+    z: Union[str, int],
+    params: dict[str, str],
+):
+    return (
+        "getWmtsTile",
+        ds_id,
+        var_name,
+        crs_name,
+        str(x),
+        str(y),
+        str(z),
+        tuple(sorted(params.items())),
+    )
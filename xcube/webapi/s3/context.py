@@ -21,6 +21,7 @@ class S3Context(ResourcesContext):
                 DatasetsMapping(self._datasets_ctx, True),
             ),
         }
+        self._datasets_ctx.add_dataset_removed_listener(self._remove_dataset)
 
     @property
     def datasets_ctx(self) -> DatasetsContext:
@@ -28,3 +29,8 @@ class S3Context(ResourcesContext):
 
     def get_bucket(self, bucket_name: str) -> ObjectStorage:
         return self._buckets[bucket_name]
+
+    def _remove_dataset(self, ds_id: str):
+        for bucket in self._buckets.values():
+            for s3_name in bucket.datasets.get_s3_names(ds_id):
+                bucket.remove_dataset(s3_name)
@@ -67,6 +67,16 @@ class DatasetsMapping(collections.abc.Mapping):
             s3_names[s3_name] = ds_id
         return s3_names
 
+    def get_s3_names(self, dataset_id: str) -> set[str]:
+        """Get the S3 names that may be used for *dataset_id*.
+        Unlike the actual S3 names, these do not depend on the
+        current dataset configurations, so they can be determined
+        for datasets that have already been removed.
+        """
+        base, ext = _split_base_ext(dataset_id)
+        new_ext = _LEVELS_EXT if self._is_multi_level else _ZARR_EXT
+        return {base + new_ext, dataset_id + new_ext}
+
     def __len__(self) -> int:
         return len(self._s3_names)
 
@@ -2,14 +2,16 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
+import bisect
 import collections.abc
 import datetime
 import hashlib
 import time
 from typing import Dict, Any, List, Optional
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
 
 from xcube.util.assertions import assert_instance
+from .objectstorage import ObjectStorage
 
 _CONTENT_LENGTH_DUMMY = -1
 _LAST_MODIFIED_DUMMY = str(
@@ -87,47 +89,29 @@ def list_s3_bucket_v2(
     start_after = None if continuation_token else start_after
     storage_class = storage_class or "STANDARD"
 
+    if continuation_token:
+        # Continuation tokens are the first key not yet listed
+        start = continuation_token
+    elif start_after:
+        # Smallest key after start_after
+        start = start_after + "\0"
+    else:
+        start = ""
+
     contents_list = []
     next_continuation_token = None
-    continuation_token_seen = continuation_token is None
-    start_key_seen = start_after is None
     common_prefixes_list = []
-    common_prefixes_set = set()
-
-    token = 0
-
-    for key in sorted(object_storage.keys()):
-        token += 1
 
+    for key, is_common_prefix in _list_keys(object_storage, start, prefix, delimiter):
         if len(contents_list) == max_keys:
-            next_continuation_token = token
+            next_continuation_token = key
             break
-
-        if key == start_after:
-            start_key_seen = True
+        if is_common_prefix:
+            common_prefixes_list.append(key)
             continue
-
-        if token == continuation_token:
-            continuation_token_seen = True
-
-        if not continuation_token_seen or not start_key_seen:
-            continue
-
-        if prefix and not key.startswith(prefix):
-            continue
-
-        if delimiter:
-            index = key.find(delimiter, len(prefix) if prefix else 0)
-            if index >= 0:
-                key = key[: index + len(delimiter)]
-                if key not in common_prefixes_set:
-                    common_prefixes_set.add(key)
-                    common_prefixes_list.append(key)
-                continue
-
         item = dict(
             Key=key,
-            Size=_CONTENT_LENGTH_DUMMY,
+            Size=_get_size(object_storage, key),
             LastModified=last_modified or _LAST_MODIFIED_DUMMY,
             ETag=_str_to_e_tag(key),
             StorageClass=storage_class,
@@ -215,37 +199,21 @@ def list_s3_bucket_v1(
     contents_list = []
     is_truncated = False
     next_marker = None
-    marker_seen = marker is None
     common_prefixes_list = []
-    common_prefixes_set = set()
 
-    for key in sorted(object_storage.keys()):
+    for key, is_common_prefix in _list_keys(
+        object_storage, marker or "", prefix, delimiter
+    ):
         if len(contents_list) == max_keys:
             is_truncated = True
             next_marker = key
             break
-
-        if key == marker:
-            marker_seen = True
-
-        if not marker_seen:
-            continue
-
-        if prefix and not key.startswith(prefix):
+        if is_common_prefix:
+            common_prefixes_list.append(key)
             continue
-
-        if delimiter:
-            index = key.find(delimiter, len(prefix) if prefix else 0)
-            if index >= 0:
-                key = key[: index + len(delimiter)]
-                if key not in common_prefixes_set:
-                    common_prefixes_set.add(key)
-                    common_prefixes_list.append(key)
-                continue
-
         item = dict(
             Key=key,
-            Size=_CONTENT_LENGTH_DUMMY,
+            Size=_get_size(object_storage, key),
             LastModified=last_modified or _LAST_MODIFIED_DUMMY,
             ETag=_str_to_e_tag(key),
             StorageClass=storage_class,
@@ -271,6 +239,58 @@ def list_s3_bucket_v1(
     return list_bucket_result
 
 
+def _list_keys(
+    object_storage: Mapping[str, bytes],
+    start: str,
+    prefix: Optional[str],
+    delimiter: Optional[str],
+) -> Iterator[tuple[str, bool]]:
+    """Iterate over the keys greater than or equal to *start* that
+    begin with *prefix* in lexicographical order.
+    If *delimiter* is given, keys that contain the delimiter after
+    the prefix are grouped into common prefixes. Yields pairs of
+    a key or common prefix and a flag telling which of the two it is.
+    """
+    prefix = prefix or ""
+    while True:
+        for key in _iter_keys(object_storage, start, prefix, delimiter):
+            if delimiter:
+                index = key.find(delimiter, len(prefix))
+                if index >= 0:
+                    common_prefix = key[: index + len(delimiter)]
+                    yield common_prefix, True
+                    # Skip all keys of the common prefix by
+                    # continuing at the smallest key after them
+                    start = common_prefix[:-1] + chr(ord(common_prefix[-1]) + 1)
+                    break
+            yield key, False
+        else:
+            return
+
+
+def _iter_keys(
+    object_storage: Mapping[str, bytes],
+    start: str,
+    prefix: str,
+    delimiter: Optional[str],
+) -> Iterator[str]:
+    if isinstance(object_storage, ObjectStorage):
+        return object_storage.iter_keys(
+            start=start, prefix=prefix, delimiter=delimiter
+        )
+    keys = sorted(object_storage.keys())
+    index = bisect.bisect_left(keys, max(start, prefix))
+    return (key for key in keys[index:] if key.startswith(prefix))
+
+
+def _get_size(object_storage: Mapping[str, bytes], key: str) -> int:
+    if isinstance(object_storage, ObjectStorage):
+        size = object_storage.get_size(key)
+        if size is not None:
+            return size
+    return _CONTENT_LENGTH_DUMMY
+
+
 def list_bucket_result_to_xml(list_bucket_result):
     return dict_to_xml(
         "ListBucketResult",
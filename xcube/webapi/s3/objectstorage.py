@@ -2,16 +2,31 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
+import bisect
+import collections
 import collections.abc
-from typing import Union, Tuple
-from collections.abc import Iterator, Mapping
+import hashlib
+import json
+import math
+import threading
+from typing import Callable, Optional, Union, Tuple
+from collections.abc import Iterable, Iterator, Mapping
 
+import fsspec.mapping
+import numpy as np
 import xarray as xr
 import zarr.storage
 
 from xcube.core.mldataset import MultiLevelDataset
+from xcube.core.zarrstore import ChunkCacheStore
+from xcube.core.zarrstore import LoggingZarrStore
 from xcube.server.api import ApiError
 
+DEFAULT_OBJECT_CACHE_SIZE = 32 * 1024**2
+"""Default byte budget of the cache of recently used objects."""
+
+_MAX_NUM_CACHED_SIZES = 100_000
+
 
 class ObjectStorage(collections.abc.Mapping):
     """Represents the emulated object storage for the S3 API.
@@ -24,10 +39,34 @@ class ObjectStorage(collections.abc.Mapping):
     Args:
         datasets: Mapping from dataset Identifier to (multi-level)
             datasets.
+        cache_size: Byte budget of the cache of recently used
+            objects, see :meth:`get_object`.
     """
 
-    def __init__(self, datasets: Mapping[str, Union[xr.Dataset, MultiLevelDataset]]):
+    def __init__(
+        self,
+        datasets: Mapping[str, Union[xr.Dataset, MultiLevelDataset]],
+        cache_size: int = DEFAULT_OBJECT_CACHE_SIZE,
+    ):
         self.datasets = datasets
+        self._key_index: Optional[KeyIndex] = None
+        self._key_index_ids: Optional[list[str]] = None
+        self._cache_size = cache_size
+        # Maps key to object bytes and ETag
+        self._objects: collections.OrderedDict[str, tuple[bytes, str]] = (
+            collections.OrderedDict()
+        )
+        self._objects_bytes = 0
+        # Maps key to object size
+        self._sizes: collections.OrderedDict[str, int] = collections.OrderedDict()
+        # Maps array key to size of its chunks, if uncompressed
+        self._chunk_sizes: dict[str, Optional[int]] = {}
+        # Keys of arrays whose chunk sizes have been listed
+        self._listed_arrays: set[str] = set()
+        # Incremented whenever a dataset is removed, so that objects
+        # of a removed dataset that are still being loaded are not cached
+        self._generation = 0
+        self._lock = threading.Lock()
 
     def __len__(self) -> int:
         return sum(1 for _ in iter(self))
@@ -46,6 +85,78 @@ class ObjectStorage(collections.abc.Mapping):
                 for k in zarr_store.keys():
                     yield f"{dataset_id}/{k}"
 
+    def iter_keys(
+        self, start: str = "", prefix: str = "", delimiter: Optional[str] = None
+    ) -> Iterator[str]:
+        """Iterate over the keys in lexicographical order.
+        Unlike iterating the object storage itself, this
+        does not require loading the keys of all datasets.
+
+        Keys are taken from a sorted index. The keys of a dataset
+        or dataset level are indexed when they are first visited.
+        The index is rebuilt, if the dataset identifiers change.
+        The keys of a dataset are indexed anew after the dataset
+        has been removed or replaced, see :meth:`remove_dataset`.
+
+        Args:
+            start: Only keys greater than or equal to *start*
+                are returned.
+            prefix: Only keys beginning with *prefix* are returned.
+            delimiter: See :meth:`KeyIndex.iter_keys`.
+        """
+        return self._get_key_index().iter_keys(
+            start=start, prefix=prefix, delimiter=delimiter
+        )
+
+    def _get_key_index(self) -> "KeyIndex":
+        dataset_ids = list(self.datasets.keys())
+        with self._lock:
+            if self._key_index is None or self._key_index_ids != dataset_ids:
+                self._key_index = KeyIndex(
+                    [f"{dataset_id}/" for dataset_id in dataset_ids],
+                    self._get_dataset_keys,
+                )
+                self._key_index_ids = dataset_ids
+            return self._key_index
+
+    def _get_dataset_keys(self, dataset_prefix: str) -> Union[list[str], "KeyIndex"]:
+        dataset = self.datasets[dataset_prefix[:-1]]
+        if isinstance(dataset, MultiLevelDataset):
+
+            def get_level_keys(level_prefix: str) -> list[str]:
+                level = int(level_prefix.split(".", maxsplit=1)[0])
+                level_dataset = dataset.get_dataset(level)
+                return list(level_dataset.zarr_store.get().keys())
+
+            return KeyIndex(
+                [f"{level}.zarr/" for level in range(dataset.num_levels)],
+                get_level_keys,
+            )
+        return list(dataset.zarr_store.get().keys())
+
+    def remove_dataset(self, ds_id: str):
+        """Forget all indexed keys, cached objects, and sizes
+        of the dataset given by *ds_id*. Called whenever a dataset is removed
+        or replaced.
+
+        Args:
+            ds_id: The dataset identifier.
+        """
+        prefix = f"{ds_id}/"
+        with self._lock:
+            self._generation += 1
+            if self._key_index is not None:
+                self._key_index.remove_group(prefix)
+            for key in [k for k in self._objects.keys() if k.startswith(prefix)]:
+                self._objects_bytes -= len(self._objects.pop(key)[0])
+            for key in [k for k in self._sizes.keys() if k.startswith(prefix)]:
+                del self._sizes[key]
+            for key in [k for k in self._chunk_sizes.keys() if k.startswith(prefix)]:
+                del self._chunk_sizes[key]
+            self._listed_arrays = {
+                k for k in self._listed_arrays if not k.startswith(prefix)
+            }
+
     def __contains__(self, key: str) -> bool:
         """Overridden to avoid a call to __getitem__(),
         which will load data, but we want this to happen
@@ -71,6 +182,151 @@ class ObjectStorage(collections.abc.Mapping):
             )
         return value
 
+    def get_object(self, key: str) -> tuple[bytes, str]:
+        """Get the bytes and the ETag of the object given by *key*.
+
+        Recently used objects are kept in a cache, so that, e.g.,
+        a HEAD request followed by GET requests for the same object
+        encodes a chunk only once.
+
+        Args:
+            key: The object key.
+
+        Returns:
+            A pair comprising the object's bytes and ETag.
+
+        Raises:
+            KeyError: If the object does not exist.
+        """
+        with self._lock:
+            entry = self._objects.get(key)
+            if entry is not None:
+                self._objects.move_to_end(key)
+                return entry
+            generation = self._generation
+        value = self[key]
+        entry = value, hashlib.md5(value).hexdigest()
+        with self._lock:
+            if generation != self._generation:
+                # A dataset has been removed meanwhile
+                return entry
+            self._put_size(key, len(value))
+            if len(value) <= self._cache_size and key not in self._objects:
+                self._objects[key] = entry
+                self._objects_bytes += len(value)
+                while self._objects_bytes > self._cache_size:
+                    _, (old_value, _) = self._objects.popitem(last=False)
+                    self._objects_bytes -= len(old_value)
+        return entry
+
+    def get_size(self, key: str) -> Optional[int]:
+        """Get the size in bytes of the object given by *key*,
+        if it can be determined without encoding chunks.
+        This is the case for metadata objects, for the chunks of
+        arrays neither compressed nor filtered, for stores that provide
+        chunk sizes cheaply, and for objects encoded before.
+
+        For stores backed by a filesystem, the sizes of all chunks
+        of an array are listed at once when first requested.
+        Other stores yield ``None`` for chunks of compressed
+        or filtered arrays that have not been encoded yet.
+
+        Args:
+            key: The object key.
+
+        Returns:
+            The object's size in bytes or ``None``, if unknown.
+        """
+        with self._lock:
+            size = self._sizes.get(key)
+            generation = self._generation
+        if size is not None:
+            return size
+        try:
+            zarr_store, item_key = self._parse_key(key)
+        except (KeyError, ApiError.NotFound):
+            return None
+        array_name, _, name = item_key.rpartition("/")
+        if not name:
+            return None
+        if name.startswith("."):
+            try:
+                size = len(zarr_store[item_key])
+            except KeyError:
+                return None
+        elif isinstance(zarr_store, zarr.storage.DirectoryStore):
+            size = zarr_store.getsize(item_key)
+        else:
+            array_key = key[: -len(name)]
+            size = self._get_chunk_size(zarr_store, array_key, array_name)
+            if size is None:
+                fs_map = _get_fs_map(zarr_store)
+                if fs_map is not None:
+                    return self._get_listed_size(fs_map, key, array_key, array_name)
+        if size is not None:
+            with self._lock:
+                if generation == self._generation:
+                    self._put_size(key, size)
+        return size
+
+    def _get_listed_size(
+        self, fs_map: fsspec.mapping.FSMap, key: str, array_key: str, array_name: str
+    ) -> Optional[int]:
+        with self._lock:
+            if array_key in self._listed_arrays:
+                return self._sizes.get(key)
+            generation = self._generation
+        try:
+            entries = fs_map.fs.ls(f"{fs_map.root}/{array_name}", detail=True)
+        except (OSError, ValueError):
+            entries = []
+        sizes = {}
+        for entry in entries:
+            size = entry.get("size")
+            if entry.get("type") == "file" and isinstance(size, int):
+                sizes[array_key + entry["name"].rsplit("/", 1)[-1]] = size
+        with self._lock:
+            if generation == self._generation:
+                for chunk_key, size in sizes.items():
+                    self._put_size(chunk_key, size)
+                self._listed_arrays.add(array_key)
+        return sizes.get(key)
+
+    def _get_chunk_size(
+        self, zarr_store: zarr.storage.BaseStore, array_key: str, array_name: str
+    ) -> Optional[int]:
+        with self._lock:
+            if array_key in self._chunk_sizes:
+                return self._chunk_sizes[array_key]
+            generation = self._generation
+        chunk_size = None
+        try:
+            spec = json.loads(zarr_store[f"{array_name}/.zarray"])
+        except (KeyError, ValueError):
+            spec = None
+        if (
+            isinstance(spec, dict)
+            and spec.get("compressor") is None
+            and not spec.get("filters")
+        ):
+            try:
+                dtype = np.dtype(spec["dtype"])
+            except (KeyError, TypeError):
+                dtype = None
+            if dtype is not None and not dtype.hasobject:
+                chunk_size = math.prod(spec["chunks"]) * dtype.itemsize
+        with self._lock:
+            if generation == self._generation:
+                self._chunk_sizes[array_key] = chunk_size
+        return chunk_size
+
+    def _put_size(self, key: str, size: int):
+        # Called with lock held
+        self._sizes[key] = size
+        self._sizes.move_to_end(key)
+        if len(self._sizes) > _MAX_NUM_CACHED_SIZES:
+            self._sizes.popitem(last=False)
+
     def _parse_key(self, key: str) -> tuple[zarr.storage.BaseStore, str]:
         """Parses a given *key* which is expected to have format
         "{dataset_id}/{level}.zarr/{*path}" for multi-level datasets and
@@ -101,3 +357,125 @@ class ObjectStorage(collections.abc.Mapping):
             zarr_store = dataset.zarr_store.get()
 
         return zarr_store, item_key
+
+
+def _get_fs_map(
+    zarr_store: collections.abc.MutableMapping,
+) -> Optional[fsspec.mapping.FSMap]:
+    """Get the filesystem mapper that backs *zarr_store*, if any."""
+    while True:
+        if isinstance(zarr_store, fsspec.mapping.FSMap):
+            return zarr_store
+        if isinstance(zarr_store, ChunkCacheStore):
+            zarr_store = zarr_store.store
+        elif isinstance(zarr_store, zarr.storage.KVStore):
+            zarr_store = zarr_store._mutable_mapping
+        elif isinstance(zarr_store, zarr.storage.FSStore):
+            zarr_store = zarr_store.map
+        elif isinstance(zarr_store, zarr.storage.LRUStoreCache):
+            zarr_store = zarr_store._store
+        elif isinstance(zarr_store, LoggingZarrStore):
+            zarr_store = zarr_store._other
+        else:
+            return None
+
+
+class KeyIndex:
+    """A sorted index of keys that are grouped by distinct prefixes.
+
+    The keys of a group are loaded when the group is first visited.
+    Hence, looking up keys by a start key or prefix does not require
+    loading all keys.
+
+    Args:
+        prefixes: The group prefixes. No prefix must be
+            the prefix of another one.
+        load_group: Function that is called with a group prefix and
+            returns the group's keys without that prefix, either as
+            list or as another key index.
+    """
+
+    def __init__(
+        self,
+        prefixes: Iterable[str],
+        load_group: Callable[[str], Union[list[str], "KeyIndex"]],
+    ):
+        self._prefixes = sorted(prefixes)
+        self._load_group = load_group
+        self._groups: dict[str, Union[list[str], KeyIndex]] = {}
+        # Groups loaded while a group is removed are not kept
+        self._num_removals = 0
+        self._lock = threading.Lock()
+
+    def iter_keys(
+        self, start: str = "", prefix: str = "", delimiter: Optional[str] = None
+    ) -> Iterator[str]:
+        """Iterate over the keys greater than or equal to *start*
+        that begin with *prefix* in lexicographical order.
+
+        If *delimiter* is given and a group prefix contains it after
+        *prefix*, all keys of the group share the same common prefix
+        up to the delimiter. Then this common prefix is returned
+        instead of the group's keys, which are not loaded.
+        """
+        start = max(start, prefix)
+        if not start.startswith(prefix):
+            return
+        prefixes = self._prefixes
+        index = bisect.bisect_left(prefixes, start)
+        if index > 0 and start.startswith(prefixes[index - 1]):
+            # start lies within the preceding group
+            index -= 1
+        for group_prefix in prefixes[index:]:
+            if not (
+                group_prefix.startswith(prefix) or prefix.startswith(group_prefix)
+            ):
+                # All following groups are beyond prefix
+                break
+            if delimiter and start <= group_prefix:
+                delimiter_index = group_prefix.find(delimiter, len(prefix))
+                if delimiter_index >= 0:
+                    yield group_prefix[: delimiter_index + len(delimiter)]
+                    continue
+            n = len(group_prefix)
+            group_start = start[n:] if start.startswith(group_prefix) else ""
+            group_key_prefix = prefix[n:] if prefix.startswith(group_prefix) else ""
+            group = self._get_group(group_prefix)
+            if isinstance(group, KeyIndex):
+                keys = group.iter_keys(
+                    start=group_start, prefix=group_key_prefix, delimiter=delimiter
+                )
+            else:
+                keys = _iter_sorted_keys(group, group_start, group_key_prefix)
+            for key in keys:
+                yield group_prefix + key
+
+    def remove_group(self, group_prefix: str):
+        """Forget the loaded keys of the group given by
+        *group_prefix*, so they are loaded again when the group
+        is visited next time.
+        """
+        with self._lock:
+            self._groups.pop(group_prefix, None)
+            self._num_removals += 1
+
+    def _get_group(self, group_prefix: str) -> Union[list[str], "KeyIndex"]:
+        with self._lock:
+            group = self._groups.get(group_prefix)
+            num_removals = self._num_removals
+        if group is None:
+            group = self._load_group(group_prefix)
+            if not isinstance(group, KeyIndex):
+                group = sorted(group)
+            with self._lock:
+                if num_removals == self._num_removals:
+                    group = self._groups.setdefault(group_prefix, group)
+        return group
+
+
+def _iter_sorted_keys(keys: list[str], start: str, prefix: str) -> Iterator[str]:
+    for index in range(bisect.bisect_left(keys, max(start, prefix)), len(keys)):
+        key = keys[index]
+        if not key.startswith(prefix):
+            break
+        yield key
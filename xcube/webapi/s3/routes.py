@@ -2,7 +2,6 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
-import hashlib
 from typing import Optional
 
 from xcube.server.api import ApiHandler, ApiError
@@ -95,6 +94,19 @@ GET_OBJECT_PARAMETERS = [
             "type": "string",
         },
     },
+    {
+        "name": "Range",
+        "in": "header",
+        "description": 'A single byte range, e.g., "bytes=0-1023".',
+        "schema": OPTIONAL_STRING_SCHEMA,
+    },
+    {
+        "name": "If-None-Match",
+        "in": "header",
+        "description": "Return the object only if its ETag differs"
+        " from the given one, otherwise respond with 304.",
+        "schema": OPTIONAL_STRING_SCHEMA,
+    },
 ]
 
 
@@ -151,23 +163,7 @@ class GetS3BucketObjectHandler(ApiHandler[S3Context]):
         parameters=GET_OBJECT_PARAMETERS,
     )
     async def head(self, bucket: str, key: Optional[str]):
-        try:
-            object_storage = self.ctx.get_bucket(bucket)
-        except KeyError:
-            return await self._bucket_not_found(bucket)
-
-        try:
-            value = object_storage[key]
-        except KeyError:
-            return await self._key_not_found(key)
-
-        e_tag = hashlib.md5(value).hexdigest()
-        content_length = len(value)
-
-        self.response.set_header("ETag", f'"{e_tag}"')
-        self.response.set_header("Last-Modified", _LAST_MODIFIED_DUMMY)
-        self.response.set_header("Content-Length", str(content_length))
-        await self.response.finish()
+        await self._send_object(bucket, key, send_data=False)
 
     # noinspection PyPep8Naming
     @api.operation(
@@ -176,25 +172,65 @@ class GetS3BucketObjectHandler(ApiHandler[S3Context]):
         parameters=GET_OBJECT_PARAMETERS,
     )
     async def get(self, bucket: str, key: Optional[str]):
+        await self._send_object(bucket, key, send_data=True)
+
+    async def _send_object(self, bucket: str, key: Optional[str], send_data: bool):
         try:
             object_storage = self.ctx.get_bucket(bucket)
         except KeyError:
             return await self._bucket_not_found(bucket)
 
         try:
-            value = object_storage[key]
+            value, e_tag = object_storage.get_object(key)
         except KeyError:
             return await self._key_not_found(key)
 
-        e_tag = hashlib.md5(value).hexdigest()
-        content_length = len(value)
-
-        self.response.set_header("ETag", f'"{e_tag}"')
+        e_tag = f'"{e_tag}"'
+        self.response.set_header("ETag", e_tag)
         self.response.set_header("Last-Modified", _LAST_MODIFIED_DUMMY)
-        self.response.set_header("Content-Length", str(content_length))
+        self.response.set_header("Accept-Ranges", "bytes")
+
+        if_none_match = self.request.headers.get("If-None-Match")
+        if if_none_match and _matches_e_tag(if_none_match, e_tag):
+            self.response.set_status(304)
+            return await self.response.finish()
+
+        size = len(value)
+        byte_range = self.request.headers.get("Range")
+        if byte_range:
+            try:
+                start_stop = _parse_byte_range(byte_range, size)
+            except ValueError:
+                return await self._invalid_range(size)
+            if start_stop is not None:
+                start, stop = start_stop
+                value = value[start:stop]
+                self.response.set_status(206)
+                self.response.set_header(
+                    "Content-Range", f"bytes {start}-{stop - 1}/{size}"
+                )
+
+        self.response.set_header("Content-Length", str(len(value)))
+        if not send_data:
+            return await self.response.finish()
         self.response.set_header("Content-Type", "binary/octet-stream")
         await self.response.finish(value)
 
+    def _invalid_range(self, size: int):
+        self.response.set_header("Content-Type", "application/xml")
+        self.response.set_header("Content-Range", f"bytes */{size}")
+        self.response.set_status(416)
+        return self.response.finish(
+            dict_to_xml(
+                root_element_name="Error",
+                content_dict={
+                    "Code": "InvalidRange",
+                    "Message": "The requested range is not satisfiable",
+                    "ActualObjectSize": size,
+                },
+            )
+        )
+
     def _key_not_found(self, key: str):
         return self._not_found(
             "NoSuchKey", "The specified key does not exist.", Key=key
@@ -216,3 +252,51 @@ class GetS3BucketObjectHandler(ApiHandler[S3Context]):
                 content_dict={"Code": code, "Message": message, **kwargs},
             )
         )
+
+
+def _matches_e_tag(if_none_match: str, e_tag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            # Weak comparison
+            candidate = candidate[2:]
+        if candidate == e_tag:
+            return True
+    return False
+
+
+def _parse_byte_range(byte_range: str, size: int) -> Optional[tuple[int, int]]:
+    """Parse the value of a "Range" header for an object of given
+    *size* into the start and stop index of the requested bytes.
+
+    Returns ``None``, if the range is to be ignored, that is,
+    if it is syntactically invalid or comprises multiple ranges.
+    Raises ``ValueError``, if the range is not satisfiable.
+    """
+    unit, _, byte_range = byte_range.partition("=")
+    if unit.strip() != "bytes" or "," in byte_range:
+        return None
+    first, sep, last = byte_range.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        first = int(first) if first else None
+        last = int(last) if last else None
+    except ValueError:
+        return None
+    if first is None:
+        if last is None:
+            return None
+        # Suffix range, i.e., the last bytes
+        if last == 0 or size == 0:
+            raise ValueError("unsatisfiable range")
+        return max(0, size - last), size
+    if last is not None and last < first:
+        return None
+    if first >= size:
+        raise ValueError("unsatisfiable range")
+    if last is None or last >= size:
+        last = size - 1
+    return first, last + 1
@@ -1,8 +1,11 @@
 from collections.abc import Mapping
 from typing import Any
 
+import dask
+import dask.array as da
 import numpy as np
 import shapely
+import xarray as xr
 
 from xcube.constants import LOG
 from xcube.core.geom import get_dataset_geometry
@@ -83,25 +86,60 @@ def _compute_statistics(
         return NAN_RESULT
 
     var = dataset[var_name]
-    count = int(np.count_nonzero(~np.isnan(var)))
+    count, minimum, maximum, mean, deviation = _compute_moments(var)
     if count == 0:
         return NAN_RESULT
 
-    # note, casting to float forces intended computation
-    minimum = float(var.min())
-    maximum = float(var.max())
-    h_values, h_edges = np.histogram(
-        var, bin_count, range=(minimum, maximum), density=True
-    )
+    h_values, h_edges = _compute_histogram(var, bin_count, minimum, maximum)
 
     return {
         "count": count,
         "minimum": minimum,
         "maximum": maximum,
-        "mean": float(var.mean()),
-        "deviation": float(var.std()),
+        "mean": mean,
+        "deviation": deviation,
         "histogram": {
             "values": [float(v) for v in h_values],
             "edges": [float(v) for v in h_edges],
         },
     }
+
+
+def _compute_moments(var: xr.DataArray) -> tuple[int, float, float, float, float]:
+    """Compute count, minimum, maximum, mean, and standard deviation
+    of the valid values of *var* in a single pass over its data.
+    """
+    var = var.astype(np.float64)
+    # Fused reductions: the chunks of var and the geometry mask
+    # are computed only once for all statistics.
+    # The standard deviation is computed from the deviations
+    # of the values from the mean of their chunk, which is
+    # numerically stable, rather than from the sum of squares.
+    count, minimum, maximum, mean, deviation = dask.compute(
+        var.count(), var.min(), var.max(), var.mean(), var.std()
+    )
+    count = int(count)
+    if count == 0:
+        return 0, np.nan, np.nan, np.nan, np.nan
+    return count, float(minimum), float(maximum), float(mean), float(deviation)
+
+
+def _compute_histogram(
+    var: xr.DataArray, bin_count: int, minimum: float, maximum: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the histogram of *var* in the range given by
+    *minimum* and *maximum*. The result equals the one
+    of ``np.histogram(var, bin_count, range=(minimum, maximum),
+    density=True)``, but is computed chunk-wise.
+    """
+    if minimum == maximum:
+        # Same as numpy
+        minimum, maximum = minimum - 0.5, maximum + 0.5
+    edges = np.linspace(minimum, maximum, bin_count + 1)
+    if isinstance(var.data, da.Array):
+        counts, _ = da.histogram(var.data, bins=edges)
+        counts = counts.compute()
+    else:
+        counts, _ = np.histogram(var.data, bins=edges)
+    values = counts / (np.diff(edges) * counts.sum())
+    return values, edges
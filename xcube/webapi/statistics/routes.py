@@ -35,7 +35,14 @@ class StatisticsHandler(ApiHandler[StatisticsContext]):
     )
     async def post(self, datasetId: str, varName: str):
         params = {k: v[0] for k, v in self.request.query.items()}
-        result = await self.ctx.run_in_executor(
+        result = await self.ctx.run_in_executor_shared(
+            (
+                "getStatistics",
+                datasetId,
+                varName,
+                self.request.body,
+                tuple(sorted(params.items())),
+            ),
             None,
             compute_statistics,
             self.ctx,
@@ -3,11 +3,13 @@
 # https://opensource.org/licenses/MIT.
 
 from xcube.server.api import Api
+from .config import CONFIG_SCHEMA
 from .context import TilesContext
 
 api = Api(
     "tiles",
     description="xcube Tiles API",
+    config_schema=CONFIG_SCHEMA,
     required_apis=["datasets"],
     create_ctx=TilesContext,
 )
@@ -0,0 +1,312 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import collections
+import hashlib
+import os
+import os.path
+import shutil
+import threading
+import urllib.parse
+from typing import Any, Optional
+from collections.abc import Hashable, Mapping
+
+from xcube.constants import LOG
+
+TileKey = tuple[Hashable, ...]
+"""A tile key. Its first element must be the dataset identifier,
+its second element a fingerprint of the dataset's configuration and data.
+"""
+
+DEFAULT_TILE_CACHE_MEMORY_SIZE = 128 * 1000**2
+"""Default byte budget of the memory tier of the tile cache."""
+
+TILE_FILE_EXT = ".png"
+
+
+class TileCache:
+    """A byte-budgeted cache for encoded image tiles.
+
+    The cache has two tiers: a memory tier that holds the most
+    recently used tiles and an optional disk tier in directory
+    *disk_path*. Tiles evicted from the memory tier remain in the disk
+    tier, and tiles found in the disk tier are promoted back into the
+    memory tier.
+
+    Tile keys are tuples whose first element is the dataset identifier
+    and whose second element is a fingerprint of the dataset's
+    configuration and data, so all tiles of a dataset can be invalidated
+    at once using :meth:`remove_dataset` or :meth:`retain_datasets`.
+    Tiles in the disk tier are only valid as long as this fingerprint
+    changes whenever the tiles would change.
+    Remaining elements should be plain values whose ``repr()`` is stable
+    across processes, because it is used to derive the file names
+    in the disk tier.
+
+    Instances of this class are thread-safe.
+
+    Args:
+        memory_size: Byte budget of the memory tier.
+            If zero or ``None``, the memory tier is disabled.
+        disk_path: Optional directory of the disk tier.
+            If not given, the disk tier is disabled.
+        disk_size: Optional byte budget of the disk tier.
+            If not given, the disk tier is unbounded.
+    """
+
+    def __init__(
+        self,
+        memory_size: Optional[int] = DEFAULT_TILE_CACHE_MEMORY_SIZE,
+        disk_path: Optional[str] = None,
+        disk_size: Optional[int] = None,
+    ):
+        self._memory_size = memory_size or 0
+        self._disk_path = os.path.normpath(disk_path) if disk_path else None
+        self._disk_size = disk_size or None
+        self._memory_tier: collections.OrderedDict[TileKey, bytes] = (
+            collections.OrderedDict()
+        )
+        self._memory_bytes = 0
+        self._disk_tier: collections.OrderedDict[str, int] = collections.OrderedDict()
+        self._disk_bytes = 0
+        self._num_hits = 0
+        self._num_misses = 0
+        self._lock = threading.Lock()
+        if self._disk_path:
+            self._scan_disk_tier()
+
+    @property
+    def memory_size(self) -> int:
+        """Byte budget of the memory tier."""
+        return self._memory_size
+
+    @property
+    def disk_path(self) -> Optional[str]:
+        """Directory of the disk tier, if any."""
+        return self._disk_path
+
+    @property
+    def disk_size(self) -> Optional[int]:
+        """Byte budget of the disk tier, if any."""
+        return self._disk_size
+
+    @property
+    def is_enabled(self) -> bool:
+        """Whether at least one cache tier is enabled."""
+        return self._memory_size > 0 or self._disk_path is not None
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Cache statistics."""
+        with self._lock:
+            return dict(
+                hits=self._num_hits,
+                misses=self._num_misses,
+                memory_tiles=len(self._memory_tier),
+                memory_bytes=self._memory_bytes,
+                disk_tiles=len(self._disk_tier),
+                disk_bytes=self._disk_bytes,
+            )
+
+    def get(self, key: TileKey) -> Optional[bytes]:
+        """Get the tile for given *key*.
+
+        Args:
+            key: The tile key.
+
+        Returns:
+            The tile's bytes, or ``None`` if the tile is not cached.
+        """
+        with self._lock:
+            data = self._memory_tier.get(key)
+            if data is not None:
+                self._memory_tier.move_to_end(key)
+                self._num_hits += 1
+                return data
+        data = self._read_disk_tier(key)
+        with self._lock:
+            if data is None:
+                self._num_misses += 1
+                return None
+            self._num_hits += 1
+            self._put_memory_tier(key, data)
+        return data
+
+    def __contains__(self, key: TileKey) -> bool:
+        """Check whether the tile for given *key* is cached.
+        Other than :meth:`get`, this does not count as hit or miss.
+        """
+        with self._lock:
+            if key in self._memory_tier:
+                return True
+        return self._disk_path is not None and os.path.isfile(
+            self.get_tile_path(key)
+        )
+
+    def put(self, key: TileKey, data: bytes):
+        """Put the tile *data* for given *key* into this cache.
+
+        Args:
+            key: The tile key.
+            data: The tile's bytes.
+        """
+        with self._lock:
+            self._put_memory_tier(key, data)
+        self._write_disk_tier(key, data)
+
+    def remove_dataset(self, ds_id: str):
+        """Remove all tiles of dataset given by *ds_id*.
+
+        Args:
+            ds_id: The dataset identifier.
+        """
+        with self._lock:
+            for key in [k for k in self._memory_tier.keys() if k[0] == ds_id]:
+                self._memory_bytes -= len(self._memory_tier.pop(key))
+            if self._disk_path:
+                dir_path = self._get_dataset_dir_path(ds_id)
+                prefix = dir_path + os.sep
+                for path in [p for p in self._disk_tier.keys() if p.startswith(prefix)]:
+                    self._disk_bytes -= self._disk_tier.pop(path)
+                shutil.rmtree(dir_path, ignore_errors=True)
+
+    def retain_datasets(self, fingerprints: Mapping[str, str]):
+        """Remove all tiles of datasets that are not contained in
+        *fingerprints* or whose fingerprint is different.
+
+        Args:
+            fingerprints: Mapping from dataset identifiers to
+                the fingerprints of the datasets.
+        """
+        with self._lock:
+            for key in [
+                k for k in self._memory_tier.keys() if fingerprints.get(k[0]) != k[1]
+            ]:
+                self._memory_bytes -= len(self._memory_tier.pop(key))
+            if self._disk_path:
+                for path in list(self._disk_tier.keys()):
+                    ds_dir_name, fingerprint = os.path.relpath(
+                        path, self._disk_path
+                    ).split(os.sep)[:2]
+                    ds_id = urllib.parse.unquote(ds_dir_name)
+                    if fingerprints.get(ds_id) != fingerprint:
+                        self._disk_bytes -= self._disk_tier.pop(path)
+                        _remove_file(path)
+
+    def clear(self):
+        """Remove all tiles from this cache."""
+        with self._lock:
+            self._memory_tier.clear()
+            self._memory_bytes = 0
+            if self._disk_path:
+                for path in self._disk_tier.keys():
+                    _remove_file(path)
+                self._disk_tier.clear()
+                self._disk_bytes = 0
+
+    def get_tile_path(self, key: TileKey) -> str:
+        """Get the path of the file in the disk tier
+        that stores the tile for given *key*.
+
+        Args:
+            key: The tile key.
+
+        Returns:
+            The tile's file path.
+        """
+        assert self._disk_path is not None
+        ds_id, fingerprint = key[0:2]
+        key_hash = hashlib.sha1(repr(key[2:]).encode("utf-8")).hexdigest()
+        return os.path.join(
+            self._get_dataset_dir_path(ds_id),
+            str(fingerprint),
+            key_hash[:2],
+            key_hash[2:] + TILE_FILE_EXT,
+        )
+
+    def _get_dataset_dir_path(self, ds_id: str) -> str:
+        return os.path.join(self._disk_path, urllib.parse.quote(str(ds_id), safe=""))
+
+    def _put_memory_tier(self, key: TileKey, data: bytes):
+        # Must be called with self._lock acquired
+        size = len(data)
+        if size > self._memory_size:
+            return
+        prev_data = self._memory_tier.pop(key, None)
+        if prev_data is not None:
+            self._memory_bytes -= len(prev_data)
+        self._memory_tier[key] = data
+        self._memory_bytes += size
+        while self._memory_bytes > self._memory_size:
+            _, evicted_data = self._memory_tier.popitem(last=False)
+            self._memory_bytes -= len(evicted_data)
+
+    def _read_disk_tier(self, key: TileKey) -> Optional[bytes]:
+        if self._disk_path is None:
+            return None
+        path = self.get_tile_path(key)
+        try:
+            with open(path, "rb") as fp:
+                data = fp.read()
+        except OSError:
+            return None
+        with self._lock:
+            if path in self._disk_tier:
+                self._disk_tier.move_to_end(path)
+        return data
+
+    def _write_disk_tier(self, key: TileKey, data: bytes):
+        if self._disk_path is None:
+            return
+        path = self.get_tile_path(key)
+        # Write to a temporary file first, so concurrent
+        # readers never see partially written tiles.
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, "wb") as fp:
+                fp.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            LOG.warning(f"Failed to write tile to cache: {e}")
+            _remove_file(temp_path)
+            return
+        with self._lock:
+            prev_size = self._disk_tier.pop(path, None)
+            if prev_size is not None:
+                self._disk_bytes -= prev_size
+            self._disk_tier[path] = len(data)
+            self._disk_bytes += len(data)
+            if self._disk_size is not None:
+                while self._disk_bytes > self._disk_size and self._disk_tier:
+                    evicted_path, evicted_size = self._disk_tier.popitem(last=False)
+                    self._disk_bytes -= evicted_size
+                    _remove_file(evicted_path)
+
+    def _scan_disk_tier(self):
+        """Register the tiles already present in the disk tier,
+        least recently modified first.
+        """
+        entries = []
+        for dir_path, _, file_names in os.walk(self._disk_path):
+            for file_name in file_names:
+                if not file_name.endswith(TILE_FILE_EXT):
+                    continue
+                path = os.path.join(dir_path, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, path, stat.st_size))
+        entries.sort()
+        for _, path, size in entries:
+            self._disk_tier[path] = size
+            self._disk_bytes += size
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
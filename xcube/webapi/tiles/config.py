@@ -0,0 +1,37 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+from xcube.core.tile import PNG_COMPRESS_STRATEGIES
+from xcube.util.jsonschema import JsonBooleanSchema
+from xcube.util.jsonschema import JsonIntegerSchema
+from xcube.util.jsonschema import JsonObjectSchema
+from xcube.util.jsonschema import JsonStringSchema
+from xcube.webapi.common.schemas import CHUNK_SIZE_SCHEMA
+from xcube.webapi.common.schemas import PATH_SCHEMA
+
+TILE_CACHE_SCHEMA = JsonObjectSchema(
+    properties=dict(
+        MemorySize=CHUNK_SIZE_SCHEMA,
+        Path=PATH_SCHEMA,
+        DiskSize=CHUNK_SIZE_SCHEMA,
+        MetatileSize=JsonIntegerSchema(minimum=1),
+    ),
+    additional_properties=False,
+)
+
+TILE_ENCODING_SCHEMA = JsonObjectSchema(
+    properties=dict(
+        PngCompressLevel=JsonIntegerSchema(minimum=0, maximum=9),
+        PngCompressStrategy=JsonStringSchema(enum=list(PNG_COMPRESS_STRATEGIES)),
+        PngPalette=JsonBooleanSchema(),
+    ),
+    additional_properties=False,
+)
+
+CONFIG_SCHEMA = JsonObjectSchema(
+    properties=dict(
+        TileCache=TILE_CACHE_SCHEMA,
+        TileEncoding=TILE_ENCODING_SCHEMA,
+    )
+)
@@ -2,8 +2,21 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
+import contextlib
+import threading
+from functools import cached_property
+from typing import Any, Optional
+from collections.abc import Iterator
+
+from xcube.constants import LOG
+from xcube.core.tile import DEFAULT_PNG_COMPRESS_LEVEL
+from xcube.core.tile import DEFAULT_PNG_COMPRESS_STRATEGY
 from xcube.server.api import ApiContext
 from xcube.server.api import Context
+from xcube.server.config import resolve_config_path
+from .cache import DEFAULT_TILE_CACHE_MEMORY_SIZE
+from .cache import TileCache
+from .cache import TileKey
 from ..datasets.context import DatasetsContext
 
 
@@ -11,7 +24,149 @@ class TilesContext(ApiContext):
     def __init__(self, server_ctx: Context):
         super().__init__(server_ctx)
         self._datasets_ctx = server_ctx.get_api_ctx("datasets")
+        self._tile_cache: Optional[TileCache] = None
+        self._tile_cache_lock = threading.Lock()
+        # Maps metatile keys to pairs [lock, number of users]
+        self._metatile_locks: dict[TileKey, list] = dict()
+        self._metatile_locks_lock = threading.Lock()
+        # Removes outdated tiles in the background
+        self._tile_cache_pruning: Optional[threading.Thread] = None
+
+    def on_update(self, prev_ctx: Optional["TilesContext"]):
+        if (
+            isinstance(prev_ctx, TilesContext)
+            and prev_ctx._tile_cache is not None
+            and prev_ctx.tile_cache_config == self.tile_cache_config
+        ):
+            # Keep the tiles of all datasets whose configuration
+            # did not change.
+            tile_cache = prev_ctx._tile_cache
+            self._set_tile_cache(tile_cache)
+            self._prune_tile_cache_in_background(tile_cache)
+
+    def get_dataset_fingerprints(self) -> dict[str, str]:
+        """Get the fingerprints of all configured datasets."""
+        return {
+            dc["Identifier"]: self.datasets_ctx.get_dataset_fingerprint(
+                dc["Identifier"]
+            )
+            for dc in self.datasets_ctx.get_dataset_configs()
+        }
+
+    def prune_tile_cache(self, tile_cache: TileCache):
+        """Remove the tiles of datasets that are no longer configured
+        or whose fingerprint changed from the given *tile_cache*.
+
+        Since this requires the current data version of all datasets,
+        the method may block for a long time.
+        """
+        fingerprints = {}
+        for dataset_config in self.datasets_ctx.get_dataset_configs():
+            ds_id = dataset_config["Identifier"]
+            # Fingerprints must not be preliminary
+            self.datasets_ctx.refresh_dataset_data_version(ds_id)
+            fingerprints[ds_id] = self.datasets_ctx.get_dataset_fingerprint(ds_id)
+        tile_cache.retain_datasets(fingerprints)
+
+    def _prune_tile_cache_in_background(self, tile_cache: TileCache):
+        def prune_tile_cache():
+            try:
+                self.prune_tile_cache(tile_cache)
+            except Exception as e:
+                LOG.warning(f"Failed to remove outdated tiles: {e}")
+
+        self._tile_cache_pruning = threading.Thread(
+            target=prune_tile_cache, name="xcube-tile-cache-pruning", daemon=True
+        )
+        self._tile_cache_pruning.start()
 
     @property
     def datasets_ctx(self) -> DatasetsContext:
         return self._datasets_ctx
+
+    @cached_property
+    def png_options(self) -> dict[str, Any]:
+        """Keyword arguments for ``compute_rgba_tile()``
+        that control the encoding of PNG tiles.
+        """
+        tile_encoding_config = self.config.get("TileEncoding", {})
+        return dict(
+            png_compress_level=tile_encoding_config.get(
+                "PngCompressLevel", DEFAULT_PNG_COMPRESS_LEVEL
+            ),
+            png_compress_strategy=tile_encoding_config.get(
+                "PngCompressStrategy", DEFAULT_PNG_COMPRESS_STRATEGY
+            ),
+            png_palette=tile_encoding_config.get("PngPalette", True),
+        )
+
+    @property
+    def tile_cache_config(self) -> dict[str, Any]:
+        return dict(self.config.get("TileCache", {}))
+
+    @property
+    def metatile_size(self) -> int:
+        """Number of tiles in x- and y-direction of the blocks
+        of tiles that are computed at once and put into the tile cache.
+        A value of one disables metatiles.
+        """
+        return self.tile_cache_config.get("MetatileSize", 1)
+
+    @property
+    def tile_cache(self) -> TileCache:
+        """The cache for computed image tiles."""
+        if self._tile_cache is None:
+            with self._tile_cache_lock:
+                if self._tile_cache is None:
+                    self._set_tile_cache(self._new_tile_cache())
+        return self._tile_cache
+
+    @contextlib.contextmanager
+    def lock_metatile(self, metatile_key: TileKey) -> Iterator[None]:
+        """Get a context manager that serializes the computation
+        of the metatile given by *metatile_key*, so that concurrent
+        requests for tiles of the same metatile compute it only once.
+
+        Args:
+            metatile_key: The key of the metatile's first tile.
+        """
+        with self._metatile_locks_lock:
+            entry = self._metatile_locks.get(metatile_key)
+            if entry is None:
+                entry = [threading.Lock(), 0]
+                self._metatile_locks[metatile_key] = entry
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._metatile_locks_lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._metatile_locks[metatile_key]
+
+    def _set_tile_cache(self, tile_cache: TileCache):
+        self._tile_cache = tile_cache
+        self._datasets_ctx.add_dataset_removed_listener(tile_cache.remove_dataset)
+
+    def _new_tile_cache(self) -> TileCache:
+        tile_cache_config = self.tile_cache_config
+        if "MemorySize" in tile_cache_config:
+            memory_size = DatasetsContext.get_chunk_cache_capacity(
+                tile_cache_config, "MemorySize"
+            )
+        else:
+            memory_size = DEFAULT_TILE_CACHE_MEMORY_SIZE
+        disk_path = tile_cache_config.get("Path")
+        if disk_path:
+            disk_path = resolve_config_path(self.config, disk_path)
+        disk_size = DatasetsContext.get_chunk_cache_capacity(
+            tile_cache_config, "DiskSize"
+        )
+        tile_cache = TileCache(
+            memory_size=memory_size, disk_path=disk_path, disk_size=disk_size
+        )
+        if disk_path:
+            # Remove outdated tiles from previous server sessions
+            self._prune_tile_cache_in_background(tile_cache)
+        return tile_cache
@@ -2,8 +2,8 @@
 # Permissions are hereby granted under the terms of the MIT License:
 # https://opensource.org/licenses/MIT.
 
-from typing import Optional, Dict
-from collections.abc import Mapping
+from typing import NamedTuple, Optional
+from collections.abc import Mapping, Sequence
 
 from xcube.constants import LOG
 from xcube.core.tile import DEFAULT_CRS_NAME
@@ -11,9 +11,11 @@ from xcube.core.tile import DEFAULT_FORMAT
 from xcube.core.tile import TileNotFoundException
 from xcube.core.tile import TileRequestException
 from xcube.core.tile import compute_rgba_tile
+from xcube.core.tile import compute_rgba_tiles
 from xcube.core.tilingscheme import DEFAULT_TILE_SIZE
 from xcube.server.api import ApiError
 from xcube.util.perf import measure_time_cm
+from .cache import TileKey
 from .context import TilesContext
 
 
@@ -36,7 +38,7 @@ def compute_ml_dataset_tile(
         )
 
 
-def _compute_ml_dataset_tile(
+def get_ml_dataset_tile_key(
     ctx: TilesContext,
     ds_id: str,
     var_name: str,
@@ -44,14 +46,41 @@ def _compute_ml_dataset_tile(
     x: str,
     y: str,
     z: str,
-    args: dict[str, str],
-    trace_perf: bool,
-):
+    params: Mapping[str, str],
+) -> TileKey:
+    """Get the key of the tile that is computed by
+    ``compute_ml_dataset_tile()`` for the same arguments.
+    """
+    x, y, z = _parse_tile_xyz(x, y, z)
+    tile_params = _get_tile_params(ctx, ds_id, var_name, crs_name, dict(params))
+    return _get_tile_key(ctx, ds_id, x, y, z, tile_params)
+
+
+class _TileParams(NamedTuple):
+    crs_name: str
+    var_names: Sequence[str]
+    tile_size: int
+    cmap_name: Optional[str]
+    cmap_norm: Optional[str]
+    value_ranges: Sequence[tuple[float, float]]
+    format: str
+    non_spatial_labels: dict[str, str]
+
+
+def _parse_tile_xyz(x: str, y: str, z: str) -> tuple[int, int, int]:
     try:
-        x, y, z = (int(c) for c in (x, y, z))
+        return int(x), int(y), int(z)
     except ValueError:
         raise ApiError.BadRequest("x, y, z must be integers")
 
+
+def _get_tile_params(
+    ctx: TilesContext,
+    ds_id: str,
+    var_name: str,
+    crs_name: Optional[str],
+    args: dict[str, str],
+) -> _TileParams:
     crs_name = args.pop("crs", crs_name or DEFAULT_CRS_NAME)
     retina = args.pop("retina", None) == "1"
     cmap_name = args.pop("cmap", args.pop("cbar", None))
@@ -63,7 +92,6 @@ def _compute_ml_dataset_tile(
     if format not in ("png", "image/png"):
         raise ApiError.BadRequest(f"Illegal format {format!r}")
 
-    ml_dataset = ctx.datasets_ctx.get_ml_dataset(ds_id)
     if var_name == "rgb":
         var_names, value_ranges = ctx.datasets_ctx.get_rgb_color_mapping(
             ds_id, norm_range=(value_min, value_max)
@@ -102,24 +130,145 @@ def _compute_ml_dataset_tile(
         var_names = (var_name,)
         value_ranges = ((value_min, value_max),)
 
+    return _TileParams(
+        crs_name=crs_name,
+        var_names=var_names,
+        tile_size=(2 if retina else 1) * DEFAULT_TILE_SIZE,
+        cmap_name=cmap_name,
+        cmap_norm=cmap_norm,
+        value_ranges=value_ranges,
+        format=format,
+        non_spatial_labels=args,
+    )
+
+
+def _compute_ml_dataset_tile(
+    ctx: TilesContext,
+    ds_id: str,
+    var_name: str,
+    crs_name: Optional[str],
+    x: str,
+    y: str,
+    z: str,
+    args: dict[str, str],
+    trace_perf: bool,
+):
+    x, y, z = _parse_tile_xyz(x, y, z)
+    ml_dataset = ctx.datasets_ctx.get_ml_dataset(ds_id)
+    tile_params = _get_tile_params(ctx, ds_id, var_name, crs_name, args)
+    var_names = tile_params.var_names
+    crs_name = tile_params.crs_name
+    tile_size = tile_params.tile_size
+    cmap_name = tile_params.cmap_name
+    cmap_norm = tile_params.cmap_norm
+    value_ranges = tile_params.value_ranges
+    format = tile_params.format
+    args = tile_params.non_spatial_labels
+
+    def get_tile_key(tile_x: int, tile_y: int) -> TileKey:
+        return _get_tile_key(ctx, ds_id, tile_x, tile_y, z, tile_params)
+
+    tile_cache = ctx.tile_cache
+    tile_key = None
+    if tile_cache.is_enabled:
+        tile_key = get_tile_key(x, y)
+        tile = tile_cache.get(tile_key)
+        if tile is not None:
+            return tile
+
+    metatile_size = ctx.metatile_size
     try:
-        return compute_rgba_tile(
-            ml_dataset,
-            var_names,
-            x,
-            y,
-            z,
-            ctx.datasets_ctx.colormap_registry,
-            crs_name=crs_name,
-            tile_size=(2 if retina else 1) * DEFAULT_TILE_SIZE,
-            cmap_name=cmap_name,
-            cmap_norm=cmap_norm,
-            value_ranges=value_ranges,
-            non_spatial_labels=args,
-            format=format,
-            trace_perf=trace_perf,
-        )
+        if tile_key is not None and metatile_size > 1:
+            metatile_x = x - x % metatile_size
+            metatile_y = y - y % metatile_size
+            # Concurrent requests for tiles of the same metatile
+            # wait for the first one to compute the metatile.
+            with ctx.lock_metatile(get_tile_key(metatile_x, metatile_y)):
+                if tile_key in tile_cache:
+                    tile = tile_cache.get(tile_key)
+                    if tile is not None:
+                        return tile
+                # Compute the block of tiles that contains the
+                # requested tile and put all of them into the cache.
+                tiles = compute_rgba_tiles(
+                    ml_dataset,
+                    var_names,
+                    metatile_x,
+                    metatile_y,
+                    z,
+                    ctx.datasets_ctx.colormap_registry,
+                    num_tiles=metatile_size,
+                    crs_name=crs_name,
+                    tile_size=tile_size,
+                    cmap_name=cmap_name,
+                    cmap_norm=cmap_norm,
+                    value_ranges=value_ranges,
+                    non_spatial_labels=args,
+                    format=format,
+                    trace_perf=trace_perf,
+                    **ctx.png_options,
+                )
+                for (tile_x, tile_y), metatile_tile in tiles.items():
+                    tile_cache.put(get_tile_key(tile_x, tile_y), metatile_tile)
+        else:
+            tiles = {}
+        tile = tiles.get((x, y))
+        if tile is None:
+            tile = compute_rgba_tile(
+                ml_dataset,
+                var_names,
+                x,
+                y,
+                z,
+                ctx.datasets_ctx.colormap_registry,
+                crs_name=crs_name,
+                tile_size=tile_size,
+                cmap_name=cmap_name,
+                cmap_norm=cmap_norm,
+                value_ranges=value_ranges,
+                non_spatial_labels=args,
+                format=format,
+                trace_perf=trace_perf,
+                **ctx.png_options,
+            )
     except TileNotFoundException as e:
         raise ApiError.NotFound(f"{e}") from e
     except TileRequestException as e:
         raise ApiError.BadRequest(f"{e}") from e
+
+    if tile_key is not None and (x, y) not in tiles:
+        tile_cache.put(tile_key, tile)
+    return tile
+
+
+def _get_tile_key(
+    ctx: TilesContext,
+    ds_id: str,
+    x: int,
+    y: int,
+    z: int,
+    tile_params: _TileParams,
+) -> TileKey:
+    # Note, the dataset's fingerprint ensures that tiles
+    # persisted in the disk tier are not reused after changes
+    # of the dataset's configuration or data.
+    return (
+        ds_id,
+        ctx.datasets_ctx.get_dataset_fingerprint(ds_id),
+        tuple(tile_params.var_names),
+        tile_params.crs_name,
+        z,
+        y,
+        x,
+        tile_params.tile_size,
+        tile_params.cmap_name,
+        tile_params.cmap_norm,
+        tuple(
+            (float(v_min), float(v_max)) for v_min, v_max in tile_params.value_ranges
+        ),
+        tuple(
+            sorted(
+                (str(k), str(v)) for k, v in tile_params.non_spatial_labels.items()
+            )
+        ),
+    )
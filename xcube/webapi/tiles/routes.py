@@ -82,13 +82,25 @@ TILE_PARAMETERS = [
 # noinspection PyPep8Naming
 @api.route("/tiles/{datasetId}/{varName}/{z}/{y}/{x}")
 class TilesHandler(ApiHandler[TilesContext]):
+    def get_etag(self, datasetId: str, varName: str, z: str, y: str, x: str):
+        return self.ctx.datasets_ctx.get_dataset_etag(
+            datasetId,
+            varName,
+            z,
+            y,
+            x,
+            {k: v[0] for k, v in self.request.query.items()},
+        )
+
     @api.operation(
         operation_id="getTile",
         summary="Get the image tile for a variable and given tile grid coordinates.",
         parameters=TILE_PARAMETERS,
     )
     async def get(self, datasetId: str, varName: str, z: str, y: str, x: str):
-        tile = await self.ctx.run_in_executor(
+        params = {k: v[0] for k, v in self.request.query.items()}
+        tile = await self.ctx.run_in_executor_shared(
+            ("getTile", datasetId, varName, z, y, x, tuple(sorted(params.items()))),
             None,
             compute_ml_dataset_tile,
             self.ctx,
@@ -98,7 +110,7 @@ class TilesHandler(ApiHandler[TilesContext]):
             x,
             y,
             z,
-            {k: v[0] for k, v in self.request.query.items()},
+            params,
         )
         self.response.set_header("Content-Type", "image/png")
         await self.response.finish(tile)
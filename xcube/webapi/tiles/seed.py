@@ -0,0 +1,289 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import concurrent.futures
+import itertools
+import math
+import os
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Optional
+
+import pyproj
+
+from xcube.constants import LOG
+from xcube.core.tilingscheme import DEFAULT_CRS_NAME
+from xcube.core.tilingscheme import GEOGRAPHIC_CRS_NAME
+from xcube.core.tilingscheme import TilingScheme
+from .context import TilesContext
+from .controllers import compute_ml_dataset_tile
+from .controllers import get_ml_dataset_tile_key
+
+TILE_SEED_COMPUTED = "computed"
+TILE_SEED_SKIPPED = "skipped"
+TILE_SEED_FAILED = "failed"
+
+# Tile coordinates (ds_id, var_name, x, y, z)
+SeedTile = tuple[str, str, int, int, int]
+
+_MAX_MERCATOR_LAT = 85.051129
+
+
+def get_seed_tiles(
+    ctx: TilesContext,
+    ds_ids: Optional[Sequence[str]] = None,
+    var_names: Optional[Sequence[str]] = None,
+    crs_name: Optional[str] = None,
+    zoom_range: tuple[int, int] = (0, 0),
+    bbox: Optional[tuple[float, float, float, float]] = None,
+) -> list[SeedTile]:
+    """Get the coordinates of the tiles to be seeded.
+
+    Tiles are ordered such that the tiles of a metatile
+    (see ``TilesContext.metatile_size``) follow each other.
+
+    Args:
+        ctx: The tiles context.
+        ds_ids: Dataset identifiers. Defaults to all configured datasets.
+        var_names: Variable names. Defaults to all spatial
+            variables of a dataset.
+        crs_name: Name of the tiling CRS. Defaults to "CRS84".
+        zoom_range: Minimum and maximum zoom level, both inclusive.
+        bbox: Bounding box in geographic coordinates
+            (lon_min, lat_min, lon_max, lat_max). Defaults to the
+            bounding box of the respective dataset.
+
+    Returns:
+        A list of tile coordinates (ds_id, var_name, x, y, z).
+    """
+    datasets_ctx = ctx.datasets_ctx
+    if not ds_ids:
+        ds_ids = [dc["Identifier"] for dc in datasets_ctx.get_dataset_configs()]
+    tiling_scheme = TilingScheme.for_crs(crs_name or DEFAULT_CRS_NAME)
+    min_zoom, max_zoom = zoom_range
+    metatile_size = ctx.metatile_size if ctx.tile_cache.is_enabled else 1
+
+    seed_tiles = []
+    for ds_id in ds_ids:
+        ml_dataset = datasets_ctx.get_ml_dataset(ds_id)
+        grid_mapping = ml_dataset.grid_mapping
+        ds_var_names = var_names
+        if not ds_var_names:
+            x_dim, y_dim = grid_mapping.xy_dim_names
+            dataset = ml_dataset.get_dataset(0)
+            ds_var_names = [
+                str(var_name)
+                for var_name, var in dataset.data_vars.items()
+                if var.ndim >= 2 and var.dims[-2:] == (y_dim, x_dim)
+            ]
+        ds_bbox = bbox
+        if ds_bbox is None:
+            ds_bbox = pyproj.Transformer.from_crs(
+                grid_mapping.crs, GEOGRAPHIC_CRS_NAME, always_xy=True
+            ).transform_bounds(*grid_mapping.xy_bbox)
+        for z in range(min_zoom, max_zoom + 1):
+            tile_range = get_tile_range(tiling_scheme, ds_bbox, z)
+            if tile_range is None:
+                continue
+            x_min, y_min, x_max, y_max = tile_range
+            tile_coords = sorted(
+                (
+                    (x, y)
+                    for y in range(y_min, y_max + 1)
+                    for x in range(x_min, x_max + 1)
+                ),
+                key=lambda xy: (
+                    xy[1] // metatile_size,
+                    xy[0] // metatile_size,
+                    xy[1],
+                    xy[0],
+                ),
+            )
+            for var_name in ds_var_names:
+                seed_tiles.extend((ds_id, var_name, x, y, z) for x, y in tile_coords)
+    return seed_tiles
+
+
+def get_tile_range(
+    tiling_scheme: TilingScheme,
+    bbox: tuple[float, float, float, float],
+    tile_z: int,
+) -> Optional[tuple[int, int, int, int]]:
+    """Get the range of tiles at level *tile_z* that intersect
+    the given geographic bounding box *bbox*.
+
+    Args:
+        tiling_scheme: The tiling scheme.
+        bbox: Bounding box in geographic coordinates
+            (lon_min, lat_min, lon_max, lat_max).
+        tile_z: The tile level.
+
+    Returns:
+        The inclusive tile range (x_min, y_min, x_max, y_max),
+        or None, if *bbox* does not intersect the map.
+    """
+    lon_min, lat_min, lon_max, lat_max = bbox
+    if tiling_scheme.crs.is_geographic:
+        x1, y1, x2, y2 = lon_min, lat_min, lon_max, lat_max
+    else:
+        lat_min = max(lat_min, -_MAX_MERCATOR_LAT)
+        lat_max = min(lat_max, _MAX_MERCATOR_LAT)
+        if lat_min >= lat_max:
+            return None
+        x1, y1, x2, y2 = pyproj.Transformer.from_crs(
+            GEOGRAPHIC_CRS_NAME, tiling_scheme.crs, always_xy=True
+        ).transform_bounds(lon_min, lat_min, lon_max, lat_max)
+
+    num_tiles_x, num_tiles_y = tiling_scheme.get_num_tiles(tile_z)
+    map_x0, map_y0 = tiling_scheme.map_origin
+    map_tile_width = tiling_scheme.map_width / num_tiles_x
+    map_tile_height = tiling_scheme.map_height / num_tiles_y
+
+    x_min = max(0, math.floor((x1 - map_x0) / map_tile_width))
+    x_max = min(num_tiles_x - 1, math.ceil((x2 - map_x0) / map_tile_width) - 1)
+    y_min = max(0, math.floor((map_y0 - y2) / map_tile_height))
+    y_max = min(num_tiles_y - 1, math.ceil((map_y0 - y1) / map_tile_height) - 1)
+    if x_min > x_max or y_min > y_max:
+        return None
+    return x_min, y_min, x_max, y_max
+
+
+def seed_tiles(
+    ctx: TilesContext,
+    tiles: Sequence[SeedTile],
+    crs_name: Optional[str] = None,
+    params: Optional[Mapping[str, str]] = None,
+    output_dir: Optional[str] = None,
+    num_workers: Optional[int] = None,
+) -> Iterator[tuple[SeedTile, str]]:
+    """Compute the given *tiles* in parallel.
+
+    If *output_dir* is given, tiles are written to
+    "{output_dir}/{ds_id}/{var_name}/{z}/{y}/{x}.png", which is the
+    layout of the tile API's and WMTS' URL paths.
+    Existing tile files are skipped, so an interrupted run can be resumed.
+    Otherwise, tiles are put into the tile cache, which must then
+    be configured to use a disk directory. Tiles already in the cache
+    are not recomputed and reported as "skipped".
+    Missing "vmin" and "vmax" parameters of variables are taken
+    from the dataset's style.
+
+    Args:
+        ctx: The tiles context.
+        tiles: Coordinates of the tiles to be computed,
+            see ``get_seed_tiles()``.
+        crs_name: Name of the tiling CRS.
+        params: Tile request parameters, such as
+            "cmap", "vmin", "vmax", "time", or "retina".
+        output_dir: Optional output directory.
+        num_workers: Number of tiles computed in parallel.
+
+    Returns:
+        An iterator of the tile coordinates and the status
+        of its computation, which is one of "computed",
+        "skipped", or "failed". Tiles are reported in the
+        order of their completion.
+    """
+    params = dict(params or {})
+    crs_name = crs_name or DEFAULT_CRS_NAME
+
+    def get_tile_path(tile: SeedTile) -> str:
+        ds_id, var_name, x, y, z = tile
+        return os.path.join(output_dir, ds_id, var_name, str(z), str(y), f"{x}.png")
+
+    def get_tile_params(tile: SeedTile) -> dict[str, str]:
+        ds_id, var_name, _, _, _ = tile
+        if var_name == "rgb" or ("vmin" in params and "vmax" in params):
+            return params
+        # Take the missing value range from the dataset's style,
+        # because the tile API would otherwise use (0, 1)
+        _, _, (value_min, value_max) = ctx.datasets_ctx.get_color_mapping(
+            ds_id, var_name
+        )
+        return dict(dict(vmin=str(value_min), vmax=str(value_max)), **params)
+
+    def is_tile_cached(tile: SeedTile) -> bool:
+        ds_id, var_name, x, y, z = tile
+        try:
+            tile_key = get_ml_dataset_tile_key(
+                ctx,
+                ds_id,
+                var_name,
+                crs_name,
+                str(x),
+                str(y),
+                str(z),
+                get_tile_params(tile),
+            )
+        except Exception:
+            # Reported when computing the tile
+            return False
+        return tile_key in ctx.tile_cache
+
+    def seed_tile(tile: SeedTile) -> str:
+        tile_path = get_tile_path(tile) if output_dir else None
+        if tile_path is not None and os.path.exists(tile_path):
+            return TILE_SEED_SKIPPED
+        ds_id, var_name, x, y, z = tile
+        try:
+            data = compute_ml_dataset_tile(
+                ctx,
+                ds_id,
+                var_name,
+                crs_name,
+                str(x),
+                str(y),
+                str(z),
+                get_tile_params(tile),
+            )
+        except Exception as e:
+            LOG.error(f"Failed to compute tile {tile}: {e}")
+            return TILE_SEED_FAILED
+        if tile_path is not None:
+            os.makedirs(os.path.dirname(tile_path), exist_ok=True)
+            # Write to temporary file first, so interrupted
+            # runs never leave incomplete tiles behind.
+            temp_path = f"{tile_path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as fp:
+                fp.write(data)
+            os.replace(temp_path, tile_path)
+        return TILE_SEED_COMPUTED
+
+    def seed_metatile(metatile: list[SeedTile]) -> list[tuple[SeedTile, str]]:
+        if output_dir:
+            return [(tile, seed_tile(tile)) for tile in metatile]
+        # Determine the cached tiles before computing any tile,
+        # because computing one tile puts the whole metatile
+        # into the cache.
+        cached_tiles = {tile for tile in metatile if is_tile_cached(tile)}
+        return [
+            (tile, TILE_SEED_SKIPPED if tile in cached_tiles else seed_tile(tile))
+            for tile in metatile
+        ]
+
+    # The tiles of a metatile are computed by the same worker,
+    # so the metatile is computed only once and all other
+    # tiles are taken from the tile cache.
+    metatile_size = ctx.metatile_size if ctx.tile_cache.is_enabled else 1
+    metatiles = [
+        list(metatile)
+        for _, metatile in itertools.groupby(
+            tiles,
+            key=lambda t: (
+                t[0],
+                t[1],
+                t[2] // metatile_size,
+                t[3] // metatile_size,
+                t[4],
+            ),
+        )
+    ]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+        futures = [executor.submit(seed_metatile, metatile) for metatile in metatiles]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
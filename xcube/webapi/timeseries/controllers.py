@@ -3,8 +3,9 @@
 # https://opensource.org/licenses/MIT.
 
 
+import io
 from typing import Dict, List, Optional, Union, Any, Set, Tuple
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 
 import numpy as np
 import pandas as pd
@@ -23,10 +24,26 @@ from .context import TimeSeriesContext
 TimeSeriesValue = dict[str, Union[str, bool, int, float, None]]
 TimeSeries = list[TimeSeriesValue]
 TimeSeriesCollection = list[TimeSeries]
+TimeSeriesColumns = dict[str, np.ndarray]
+TimeSeriesColumnsCollection = list[TimeSeriesColumns]
 GeoJsonObj = dict[str, Any]
 GeoJsonFeature = GeoJsonObj
 GeoJsonGeometry = GeoJsonObj
 
+TIME_SERIES_FORMAT_JSON = "json"
+TIME_SERIES_FORMAT_COLUMNS = "columns"
+TIME_SERIES_FORMAT_CSV = "csv"
+TIME_SERIES_FORMAT_ARROW = "arrow"
+TIME_SERIES_FORMATS = (
+    TIME_SERIES_FORMAT_JSON,
+    TIME_SERIES_FORMAT_COLUMNS,
+    TIME_SERIES_FORMAT_CSV,
+    TIME_SERIES_FORMAT_ARROW,
+)
+
+# Number of rows per chunk of streamed time-series formats
+DEFAULT_CHUNK_SIZE = 10000
+
 
 def get_time_series(
     ctx: TimeSeriesContext,
@@ -39,7 +56,10 @@ def get_time_series(
     tolerance: Optional[float] = 1.0,
     max_valids: Optional[int] = None,
     incl_ancillary_vars: bool = False,
-) -> Union[TimeSeries, TimeSeriesCollection]:
+    columnar: bool = False,
+) -> Union[
+    TimeSeries, TimeSeriesCollection, TimeSeriesColumns, TimeSeriesColumnsCollection
+]:
     """Get the time-series for a given GeoJSON object *geo_json*.
 
     If *geo_json* is a single geometry or feature a list of
@@ -77,6 +97,10 @@ def get_time_series(
             integer, the most recent valid values are returned.
         incl_ancillary_vars: For point geometries, include values of
             ancillary variables, if any.
+        columnar: If True, a time-series is returned as a mapping
+            from keys to numpy arrays of values instead of
+            a list of time-series values, see
+            :func:`collect_timeseries_columns`.
 
     Returns:
         Time-series data structure.
@@ -93,7 +117,9 @@ def get_time_series(
     )
 
     ml_dataset = ctx.datasets_ctx.get_ml_dataset(ds_name)
-    dataset = ctx.datasets_ctx.get_time_series_dataset(ds_name, var_name=var_name)
+    dataset = ctx.datasets_ctx.get_time_series_dataset(
+        ds_name, var_name=var_name, build_copy=True
+    )
     geo_json_geometries, is_collection = _to_geo_json_geometries(geo_json)
     geometries = _to_shapely_geometries(geo_json_geometries)
 
@@ -108,13 +134,14 @@ def get_time_series(
             grid_mapping=ml_dataset.grid_mapping,
             max_valids=max_valids,
             incl_ancillary_vars=incl_ancillary_vars,
+            columnar=columnar,
         )
 
     if ctx.datasets_ctx.trace_perf:
         LOG.info(
             f"get_time_series: dataset id {ds_name},"
             f" variable {var_name}, "
-            f"{len(results)} x {len(results[0])} values,"
+            f"{len(results)} time-series,"
             f" took {time_result.duration} seconds"
         )
 
@@ -131,9 +158,54 @@ def _get_time_series_for_geometries(
     end_date: Optional[np.datetime64] = None,
     max_valids: Optional[int] = None,
     incl_ancillary_vars: bool = False,
+    columnar: bool = False,
 ) -> TimeSeriesCollection:
+    batched_time_series = {}
+    point_indexes = [
+        index
+        for index, geometry in enumerate(geometries)
+        if isinstance(geometry, shapely.geometry.Point)
+    ]
+    zone_indexes = [
+        index
+        for index, geometry in enumerate(geometries)
+        if not isinstance(geometry, shapely.geometry.Point)
+    ]
+    if len(point_indexes) > 1:
+        # Extract the time series of all points in one go
+        points_time_series = _get_time_series_for_points(
+            dataset,
+            var_name,
+            [geometries[index] for index in point_indexes],
+            agg_methods,
+            grid_mapping=grid_mapping,
+            start_date=start_date,
+            end_date=end_date,
+            max_valids=max_valids,
+            incl_ancillary_vars=incl_ancillary_vars,
+            columnar=columnar,
+        )
+        batched_time_series.update(zip(point_indexes, points_time_series))
+    if len(zone_indexes) > 1:
+        # Compute the time series of all areas in one go
+        zonal_time_series = _get_time_series_for_zones(
+            dataset,
+            var_name,
+            [geometries[index] for index in zone_indexes],
+            agg_methods,
+            grid_mapping=grid_mapping,
+            start_date=start_date,
+            end_date=end_date,
+            max_valids=max_valids,
+            columnar=columnar,
+        )
+        batched_time_series.update(zip(zone_indexes, zonal_time_series))
+
     time_series_collection = []
-    for geometry in geometries:
+    for index, geometry in enumerate(geometries):
+        if index in batched_time_series:
+            time_series_collection.append(batched_time_series[index])
+            continue
         time_series = _get_time_series_for_geometry(
             dataset,
             var_name,
@@ -144,6 +216,7 @@ def _get_time_series_for_geometries(
             end_date=end_date,
             max_valids=max_valids,
             incl_ancillary_vars=incl_ancillary_vars,
+            columnar=columnar,
         )
         time_series_collection.append(time_series)
     return time_series_collection
@@ -159,6 +232,7 @@ def _get_time_series_for_geometry(
     end_date: Optional[np.datetime64] = None,
     max_valids: Optional[int] = None,
     incl_ancillary_vars: bool = False,
+    columnar: bool = False,
 ) -> TimeSeries:
     if isinstance(geometry, shapely.geometry.Point):
         return _get_time_series_for_point(
@@ -171,6 +245,7 @@ def _get_time_series_for_geometry(
             end_date=end_date,
             max_valids=max_valids,
             incl_ancillary_vars=incl_ancillary_vars,
+            columnar=columnar,
         )
 
     time_series_ds = timeseries.get_time_series(
@@ -183,12 +258,43 @@ def _get_time_series_for_geometry(
         end_date=end_date,
         cube_asserted=True,
     )
-    if time_series_ds is None:
-        return []
 
     var_names = {agg_method: f"{var_name}_{agg_method}" for agg_method in agg_methods}
 
-    return collect_timeseries_result(time_series_ds, var_names, max_valids=max_valids)
+    return _collect_time_series(
+        time_series_ds, var_names, max_valids=max_valids, columnar=columnar
+    )
+
+
+def _get_time_series_for_zones(
+    dataset: xr.Dataset,
+    var_name: str,
+    geometries: list[shapely.geometry.base.BaseGeometry],
+    agg_methods: set[str],
+    grid_mapping: Optional[GridMapping] = None,
+    start_date: Optional[np.datetime64] = None,
+    end_date: Optional[np.datetime64] = None,
+    max_valids: Optional[int] = None,
+    columnar: bool = False,
+) -> TimeSeriesCollection:
+    time_series_datasets = timeseries.get_zonal_time_series(
+        dataset,
+        geometries,
+        var_name,
+        grid_mapping=grid_mapping,
+        agg_methods=agg_methods,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+    var_names = {agg_method: f"{var_name}_{agg_method}" for agg_method in agg_methods}
+
+    return [
+        _collect_time_series(
+            time_series_ds, var_names, max_valids=max_valids, columnar=columnar
+        )
+        for time_series_ds in time_series_datasets
+    ]
 
 
 def _get_time_series_for_point(
@@ -201,27 +307,12 @@ def _get_time_series_for_point(
     end_date: Optional[np.datetime64] = None,
     max_valids: Optional[int] = None,
     incl_ancillary_vars: bool = False,
+    columnar: bool = False,
 ) -> TimeSeries:
-    var_key = None
-    if timeseries.AGG_MEAN in agg_methods:
-        var_key = timeseries.AGG_MEAN
-    elif timeseries.AGG_MEDIAN in agg_methods:
-        var_key = timeseries.AGG_MEDIAN
-    elif timeseries.AGG_MIN in agg_methods or timeseries.AGG_MAX in agg_methods:
-        var_key = timeseries.AGG_MIN
-    if not var_key:
-        raise ApiError.BadRequest(
-            "Aggregation methods must include one of" ' "mean", "median", "min", "max"'
-        )
-
-    roles_to_anc_var_names = dict()
-    if incl_ancillary_vars:
-        roles_to_anc_var_name_sets = find_ancillary_var_names(
-            dataset, var_name, same_shape=True, same_dims=True
-        )
-        for role, roles_to_anc_var_name_sets in roles_to_anc_var_name_sets.items():
-            if role:
-                roles_to_anc_var_names[role] = roles_to_anc_var_name_sets.pop()
+    var_key = _get_point_var_key(agg_methods)
+    roles_to_anc_var_names = _get_roles_to_anc_var_names(
+        dataset, var_name, incl_ancillary_vars
+    )
 
     var_names = [var_name] + list(set(roles_to_anc_var_names.values()))
 
@@ -234,13 +325,96 @@ def _get_time_series_for_point(
         end_date=end_date,
         cube_asserted=True,
     )
-    if time_series_ds is None:
-        return []
 
     key_to_var_names = {var_key: var_name}
     for role, anc_var_name in roles_to_anc_var_names.items():
         key_to_var_names[role] = anc_var_name
 
+    return _collect_time_series(
+        time_series_ds, key_to_var_names, max_valids=max_valids, columnar=columnar
+    )
+
+
+def _get_time_series_for_points(
+    dataset: xr.Dataset,
+    var_name: str,
+    points: list[shapely.geometry.Point],
+    agg_methods: set[str],
+    grid_mapping: Optional[GridMapping] = None,
+    start_date: Optional[np.datetime64] = None,
+    end_date: Optional[np.datetime64] = None,
+    max_valids: Optional[int] = None,
+    incl_ancillary_vars: bool = False,
+    columnar: bool = False,
+) -> TimeSeriesCollection:
+    var_key = _get_point_var_key(agg_methods)
+    roles_to_anc_var_names = _get_roles_to_anc_var_names(
+        dataset, var_name, incl_ancillary_vars
+    )
+
+    var_names = [var_name] + list(set(roles_to_anc_var_names.values()))
+
+    time_series_datasets = timeseries.get_points_time_series(
+        dataset,
+        points,
+        grid_mapping=grid_mapping,
+        var_names=var_names,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+    key_to_var_names = {var_key: var_name}
+    for role, anc_var_name in roles_to_anc_var_names.items():
+        key_to_var_names[role] = anc_var_name
+
+    return [
+        _collect_time_series(
+            time_series_ds, key_to_var_names, max_valids=max_valids, columnar=columnar
+        )
+        for time_series_ds in time_series_datasets
+    ]
+
+
+def _get_point_var_key(agg_methods: set[str]) -> str:
+    if timeseries.AGG_MEAN in agg_methods:
+        return timeseries.AGG_MEAN
+    if timeseries.AGG_MEDIAN in agg_methods:
+        return timeseries.AGG_MEDIAN
+    if timeseries.AGG_MIN in agg_methods or timeseries.AGG_MAX in agg_methods:
+        return timeseries.AGG_MIN
+    raise ApiError.BadRequest(
+        "Aggregation methods must include one of" ' "mean", "median", "min", "max"'
+    )
+
+
+def _get_roles_to_anc_var_names(
+    dataset: xr.Dataset, var_name: str, incl_ancillary_vars: bool
+) -> dict[str, str]:
+    roles_to_anc_var_names = dict()
+    if incl_ancillary_vars:
+        roles_to_anc_var_name_sets = find_ancillary_var_names(
+            dataset, var_name, same_shape=True, same_dims=True
+        )
+        for role, roles_to_anc_var_name_sets in roles_to_anc_var_name_sets.items():
+            if role:
+                roles_to_anc_var_names[role] = roles_to_anc_var_name_sets.pop()
+    return roles_to_anc_var_names
+
+
+def _collect_time_series(
+    time_series_ds: Optional[xr.Dataset],
+    key_to_var_names: dict[str, str],
+    max_valids: Optional[int] = None,
+    columnar: bool = False,
+) -> Union[TimeSeries, TimeSeriesColumns]:
+    if columnar:
+        if time_series_ds is None:
+            return {}
+        return collect_timeseries_columns(
+            time_series_ds, key_to_var_names, max_valids=max_valids
+        )
+    if time_series_ds is None:
+        return []
     return collect_timeseries_result(
         time_series_ds, key_to_var_names, max_valids=max_valids
     )
@@ -254,16 +428,7 @@ def collect_timeseries_result(
     var_values_map = dict()
     for key, var_name in key_to_var_names.items():
         values = time_series_ds[var_name].values
-        if np.issubdtype(values.dtype, np.floating):
-            num_type = float
-        elif np.issubdtype(values.dtype, np.integer):
-            num_type = int
-        elif np.issubdtype(values.dtype, np.dtype(bool)):
-            num_type = bool
-        else:
-            raise ValueError(
-                f"cannot convert {values.dtype}" f" into JSON-convertible value"
-            )
+        num_type = _get_num_type(values)
         var_values_map[key] = [
             (num_type(v) if f else None) for f, v in zip(np.isfinite(values), values)
         ]
@@ -314,6 +479,237 @@ def collect_timeseries_result(
     return time_series
 
 
+def collect_timeseries_columns(
+    time_series_ds: xr.Dataset,
+    key_to_var_names: dict[str, str],
+    max_valids: Optional[int] = None,
+) -> TimeSeriesColumns:
+    """Same as :func:`collect_timeseries_result`, but returns the
+    time-series as columns, that is, a mapping from keys to numpy
+    arrays of equal length. The "time" column contains the
+    observation times as ``datetime64[s]`` values.
+    Null values are represented by non-finite values.
+
+    Args:
+        time_series_ds: The time-series dataset.
+        key_to_var_names: Mapping from result keys to variable names.
+        max_valids: If given, only time steps with valid values are
+            included. If positive, the number of the most recent
+            time steps to be included.
+
+    Returns:
+        A mapping from keys to numpy arrays.
+    """
+    _check_max_valids(max_valids)
+
+    columns = dict()
+    valid = None
+    for key, var_name in key_to_var_names.items():
+        values = time_series_ds[var_name].values
+        _get_num_type(values)
+        is_finite = np.isfinite(values)
+        valid = is_finite if valid is None else valid | is_finite
+        columns[key] = values
+
+    time_values = (
+        pd.DatetimeIndex(time_series_ds.time.values)
+        .round("s")
+        .values.astype("datetime64[s]")
+    )
+
+    if max_valids is not None:
+        no_obs = ~valid if valid is not None else np.zeros_like(time_values, bool)
+        if "count" in columns:
+            no_obs |= columns["count"] == 0
+        (time_indexes,) = np.nonzero(~no_obs)
+        if max_valids > 0:
+            time_indexes = time_indexes[-max_valids:]
+        columns = {key: values[time_indexes] for key, values in columns.items()}
+        time_values = time_values[time_indexes]
+
+    has_count = "count" in columns
+    columns["time"] = time_values
+    if has_count:
+        max_number_of_observations = time_series_ds.attrs.get(
+            "max_number_of_observations", 1
+        )
+        columns["count_tot"] = np.full(
+            len(time_values), max_number_of_observations, dtype=np.int64
+        )
+
+    return columns
+
+
+def encode_time_series_columns(
+    result: Union[TimeSeriesColumns, TimeSeriesColumnsCollection]
+) -> Union[dict[str, list], list[dict[str, list]]]:
+    """Convert the columnar time-series *result* of
+    :func:`get_time_series` into a JSON-serializable object.
+    Null values are encoded as None, times as ISO strings.
+    """
+    if isinstance(result, list):
+        return [encode_time_series_columns(columns) for columns in result]
+    json_columns = dict()
+    for key, values in result.items():
+        if key == "time":
+            json_columns[key] = [
+                t + "Z" for t in np.datetime_as_string(values, unit="s").tolist()
+            ]
+        elif np.issubdtype(values.dtype, np.floating):
+            json_values = values.astype(object)
+            json_values[~np.isfinite(values)] = None
+            json_columns[key] = json_values.tolist()
+        else:
+            json_columns[key] = values.tolist()
+    return json_columns
+
+
+def iter_time_series_csv(
+    result: Union[TimeSeriesColumns, TimeSeriesColumnsCollection],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Encode the columnar time-series *result* of
+    :func:`get_time_series` as CSV.
+    If *result* is a collection, the first column "index"
+    refers to the time-series' geometry.
+
+    Args:
+        result: Columnar time-series or collection thereof.
+        chunk_size: Maximum number of rows per chunk.
+
+    Returns:
+        An iterator of chunks of CSV-encoded bytes.
+    """
+    header = True
+    for df in _iter_time_series_frames(result, chunk_size):
+        yield df.to_csv(
+            header=header, index=False, date_format="%Y-%m-%dT%H:%M:%SZ"
+        ).encode("utf-8")
+        header = False
+
+
+def iter_time_series_arrow(
+    result: Union[TimeSeriesColumns, TimeSeriesColumnsCollection],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Encode the columnar time-series *result* of
+    :func:`get_time_series` in the Apache Arrow IPC streaming format.
+    Requires the package "pyarrow".
+    If *result* is a collection, the first column "index"
+    refers to the time-series' geometry.
+
+    Args:
+        result: Columnar time-series or collection thereof.
+        chunk_size: Maximum number of rows per record batch.
+
+    Returns:
+        An iterator of chunks of Arrow-encoded bytes.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ApiError.BadRequest(
+            'Time-series format "arrow" requires the package "pyarrow"'
+        ) from e
+
+    schema = None
+    fields = dict()
+    for df in _iter_time_series_frames(result, chunk_size):
+        if schema is None:
+            for name in df.columns:
+                if name == "time":
+                    fields[name] = pa.timestamp("s", tz="UTC")
+                else:
+                    fields[name] = pa.from_numpy_dtype(df[name].dtype)
+            schema = pa.schema(list(fields.items()))
+            sink = io.BytesIO()
+            writer = pa.ipc.new_stream(sink, schema)
+        batch = pa.RecordBatch.from_arrays(
+            [
+                pa.array(
+                    df[name].values,
+                    type=fields[name],
+                    from_pandas=True,
+                )
+                for name in fields.keys()
+            ],
+            schema=schema,
+        )
+        writer.write_batch(batch)
+        yield sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+    if schema is not None:
+        writer.close()
+        yield sink.getvalue()
+
+
+def _iter_time_series_frames(
+    result: Union[TimeSeriesColumns, TimeSeriesColumnsCollection],
+    chunk_size: int,
+) -> Iterator[pd.DataFrame]:
+    """Iterate the columnar time-series *result* as data frames
+    with equal columns and at most *chunk_size* rows.
+    """
+    if isinstance(result, list):
+        column_names = ["index"]
+        for columns in result:
+            for name in columns.keys():
+                if name not in column_names:
+                    column_names.append(name)
+        column_dtypes = {
+            name: np.result_type(
+                *[columns[name].dtype for columns in result if name in columns]
+            )
+            for name in column_names[1:]
+        }
+        time_series_list = [
+            (index, columns)
+            for index, columns in enumerate(result)
+            if columns and len(columns["time"]) > 0
+        ]
+    else:
+        column_names = list(result.keys())
+        column_dtypes = {name: values.dtype for name, values in result.items()}
+        time_series_list = [(None, result)] if result else []
+
+    if not time_series_list:
+        if not column_names:
+            return
+        # Emit the header only
+        yield pd.DataFrame(
+            {
+                name: np.array([], dtype=column_dtypes.get(name, np.int64))
+                for name in column_names
+            }
+        )
+        return
+
+    for index, columns in time_series_list:
+        num_times = len(columns["time"])
+        for start in range(0, num_times, chunk_size):
+            stop = min(start + chunk_size, num_times)
+            data = dict()
+            for name in column_names:
+                if name == "index":
+                    data[name] = np.full(stop - start, index, dtype=np.int64)
+                elif name in columns:
+                    data[name] = columns[name][start:stop]
+                else:
+                    data[name] = np.full(stop - start, np.nan)
+            yield pd.DataFrame(data)
+
+
+def _get_num_type(values: np.ndarray) -> type:
+    if np.issubdtype(values.dtype, np.floating):
+        return float
+    if np.issubdtype(values.dtype, np.integer):
+        return int
+    if np.issubdtype(values.dtype, np.dtype(bool)):
+        return bool
+    raise ValueError(f"cannot convert {values.dtype}" f" into JSON-convertible value")
+
+
 def _to_shapely_geometries(
     geo_json_geometries: list[GeoJsonGeometry],
 ) -> list[shapely.geometry.base.BaseGeometry]:
@@ -4,10 +4,19 @@
 
 import pandas as pd
 
+from xcube.server.api import ApiError
 from xcube.server.api import ApiHandler
 from .api import api
 from .context import TimeSeriesContext
+from .controllers import TIME_SERIES_FORMATS
+from .controllers import TIME_SERIES_FORMAT_ARROW
+from .controllers import TIME_SERIES_FORMAT_COLUMNS
+from .controllers import TIME_SERIES_FORMAT_CSV
+from .controllers import TIME_SERIES_FORMAT_JSON
+from .controllers import encode_time_series_columns
 from .controllers import get_time_series
+from .controllers import iter_time_series_arrow
+from .controllers import iter_time_series_csv
 from ..datasets import PATH_PARAM_DATASET_ID
 from ..datasets import PATH_PARAM_VAR_NAME
 
@@ -65,6 +74,20 @@ class TimeseriesHandler(ApiHandler[TimeSeriesContext]):
                     "type": "integer",
                 },
             },
+            {
+                "name": "format",
+                "in": "query",
+                "description": "Output format."
+                ' "json" returns a list of time-series values,'
+                ' "columns" returns a JSON object of value arrays,'
+                ' "csv" and "arrow" stream the values as CSV'
+                " and Apache Arrow IPC stream, respectively.",
+                "schema": {
+                    "type": "string",
+                    "enum": list(TIME_SERIES_FORMATS),
+                    "default": TIME_SERIES_FORMAT_JSON,
+                },
+            },
         ],
     )
     async def post(self, datasetId: str, varName: str):
@@ -79,7 +102,28 @@ class TimeseriesHandler(ApiHandler[TimeSeriesContext]):
         )
         tolerance = self.request.get_query_arg("tolerance", type=float, default=1.0)
         max_valids = self.request.get_query_arg("maxValids", type=int, default=None)
-        result = await self.ctx.run_in_executor(
+        output_format = self.request.get_query_arg(
+            "format", type=str, default=TIME_SERIES_FORMAT_JSON
+        )
+        if output_format not in TIME_SERIES_FORMATS:
+            raise ApiError.BadRequest(
+                f"Query parameter 'format' must be one of"
+                f" {', '.join(TIME_SERIES_FORMATS)}, was {output_format!r}"
+            )
+        columnar = output_format != TIME_SERIES_FORMAT_JSON
+        result = await self.ctx.run_in_executor_shared(
+            (
+                "getTimeSeries",
+                datasetId,
+                varName,
+                self.request.body,
+                tuple(agg_methods) if agg_methods else None,
+                start_date,
+                end_date,
+                tolerance,
+                max_valids,
+                columnar,
+            ),
             None,
             get_time_series,
             self.ctx,
@@ -91,6 +135,18 @@ class TimeseriesHandler(ApiHandler[TimeSeriesContext]):
             end_date,
             tolerance,
             max_valids,
+            columnar=columnar,
         )
-        self.response.set_header("Content-Type", "application/json")
-        await self.response.finish(dict(result=result))
+        if output_format == TIME_SERIES_FORMAT_CSV:
+            await self.stream_response(iter_time_series_csv(result), "text/csv")
+        elif output_format == TIME_SERIES_FORMAT_ARROW:
+            await self.stream_response(
+                iter_time_series_arrow(result), "application/vnd.apache.arrow.stream"
+            )
+        else:
+            if output_format == TIME_SERIES_FORMAT_COLUMNS:
+                result = await self.ctx.run_in_executor(
+                    None, encode_time_series_columns, result
+                )
+            self.response.set_header("Content-Type", "application/json")
+            await self.response.finish(dict(result=result))
@@ -0,0 +1,163 @@
+# Copyright (c) 2018-2024 by xcube team and contributors
+# Permissions are hereby granted under the terms of the MIT License:
+# https://opensource.org/licenses/MIT.
+
+import sys
+import zlib
+from collections.abc import Iterator
+from typing import Optional
+
+import numpy as np
+import xarray as xr
+
+VOLUME_DTYPES = ("float32", "uint16", "uint8")
+"""Data types of the voxels of encoded volumes."""
+
+VOLUME_ENCODINGS = ("gz", "raw")
+"""Encodings of volumes."""
+
+_NRRD_TYPES = dict(float32="float", uint16="ushort", uint8="uchar")
+
+# Raw value of missing voxels in quantized volumes
+_MISSING_RAW_VALUE = 0
+
+
+def get_volume_nrrd_header(
+    shape: tuple[int, int, int],
+    encoding: str = "gz",
+    dtype: str = "float32",
+    value_range: Optional[tuple[float, float]] = None,
+) -> str:
+    """Get the NRRD header of a volume.
+
+    For quantized volumes, i.e., if *dtype* is an integer type,
+    the header contains the key-value pairs "scale" and "offset"
+    that decode a raw voxel value into ``raw * scale + offset``.
+    Missing values are encoded by the raw value zero.
+
+    Args:
+        shape: The volume's shape (size_z, size_y, size_x).
+        encoding: The encoding, "gz" or "raw".
+        dtype: The data type of the voxels, one of "float32",
+            "uint16", "uint8".
+        value_range: Value range (vmin, vmax) mapped to the
+            raw values of quantized volumes.
+
+    Returns:
+        The NRRD header including the terminating empty line.
+    """
+    size_z, size_y, size_x = shape
+    # TODO (forman): find more suitable normalisation
+    scale_x = scale_y = 100.0 / max(size_x, size_y)
+    scale_z = 100.0 / size_z
+
+    header = (
+        "NRRD0004\n"
+        "# NRRD 4 Format\n"
+        "# see http://teem.sourceforge.net/nrrd/format.html\n"
+        f"type: {_NRRD_TYPES[dtype]}\n"
+        "dimension: 3\n"
+        f"sizes: {size_x} {size_y} {size_z}\n"
+        f"encoding: {encoding}\n"
+    )
+    if np.dtype(dtype).itemsize > 1:
+        header += f"endian: {sys.byteorder}\n"
+    header += (
+        "space directions:"
+        f" ({scale_x},0,0) (0,{scale_y},0) (0,0,{scale_z})\n"
+        "space origin: (0,0,0)\n"
+    )
+    if dtype != "float32":
+        scale, offset = get_volume_scaling(dtype, value_range)
+        header += f"scale:={scale}\noffset:={offset}\n"
+    return header + "\n"
+
+
+def get_volume_scaling(
+    dtype: str, value_range: tuple[float, float]
+) -> tuple[float, float]:
+    """Get the scaling of the raw values of a quantized volume.
+
+    The value range is mapped to the raw values from one to the
+    maximum value of *dtype*, zero is reserved for missing values.
+
+    Args:
+        dtype: The integer data type of the voxels.
+        value_range: Value range (vmin, vmax).
+
+    Returns:
+        The tuple (scale, offset).
+    """
+    vmin, vmax = value_range
+    max_raw_value = np.iinfo(dtype).max
+    scale = (vmax - vmin) / (max_raw_value - 1) if vmax > vmin else 1.0
+    return scale, vmin - scale
+
+
+def iter_volume_blocks(
+    var: xr.DataArray,
+    is_j_axis_up: bool = True,
+    encoding: str = "gz",
+    dtype: str = "float32",
+    value_range: Optional[tuple[float, float]] = None,
+) -> Iterator[bytes]:
+    """Encode the values of the 3-D variable *var* and return
+    an iterator of the encoded bytes.
+
+    The values are computed slab by slab along the first dimension,
+    where a slab comprises the first dimension's chunk, if any,
+    otherwise a single plane. Each slab is encoded and compressed
+    before the next one is computed, so only one slab at a time is
+    held in memory.
+
+    Args:
+        var: A 3-D variable.
+        is_j_axis_up: Whether the y-axis of *var* points upwards.
+            If not, the y-axis is flipped.
+        encoding: The encoding, "gz" or "raw".
+        dtype: The data type of the voxels, one of "float32",
+            "uint16", "uint8".
+        value_range: Value range (vmin, vmax) mapped to the
+            raw values of quantized volumes.
+
+    Returns:
+        An iterator of the blocks of the encoded volume.
+    """
+    compressor = (
+        zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        if encoding == "gz"
+        else None
+    )
+    z_chunks = var.chunks[0] if var.chunks else (1,) * var.shape[0]
+    z_start = 0
+    for z_chunk in z_chunks:
+        values = var[z_start : z_start + z_chunk].values
+        z_start += z_chunk
+        if not is_j_axis_up:
+            values = values[:, ::-1, :]
+        data = _encode_values(values, dtype, value_range).tobytes(order="C")
+        if compressor is not None:
+            data = compressor.compress(data)
+        if data:
+            yield data
+    if compressor is not None:
+        yield compressor.flush()
+
+
+def _encode_values(
+    values: np.ndarray,
+    dtype: str,
+    value_range: Optional[tuple[float, float]],
+) -> np.ndarray:
+    values = values.astype(np.float32)
+    missing = np.isnan(values)
+    if dtype == "float32":
+        values[missing] = 0.0
+        return values
+    scale, offset = get_volume_scaling(dtype, value_range)
+    values -= offset
+    values /= scale
+    np.rint(values, out=values)
+    np.clip(values, 1, np.iinfo(dtype).max, out=values)
+    values[missing] = _MISSING_RAW_VALUE
+    return values.astype(dtype)
@@ -3,11 +3,7 @@
 # https://opensource.org/licenses/MIT.
 
 import functools
-import gzip
-import math
-import sys
 
-import numpy as np
 import pandas as pd
 import pyproj
 
@@ -18,6 +14,10 @@ from xcube.server.api import ApiHandler
 from .api import api
 from .config import DEFAULT_MAX_VOXEL_COUNT
 from .context import VolumesContext
+from .controllers import VOLUME_DTYPES
+from .controllers import VOLUME_ENCODINGS
+from .controllers import get_volume_nrrd_header
+from .controllers import iter_volume_blocks
 from ..datasets import PATH_PARAM_DATASET_ID
 from ..datasets import PATH_PARAM_VAR_NAME
 
@@ -64,10 +64,37 @@ class VolumesContextHandler(ApiHandler[VolumesContext]):
                 "description": "Encoding of the result",
                 "schema": {
                     "type": "string",
-                    "enum": ["raw", "gz"],
+                    "enum": list(VOLUME_ENCODINGS),
                     "default": "gz",
                 },
             },
+            {
+                "name": "dtype",
+                "in": "query",
+                "description": "Data type of the voxels. Integer types"
+                " quantize the values in the range given by vmin and vmax;"
+                " the NRRD header then provides the key-value pairs"
+                " scale and offset, and missing values are encoded as zero.",
+                "schema": {
+                    "type": "string",
+                    "enum": list(VOLUME_DTYPES),
+                    "default": "float32",
+                },
+            },
+            {
+                "name": "vmin",
+                "in": "query",
+                "description": "Minimum value of quantized volumes."
+                " Defaults to the minimum of the variable's color mapping.",
+                "schema": {"type": "number"},
+            },
+            {
+                "name": "vmax",
+                "in": "query",
+                "description": "Maximum value of quantized volumes."
+                " Defaults to the maximum of the variable's color mapping.",
+                "schema": {"type": "number"},
+            },
         ],
     )
     async def get(self, datasetId: str, varName: str):
@@ -92,9 +119,17 @@ class VolumesContextHandler(ApiHandler[VolumesContext]):
 
         encoding = self.request.get_query_arg("encoding", type=str, default="gz")
 
-        if encoding not in ("gz", "raw"):
+        if encoding not in VOLUME_ENCODINGS:
             raise ApiError.BadRequest('Encoding must be one of "gz" or "raw"')
 
+        dtype = self.request.get_query_arg("dtype", type=str, default="float32")
+        if dtype not in VOLUME_DTYPES:
+            raise ApiError.BadRequest(
+                f"Data type must be one of {', '.join(map(repr, VOLUME_DTYPES))}"
+            )
+        vmin = self.request.get_query_arg("vmin", type=float, default=None)
+        vmax = self.request.get_query_arg("vmax", type=float, default=None)
+
         ml_dataset = self.ctx.datasets_ctx.get_ml_dataset(datasetId)
         grid_mapping = ml_dataset.grid_mapping
 
@@ -129,48 +164,28 @@ class VolumesContextHandler(ApiHandler[VolumesContext]):
                 f' got {" x ".join(map(str, var.shape))} = {voxel_count}.'
             )
 
-        # TODO (forman): allow for any dtype
-        values = var.astype(dtype=np.float32).values
-        if not ml_dataset.grid_mapping.is_j_axis_up:
-            values = values[:, ::-1, :]
-        values = np.where(np.isnan(values), 0.0, values)
-        data = values.tobytes(order="C")
-        if encoding == "gz":
-            data = gzip.compress(data)
-
-        block_size = 1024 * 1024
-        num_blocks = math.ceil(len(data) / block_size)
-
-        size_z, size_y, size_x = var.shape
-        # TODO (forman): find more suitable normalisation
-        scale_x = scale_y = 100.0 / max(size_x, size_y)
-        scale_z = 100.0 / size_z
-
-        nrrd_header = (
-            "NRRD0004\n"
-            "# NRRD 4 Format\n"
-            "# see http://teem.sourceforge.net/nrrd/format.html\n"
-            "type: float\n"  # TODO (forman): allow for any dtype
-            "dimension: 3\n"
-            "sizes:"
-            f" {size_x} {size_y} {size_z}\n"
-            f"encoding:"
-            f" {encoding}\n"
-            "endian:"
-            f" {sys.byteorder}\n"
-            "space directions:"
-            f" ({scale_x},0,0) (0,{scale_y},0) (0,0,{scale_z})\n"
-            "space origin: (0,0,0)\n"
-            "\n"
+        value_range = None
+        if dtype != "float32":
+            if vmin is None or vmax is None:
+                _, _, (cmap_vmin, cmap_vmax) = self.ctx.datasets_ctx.get_color_mapping(
+                    datasetId, varName
+                )
+                vmin = cmap_vmin if vmin is None else vmin
+                vmax = cmap_vmax if vmax is None else vmax
+            value_range = vmin, vmax
+
+        nrrd_header = get_volume_nrrd_header(
+            var.shape, encoding=encoding, dtype=dtype, value_range=value_range
+        )
+        blocks = iter_volume_blocks(
+            var,
+            is_j_axis_up=ml_dataset.grid_mapping.is_j_axis_up,
+            encoding=encoding,
+            dtype=dtype,
+            value_range=value_range,
         )
 
         self.response.set_header("Content-Type", "application/octet-stream")
         self.response.set_header("Cache-Control", "max-age=1")
         self.response.write(bytes(nrrd_header, "utf-8"))
-        import time
-
-        for i in range(num_blocks):
-            self.response.write(data[i * block_size : i * block_size + block_size])
-            time.sleep(1 / 10000)
-
-        await self.response.finish()
+        await self.stream_response(blocks)